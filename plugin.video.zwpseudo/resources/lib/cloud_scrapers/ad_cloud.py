@@ -6,6 +6,7 @@
 import re
 from resources.lib.cloud_scrapers import cloud_utils
 from resources.lib.database import cache
+from resources.lib.debrid import cloud_library
 from resources.lib.debrid.alldebrid import AllDebrid
 from resources.lib.modules.control import setting as getSetting
 # from resources.lib.modules.source_utils import supported_video_extensions
@@ -35,11 +36,9 @@ class source:
 			self.episode = str(data['episode']) if 'tvshowtitle' in data else None
 			query_list = self.episode_query_list() if 'tvshowtitle' in data else self.year_query_list()
 			# log_utils.log('query_list = %s' % query_list)
-			try: cloud_folders = AllDebrid().user_cloud()['magnets']
-			except: return sources
-			if not cloud_folders: return sources
-			cloud_folders = [i for i in cloud_folders if i['statusCode'] == 4]
+			cloud_folders = [folder for folder, details in cloud_library.folders('AllDebrid', title, aliases, self.season, self.episode)] # finished magnets from the local cloud index
 			if not cloud_folders: return sources
+			source_names = set() # names already added, replaces the "name in str(sources)" scan
 			ignoreM2ts = getSetting('ad_cloud.ignore.m2ts') == 'true'
 			extras_filter = cloud_utils.extras_filter()
 		except:
@@ -70,7 +69,7 @@ class source:
 					if any(value in rt for value in extras_filter): continue
 					if '.m2ts' in str(file.get('files')):
 						if ignoreM2ts: continue
-						if name in str(sources): continue
+						if name in source_names: continue
 						if all(not bool(re.search(i, rt)) for i in query_list): continue  # check if this newly added causes any movie titles that do not have the year to get dropped
 						is_m2ts = True
 						m2ts_files = [i for i in files if name == i.get('filename')]
@@ -116,6 +115,7 @@ class source:
 
 					sources.append({'provider': 'ad_cloud', 'source': 'cloud', 'debrid': 'AllDebrid', 'seeders': seeders, 'hash': hash, 'name': name, 'name_info': name_info,
 												'quality': quality, 'language': 'en', 'url': link, 'info': info, 'direct': True, 'debridonly': True, 'size': dsize})
+					source_names.add(name)
 				except:
 					from resources.lib.modules import log_utils
 					log_utils.error('AD_CLOUD: ')
@@ -5,6 +5,7 @@
 
 import re
 from resources.lib.cloud_scrapers import cloud_utils
+from resources.lib.debrid import cloud_library
 #from resources.lib.database import cache
 from resources.lib.debrid.offcloud import Offcloud
 from resources.lib.modules.control import setting as getSetting
@@ -34,9 +35,7 @@ class source:
 			self.episode = str(data['episode']) if 'tvshowtitle' in data else None
 			query_list = self.episode_query_list() if 'tvshowtitle' in data else self.year_query_list()
 			# log_utils.log('query_list = %s' % query_list)
-			cloud_folders = Offcloud().user_cloud()
-			if not cloud_folders: return sources
-			cloud_folders = [i for i in cloud_folders if i['status'] == 'downloaded']
+			cloud_folders = cloud_library.folders('Offcloud', title, aliases, self.season, self.episode) # downloaded requests from the local cloud index
 			if not cloud_folders: return sources
 			extras_filter = cloud_utils.extras_filter()
 		except:
@@ -44,13 +43,11 @@ class source:
 			log_utils.error('OC_CLOUD: ')
 			return sources
 
-		for folder in cloud_folders:
+		for folder, folder_files in cloud_folders:
 			try:
 				folder_name = folder.get('fileName', '')
 				if not cloud_utils.cloud_check_title(title, aliases, folder_name): continue
-				request_id = folder.get('requestId', '')
-				if not folder['isDirectory']: folder_files = [Offcloud().build_url(folder['server'], folder['requestId'], folder['fileName'])]
-				else: folder_files = Offcloud().torrent_info(request_id)
+				if not folder_files: continue # explore request failed, retried on the next scrape
 			except:
 				from resources.lib.modules import log_utils
 				log_utils.error('OC_CLOUD: ')
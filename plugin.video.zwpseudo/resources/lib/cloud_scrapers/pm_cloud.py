@@ -5,9 +5,9 @@
 
 import re
 from resources.lib.cloud_scrapers import cloud_utils
+from resources.lib.debrid import cloud_library
 from resources.lib.debrid.premiumize import Premiumize
 from resources.lib.modules.control import setting as getSetting
-from resources.lib.modules.source_utils import supported_video_extensions
 from resources.lib.fenom import source_utils as fs_utils
 
 
@@ -33,10 +33,9 @@ class source:
 			self.episode = str(data['episode']) if 'tvshowtitle' in data else None
 			query_list = self.episode_query_list() if 'tvshowtitle' in data else self.year_query_list()
 			# log_utils.log('query_list = %s' % query_list)
-			cloud_files = Premiumize().my_files_all()
-			if not cloud_files: return sources
-			cloud_files = [i for i in cloud_files if i['path'].lower().endswith(tuple(supported_video_extensions()))] # this only lets folder names thru with known video extensions..?
+			cloud_files = [i for folder, details in cloud_library.folders('Premiumize.me', title, aliases, self.season, self.episode) for i in folder['files']] # video files of matching top level folders, from the local cloud index
 			if not cloud_files: return sources
+			source_names = set() # names already added, replaces the "name in str(sources)" scan
 			ignoreM2ts = getSetting('pm_cloud.ignore.m2ts') == 'true'
 			extras_filter = cloud_utils.extras_filter()
 		except:
@@ -58,7 +57,7 @@ class source:
 				if name.endswith('m2ts'):
 					if ignoreM2ts: continue
 					name = item.get('path', '').split('/')[0]
-					if name in str(sources): continue
+					if name in source_names: continue
 					if all(not bool(re.search(i, rt)) for i in query_list): continue # check if this newly added causes any movie titles that do not have the year to get dropped
 					is_m2ts = True
 					m2ts_files = [i for i in cloud_files if name in i.get('path')]
@@ -90,6 +89,7 @@ class source:
 
 				sources.append({'provider': 'pm_cloud', 'source': 'cloud', 'debrid': 'Premiumize.me', 'seeders': '', 'hash': '', 'name': name, 'name_info': name_info,
 											'quality': quality, 'language': 'en', 'url': url_id, 'info': info, 'direct': True, 'debridonly': True, 'size': dsize})
+				source_names.add(name)
 			except:
 				from resources.lib.modules import log_utils
 				log_utils.error('PM_CLOUD: ')
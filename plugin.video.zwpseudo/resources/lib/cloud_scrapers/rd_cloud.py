@@ -6,6 +6,7 @@
 import re
 from resources.lib.cloud_scrapers import cloud_utils
 from resources.lib.database import cache
+from resources.lib.debrid import cloud_library
 from resources.lib.debrid.realdebrid import RealDebrid
 from resources.lib.modules.control import setting as getSetting
 from resources.lib.modules.source_utils import supported_video_extensions
@@ -34,11 +35,9 @@ class source:
 			self.episode = str(data['episode']) if 'tvshowtitle' in data else None
 			query_list = self.episode_query_list() if 'tvshowtitle' in data else self.year_query_list()
 			# log_utils.log('query_list = %s' % query_list)
-			cloud_folders = RealDebrid().user_torrents()
-			if not cloud_folders: return sources
-#			cloud_folders = [i for i in cloud_folders if i['status'] == 'downloaded']
-			cloud_folders = [i for i in cloud_folders if i.get('ended')]
+			cloud_folders = cloud_library.folders('Real-Debrid', title, aliases, self.season, self.episode) # finished torrents from the local cloud index
 			if not cloud_folders: return sources
+			source_names = set() # names already added, replaces the "name in str(sources)" scan
 			ignoreM2ts = getSetting('rd_cloud.ignore.m2ts') == 'true'
 			extras_filter = cloud_utils.extras_filter()
 		except:
@@ -46,13 +45,12 @@ class source:
 			log_utils.error('RD_CLOUD: ')
 			return sources
 
-		for folder in cloud_folders:
+		for folder, torrent_info in cloud_folders:
 			is_m2ts = False
 			try:
 				folder_name = folder.get('filename', '')
 				if not cloud_utils.cloud_check_title(title, aliases, folder_name): continue
-				id = folder.get('id', '')
-				torrent_info = RealDebrid().torrent_info(id)
+				if not torrent_info: continue # torrent_info request failed, retried on the next scrape
 				folder_files = torrent_info['files']
 				folder_files = [i for i in folder_files if i['selected'] == 1]
 			except:
@@ -70,7 +68,7 @@ class source:
 						if ignoreM2ts: continue
 						name = folder_name
 						rt = cloud_utils.release_title_format(name)
-						if name in str(sources): continue
+						if name in source_names: continue
 						if all(not bool(re.search(i, rt)) for i in query_list): continue  # check if this newly added causes any movie titles that do not have the year to get dropped
 						is_m2ts = True
 						largest = sorted(folder_files, key=lambda k: k['bytes'], reverse=True)[0]
@@ -109,6 +107,7 @@ class source:
 
 					sources.append({'provider': 'rd_cloud', 'source': 'cloud', 'debrid': 'Real-Debrid', 'seeders': '', 'hash': hash, 'name': name, 'name_info': name_info,
 												'quality': quality, 'language': 'en', 'url': link, 'info': info, 'direct': True, 'debridonly': True, 'size': dsize})
+					source_names.add(name)
 				except:
 					from resources.lib.modules import log_utils
 					log_utils.error('RD_CLOUD: ')
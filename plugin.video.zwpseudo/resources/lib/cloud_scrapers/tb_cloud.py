@@ -4,9 +4,9 @@
 """
 
 import re
-from threading import Thread
 from resources.lib.cloud_scrapers import cloud_utils
 from resources.lib.database import cache
+from resources.lib.debrid import cloud_library
 from resources.lib.debrid.torbox import TorBox
 from resources.lib.modules.control import setting as getSetting
 from resources.lib.modules.source_utils import supported_video_extensions
@@ -35,13 +35,7 @@ class source:
 			self.episode = str(data['episode']) if 'tvshowtitle' in data else None
 			query_list = self.episode_query_list() if 'tvshowtitle' in data else self.year_query_list()
 			# log_utils.log('query_list = %s' % query_list)
-			folders = []
-			threads = (
-				Thread(target=self._scraper, args=(folders, TorBox().user_cloud, 'torent')),
-				Thread(target=self._scraper, args=(folders, TorBox().user_cloud_usenet, 'usenet'))
-			)
-			[i.start() for i in threads]
-			[i.join() for i in threads]
+			folders = [folder for folder, details in cloud_library.folders('TorBox', title, aliases, self.season, self.episode)] # torrent and usenet downloads from the local cloud index
 			if not folders: return sources
 			extras_filter = cloud_utils.extras_filter()
 		except:
@@ -164,7 +158,3 @@ class source:
 			from resources.lib.modules import log_utils
 			log_utils.error('TB_CLOUD: ')
 			return None
-
-	def _scraper(self, results, function, mediatype):
-		try: results += [{**i, 'mediatype': mediatype} for i in function()['data'] if i['download_finished'] and i['files']]
-		except: pass
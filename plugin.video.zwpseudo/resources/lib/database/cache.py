@@ -2,13 +2,57 @@
 	Venom Add-on
 """
 
-from ast import literal_eval
+import atexit
 from hashlib import md5
+from importlib import import_module
+from inspect import signature
 from re import sub as re_sub
 from sqlite3 import dbapi2 as db
+from threading import Lock, Thread
 from time import time
+from resources.lib.database import codec, dbpool
 from resources.lib.modules import control
 
+meta_handle_expiry = 2592000 # 30 days, widgets keep their listing urls well past a session
+refresh_wake = 'zwpseudo.cache_refresh' # home window property set when refresh_queue has rows for the service
+
+dbpool.register(control.cacheFile, schema=(
+	'''CREATE TABLE IF NOT EXISTS cache (key TEXT, value TEXT, date INTEGER, UNIQUE(key));''',
+	'''CREATE TABLE IF NOT EXISTS meta_handle (handle TEXT, meta TEXT, date INTEGER, UNIQUE(handle));''',
+	'''CREATE TABLE IF NOT EXISTS cache_stats (name TEXT, hits INTEGER, stale INTEGER, misses INTEGER, UNIQUE(name));''',
+	'''CREATE TABLE IF NOT EXISTS refresh_queue (key TEXT, store TEXT, module TEXT, owner TEXT, name TEXT, args BLOB, date INTEGER, UNIQUE(key));'''),
+	version=codec.FORMAT_VERSION, migrate=codec.migrator(('cache', 'value')))
+_function_names = {} # underlying function: name its cache keys start with, resolved from repr() once per interpreter
+_stats = {} # function name: [hits, stale, misses] counted by get() in this interpreter, added to cache_stats at exit
+_stats_lock = Lock()
+_refreshing = set() # keys with a background refresh running in this interpreter
+_refresh_lock = Lock()
+
+
+def key_args(*names):
+	"""
+	Decorator naming the arguments a function's cache key is built from, the others are still passed to the function but left out of
+	the key. For blobs whose changes something else already tracks, ex. the bookmarks handed to trakt_episodes_list(), where Trakt's
+	paused activity forces the refetch, so str() of the whole list is neither hashed on every call nor a new row each time it changes.
+	"""
+	def decorator(function):
+		params = list(signature(function).parameters)
+		if params and params[0] == 'self': params = params[1:] # get() is handed the bound method
+		function.cache_key_positions = tuple(params.index(i) for i in names)
+		return function
+	return decorator
+
+def max_stale(hours):
+	"""
+	Decorator opting a function into stale-while-revalidate. An entry expired by less than hours, and by less than the duration of the get()
+	call itself, is returned at once and refreshed in the background, one older than that is fetched before returning as before. So a 6 hour
+	search listing is never served more than 12 hours old whatever the bound. A duration of 0 still forces the fetch.
+	"""
+	def decorator(function):
+		function.cache_max_stale = hours
+		return function
+	return decorator
+
 
 def get(function, duration, *args):
 	"""
@@ -20,39 +64,133 @@ def get(function, duration, *args):
 		key = _hash_function(function, args)
 		cache_result = cache_get(key)
 		if cache_result:
-			try: result = literal_eval(cache_result['value'])
+			try: result = codec.decode(cache_result['value'])
 			except: result = None
 			if _is_cache_valid(cache_result['date'], duration):
+				_count(key, 0)
 				return result
+			_count(key, 1)
+			if revalidate(function, duration, args, key, cache_result): return result
+		else: _count(key, 2)
 
-		fresh_result = repr(function(*args)) # may need a try-except block for server timeouts
+		fresh_result = function(*args) # may need a try-except block for server timeouts
 
-		if cache_result and (result and len(result) == 1) and fresh_result == '[]': # fix for syncSeason mark unwatched season when it's the last item remaining
+		if cache_result and (result and len(result) == 1) and fresh_result == []: # fix for syncSeason mark unwatched season when it's the last item remaining
 			if result[0].isdigit():
 				remove(function, *args)
 				return []
 
-		invalid = False
-		try: # Sometimes None is returned as a string instead of None type for "fresh_result"
-			if not fresh_result: invalid = True
-			elif fresh_result == 'None' or fresh_result == '' or fresh_result == '[]' or fresh_result == '{}': invalid = True
-			elif len(fresh_result) == 0: invalid = True
-		except: pass
+		invalid = codec.is_empty(fresh_result) # None, "", [] and {} are never cached, the same results the old repr() checks rejected
 
 		if invalid: # If the cache is old, but we didn't get "fresh_result", return the old cache
 			if cache_result: return result
 			else: return None # do not cache_insert() None type, sometimes servers just down momentarily
 		else:
-			if '404:NOT FOUND' in fresh_result:
+			if isinstance(fresh_result, str) and '404:NOT FOUND' in fresh_result:
 				cache_insert(key, None) # cache_insert() "404:NOT FOUND" cases only as None type
 				return None
 			else: cache_insert(key, fresh_result)
-			return literal_eval(fresh_result)
+			return fresh_result
 	except:
 		from resources.lib.modules import log_utils
 		log_utils.error()
 		return None
 
+def revalidate(function, duration, args, key, cache_result, store='cache'):
+	"""
+	Returns True when the expired cache_result is within the function's max_stale bound, its refresh is then started. With the language
+	invoker reused the interpreter outlives the directory, so a daemon thread refreshes it, else it goes in refresh_queue for the service.
+	:param store: 'cache' or 'fanarttv', the database the refreshed value is written to
+	"""
+	stale_hours = min(getattr(function, 'cache_max_stale', 0), duration) # bound scaled to the call, short lived listings stay short lived
+	if not (duration and stale_hours) or not _is_cache_valid(cache_result['date'], duration + stale_hours): return False
+	with _refresh_lock:
+		if key in _refreshing: return True
+		_refreshing.add(key)
+	if control.setting('reuse.languageinvoker') == 'true':
+		Thread(target=_refresh_thread, args=(function, args, key, store), name='zwpseudo_revalidate', daemon=True).start()
+	else:
+		_queue_refresh(function, args, key, store)
+		with _refresh_lock: _refreshing.discard(key)
+	return True
+
+def _refresh(function, args, key, store):
+	"""
+	Fetches and stores a fresh value for a stale entry, returns True when it differs from the cached one. An empty result keeps the stale
+	entry, the next get() past max_stale then fetches in the foreground.
+	"""
+	fresh_result = function(*args)
+	if codec.is_empty(fresh_result): return False
+	if isinstance(fresh_result, str) and '404:NOT FOUND' in fresh_result: fresh_result = None
+	if store == 'fanarttv':
+		from resources.lib.database import fanarttv_cache
+		cached = fanarttv_cache.cache_get(key)
+		fanarttv_cache.cache_insert(key, str(args), fresh_result)
+	else:
+		cached = cache_get(key)
+		cache_insert(key, fresh_result)
+	return not cached or cached['value'] != codec.encode(fresh_result)
+
+def _refresh_thread(function, args, key, store):
+	try:
+		owner = getattr(function, '__self__', None) # methods like trakt_list() reset self.list, so not the instance building the directory
+		if owner is not None: function = getattr(type(owner)(), function.__name__)
+		if _refresh(function, args, key, store): control.trigger_widget_refresh()
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+	finally:
+		with _refresh_lock: _refreshing.discard(key)
+
+def _queue_refresh(function, args, key, store):
+	owner = getattr(function, '__self__', None) # a bound method is called on a new instance of its class
+	module = (type(owner) if owner is not None else function).__module__
+	try:
+		dbcon = get_connection()
+		dbcur = get_connection_cursor(dbcon)
+		dbcur.execute('''INSERT OR REPLACE INTO refresh_queue Values (?, ?, ?, ?, ?, ?, ?)''', (key, store, module,
+					type(owner).__qualname__ if owner is not None else '', function.__name__, codec.encode(args), int(time())))
+		dbcur.connection.commit()
+		control.homeWindow.setProperty(refresh_wake, 'true')
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+	finally:
+		dbcur.close() ; dbcon.close()
+
+def refresh_queued():
+	"""
+	Service side of revalidate(), refreshes every entry in refresh_queue and reloads the widgets when any of them changed.
+	Returns the number of entries whose value changed.
+	"""
+	try:
+		dbcon = get_connection()
+		dbcur = get_connection_cursor(dbcon)
+		queued = dbcur.execute('''SELECT * FROM refresh_queue''').fetchall()
+		dbcur.executemany('''DELETE FROM refresh_queue WHERE key=? AND date=?''', [(i['key'], i['date']) for i in queued])
+		dbcur.connection.commit()
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+		queued = []
+	finally:
+		dbcur.close() ; dbcon.close()
+	owners, changed = {}, 0
+	for i in queued:
+		try:
+			module = import_module(i['module'])
+			if i['owner']:
+				owner = owners.get((i['module'], i['owner']))
+				if owner is None: owner = owners[(i['module'], i['owner'])] = getattr(module, i['owner'])()
+				function = getattr(owner, i['name'])
+			else: function = getattr(module, i['name'])
+			if _refresh(function, codec.decode(i['args']), i['key'], i['store']): changed += 1
+		except:
+			from resources.lib.modules import log_utils
+			log_utils.error()
+	if changed: control.trigger_widget_refresh()
+	return changed
+
 def _is_cache_valid(cached_time, cache_timeout):
 	now = int(time())
 	diff = now - cached_time
@@ -71,7 +209,7 @@ def timeout(function, *args):
 def cache_existing(function, *args):
 	try:
 		cache_result = cache_get(_hash_function(function, args))
-		if cache_result: return literal_eval(cache_result['value'])
+		if cache_result: return codec.decode(cache_result['value'])
 		else: return None
 	except:
 		from resources.lib.modules import log_utils
@@ -82,8 +220,6 @@ def cache_get(key):
 	try:
 		dbcon = get_connection()
 		dbcur = get_connection_cursor(dbcon)
-		ck_table = dbcur.execute('''SELECT * FROM sqlite_master WHERE type='table' AND name='cache';''').fetchone()
-		if not ck_table: return None
 		results = dbcur.execute('''SELECT * FROM cache WHERE key=?''', (key,)).fetchone()
 		return results
 	except:
@@ -98,8 +234,32 @@ def cache_insert(key, value):
 		dbcon = get_connection()
 		dbcur = get_connection_cursor(dbcon)
 		now = int(time())
-		dbcur.execute('''CREATE TABLE IF NOT EXISTS cache (key TEXT, value TEXT, date INTEGER, UNIQUE(key));''')
-		dbcur.execute('''INSERT OR REPLACE INTO cache Values (?, ?, ?)''', (key, value, now))
+		dbcur.execute('''INSERT OR REPLACE INTO cache Values (?, ?, ?)''', (key, codec.encode(value), now))
+		dbcur.connection.commit()
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+	finally:
+		dbcur.close() ; dbcon.close()
+
+def meta_handle(*ids):
+	"""
+	:param ids: mediatype, lang and the item ids, ex. ('episode', 'en', imdb, tmdb, tvdb, season, episode)
+	Compact key carried in ListItem urls as "meta_id" in place of the full url-encoded meta json.
+	"""
+	return '.'.join(str(i) for i in ids)
+
+def meta_store(items):
+	"""
+	:param items: list of (handle, meta json) for a whole directory, written in one transaction
+	"""
+	if not items: return
+	try:
+		dbcon = get_connection()
+		dbcur = get_connection_cursor(dbcon)
+		now = int(time())
+		dbcur.executemany('''INSERT OR REPLACE INTO meta_handle Values (?, ?, ?)''', [(i[0], i[1], now) for i in items])
+		dbcur.execute('''DELETE FROM meta_handle WHERE date < ?''', (now - meta_handle_expiry,))
 		dbcur.connection.commit()
 	except:
 		from resources.lib.modules import log_utils
@@ -107,6 +267,22 @@ def cache_insert(key, value):
 	finally:
 		dbcur.close() ; dbcon.close()
 
+def meta_fetch(handle):
+	"""
+	Returns the meta json stored for handle, None if it expired (callers treat it the same as a url without meta).
+	"""
+	try:
+		dbcon = get_connection()
+		dbcur = get_connection_cursor(dbcon)
+		result = dbcur.execute('''SELECT meta FROM meta_handle WHERE handle=?''', (handle,)).fetchone()
+		return result['meta'] if result else None
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+		return None
+	finally:
+		dbcur.close() ; dbcon.close()
+
 def remove(function, *args):
 	try:
 		key = _hash_function(function, args)
@@ -123,10 +299,80 @@ def remove(function, *args):
 	except: pass
 
 def _hash_function(function_instance, *args):
+	positions = getattr(function_instance, 'cache_key_positions', None)
+	if positions is not None: args = (tuple(args[0][i] for i in positions if i < len(args[0])),)
 	return _get_function_name(function_instance) + _generate_md5(args)
 
 def _get_function_name(function_instance):
-	return re_sub(r'.+\smethod\s|.+function\s|\sat\s.+|\sof\s.+', '', repr(function_instance))
+	function = getattr(function_instance, '__func__', function_instance) # the same name for every instance a method is bound to
+	try: return _function_names[function]
+	except KeyError: pass
+	except TypeError: return re_sub(r'.+\smethod\s|.+function\s|\sat\s.+|\sof\s.+', '', repr(function_instance)) # unhashable callable
+	name = _function_names[function] = re_sub(r'.+\smethod\s|.+function\s|\sat\s.+|\sof\s.+', '', repr(function_instance))
+	return name
+
+def _count(key, outcome):
+	name = key[:-32] # key is the function name + a 32 character md5
+	with _stats_lock:
+		counts = _stats.get(name)
+		if counts is None: counts = _stats[name] = [0, 0, 0]
+		counts[outcome] += 1
+
+def stats():
+	"""
+	Returns {function name: (hits, stale, misses)} for get() since cache_stats was last cleared, including this interpreter's counts.
+	"""
+	totals = {}
+	try:
+		dbcon = get_connection()
+		dbcur = get_connection_cursor(dbcon)
+		dbcur.row_factory = None
+		totals = {i[0]: list(i[1:]) for i in dbcur.execute('''SELECT name, hits, stale, misses FROM cache_stats''').fetchall()}
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+	finally:
+		dbcur.close() ; dbcon.close()
+	with _stats_lock:
+		for name, counts in _stats.items(): totals[name] = [a + b for a, b in zip(totals.get(name, [0, 0, 0]), counts)]
+	return {name: tuple(counts) for name, counts in totals.items()}
+
+def _flush_stats():
+	with _stats_lock:
+		if not _stats: return
+		counts = [(name,) + tuple(i) for name, i in _stats.items()]
+		_stats.clear()
+	try:
+		dbcon = get_connection()
+		dbcur = get_connection_cursor(dbcon)
+		dbcur.executemany('''INSERT OR IGNORE INTO cache_stats Values (?, 0, 0, 0)''', [(i[0],) for i in counts])
+		dbcur.executemany('''UPDATE cache_stats SET hits=hits+?, stale=stale+?, misses=misses+? WHERE name=?''', [i[1:] + i[:1] for i in counts])
+		dbcur.connection.commit()
+		from resources.lib.modules import log_utils
+		log_utils.log('cache.get() hit rate this run: %s' % ', '.join('%s %d/%d' % (i[0], i[1], sum(i[1:])) for i in counts), level=log_utils.LOGINFO)
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+	finally:
+		dbcur.close() ; dbcon.close()
+
+atexit.register(_flush_stats)
+
+def view_stats():
+	"""
+	Tools > Cache window listing cache.get() hits, stale hits and misses per function, busiest first.
+	"""
+	try:
+		from resources.lib.windows.textviewer import TextViewerXML
+		totals = sorted(stats().items(), key=lambda k: sum(k[1]), reverse=True)
+		text = '\n'.join('%s\n    %d%% hit rate: %d hits, %d stale, %d misses' % ((name, (i[0] + i[1]) * 100 // (sum(i) or 1)) + i) for name, i in totals)
+		if not text: text = 'No cache requests counted yet.'
+		windows = TextViewerXML('textviewer.xml', control.addonPath(control.addonId()), heading='[B]Cache Hit Rates[/B]', text=text)
+		windows.run()
+		del windows
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
 
 def _generate_md5(*args):
 	md5_hash = md5()
@@ -158,15 +404,7 @@ def cache_clear(flush_only=False):
 	return cleared
 
 def get_connection():
-	if not control.existsPath(control.dataPath): control.makeFile(control.dataPath)
-	dbcon = db.connect(control.cacheFile, timeout=60) # added timeout 3/23/21 for concurrency with threads
-	dbcon.execute('''PRAGMA page_size = 32768''')
-	dbcon.execute('''PRAGMA journal_mode = OFF''')
-	dbcon.execute('''PRAGMA synchronous = OFF''')
-	dbcon.execute('''PRAGMA temp_store = memory''')
-	dbcon.execute('''PRAGMA mmap_size = 30000000000''')
-	dbcon.row_factory = _dict_factory
-	return dbcon
+	return dbpool.connect(control.cacheFile, row_factory=_dict_factory) # pooled per thread, close() only releases it
 
 def get_connection_cursor(dbcon):
 	dbcur = dbcon.cursor()
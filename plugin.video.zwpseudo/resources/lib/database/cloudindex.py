@@ -0,0 +1,116 @@
+"""
+	Venom Add-on
+"""
+
+from time import time
+from resources.lib.database import codec, dbpool
+from resources.lib.modules.control import cloudindexFile
+
+dbpool.register(cloudindexFile, journal_mode='WAL', schema=(
+	'''CREATE TABLE IF NOT EXISTS folders (debrid TEXT, folder_id TEXT, name TEXT, title_key TEXT, stamp TEXT, detailed INTEGER, folder BLOB, details BLOB,
+		UNIQUE(debrid, folder_id));''',
+	'''CREATE TABLE IF NOT EXISTS files (debrid TEXT, folder_id TEXT, name TEXT, title_key TEXT, size INTEGER, link TEXT, season INTEGER,
+		episode_start INTEGER, episode_end INTEGER);''',
+	'''CREATE INDEX IF NOT EXISTS files_folder ON files (debrid, folder_id);''',
+	'''CREATE TABLE IF NOT EXISTS synced (debrid TEXT, date INTEGER, UNIQUE(debrid));'''))
+
+
+def stamps(debrid):
+	"""
+	Returns {folder_id: (stamp, detailed)} for the folders indexed for this debrid account.
+	"""
+	try:
+		dbcon = get_connection()
+		dbcur = dbcon.cursor()
+		return {i[0]: (i[1], i[2]) for i in dbcur.execute('''SELECT folder_id, stamp, detailed FROM folders WHERE debrid=?''', (debrid,)).fetchall()}
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+		return {}
+	finally:
+		dbcur.close() ; dbcon.close()
+
+def store(debrid, folders, removed=(), synced=False):
+	"""
+	One transaction per sync so scrapers reading the index never see a half written folder.
+	:param folders: list of dicts with folder_id, name, title_key, stamp, folder, details (None until fetched) and files, a list of
+		(name, title_key, size, link, season, episode_start, episode_end) tuples
+	:param removed: folder ids no longer in the account's cloud
+	:param synced: True when folders is the account's complete listing, recorded as the time of the last sync
+	"""
+	try:
+		dbcon = get_connection()
+		dbcur = dbcon.cursor()
+		for folder_id in removed:
+			dbcur.execute('''DELETE FROM folders WHERE debrid=? AND folder_id=?''', (debrid, folder_id))
+			dbcur.execute('''DELETE FROM files WHERE debrid=? AND folder_id=?''', (debrid, folder_id))
+		for i in folders:
+			dbcur.execute('''INSERT OR REPLACE INTO folders Values (?, ?, ?, ?, ?, ?, ?, ?)''', (debrid, i['folder_id'], i['name'], i['title_key'], i['stamp'],
+						int(i['details'] is not None), codec.encode(i['folder']), codec.encode(i['details'])))
+			dbcur.execute('''DELETE FROM files WHERE debrid=? AND folder_id=?''', (debrid, i['folder_id']))
+			dbcur.executemany('''INSERT INTO files Values (?, ?, ?, ?, ?, ?, ?, ?, ?)''', [(debrid, i['folder_id']) + tuple(file) for file in i['files']])
+		if synced: dbcur.execute('''INSERT OR REPLACE INTO synced Values (?, ?)''', (debrid, int(time())))
+		dbcur.connection.commit()
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+	finally:
+		dbcur.close() ; dbcon.close()
+
+def last_synced(debrid):
+	try:
+		dbcon = get_connection()
+		dbcur = dbcon.cursor()
+		match = dbcur.execute('''SELECT date FROM synced WHERE debrid=?''', (debrid,)).fetchone()
+		return match[0] if match else 0
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+		return 0
+	finally:
+		dbcur.close() ; dbcon.close()
+
+def lookup(debrid, title_keys, season=None, episode=None):
+	"""
+	Returns [(folder_id, folder, details)] for folders whose name, or one of whose files, holds any of title_keys. For an episode, detailed
+	folders are kept only when a file parsed to that season/episode, or one that could not be parsed, is in them.
+	"""
+	title_keys = [i for i in title_keys if i]
+	if not title_keys: return []
+	try:
+		dbcon = get_connection()
+		dbcur = dbcon.cursor()
+		match = ' OR '.join(['''instr(%s, ?)'''] * len(title_keys))
+		sql = '''SELECT folder_id, folder, details FROM folders WHERE debrid=? AND ((%s) OR folder_id IN (SELECT folder_id FROM files WHERE debrid=? AND (%s)))''' % (
+				match % (('title_key',) * len(title_keys)), match % (('title_key',) * len(title_keys)))
+		args = [debrid] + title_keys + [debrid] + title_keys
+		if season is not None and episode is not None:
+			sql += ''' AND (detailed=0 OR folder_id IN (SELECT folder_id FROM files WHERE debrid=? AND (season IS NULL OR (season=? AND ? BETWEEN episode_start AND episode_end))))'''
+			args += [debrid, int(season), int(episode)]
+		return [(i[0], codec.decode(i[1]), codec.decode(i[2])) for i in dbcur.execute(sql, args).fetchall()]
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+		return []
+	finally:
+		dbcur.close() ; dbcon.close()
+
+def clear(debrid=None):
+	cleared = False
+	try:
+		dbcon = get_connection()
+		dbcur = dbcon.cursor()
+		for t in ('folders', 'files', 'synced'):
+			if debrid: dbcur.execute('''DELETE FROM {} WHERE debrid=?'''.format(t), (debrid,))
+			else: dbcur.execute('''DELETE FROM {}'''.format(t))
+		dbcur.connection.commit()
+		cleared = True
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+	finally:
+		dbcur.close() ; dbcon.close()
+	return cleared
+
+def get_connection():
+	return dbpool.connect(cloudindexFile) # pooled per thread, close() only releases it
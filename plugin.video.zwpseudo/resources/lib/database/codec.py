@@ -0,0 +1,72 @@
+"""
+	Venom Add-on
+"""
+
+from ast import literal_eval
+from json import dumps as jsdumps, loads as jsloads
+from marshal import dumps as marshal_dumps, loads as marshal_loads
+
+# Stored payloads are BLOBs: MAGIC + format version byte + codec id byte + body.
+# Anything stored as TEXT is the legacy repr() format and is read with literal_eval().
+MAGIC = b'ZW'
+FORMAT_VERSION = 1
+MARSHAL = b'm' # compact and fastest for the plain dict/list/tuple/str payloads cached here
+JSON = b'j' # portable, but tuples come back as lists
+DEFAULT_CODEC = MARSHAL
+
+_codecs = {
+	MARSHAL: (lambda obj: marshal_dumps(obj, 4), marshal_loads),
+	JSON: (lambda obj: jsdumps(obj, separators=(',', ':')).encode('utf-8'), lambda body: jsloads(body.decode('utf-8')))}
+
+
+def register_codec(codec_id, dumps, loads):
+	"""
+	:param codec_id: single byte stored in the payload header
+	:param dumps: callable returning bytes for an object
+	:param loads: callable returning the object for those bytes
+	"""
+	_codecs[codec_id] = (dumps, loads)
+
+def encode(obj, codec=DEFAULT_CODEC):
+	if obj is None: return None
+	return MAGIC + bytes((FORMAT_VERSION,)) + codec + _codecs[codec][0](obj)
+
+def decode(value):
+	if value is None: return None
+	if isinstance(value, bytes) and value[:2] == MAGIC:
+		if value[2] != FORMAT_VERSION: raise ValueError('unsupported payload format version %s' % value[2])
+		return _codecs[value[3:4]][1](value[4:])
+	if isinstance(value, bytes): value = value.decode('utf-8')
+	return literal_eval(value) # legacy repr() rows not yet migrated
+
+def is_empty(obj):
+	return obj is None or (isinstance(obj, (str, list, dict)) and not obj)
+
+def is_encoded(value):
+	return isinstance(value, bytes) and value[:2] == MAGIC
+
+def migrator(*columns):
+	"""
+	:param columns: (table, column) pairs holding repr() payloads, used as dbpool.register(migrate=...)
+	"""
+	def migrate(dbcon, from_version):
+		if from_version >= FORMAT_VERSION: return
+		for table, column in columns: migrate_column(dbcon, table, column)
+	return migrate
+
+def migrate_column(dbcon, table, column, codec=DEFAULT_CODEC):
+	"""
+	One time conversion of legacy repr() TEXT rows to encoded BLOBs. Rows that no longer parse are dropped, they are cache rows only.
+	"""
+	migrated = dropped = 0
+	try: rows = dbcon.execute('''SELECT rowid, %s FROM %s WHERE typeof(%s)='text' ''' % (column, table, column)).fetchall()
+	except: return migrated, dropped # table does not exist yet
+	for rowid, value in rows:
+		try:
+			dbcon.execute('''UPDATE %s SET %s=? WHERE rowid=?''' % (table, column), (encode(literal_eval(value), codec), rowid))
+			migrated += 1
+		except:
+			dbcon.execute('''DELETE FROM %s WHERE rowid=?''' % table, (rowid,))
+			dropped += 1
+	dbcon.commit()
+	return migrated, dropped
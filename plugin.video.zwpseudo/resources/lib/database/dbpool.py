@@ -0,0 +1,117 @@
+"""
+	Venom Add-on
+"""
+
+from sqlite3 import dbapi2 as db
+from threading import Lock, local
+from resources.lib.modules.control import existsPath, dataPath, makeFile
+
+_registry = {} # dbfile: {'pragmas': (...), 'schema': (...)}
+_schema_ready = set() # dbfiles whose schema has been created by this interpreter
+_schema_lock = Lock()
+_local = local() # per thread {dbfile: sqlite3 connection}
+
+
+def register(dbfile, journal_mode='OFF', schema=(), page_size=32768, version=0, migrate=None):
+	"""
+	:param dbfile: Full path of the sqlite file
+	:param journal_mode: journal_mode PRAGMA applied once per connection
+	:param schema: CREATE statements run once per interpreter (and again if a table is found missing)
+	:param version: storage format version kept in PRAGMA user_version
+	:param migrate: callable(dbcon, from_version) run once when the file's user_version is older than version
+	"""
+	_registry[dbfile] = {
+		'pragmas': ('''PRAGMA page_size = %d''' % page_size, '''PRAGMA journal_mode = %s''' % journal_mode, '''PRAGMA synchronous = OFF''',
+					'''PRAGMA temp_store = memory''', '''PRAGMA mmap_size = 30000000000'''),
+		'schema': tuple(schema), 'version': version, 'migrate': migrate}
+
+def connect(dbfile, row_factory=None):
+	"""
+	Returns this thread's connection to dbfile wrapped so the usual "dbcur.close() ; dbcon.close()" hands it back to the pool instead of closing it.
+	"""
+	dbcon = _thread_connection(dbfile)
+	if dbfile not in _schema_ready: ensure_schema(dbfile, dbcon)
+	return PooledConnection(dbfile, dbcon, row_factory)
+
+def _thread_connection(dbfile):
+	connections = getattr(_local, 'connections', None)
+	if connections is None: connections = _local.connections = {}
+	dbcon = connections.get(dbfile)
+	if dbcon is None:
+		if not existsPath(dataPath): makeFile(dataPath)
+		dbcon = db.connect(dbfile, timeout=60) # added timeout 3/23/21 for concurrency with threads
+		for pragma in _registry.get(dbfile, {}).get('pragmas', ()): dbcon.execute(pragma)
+		connections[dbfile] = dbcon
+	return dbcon
+
+def ensure_schema(dbfile, dbcon=None, force=False):
+	with _schema_lock:
+		if dbfile in _schema_ready and not force: return True
+		try:
+			if dbcon is None: dbcon = _thread_connection(dbfile)
+			entry = _registry.get(dbfile, {})
+			for statement in entry.get('schema', ()): dbcon.execute(statement)
+			dbcon.commit()
+			version = entry.get('version', 0)
+			if version:
+				current = dbcon.execute('''PRAGMA user_version''').fetchone()[0]
+				if current < version:
+					if entry.get('migrate'): entry['migrate'](dbcon, current)
+					dbcon.execute('''PRAGMA user_version = %d''' % version)
+					dbcon.commit()
+			_schema_ready.add(dbfile)
+			return True
+		except:
+			from resources.lib.modules import log_utils
+			log_utils.error()
+			return False
+
+def close_all():
+	connections = getattr(_local, 'connections', None)
+	if not connections: return
+	for dbcon in connections.values():
+		try: dbcon.close()
+		except: pass
+	connections.clear()
+
+
+class PooledCursor(db.Cursor):
+	def execute(self, sql, parameters=()):
+		try: return super().execute(sql, parameters)
+		except db.OperationalError as e: # table dropped by a cache clear, possibly from another interpreter
+			if 'no such table' not in str(e) or not ensure_schema(self.dbfile, self.connection, force=True): raise
+			return super().execute(sql, parameters)
+
+
+class PooledConnection:
+	__slots__ = ('dbfile', '_dbcon', 'row_factory')
+
+	def __init__(self, dbfile, dbcon, row_factory=None):
+		self.dbfile = dbfile
+		self._dbcon = dbcon
+		self.row_factory = row_factory
+
+	def cursor(self):
+		dbcur = self._dbcon.cursor(PooledCursor)
+		dbcur.dbfile = self.dbfile
+		dbcur.row_factory = self.row_factory
+		return dbcur
+
+	def execute(self, sql, parameters=()):
+		return self.cursor().execute(sql, parameters)
+
+	def executemany(self, sql, seq_of_parameters):
+		return self.cursor().executemany(sql, seq_of_parameters)
+
+	def commit(self):
+		self._dbcon.commit()
+
+	def rollback(self):
+		self._dbcon.rollback()
+
+	@property
+	def in_transaction(self):
+		return self._dbcon.in_transaction
+
+	def close(self): # release only, an uncommitted write is discarded the same as closing it would
+		if self._dbcon.in_transaction: self._dbcon.rollback()
@@ -0,0 +1,151 @@
+"""
+	Venom Add-on
+"""
+
+from json import dumps as jsdumps, loads as jsloads
+from time import time
+from resources.lib.database import dbpool
+from resources.lib.modules.control import downloadsFile
+
+dbpool.register(downloadsFile, journal_mode='WAL', schema=(
+	'''CREATE TABLE IF NOT EXISTS jobs (id INTEGER PRIMARY KEY AUTOINCREMENT, url TEXT, headers TEXT, dest TEXT, title TEXT, image TEXT,
+		size INTEGER, status TEXT, error TEXT, added INTEGER);''',
+	'''CREATE TABLE IF NOT EXISTS segments (job INTEGER, start INTEGER, end INTEGER, done INTEGER, UNIQUE(job, start));'''))
+
+QUEUED, RUNNING, PAUSED, CANCELLED, DONE, FAILED = 'queued', 'running', 'paused', 'cancelled', 'done', 'failed'
+
+
+def add_job(url, headers, dest, title, image, size):
+	try:
+		dbcon = get_connection()
+		dbcur = dbcon.cursor()
+		dbcur.execute('''INSERT INTO jobs (url, headers, dest, title, image, size, status, error, added) Values (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+					(url, jsdumps(headers), dest, title, image, size, QUEUED, '', int(time())))
+		dbcur.connection.commit()
+		return dbcur.lastrowid
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+		return None
+	finally:
+		dbcur.close() ; dbcon.close()
+
+def fetch_jobs(status=None):
+	"""
+	Returns the jobs oldest first as dicts, with 'downloaded' summed from their segments.
+	:param status: a status or tuple of them to filter on
+	"""
+	try:
+		dbcon = get_connection()
+		dbcur = dbcon.cursor()
+		sql = '''SELECT jobs.*, COALESCE(SUM(segments.done), 0) FROM jobs LEFT JOIN segments ON segments.job=jobs.id'''
+		if isinstance(status, str): status = (status,)
+		if status: sql += ''' WHERE jobs.status IN (%s)''' % ', '.join('?' * len(status))
+		match = dbcur.execute(sql + ''' GROUP BY jobs.id ORDER BY jobs.id''', status or ()).fetchall()
+		return [{'id': i[0], 'url': i[1], 'headers': jsloads(i[2]), 'dest': i[3], 'title': i[4], 'image': i[5], 'size': i[6], 'status': i[7],
+				'error': i[8], 'added': i[9], 'downloaded': i[10]} for i in match]
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+		return []
+	finally:
+		dbcur.close() ; dbcon.close()
+
+def job_status(id):
+	try:
+		dbcon = get_connection()
+		dbcur = dbcon.cursor()
+		match = dbcur.execute('''SELECT status FROM jobs WHERE id=?''', (id,)).fetchone()
+		return match[0] if match else None
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+		return None
+	finally:
+		dbcur.close() ; dbcon.close()
+
+def set_status(id, status, error='', size=None, where=None):
+	"""
+	:param size: stored with the status when the job's size was only learned once it started
+	:param where: statuses the job must be in for the change to apply, so a pause racing a finished download does not undo it
+	Returns True when the job was changed.
+	"""
+	try:
+		dbcon = get_connection()
+		dbcur = dbcon.cursor()
+		sql, args = '''UPDATE jobs SET status=?, error=?''', [status, error]
+		if size is not None: sql += ''', size=?''' ; args.append(size)
+		sql += ''' WHERE id=?''' ; args.append(id)
+		if where: sql += ''' AND status IN (%s)''' % ', '.join('?' * len(where)) ; args.extend(where)
+		changed = dbcur.execute(sql, args).rowcount > 0
+		dbcur.connection.commit()
+		return changed
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+		return False
+	finally:
+		dbcur.close() ; dbcon.close()
+
+def requeue_running():
+	"""
+	Jobs left running when Kodi last closed are queued again, their segments resume where the last saved progress left them.
+	"""
+	try:
+		dbcon = get_connection()
+		dbcur = dbcon.cursor()
+		dbcur.execute('''UPDATE jobs SET status=? WHERE status=?''', (QUEUED, RUNNING))
+		dbcur.connection.commit()
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+	finally:
+		dbcur.close() ; dbcon.close()
+
+def fetch_segments(job):
+	"""
+	Returns [[start, end, done]] for the job's byte ranges, end inclusive.
+	"""
+	try:
+		dbcon = get_connection()
+		dbcur = dbcon.cursor()
+		return [list(i) for i in dbcur.execute('''SELECT start, end, done FROM segments WHERE job=? ORDER BY start''', (job,)).fetchall()]
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+		return []
+	finally:
+		dbcur.close() ; dbcon.close()
+
+def store_segments(job, segments, replace=False):
+	"""
+	:param segments: [[start, end, done]]
+	:param replace: True drops the job's previous segments first, for a fresh split
+	"""
+	try:
+		dbcon = get_connection()
+		dbcur = dbcon.cursor()
+		if replace: dbcur.execute('''DELETE FROM segments WHERE job=?''', (job,))
+		dbcur.executemany('''INSERT OR REPLACE INTO segments Values (?, ?, ?, ?)''', [(job, start, end, done) for start, end, done in segments])
+		dbcur.connection.commit()
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+	finally:
+		dbcur.close() ; dbcon.close()
+
+def remove_job(id):
+	try:
+		dbcon = get_connection()
+		dbcur = dbcon.cursor()
+		dbcur.execute('''DELETE FROM segments WHERE job=?''', (id,))
+		dbcur.execute('''DELETE FROM jobs WHERE id=?''', (id,))
+		dbcur.connection.commit()
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+	finally:
+		dbcur.close() ; dbcon.close()
+
+def get_connection():
+	return dbpool.connect(downloadsFile) # pooled per thread, close() only releases it
@@ -2,12 +2,14 @@
 	Venom Add-on
 """
 
-from ast import literal_eval
 from hashlib import md5
 from re import sub as re_sub
 from time import time
-from sqlite3 import dbapi2 as db
-from resources.lib.modules.control import existsPath, dataPath, makeFile, fanarttvCacheFile
+from resources.lib.database import codec, dbpool
+from resources.lib.modules.control import fanarttvCacheFile
+
+dbpool.register(fanarttvCacheFile, schema=('''CREATE TABLE IF NOT EXISTS cache (key TEXT, args TEXT, value TEXT, date INTEGER, UNIQUE(key));''',),
+	version=codec.FORMAT_VERSION, migrate=codec.migrator(('cache', 'value')))
 
 
 def get(function, duration, *args):
@@ -20,30 +22,26 @@ def get(function, duration, *args):
 		key = _hash_function(function, args)
 		cache_result = cache_get(key)
 		if cache_result:
-			try: result = literal_eval(cache_result['value'])
+			try: result = codec.decode(cache_result['value'])
 			except: result = None
 			if _is_cache_valid(cache_result['date'], duration):
 				return result
+			from resources.lib.database import cache
+			if cache.revalidate(function, duration, args, key, cache_result, store='fanarttv'): return result
 
-		fresh_result = repr(function(*args)) # may need a try-except block for server timeouts
-
-		invalid = False
-		try:  # repr() returns None as a string instead of None type for "fresh_result" as well as below converted strings
-			if not fresh_result: invalid = True
-			elif fresh_result == 'None' or fresh_result == '' or fresh_result == '[]' or fresh_result == '{}': invalid = True
-			elif len(fresh_result) == 0: invalid = True
-		except: pass
+		fresh_result = function(*args) # may need a try-except block for server timeouts
+		invalid = codec.is_empty(fresh_result)
 
 		if invalid: # If the cache is old, but we didn't get "fresh_result", return the old cache
 			if cache_result: return result
 			else: return None # do not cache_insert() None type, sometimes servers down momentarily
 		else:
 			args = str(args)
-			if '404:NOT FOUND' in fresh_result:
+			if isinstance(fresh_result, str) and '404:NOT FOUND' in fresh_result:
 				cache_insert(key, args, None) # cache_insert() "404:NOT FOUND" cases only as None type to avoid repeated requests
 				return None
 			else: cache_insert(key, args, fresh_result)
-			return literal_eval(fresh_result)
+			return fresh_result
 	except:
 		from resources.lib.modules import log_utils
 		log_utils.error()
@@ -53,8 +51,6 @@ def cache_get(key):
 	try:
 		dbcon = get_connection()
 		dbcur = get_connection_cursor(dbcon)
-		ck_table = dbcur.execute('''SELECT * FROM sqlite_master WHERE type='table' AND name='cache';''').fetchone()
-		if not ck_table: return None
 		results = dbcur.execute('''SELECT * FROM cache WHERE key=?''', (key,)).fetchone()
 		return results
 	except:
@@ -69,8 +65,7 @@ def cache_insert(key, args, value):
 		dbcon = get_connection()
 		dbcur = get_connection_cursor(dbcon)
 		now = int(time())
-		dbcur.execute('''CREATE TABLE IF NOT EXISTS cache (key TEXT, args TEXT, value TEXT, date INTEGER, UNIQUE(key));''')
-		dbcur.execute('''INSERT OR REPLACE INTO cache Values (?, ?, ?, ?)''', (key, args, value, now))
+		dbcur.execute('''INSERT OR REPLACE INTO cache Values (?, ?, ?, ?)''', (key, args, codec.encode(value), now))
 		dbcur.connection.commit()
 	except:
 		from resources.lib.modules import log_utils
@@ -123,15 +118,7 @@ def cache_clear():
 	return cleared
 
 def get_connection():
-	if not existsPath(dataPath): makeFile(dataPath)
-	dbcon = db.connect(fanarttvCacheFile, timeout=60) # added timeout 3/23/21 for concurrency with threads
-	dbcon.execute('''PRAGMA page_size = 32768''')
-	dbcon.execute('''PRAGMA journal_mode = OFF''')
-	dbcon.execute('''PRAGMA synchronous = OFF''')
-	dbcon.execute('''PRAGMA temp_store = memory''')
-	dbcon.execute('''PRAGMA mmap_size = 30000000000''')
-	dbcon.row_factory = _dict_factory
-	return dbcon
+	return dbpool.connect(fanarttvCacheFile, row_factory=_dict_factory) # pooled per thread, close() only releases it
 
 def get_connection_cursor(dbcon):
 	dbcur = dbcon.cursor()
@@ -3,87 +3,115 @@
 """
 
 from time import time
-from sqlite3 import dbapi2 as db
-from resources.lib.modules.control import existsPath, dataPath, makeFile, metacacheFile
+from resources.lib.database import codec, dbpool
+from resources.lib.modules.control import metacacheFile
+
+_chunk_size = 300 # 3 ID lists per chunk keeps under the 999 bound parameter limit of older sqlite builds
+
+dbpool.register(metacacheFile, schema=(
+	'''CREATE TABLE IF NOT EXISTS meta (imdb TEXT, tmdb TEXT, tvdb TEXT, lang TEXT, user TEXT, item TEXT, time TEXT, UNIQUE(imdb, tmdb, tvdb, lang, user));''',
+	'''CREATE INDEX IF NOT EXISTS meta_imdb ON meta (imdb, lang, user);''',
+	'''CREATE INDEX IF NOT EXISTS meta_tmdb ON meta (tmdb, lang, user);''',
+	'''CREATE INDEX IF NOT EXISTS meta_tvdb ON meta (tvdb, lang, user);'''),
+	version=codec.FORMAT_VERSION, migrate=codec.migrator(('meta', 'item')))
 
 
 def fetch(items, lang='en', user=''):
+	"""
+	Resolves the whole list with one indexed query per chunk instead of up to 3 SELECTs per item. Lookup precedence is unchanged:
+	imdb+tvdb first (there are some incorrect shows on Trakt that have the same IMDb ID, but different TVDb IDs, eg: Gotham, Supergirl),
+	then imdb+tmdb for a more accurate match, then the first stored row matching any single ID.
+	"""
 	try:
-		dbcon = get_connection()
-		dbcur = get_connection_cursor(dbcon)
-		ck_table = dbcur.execute('''SELECT * FROM sqlite_master WHERE type='table' AND name='meta';''').fetchone()
-		if not ck_table:
-			dbcur.execute('''CREATE TABLE IF NOT EXISTS meta (imdb TEXT, tmdb TEXT, tvdb TEXT, lang TEXT, user TEXT, item TEXT, time TEXT,
-			UNIQUE(imdb, tmdb, tvdb, lang, user));''')
-			dbcur.connection.commit()
-			dbcur.close() ; dbcon.close()
-			return items
 		t2 = int(time())
+		matches = _fetch_matches(items, lang, user)
 	except:
 		from resources.lib.modules import log_utils
 		log_utils.error()
+		return items
 	for i in range(0, len(items)):
 		try:
-			try: # First lookup by TVDb and IMDb, since there are some incorrect shows on Trakt that have the same IMDb ID, but different TVDb IDs (eg: Gotham, Supergirl).
-				match = dbcur.execute('''SELECT * FROM meta WHERE (imdb=? AND tvdb=? AND lang=? AND user=? AND NOT imdb='' AND NOT tvdb='')''',
-					(items[i].get('imdb', ''), items[i].get('tvdb', ''), lang, user)).fetchone()
-				t1 = int(match[6])
-			except:
-				try: # Lookup both IMDb and TMDb for more accurate match.
-					match = dbcur.execute('''SELECT * FROM meta WHERE (imdb=? AND tmdb=? AND lang=? AND user=? AND not imdb='' AND NOT tmdb='')''',
-						(items[i].get('imdb', ''), items[i].get('tmdb', ''), lang, user)).fetchone()
-					t1 = int(match[6])
-				except:
-					try: # Last resort single ID lookup.
-						match = dbcur.execute('''SELECT * FROM meta WHERE (imdb=? AND lang=? AND user=? AND NOT imdb='') OR (tmdb=? AND lang=? AND user=? AND NOT tmdb='') OR (tvdb=? AND lang=? AND user=? AND NOT tvdb='')''',
-							(items[i].get('imdb', ''), lang, user, items[i].get('tmdb', ''), lang, user, items[i].get('tvdb', ''), lang, user)).fetchone()
-						t1 = int(match[6])
-					except: pass
-			if match:
-				update = (abs(t2 - t1) / 3600) >= 720 # 30 days? for airing shows this is to much.
-				if update: continue
-				item = eval(match[5])
+			match = matches[i]
+			if not match: continue
+			t1 = int(match[6])
+			update = (abs(t2 - t1) / 3600) >= 720 # 30 days? for airing shows this is to much.
+			if update: continue
+			item = codec.decode(match[5])
 
-				if item['mediatype'] == 'tvshow':
-					status = item['status'].lower()
-					if not any(value in status for value in ('ended', 'canceled')):
-						from resources.lib.modules.cleandate import timestamp_from_string
-						next_episode_to_air = timestamp_from_string(item.get('next_episode_to_air', {}).get('air_date', ''))
-						if not next_episode_to_air:
-							update = (abs(t2 - t1) / 3600) >= 168 # 7 days for returning shows with None for next_episode_to_air
-							if update: continue
-						else:
-							if next_episode_to_air+(18*3600) <= t2 and (abs(t2 - t1) / 3600) >= 1: # refresh meta when next_episode_to_air is less than or equal to system date, every 1hr starting at 6pm till it flips
-								from resources.lib.database.traktsync import cache_existing
-								from resources.lib.indexers.trakt import syncTVShows
-								imdb = item.get('imdb', '')
-								indicators = cache_existing(syncTVShows)
-								watching = [i[0] for i in indicators if i[0] == imdb]
-								if watching:
-									from resources.lib.indexers.trakt import cachesyncSeasons
-									cachesyncSeasons(imdb) # refreshes only shows you are "watching"
-								continue
-				item = dict((k, v) for k, v in iter(item.items()) if v is not None and v != '')
-				items[i].update(item)
-				items[i].update({'metacache': True})
+			if item['mediatype'] == 'tvshow':
+				status = item['status'].lower()
+				if not any(value in status for value in ('ended', 'canceled')):
+					from resources.lib.modules.cleandate import timestamp_from_string
+					next_episode_to_air = timestamp_from_string(item.get('next_episode_to_air', {}).get('air_date', ''))
+					if not next_episode_to_air:
+						update = (abs(t2 - t1) / 3600) >= 168 # 7 days for returning shows with None for next_episode_to_air
+						if update: continue
+					else:
+						if next_episode_to_air+(18*3600) <= t2 and (abs(t2 - t1) / 3600) >= 1: # refresh meta when next_episode_to_air is less than or equal to system date, every 1hr starting at 6pm till it flips
+							from resources.lib.database.traktsync import cache_existing
+							from resources.lib.indexers.trakt import syncTVShows
+							imdb = item.get('imdb', '')
+							indicators = cache_existing(syncTVShows)
+							watching = [i[0] for i in indicators if i[0] == imdb]
+							if watching:
+								from resources.lib.indexers.trakt import cachesyncSeasons
+								cachesyncSeasons(imdb) # refreshes only shows you are "watching"
+							continue
+			item = dict((k, v) for k, v in iter(item.items()) if v is not None and v != '')
+			items[i].update(item)
+			items[i].update({'metacache': True})
 		except:
 			from resources.lib.modules import log_utils
 			log_utils.error()
-	try: dbcur.close() ; dbcon.close()
-	except: pass
 	return items
 
+def _fetch_matches(items, lang, user):
+	ids = [(i.get('imdb') or '', i.get('tmdb') or '', i.get('tvdb') or '') for i in items]
+	rows = []
+	try:
+		dbcon = get_connection()
+		dbcur = get_connection_cursor(dbcon)
+		for r in range(0, len(ids), _chunk_size):
+			chunk = ids[r:r + _chunk_size]
+			selects, args = [], []
+			for n, column in enumerate(('imdb', 'tmdb', 'tvdb')):
+				values = [v for v in set(i[n] for i in chunk) if v]
+				if not values: continue
+				selects.append('''SELECT rowid, * FROM meta WHERE %s IN (%s) AND lang=? AND user=?''' % (column, ','.join('?' * len(values)))) # one index search per ID column
+				args += values + [lang, user]
+			if selects: rows += dbcur.execute(' UNION '.join(selects), args).fetchall()
+	finally:
+		dbcur.close() ; dbcon.close()
+	rows.sort(key=lambda k: k[0]) # oldest row wins the single ID lookup as fetchone() did
+	by_imdb_tvdb, by_imdb_tmdb, by_imdb, by_tmdb, by_tvdb = {}, {}, {}, {}, {}
+	for row in rows:
+		imdb, tmdb, tvdb = row[1], row[2], row[3]
+		if imdb:
+			by_imdb.setdefault(imdb, row)
+			if tvdb: by_imdb_tvdb.setdefault((imdb, tvdb), row)
+			if tmdb: by_imdb_tmdb.setdefault((imdb, tmdb), row)
+		if tmdb: by_tmdb.setdefault(tmdb, row)
+		if tvdb: by_tvdb.setdefault(tvdb, row)
+	matches = []
+	for imdb, tmdb, tvdb in ids:
+		match = None
+		if imdb and tvdb: match = by_imdb_tvdb.get((imdb, tvdb))
+		if not match and imdb and tmdb: match = by_imdb_tmdb.get((imdb, tmdb))
+		if not match:
+			single = [row for row in (by_imdb.get(imdb), by_tmdb.get(tmdb), by_tvdb.get(tvdb)) if row]
+			if single: match = min(single, key=lambda k: k[0])
+		matches.append(match[1:] if match else None) # drop rowid, same column layout as "SELECT *"
+	return matches
+
 def insert(meta):
 	try:
 		dbcon = get_connection()
 		dbcur = get_connection_cursor(dbcon)
-		dbcur.execute('''CREATE TABLE IF NOT EXISTS meta (imdb TEXT, tmdb TEXT, tvdb TEXT, lang TEXT, user TEXT, item TEXT, time TEXT,
-		UNIQUE(imdb, tmdb, tvdb, lang, user));''')
 		t = int(time())
 		for m in meta:
 			if "user" not in m: m["user"] = ''
 			if "lang" not in m: m["lang"] = 'en'
-			i = repr(m['item'])
+			i = codec.encode(m['item'])
 			try: dbcur.execute('''INSERT OR REPLACE INTO meta Values (?, ?, ?, ?, ?, ?, ?)''', (m.get('imdb', ''), m.get('tmdb', ''), m.get('tvdb', ''), m['lang'], m['user'], i, t))
 			except: pass
 		dbcur.connection.commit()
@@ -111,15 +139,7 @@ def cache_clear_meta():
 	return cleared
 
 def get_connection():
-	if not existsPath(dataPath): makeFile(dataPath)
-	dbcon = db.connect(metacacheFile, timeout=60) # added timeout 3/23/21 for concurrency with threads
-	dbcon.execute('''PRAGMA page_size = 32768''')
-	dbcon.execute('''PRAGMA journal_mode = OFF''')
-	dbcon.execute('''PRAGMA synchronous = OFF''')
-	dbcon.execute('''PRAGMA temp_store = memory''')
-	dbcon.execute('''PRAGMA mmap_size = 30000000000''')
-	# dbcon.row_factory = _dict_factory # not needed for metacache
-	return dbcon
+	return dbpool.connect(metacacheFile) # pooled per thread, close() only releases it
 
 def get_connection_cursor(dbcon):
 	dbcur = dbcon.cursor()
@@ -2,12 +2,27 @@
 	Venom Add-on
 """
 
-from ast import literal_eval
 from hashlib import md5
 from re import sub as re_sub
+from threading import Lock
 from time import time
-from sqlite3 import dbapi2 as db
-from resources.lib.modules.control import existsPath, dataPath, makeFile, providercacheFile
+from uuid import uuid4
+from resources.lib.database import codec, dbpool
+from resources.lib.modules.control import providercacheFile
+
+dbpool.register(providercacheFile, journal_mode='WAL', schema=(
+	'''CREATE TABLE IF NOT EXISTS cache (key TEXT, value TEXT, date INTEGER, UNIQUE(key));''',
+	'''CREATE TABLE IF NOT EXISTS rel_results (provider TEXT, imdb_id TEXT, season TEXT, episode TEXT, hash TEXT, name TEXT, quality TEXT, size REAL, seeders INTEGER,
+		package TEXT, episode_start INTEGER, episode_end INTEGER, last_season INTEGER, expires INTEGER, item BLOB);''',
+	'''CREATE INDEX IF NOT EXISTS rel_results_item ON rel_results (imdb_id, season, episode, provider);''',
+	'''CREATE INDEX IF NOT EXISTS rel_results_expires ON rel_results (expires);''',
+	'''CREATE TABLE IF NOT EXISTS rel_aliases (title TEXT, aliases TEXT, UNIQUE(title));''',
+	'''CREATE TABLE IF NOT EXISTS availability (hash TEXT, debrid TEXT, cached INTEGER, expires INTEGER, UNIQUE(hash, debrid));''',
+	'''CREATE TABLE IF NOT EXISTS result_sets (set_id TEXT, idx INTEGER, created INTEGER, item BLOB, UNIQUE(set_id, idx));'''),
+	version=2, migrate=lambda dbcon, from_version: _migrate(dbcon, from_version))
+RESULT_SET_EXPIRY = 86400 # seconds a source list stays resolvable from a RunPlugin url after its scrape
+_result_sets = {} # set_id: items, the sets created or read by this interpreter
+_result_sets_lock = Lock()
 
 
 def get(function, duration, *args):
@@ -21,24 +36,19 @@ def get(function, duration, *args):
 		key = _hash_function(function, rev_args)
 		cache_result = cache_get(key)
 		if cache_result:
-			result = literal_eval(cache_result['value'])
+			result = codec.decode(cache_result['value'])
 			if _is_cache_valid(cache_result['date'], duration):
 				return result
 
-		fresh_result = repr(function(*args)) # may need a try-except block for server timeouts
-		invalid = False
-		try:  # Sometimes None is returned as a string instead of None type for "fresh_result"
-			if not fresh_result: invalid = True
-			elif fresh_result == 'None' or fresh_result == '' or fresh_result == '[]' or fresh_result == '{}': invalid = True
-			elif len(fresh_result) == 0: invalid = True
-		except: pass
+		fresh_result = function(*args) # may need a try-except block for server timeouts
+		invalid = codec.is_empty(fresh_result)
 
 		if invalid: # If the cache is old, but we didn't get "fresh_result", return the old cache
 			if cache_result: return result
 			else: return None # do not cache_insert() None type, sometimes servers just down momentarily
 		else:
 			cache_insert(key, fresh_result)
-			return literal_eval(fresh_result)
+			return fresh_result
 	except:
 		from resources.lib.modules import log_utils
 		log_utils.error()
@@ -48,8 +58,6 @@ def cache_get(key):
 	try:
 		dbcon = get_connection()
 		dbcur = get_connection_cursor(dbcon)
-		ck_table = dbcur.execute('''SELECT * FROM sqlite_master WHERE type='table' AND name='cache';''').fetchone()
-		if not ck_table: return None
 		results = dbcur.execute('''SELECT * FROM cache WHERE key=?''', (key,)).fetchone()
 		return results
 	except:
@@ -64,8 +72,7 @@ def cache_insert(key, value):
 		dbcon = get_connection()
 		dbcur = get_connection_cursor(dbcon)
 		now = int(time())
-		dbcur.execute('''CREATE TABLE IF NOT EXISTS cache (key TEXT, value TEXT, date INTEGER, UNIQUE(key));''')
-		dbcur.execute('''INSERT OR REPLACE INTO cache Values (?, ?, ?)''', (key, value, now))
+		dbcur.execute('''INSERT OR REPLACE INTO cache Values (?, ?, ?)''', (key, codec.encode(value), now))
 		dbcur.connection.commit()
 	except:
 		from resources.lib.modules import log_utils
@@ -88,12 +95,204 @@ def remove(function, *args):
 	try: dbcur.close() ; dbcon.close()
 	except: pass
 
+def results_fetch(provider, imdb, season='', episode='', range_episode=None, range_season=None):
+	"""
+	Returns the cached release list for one provider scrape or None when there is no unexpired scrape stored.
+	:param range_episode: season packs, keep only releases without a range or whose episode_start-episode_end holds this episode
+	:param range_season: show packs, keep only releases whose last_season is this season or later
+	"""
+	try:
+		dbcon = get_connection()
+		dbcur = dbcon.cursor() # plain tuples, the row factory is for the cache table
+		dbcur.row_factory = None
+		args = (imdb, season, episode, provider, int(time()))
+		if not dbcur.execute('''SELECT 1 FROM rel_results WHERE imdb_id=? AND season=? AND episode=? AND provider=? AND expires>? LIMIT 1''', args).fetchone(): return None
+		sql = '''SELECT item FROM rel_results WHERE imdb_id=? AND season=? AND episode=? AND provider=? AND expires>?'''
+		if range_episode is not None:
+			sql += ''' AND (episode_start IS NULL OR ? BETWEEN episode_start AND episode_end)'''
+			args += (int(range_episode),)
+		if range_season is not None:
+			sql += ''' AND last_season>=?'''
+			args += (int(range_season),)
+		return [codec.decode(i[0]) for i in dbcur.execute(sql + ''' ORDER BY rowid''', args).fetchall()]
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+		return None
+	finally:
+		dbcur.close() ; dbcon.close()
+
+def results_store(results, aliases=None):
+	"""
+	Single writer for a finished scrape, all providers in one transaction so scraper threads never queue on the sqlite writer lock.
+	:param results: list of (provider, imdb, season, episode, expiry in seconds, sources)
+	:param aliases: optional (title, aliases) for rel_aliases
+	"""
+	if not results and not aliases: return
+	try:
+		dbcon = get_connection()
+		dbcur = dbcon.cursor()
+		now = int(time())
+		rows = []
+		for provider, imdb, season, episode, expiry, sources in results:
+			dbcur.execute('''DELETE FROM rel_results WHERE imdb_id=? AND season=? AND episode=? AND provider=?''', (imdb, season, episode, provider))
+			expires = now + int(expiry)
+			rows += [(provider, imdb, season, episode, i.get('hash'), i.get('name'), i.get('quality'), _number(i.get('size'), float), _number(i.get('seeders'), int),
+					i.get('package'), i.get('episode_start'), i.get('episode_end'), i.get('last_season'), expires, codec.encode(i)) for i in sources]
+		dbcur.executemany('''INSERT INTO rel_results Values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''', rows)
+		dbcur.execute('''DELETE FROM rel_results WHERE expires<=?''', (now,))
+		if aliases: dbcur.execute('''INSERT OR REPLACE INTO rel_aliases Values (?, ?)''', (aliases[0], codec.encode(aliases[1])))
+		dbcur.connection.commit()
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+	finally:
+		dbcur.close() ; dbcon.close()
+
+def results_remove(imdb):
+	try:
+		dbcon = get_connection()
+		dbcur = dbcon.cursor()
+		dbcur.execute('''DELETE FROM rel_results WHERE imdb_id=?''', (imdb,))
+		dbcur.connection.commit()
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+	finally:
+		dbcur.close() ; dbcon.close()
+
+def availability_fetch(debrid, hashes):
+	"""
+	Returns {hash: True/False} for the hashes with an unexpired cache-check verdict from this debrid service, unknown or stale hashes are left out.
+	"""
+	verdicts = {}
+	if not hashes: return verdicts
+	try:
+		dbcon = get_connection()
+		dbcur = dbcon.cursor()
+		dbcur.row_factory = None
+		now = int(time())
+		hashes = list(hashes)
+		for i in range(0, len(hashes), 500): # stay under the sqlite bound parameter limit
+			chunk = hashes[i:i + 500]
+			sql = '''SELECT hash, cached FROM availability WHERE debrid=? AND expires>? AND hash IN (%s)''' % ','.join('?' * len(chunk))
+			verdicts.update((hash, bool(cached)) for hash, cached in dbcur.execute(sql, [debrid, now] + chunk).fetchall())
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+	finally:
+		dbcur.close() ; dbcon.close()
+	return verdicts
+
+def availability_store(debrid, verdicts, cached_expiry, uncached_expiry):
+	"""
+	:param verdicts: {hash: True/False} from one cache-check request
+	:param cached_expiry: seconds a cached verdict is trusted, uncached_expiry the same for uncached ones
+	"""
+	if not verdicts: return
+	try:
+		dbcon = get_connection()
+		dbcur = dbcon.cursor()
+		now = int(time())
+		rows = [(hash, debrid, int(cached), now + int(cached_expiry if cached else uncached_expiry)) for hash, cached in verdicts.items()]
+		dbcur.executemany('''INSERT OR REPLACE INTO availability Values (?, ?, ?, ?)''', rows)
+		dbcur.connection.commit()
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+	finally:
+		dbcur.close() ; dbcon.close()
+
+def availability_prune():
+	try:
+		dbcon = get_connection()
+		dbcur = dbcon.cursor()
+		dbcur.execute('''DELETE FROM availability WHERE expires<=?''', (int(time()),))
+		dbcur.connection.commit()
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+	finally:
+		dbcur.close() ; dbcon.close()
+
+def resultset_store(items):
+	"""
+	Stores a source list once, one row per item, and returns its set id. Windows and RunPlugin urls carry only the set id and an item's
+	index, sets older than RESULT_SET_EXPIRY are pruned here.
+	"""
+	now = int(time())
+	set_id = uuid4().hex
+	with _result_sets_lock:
+		if len(_result_sets) >= 4: _result_sets.pop(next(iter(_result_sets)))
+		_result_sets[set_id] = items
+	try:
+		dbcon = get_connection()
+		dbcur = dbcon.cursor()
+		dbcur.execute('''DELETE FROM result_sets WHERE created<=?''', (now - RESULT_SET_EXPIRY,))
+		dbcur.executemany('''INSERT OR REPLACE INTO result_sets Values (?, ?, ?, ?)''', [(set_id, idx, now, codec.encode(i)) for idx, i in enumerate(items)])
+		dbcur.connection.commit()
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+	finally:
+		dbcur.close() ; dbcon.close()
+	return set_id
+
+def resultset_items(set_id, indexes):
+	"""
+	Returns {index: item} for the indexes found in the set, an expired or unknown set returns {}.
+	"""
+	indexes = [int(i) for i in indexes]
+	items = _result_sets.get(set_id)
+	if items is not None: return {i: items[i] for i in indexes if 0 <= i < len(items)}
+	if not set_id or not indexes: return {}
+	try:
+		dbcon = get_connection()
+		dbcur = dbcon.cursor()
+		dbcur.row_factory = None
+		sql = '''SELECT idx, item FROM result_sets WHERE set_id=? AND idx IN (%s)''' % ','.join('?' * len(indexes))
+		return {idx: codec.decode(item) for idx, item in dbcur.execute(sql, [set_id] + indexes).fetchall()}
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+		return {}
+	finally:
+		dbcur.close() ; dbcon.close()
+
+def resultset_item(set_id, index):
+	return resultset_items(set_id, [index]).get(int(index))
+
+def resultset_len(set_id):
+	items = _result_sets.get(set_id)
+	if items is not None: return len(items)
+	try:
+		dbcon = get_connection()
+		dbcur = dbcon.cursor()
+		dbcur.row_factory = None
+		return dbcur.execute('''SELECT COUNT(*) FROM result_sets WHERE set_id=?''', (set_id,)).fetchone()[0]
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+		return 0
+	finally:
+		dbcur.close() ; dbcon.close()
+
+def _number(value, cast):
+	try: return cast(value)
+	except: return None
+
+def _migrate(dbcon, from_version):
+	if from_version < 1: codec.migrator(('cache', 'value'), ('rel_aliases', 'aliases'))(dbcon, from_version)
+	if from_version < 2: # rel_src kept one repr() blob per provider, replaced by one rel_results row per release
+		dbcon.execute('''DROP TABLE IF EXISTS rel_src''')
+		dbcon.commit()
+
 def cache_clear_providers():
 	cleared = False
 	try:
 		dbcon = get_connection()
 		dbcur = get_connection_cursor(dbcon)
-		for t in ('cache', 'rel_src', 'rel_url', 'rel_aliases'): # rel_url table was removed 11-8-21
+		for t in ('cache', 'rel_src', 'rel_results', 'rel_url', 'rel_aliases', 'availability', 'result_sets'): # rel_url table was removed 11-8-21, rel_src replaced by rel_results
 			dbcur.execute('''DROP TABLE IF EXISTS {}'''.format(t))
 			dbcur.execute('''VACUUM''')
 			dbcur.connection.commit()
@@ -107,15 +306,7 @@ def cache_clear_providers():
 	return cleared
 
 def get_connection():
-	if not existsPath(dataPath): makeFile(dataPath)
-	dbcon = db.connect(providercacheFile, timeout=60) # added timeout 3/23/21 for concurrency with threads
-	dbcon.execute('''PRAGMA page_size = 32768''')
-	dbcon.execute('''PRAGMA journal_mode = WAL''')
-	dbcon.execute('''PRAGMA synchronous = OFF''')
-	dbcon.execute('''PRAGMA temp_store = memory''')
-	dbcon.execute('''PRAGMA mmap_size = 30000000000''')
-	dbcon.row_factory = _dict_factory
-	return dbcon
+	return dbpool.connect(providercacheFile, row_factory=_dict_factory) # pooled per thread, close() only releases it
 
 def get_connection_cursor(dbcon):
 	dbcur = dbcon.cursor()
@@ -2,15 +2,39 @@
 	Venom Add-on
 """
 
-from ast import literal_eval
 from hashlib import md5
 from re import sub as re_sub
 from time import time
 
 from datetime import datetime
-from sqlite3 import dbapi2 as db
+from resources.lib.database import codec, dbpool
 from resources.lib.modules import cleandate
-from resources.lib.modules.control import existsPath, dataPath, makeFile, traktSyncFile
+from resources.lib.modules.control import traktSyncFile
+
+_list_columns = 'title TEXT, year TEXT, premiered TEXT, imdb TEXT, tmdb TEXT, tvdb TEXT, trakt TEXT, rating FLOAT, votes INTEGER'
+_list_tables = {'movies_collection': 'collected_at', 'shows_collection': 'collected_at', 'movies_watchlist': 'listed_at', 'shows_watchlist': 'listed_at'} # table: its "added" column
+_sort_title = '''CASE WHEN substr(lower(title), 1, 4)='the ' THEN substr(lower(title), 5) WHEN substr(lower(title), 1, 2)='a ' THEN substr(lower(title), 3)
+	WHEN substr(lower(title), 1, 3)='an ' THEN substr(lower(title), 4) ELSE lower(title) END''' # the menus' title sort key, ascii lower() only
+_sort_columns = {1: _sort_title, 2: 'rating', 3: 'votes', 4: 'premiered', 5: 'added'} # sort.*.type setting: ORDER BY expression
+dbpool.register(traktSyncFile, schema=(
+	'''CREATE TABLE IF NOT EXISTS service (setting TEXT, value TEXT, UNIQUE(setting));''',
+	'''CREATE TABLE IF NOT EXISTS bookmarks (tvshowtitle TEXT, title TEXT, resume_id TEXT, imdb TEXT, tmdb TEXT, tvdb TEXT, season TEXT, episode TEXT, genre TEXT, mpaa TEXT,
+		studio TEXT, duration TEXT, percent_played TEXT, paused_at TEXT, UNIQUE(resume_id, imdb, tmdb, tvdb, season, episode));''',
+	'''CREATE TABLE IF NOT EXISTS liked_lists (list_owner TEXT, list_owner_slug TEXT, list_name TEXT, trakt_id TEXT, content_type TEXT, item_count INTEGER, likes INTEGER, UNIQUE(trakt_id));''',
+	'''CREATE TABLE IF NOT EXISTS hiddenProgress (title TEXT, year TEXT, imdb TEXT, tmdb TEXT, tvdb TEXT, trakt TEXT, hidden_at TEXT, UNIQUE(imdb, tmdb, tvdb, trakt));''',
+	'''CREATE TABLE IF NOT EXISTS movies_collection (%s, collected_at TEXT, UNIQUE(imdb, tmdb, tvdb, trakt));''' % _list_columns,
+	'''CREATE TABLE IF NOT EXISTS shows_collection (%s, collected_at TEXT, UNIQUE(imdb, tmdb, tvdb, trakt));''' % _list_columns,
+	'''CREATE TABLE IF NOT EXISTS movies_watchlist (%s, listed_at TEXT, UNIQUE(imdb, tmdb, tvdb, trakt));''' % _list_columns,
+	'''CREATE TABLE IF NOT EXISTS shows_watchlist (%s, listed_at TEXT, UNIQUE(imdb, tmdb, tvdb, trakt));''' % _list_columns,
+	'''CREATE TABLE IF NOT EXISTS user_lists (list_owner TEXT, list_owner_slug TEXT, list_name TEXT, trakt_id TEXT, content_type TEXT, item_count INTEGER, likes INTEGER, UNIQUE(trakt_id));''',
+	'''CREATE TABLE IF NOT EXISTS public_lists (list_owner TEXT, list_owner_slug TEXT, list_name TEXT, trakt_id TEXT, content_type TEXT, item_count INTEGER, likes INTEGER, updated_at TEXT, UNIQUE(trakt_id));''',
+	'''CREATE TABLE IF NOT EXISTS watched (key TEXT, value TEXT, date INTEGER, UNIQUE(key));''',
+	'''CREATE TABLE IF NOT EXISTS next_episodes (imdb TEXT, tvdb TEXT, tmdb TEXT, trakt TEXT, next_episode TEXT, date INTEGER, UNIQUE(imdb, tvdb, tmdb, trakt));''',
+	'''CREATE TABLE IF NOT EXISTS watched_snapshot (trakt TEXT, stamp TEXT, UNIQUE(trakt));''',
+	'''CREATE TABLE IF NOT EXISTS mutations (method TEXT, endpoint TEXT, post TEXT, date INTEGER);''') +
+	tuple('''CREATE INDEX IF NOT EXISTS %s_%s ON %s (%s);''' % (table, name, table, column) for table, added in _list_tables.items()
+		for name, column in (('title', _sort_title), ('rating', 'rating'), ('votes', 'votes'), ('premiered', 'premiered'), ('added', added))),
+	version=codec.FORMAT_VERSION, migrate=codec.migrator(('watched', 'value')))
 
 
 def fetch_bookmarks(imdb, tmdb='', tvdb='', season=None, episode=None, ret_all=None, ret_type='movies'):
@@ -18,12 +42,6 @@ def fetch_bookmarks(imdb, tmdb='', tvdb='', season=None, episode=None, ret_all=N
 	try:
 		dbcon = get_connection()
 		dbcur = get_connection_cursor(dbcon)
-		ck_table = dbcur.execute('''SELECT * FROM sqlite_master WHERE type='table' AND name='bookmarks';''').fetchone()
-		if not ck_table:
-			dbcur.execute('''CREATE TABLE IF NOT EXISTS bookmarks (tvshowtitle TEXT, title TEXT, resume_id TEXT, imdb TEXT, tmdb TEXT, tvdb TEXT, season TEXT, episode TEXT, genre TEXT, mpaa TEXT, 
-									studio TEXT, duration TEXT, percent_played TEXT, paused_at TEXT, UNIQUE(resume_id, imdb, tmdb, tvdb, season, episode));''')
-			dbcur.connection.commit()
-			return progress
 		if ret_all:
 			if ret_type == 'movies':
 				match = dbcur.execute('''SELECT * FROM bookmarks WHERE (tvshowtitle='')''').fetchall()
@@ -66,9 +84,6 @@ def insert_bookmarks(items, new_scrobble=False):
 	try:
 		dbcon = get_connection()
 		dbcur = get_connection_cursor(dbcon)
-		dbcur.execute('''CREATE TABLE IF NOT EXISTS bookmarks (tvshowtitle TEXT, title TEXT, resume_id TEXT, imdb TEXT, tmdb TEXT, tvdb TEXT, season TEXT, episode TEXT, genre TEXT, mpaa TEXT, 
-								studio TEXT, duration TEXT, percent_played TEXT, paused_at TEXT, UNIQUE(resume_id, imdb, tmdb, tvdb, season, episode));''')
-		dbcur.execute('''CREATE TABLE IF NOT EXISTS service (setting TEXT, value TEXT, UNIQUE(setting));''')
 		if not new_scrobble:
 			dbcur.execute('''DELETE FROM bookmarks''') # this just wipes the data but if table is corrupt this won't allow write to work
 			dbcur.connection.commit() # added this for what looks like a 19 bug not found in 18, normal commit is at end
@@ -100,13 +115,6 @@ def delete_bookmark(items):
 	try:
 		dbcon = get_connection()
 		dbcur = get_connection_cursor(dbcon)
-		ck_table = dbcur.execute('''SELECT * FROM sqlite_master WHERE type='table' AND name='bookmarks';''').fetchone()
-		if not ck_table:
-			dbcur.execute('''CREATE TABLE IF NOT EXISTS bookmarks (tvshowtitle TEXT, title TEXT, resume_id TEXT, imdb TEXT, tmdb TEXT, tvdb TEXT, season TEXT, episode TEXT, genre TEXT, mpaa TEXT, 
-									studio TEXT, duration TEXT, percent_played TEXT, paused_at TEXT, UNIQUE(resume_id, imdb, tmdb, tvdb, season, episode));''')
-			dbcur.execute('''CREATE TABLE IF NOT EXISTS service (setting TEXT, value TEXT, UNIQUE(setting));''')
-			dbcur.connection.commit()
-			return
 		for i in items:
 			if i.get('type') == 'episode':
 				ids = i.get('show').get('ids')
@@ -131,11 +139,6 @@ def fetch_liked_list(trakt_id, ret_all=False):
 	try:
 		dbcon = get_connection()
 		dbcur = get_connection_cursor(dbcon)
-		ck_table = dbcur.execute('''SELECT * FROM sqlite_master WHERE type='table' AND name='liked_lists';''').fetchone()
-		if not ck_table:
-			dbcur.execute('''CREATE TABLE IF NOT EXISTS liked_lists (list_owner TEXT, list_owner_slug TEXT, list_name TEXT, trakt_id TEXT, content_type TEXT, item_count INTEGER, likes INTEGER, UNIQUE(trakt_id));''')
-			dbcur.connection.commit()
-			return liked_list
 		if ret_all:
 			try:
 				match = dbcur.execute('''SELECT * FROM liked_lists WHERE NOT trakt_id=""''').fetchall()
@@ -157,8 +160,6 @@ def insert_liked_lists(items, new_sync=True):
 	try:
 		dbcon = get_connection()
 		dbcur = get_connection_cursor(dbcon)
-		dbcur.execute('''CREATE TABLE IF NOT EXISTS liked_lists (list_owner TEXT, list_owner_slug TEXT, list_name TEXT, trakt_id TEXT, content_type TEXT, item_count INTEGER, likes INTEGER, UNIQUE(trakt_id));''')
-		dbcur.execute('''CREATE TABLE IF NOT EXISTS service (setting TEXT, value TEXT, UNIQUE(setting));''')
 		if new_sync:
 			dbcur.execute('''DELETE FROM liked_lists''')
 			dbcur.connection.commit() # added this for what looks like a 19 bug not found in 18, normal commit is at end
@@ -191,12 +192,6 @@ def delete_liked_list(trakt_id):
 	try:
 		dbcon = get_connection()
 		dbcur = get_connection_cursor(dbcon)
-		ck_table = dbcur.execute('''SELECT * FROM sqlite_master WHERE type='table' AND name='liked_lists';''').fetchone()
-		if not ck_table:
-			dbcur.execute('''CREATE TABLE IF NOT EXISTS liked_lists (list_owner TEXT, list_owner_slug TEXT, list_name TEXT, trakt_id TEXT, item_count INTEGER, likes INTEGER, UNIQUE(trakt_id));''')
-			dbcur.execute('''CREATE TABLE IF NOT EXISTS service (setting TEXT, value TEXT, UNIQUE(setting));''')
-			dbcur.connection.commit()
-			return
 		dbcur.execute('''DELETE FROM liked_lists WHERE trakt_id=?;''', (trakt_id,))
 		timestamp = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.000Z")
 		dbcur.execute('''INSERT OR REPLACE INTO service Values (?, ?)''', ('last_liked_at', timestamp))
@@ -212,11 +207,6 @@ def fetch_hidden_progress():
 	try:
 		dbcon = get_connection()
 		dbcur = get_connection_cursor(dbcon)
-		ck_table = dbcur.execute('''SELECT * FROM sqlite_master WHERE type='table' AND name='hiddenProgress';''').fetchone()
-		if not ck_table:
-			dbcur.execute('''CREATE TABLE IF NOT EXISTS hiddenProgress (title TEXT, year TEXT, imdb TEXT, tmdb TEXT, tvdb TEXT, trakt TEXT, hidden_at TEXT, UNIQUE(imdb, tmdb, tvdb, trakt));''')
-			dbcur.connection.commit()
-			return list
 		try:
 			match = dbcur.execute('''SELECT * FROM hiddenProgress WHERE NOT title=""''').fetchall()
 			list = [{'title': i[0], 'year': i[1], 'imdb': i[2], 'tmdb': i[3], 'tvdb': i[4], 'trakt': i[5], 'added': i[6]} for i in match]
@@ -232,8 +222,6 @@ def insert_hidden_progress(items, new_sync=True):
 	try:
 		dbcon = get_connection()
 		dbcur = get_connection_cursor(dbcon)
-		dbcur.execute('''CREATE TABLE IF NOT EXISTS hiddenProgress (title TEXT, year TEXT, imdb TEXT, tmdb TEXT, tvdb TEXT, trakt TEXT, hidden_at TEXT, UNIQUE(imdb, tmdb, tvdb, trakt));''')
-		dbcur.execute('''CREATE TABLE IF NOT EXISTS service (setting TEXT, value TEXT, UNIQUE(setting));''')
 		if new_sync:
 			dbcur.execute('''DELETE FROM hiddenProgress''')
 			dbcur.connection.commit() # added this for what looks like a 19 bug not found in 18, normal commit is at end
@@ -266,12 +254,6 @@ def delete_hidden_progress(items):
 	try:
 		dbcon = get_connection()
 		dbcur = get_connection_cursor(dbcon)
-		ck_table = dbcur.execute('''SELECT * FROM sqlite_master WHERE type='table' AND name='hiddenProgress';''').fetchone()
-		if not ck_table:
-			dbcur.execute('''CREATE TABLE IF NOT EXISTS hiddenProgress (title TEXT, year TEXT, imdb TEXT, tmdb TEXT, tvdb TEXT, trakt TEXT, hidden_at TEXT, UNIQUE(imdb, tmdb, tvdb, trakt));''')
-			dbcur.execute('''CREATE TABLE IF NOT EXISTS service (setting TEXT, value TEXT, UNIQUE(setting));''')
-			dbcur.connection.commit()
-			return
 		for item in items: # item is tvdb_id in list
 			try:
 				dbcur.execute('''DELETE FROM hiddenProgress WHERE tvdb=?;''', (item,))
@@ -292,14 +274,9 @@ def fetch_collection(table):
 	try:
 		dbcon = get_connection()
 		dbcur = get_connection_cursor(dbcon)
-		ck_table = dbcur.execute('''SELECT * FROM sqlite_master WHERE type='table' AND name=?;''', (table,)).fetchone()
-		if not ck_table:
-			dbcur.execute('''CREATE TABLE IF NOT EXISTS %s (title TEXT, year TEXT, premiered TEXT, imdb TEXT, tmdb TEXT, tvdb TEXT, trakt TEXT, rating FLOAT, votes INTEGER, collected_at TEXT, UNIQUE(imdb, tmdb, tvdb, trakt));''' % table)
-			dbcur.connection.commit()
-			return list
 		try:
 			match = dbcur.execute('''SELECT * FROM %s WHERE NOT title=""''' % table).fetchall()
-			list = [{'title': i[0], 'year': i[1], 'premiered': i[2], 'imdb': i[3], 'tmdb': i[4], 'tvdb': i[5], 'trakt': i[6], 'rating': i[7], 'votes': i[8], 'added': i[9]} for i in match]
+			list = [_list_item(i) for i in match]
 		except: pass
 	except:
 		from resources.lib.modules import log_utils
@@ -308,12 +285,37 @@ def fetch_collection(table):
 		dbcur.close() ; dbcon.close()
 	return list
 
+def fetch_list_page(table, sort_attribute=0, reverse=False, limit=None, offset=0):
+	"""
+	Returns (items, total) for one page of a collection or watch list table, ordered in sqlite the way the menus' sort() orders a whole list.
+	:param sort_attribute: the sort.*.type setting, 0 (and 6, last played, which these tables do not hold) keep the synced order
+	:param limit: items per page, None for all of them
+	"""
+	items, total = [], 0
+	try:
+		dbcon = get_connection()
+		dbcur = get_connection_cursor(dbcon)
+		total = dbcur.execute('''SELECT COUNT(*) FROM %s WHERE NOT title=""''' % table).fetchone()[0]
+		column = _sort_columns.get(sort_attribute)
+		if column == 'added': column = _list_tables[table]
+		order = '''%s %s, rowid''' % (column, 'DESC' if reverse else 'ASC') if column else '''rowid'''
+		sql = '''SELECT * FROM %s WHERE NOT title="" ORDER BY %s''' % (table, order)
+		if limit: sql += ''' LIMIT %d OFFSET %d''' % (int(limit), int(offset))
+		items = [_list_item(i) for i in dbcur.execute(sql).fetchall()]
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+	finally:
+		dbcur.close() ; dbcon.close()
+	return items, total
+
+def _list_item(row):
+	return {'title': row[0], 'year': row[1], 'premiered': row[2], 'imdb': row[3], 'tmdb': row[4], 'tvdb': row[5], 'trakt': row[6], 'rating': row[7], 'votes': row[8], 'added': row[9]}
+
 def insert_collection(items, table, new_sync=True):
 	try:
 		dbcon = get_connection()
 		dbcur = get_connection_cursor(dbcon)
-		dbcur.execute('''CREATE TABLE IF NOT EXISTS %s (title TEXT, year TEXT, premiered TEXT, imdb TEXT, tmdb TEXT, tvdb TEXT, trakt TEXT, rating FLOAT, votes INTEGER, collected_at TEXT, UNIQUE(imdb, tmdb, tvdb, trakt));''' % table)
-		dbcur.execute('''CREATE TABLE IF NOT EXISTS service (setting TEXT, value TEXT, UNIQUE(setting));''')
 		if new_sync:
 			dbcur.execute('''DELETE FROM %s''' % table)
 			dbcur.connection.commit() # added this for what looks like a 19 bug not found in 18, normal commit is at end
@@ -355,12 +357,6 @@ def delete_collection_items(items, table, col_name='trakt'):
 	try:
 		dbcon = get_connection()
 		dbcur = get_connection_cursor(dbcon)
-		ck_table = dbcur.execute('''SELECT * FROM sqlite_master WHERE type='table' AND name=?;''', (table,)).fetchone()
-		if not ck_table:
-			dbcur.execute('''CREATE TABLE IF NOT EXISTS %s (title TEXT, year TEXT, premiered TEXT, imdb TEXT, tmdb TEXT, tvdb TEXT, trakt TEXT, rating FLOAT, votes INTEGER, collected_at TEXT, UNIQUE(imdb, tmdb, tvdb, trakt));''' % table)
-			dbcur.execute('''CREATE TABLE IF NOT EXISTS service (setting TEXT, value TEXT, UNIQUE(setting));''')
-			dbcur.connection.commit()
-			return
 		for item in items:
 			try:
 				dbcur.execute('''DELETE FROM %s WHERE %s=?;''' % (table, col_name), (item,))
@@ -381,14 +377,9 @@ def fetch_watch_list(table):
 	try:
 		dbcon = get_connection()
 		dbcur = get_connection_cursor(dbcon)
-		ck_table = dbcur.execute('''SELECT * FROM sqlite_master WHERE type='table' AND name=?;''', (table,)).fetchone()
-		if not ck_table:
-			dbcur.execute('''CREATE TABLE IF NOT EXISTS %s (title TEXT, year TEXT, premiered TEXT, imdb TEXT, tmdb TEXT, tvdb TEXT, trakt TEXT, rating FLOAT, votes INTEGER, listed_at TEXT, UNIQUE(imdb, tmdb, tvdb, trakt));''' % table)
-			dbcur.connection.commit()
-			return list
 		try:
 			match = dbcur.execute('''SELECT * FROM %s WHERE NOT title=""''' % table).fetchall()
-			list = [{'title': i[0], 'year': i[1], 'premiered': i[2], 'imdb': i[3], 'tmdb': i[4], 'tvdb': i[5], 'trakt': i[6], 'rating': i[7], 'votes': i[8], 'added': i[9]} for i in match]
+			list = [_list_item(i) for i in match]
 		except: pass
 	except:
 		from resources.lib.modules import log_utils
@@ -401,8 +392,6 @@ def insert_watch_list(items, table, new_sync=True):
 	try:
 		dbcon = get_connection()
 		dbcur = get_connection_cursor(dbcon)
-		dbcur.execute('''CREATE TABLE IF NOT EXISTS %s (title TEXT, year TEXT, premiered TEXT, imdb TEXT, tmdb TEXT, tvdb TEXT, trakt TEXT, rating FLOAT, votes INTEGER, listed_at TEXT, UNIQUE(imdb, tmdb, tvdb, trakt));''' % table)
-		dbcur.execute('''CREATE TABLE IF NOT EXISTS service (setting TEXT, value TEXT, UNIQUE(setting));''')
 		if new_sync:
 			dbcur.execute('''DELETE FROM %s''' % table)
 			dbcur.connection.commit() # added this for what looks like a 19 bug not found in 18, normal commit is at end
@@ -443,12 +432,6 @@ def delete_watchList_items(items, table, col_name='trakt'):
 	try:
 		dbcon = get_connection()
 		dbcur = get_connection_cursor(dbcon)
-		ck_table = dbcur.execute('''SELECT * FROM sqlite_master WHERE type='table' AND name=?;''', (table,)).fetchone()
-		if not ck_table:
-			dbcur.execute('''CREATE TABLE IF NOT EXISTS %s (title TEXT, year TEXT, premiered TEXT, imdb TEXT, tmdb TEXT, tvdb TEXT, trakt TEXT, rating FLOAT, votes INTEGER, listed_at TEXT, UNIQUE(imdb, tmdb, tvdb, trakt));''' % table)
-			dbcur.execute('''CREATE TABLE IF NOT EXISTS service (setting TEXT, value TEXT, UNIQUE(setting));''')
-			dbcur.connection.commit()
-			return
 		for item in items:
 			try:
 				dbcur.execute('''DELETE FROM %s WHERE %s=?;''' % (table, col_name), (item,))
@@ -469,11 +452,6 @@ def fetch_user_lists(trakt_id, ret_all=False):
 	try:
 		dbcon = get_connection()
 		dbcur = get_connection_cursor(dbcon)
-		ck_table = dbcur.execute('''SELECT * FROM sqlite_master WHERE type='table' AND name='user_lists';''').fetchone()
-		if not ck_table:
-			dbcur.execute('''CREATE TABLE IF NOT EXISTS user_lists (list_owner TEXT, list_owner_slug TEXT, list_name TEXT, trakt_id TEXT, content_type TEXT, item_count INTEGER, likes INTEGER, UNIQUE(trakt_id));''')
-			dbcur.connection.commit()
-			return user_lists
 		if ret_all:
 			try:
 				match = dbcur.execute('''SELECT * FROM user_lists WHERE NOT trakt_id=""''').fetchall()
@@ -495,8 +473,6 @@ def insert_user_lists(items, new_sync=True):
 	try:
 		dbcon = get_connection()
 		dbcur = get_connection_cursor(dbcon)
-		dbcur.execute('''CREATE TABLE IF NOT EXISTS user_lists (list_owner TEXT, list_owner_slug TEXT, list_name TEXT, trakt_id TEXT, content_type TEXT, item_count INTEGER, likes INTEGER, UNIQUE(trakt_id));''')
-		dbcur.execute('''CREATE TABLE IF NOT EXISTS service (setting TEXT, value TEXT, UNIQUE(setting));''')
 		if new_sync:
 			dbcur.execute('''DELETE FROM user_lists''')
 			dbcur.connection.commit() # added this for what looks like a 19 bug not found in 18, normal commit is at end
@@ -535,11 +511,6 @@ def fetch_public_list(trakt_id, ret_all=False):
 	try:
 		dbcon = get_connection()
 		dbcur = get_connection_cursor(dbcon)
-		ck_table = dbcur.execute('''SELECT * FROM sqlite_master WHERE type='table' AND name='public_lists';''').fetchone()
-		if not ck_table:
-			dbcur.execute('''CREATE TABLE IF NOT EXISTS public_lists (list_owner TEXT, list_owner_slug TEXT, list_name TEXT, trakt_id TEXT, content_type TEXT, item_count INTEGER, likes INTEGER, updated_at TEXT, UNIQUE(trakt_id));''')
-			dbcur.connection.commit()
-			return public_list
 		if ret_all:
 			try:
 				match = dbcur.execute('''SELECT * FROM public_lists WHERE NOT trakt_id=""''').fetchall()
@@ -561,8 +532,6 @@ def insert_public_lists(items, service_type='last_popularlist_at', new_sync=True
 	try:
 		dbcon = get_connection()
 		dbcur = get_connection_cursor(dbcon)
-		dbcur.execute('''CREATE TABLE IF NOT EXISTS public_lists (list_owner TEXT, list_owner_slug TEXT, list_name TEXT, trakt_id TEXT, content_type TEXT, item_count INTEGER, likes INTEGER, updated_at TEXT, UNIQUE(trakt_id));''')
-		dbcur.execute('''CREATE TABLE IF NOT EXISTS service (setting TEXT, value TEXT, UNIQUE(setting));''')
 		if new_sync:
 			dbcur.execute('''DELETE FROM public_lists''')
 			dbcur.connection.commit() # added this for what looks like a 19 bug not found in 18, normal commit is at end
@@ -596,12 +565,9 @@ def last_sync(type):
 	try:
 		dbcon = get_connection()
 		dbcur = get_connection_cursor(dbcon)
-		ck_table = dbcur.execute('''SELECT * FROM sqlite_master WHERE type='table' AND name='service';''').fetchone()
-		if ck_table:
-			match = dbcur.execute('''SELECT * FROM service WHERE setting=?;''', (type,)).fetchone()
-			if match: last_sync_at = int(cleandate.iso_2_utc(match[1]))
-			else: dbcur.execute('''INSERT OR REPLACE INTO service Values (?, ?)''', (type, '1970-01-01T20:00:00.000Z'))
-		else: dbcur.execute('''CREATE TABLE IF NOT EXISTS service (setting TEXT, value TEXT, UNIQUE(setting));''')
+		match = dbcur.execute('''SELECT * FROM service WHERE setting=?;''', (type,)).fetchone()
+		if match: last_sync_at = int(cleandate.iso_2_utc(match[1]))
+		else: dbcur.execute('''INSERT OR REPLACE INTO service Values (?, ?)''', (type, '1970-01-01T20:00:00.000Z'))
 		dbcur.connection.commit()
 	except:
 		from resources.lib.modules import log_utils
@@ -631,6 +597,7 @@ def delete_tables(tables):
 		for table,v in iter(tables.items()):
 			if v is True:
 				dbcur.execute('''DROP TABLE IF EXISTS {}'''.format(table))
+				if table == 'watched': dbcur.execute('''DROP TABLE IF EXISTS watched_snapshot''') # the next season sync is a full one
 				dbcur.execute('''VACUUM''')
 				dbcur.execute('''INSERT OR REPLACE INTO service Values (?, ?)''', (service_dict[table], '1970-01-01T20:00:00.000Z'))
 				dbcur.connection.commit()
@@ -644,15 +611,7 @@ def delete_tables(tables):
 	return cleared
 
 def get_connection(setRowFactory=False):
-	if not existsPath(dataPath): makeFile(dataPath)
-	dbcon = db.connect(traktSyncFile, timeout=60) # added timeout 3/23/21 for concurrency with threads
-	dbcon.execute('''PRAGMA page_size = 32768''')
-	dbcon.execute('''PRAGMA journal_mode = OFF''')
-	dbcon.execute('''PRAGMA synchronous = OFF''')
-	dbcon.execute('''PRAGMA temp_store = memory''')
-	dbcon.execute('''PRAGMA mmap_size = 30000000000''')
-	if setRowFactory: dbcon.row_factory = _dict_factory
-	return dbcon
+	return dbpool.connect(traktSyncFile, row_factory=_dict_factory if setRowFactory else None) # pooled per thread, close() only releases it
 
 def get_connection_cursor(dbcon):
 	dbcur = dbcon.cursor()
@@ -676,33 +635,28 @@ def get(function, duration, *args, trakt=None):
 		key = _hash_function(function, args)
 		cache_result = cache_get(key)
 		if cache_result:
-			try: result = literal_eval(cache_result['value'])
+			try: result = codec.decode(cache_result['value'])
 			except: result = None
 			if _is_cache_valid(cache_result['date'], duration): return result
-		if trakt: fresh_result = repr(function(*args, trakt=trakt)) # may need a try-except block for server timeouts
-		else: fresh_result = repr(function(*args))
+		if trakt: fresh_result = function(*args, trakt=trakt) # may need a try-except block for server timeouts
+		else: fresh_result = function(*args)
 
-		if cache_result and (result and len(result) == 1) and fresh_result == '[]': # fix for syncSeason mark unwatched season when it's the last item remaining
+		if cache_result and (result and len(result) == 1) and fresh_result == []: # fix for syncSeason mark unwatched season when it's the last item remaining
 			if result[0].isdigit():
 				remove(function, *args)
 				return []
 
-		invalid = False
-		try: # Sometimes None is returned as a string instead of None type for "fresh_result"
-			if not fresh_result: invalid = True
-			elif fresh_result == 'None' or fresh_result == '' or fresh_result == '[]' or fresh_result == '{}': invalid = True
-			elif len(fresh_result) == 0: invalid = True
-		except: pass
+		invalid = codec.is_empty(fresh_result) # None, "", [] and {} are never cached, the same results the old repr() checks rejected
 
 		if invalid: # If the cache is old, but we didn't get "fresh_result", return the old cache
 			if cache_result: return result
 			else: return None # do not cache_insert() None type, sometimes servers just down momentarily
 		else:
-			if '404:NOT FOUND' in fresh_result:
+			if isinstance(fresh_result, str) and '404:NOT FOUND' in fresh_result:
 				cache_insert(key, None) # cache_insert() "404:NOT FOUND" cases only as None type
 				return None
 			else: cache_insert(key, fresh_result)
-			return literal_eval(fresh_result)
+			return fresh_result
 	except:
 		from resources.lib.modules import log_utils
 		log_utils.error()
@@ -727,7 +681,7 @@ def timeout(function, *args, returnNone=False):
 def cache_existing(function, *args):
 	try:
 		cache_result = cache_get(_hash_function(function, args))
-		if cache_result: return literal_eval(cache_result['value'])
+		if cache_result: return codec.decode(cache_result['value'])
 		else: return None
 	except:
 		from resources.lib.modules import log_utils
@@ -738,8 +692,6 @@ def cache_get(key):
 	try:
 		dbcon = get_connection(setRowFactory=True)
 		dbcur = get_connection_cursor(dbcon)
-		ck_table = dbcur.execute('''SELECT * FROM sqlite_master WHERE type='table' AND name='watched';''').fetchone()
-		if not ck_table: return None
 		results = dbcur.execute('''SELECT * FROM watched WHERE key=?''', (key,)).fetchone()
 		return results
 	except:
@@ -754,8 +706,7 @@ def cache_insert(key, value):
 		dbcon = get_connection(setRowFactory=True)
 		dbcur = get_connection_cursor(dbcon)
 		now = int(time())
-		dbcur.execute('''CREATE TABLE IF NOT EXISTS watched (key TEXT, value TEXT, date INTEGER, UNIQUE(key));''')
-		dbcur.execute('''INSERT OR REPLACE INTO watched Values (?, ?, ?)''', (key, value, now))
+		dbcur.execute('''INSERT OR REPLACE INTO watched Values (?, ?, ?)''', (key, codec.encode(value), now))
 		dbcur.connection.commit()
 	except:
 		from resources.lib.modules import log_utils
@@ -797,11 +748,85 @@ def _generate_md5(*args):
 		from resources.lib.modules import log_utils
 		log_utils.error()
 
+def fetch_watched_snapshot():
+	"""
+	Returns {trakt id: stamp} of each watched show as it was when its season indicators were last synced.
+	"""
+	try:
+		dbcon = get_connection()
+		dbcur = get_connection_cursor(dbcon)
+		return dict(dbcur.execute('''SELECT trakt, stamp FROM watched_snapshot''').fetchall())
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+		return {}
+	finally:
+		dbcur.close() ; dbcon.close()
+
+def update_watched_snapshot(stamps, removed=()):
+	"""
+	:param stamps: {trakt id: stamp} for the shows whose season indicators were just synced
+	:param removed: trakt ids no longer in the watched shows
+	"""
+	try:
+		dbcon = get_connection()
+		dbcur = get_connection_cursor(dbcon)
+		dbcur.executemany('''INSERT OR REPLACE INTO watched_snapshot Values (?, ?)''', list(stamps.items()))
+		dbcur.executemany('''DELETE FROM watched_snapshot WHERE trakt=?''', [(i,) for i in removed])
+		dbcur.connection.commit()
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+	finally:
+		dbcur.close() ; dbcon.close()
+
+def queue_mutations(mutations):
+	"""
+	:param mutations: [(method, endpoint, post json or '')] Trakt writes for the service to send
+	"""
+	try:
+		dbcon = get_connection()
+		dbcur = get_connection_cursor(dbcon)
+		now = int(time())
+		dbcur.executemany('''INSERT INTO mutations Values (?, ?, ?, ?)''', [(method, endpoint, post, now) for method, endpoint, post in mutations])
+		dbcur.connection.commit()
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+	finally:
+		dbcur.close() ; dbcon.close()
+
+def fetch_mutations():
+	"""
+	Returns the queued Trakt writes oldest first as (rowid, method, endpoint, post, date).
+	"""
+	try:
+		dbcon = get_connection()
+		dbcur = get_connection_cursor(dbcon)
+		return dbcur.execute('''SELECT rowid, method, endpoint, post, date FROM mutations ORDER BY rowid''').fetchall()
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+		return []
+	finally:
+		dbcur.close() ; dbcon.close()
+
+def delete_mutations(rowids):
+	try:
+		dbcon = get_connection()
+		dbcur = get_connection_cursor(dbcon)
+		dbcur.executemany('''DELETE FROM mutations WHERE rowid=?''', [(i,) for i in rowids])
+		dbcur.connection.commit()
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+	finally:
+		dbcur.close() ; dbcon.close()
+
 def insert_syncSeasons_at():
 	try:
 		dbcon = get_connection()
 		dbcur = get_connection_cursor(dbcon)
-		dbcur.execute('''CREATE TABLE IF NOT EXISTS service (setting TEXT, value TEXT, UNIQUE(setting));''')
 		timestamp = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.000Z")
 		dbcur.execute('''INSERT OR REPLACE INTO service Values (?, ?)''', ('last_syncSeasons_at', timestamp))
 		dbcur.connection.commit()
@@ -817,7 +842,6 @@ def insert_nextEpisode(imdb, tvdb, tmdb, trakt, next_episode):
 		dbcon = get_connection(setRowFactory=True)
 		dbcur = get_connection_cursor(dbcon)
 		now = int(time())
-		dbcur.execute('''CREATE TABLE IF NOT EXISTS next_episodes (imdb TEXT, tvdb TEXT, tmdb TEXT, trakt TEXT, next_episode TEXT, date INTEGER, UNIQUE(imdb, tvdb, tmdb, trakt));''')
 		dbcur.execute('''INSERT OR REPLACE INTO next_episodes Values (?, ?, ?, ?, ?, ?)''', (imdb, tvdb, tmdb, trakt, repr(next_episode), now))
 		dbcur.connection.commit()
 	except:
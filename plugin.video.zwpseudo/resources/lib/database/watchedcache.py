@@ -1,48 +1,33 @@
 import datetime
 import time
 from sqlite3 import dbapi2 as db
+from resources.lib.database import dbpool
 from resources.lib.modules.control import watchedcacheFile
 # from resources.lib.modules.control import log
 
+dbpool.register(watchedcacheFile, schema=(
+	# Create Watched table
+	"""CREATE TABLE IF NOT EXISTS watched
+	(media_type TEXT, imdb_id TEXT, tmdb_id TEXT, season INTEGER, episode INTEGER, title TEXT, last_played TEXT, overlay INTEGER, UNIQUE
+	(imdb_id, tmdb_id, season, episode));""",
+	# Create Progress table
+	"""CREATE TABLE IF NOT EXISTS progress
+	(media_type TEXT, imdb_id TEXT, tmdb_id TEXT, season INTEGER, episode INTEGER, title TEXT, resume_point TEXT, curr_time TEXT, last_played TEXT, resume_id INTEGER, UNIQUE
+	(imdb_id, tmdb_id, season, episode));"""))
 
-class WatchedCache:
-	def __init__(self):
-		self.__connect_database()
-		self.__set_PRAGMAS()
-		self.__create_cache_db()
-
-	def __connect_database(self):
-		self.dbcon = db.connect(watchedcacheFile, timeout=60, isolation_level=None)
-		self.dbcon.row_factory = db.Row # return results indexed by field names and not numbers so we can convert to dict
 
-	def __set_PRAGMAS(self):
-		self.dbcur = self.dbcon.cursor()
-		self.dbcur.execute('''PRAGMA journal_mode = OFF''')
-		self.dbcur.execute('''PRAGMA synchronous = OFF''')
+class WatchedCache:
+	@property
+	def dbcon(self): # the calling thread's pooled connection, the module level instance is shared across threads
+		return dbpool.connect(watchedcacheFile, row_factory=db.Row) # return results indexed by field names and not numbers so we can convert to dict
 
-	def __del__(self):
-		try:
-			self.dbcur.close()
-			self.dbcon.close()
-		except: pass
-
-	def __create_cache_db(self):
-		# Create Watched table
-		sql_create = """CREATE TABLE IF NOT EXISTS watched
-		(media_type TEXT, imdb_id TEXT, tmdb_id TEXT, season INTEGER, episode INTEGER, title TEXT, last_played TEXT, overlay INTEGER, UNIQUE
-		(imdb_id, tmdb_id, season, episode));"""
-		self.dbcur.execute(sql_create)
-
-		# Create Progress table
-		sql_create = """CREATE TABLE IF NOT EXISTS progress
-		(media_type TEXT, imdb_id TEXT, tmdb_id TEXT, season INTEGER, episode INTEGER, title TEXT, resume_point TEXT, curr_time TEXT, last_played TEXT, resume_id INTEGER, UNIQUE
-		(imdb_id, tmdb_id, season, episode));"""
-		self.dbcur.execute(sql_create)
+	@property
+	def dbcur(self):
+		return self.dbcon.cursor()
 
 	def select_single(self, query):
 		try:
-			self.dbcur.execute(query)
-			return self.dbcur.fetchone()
+			return self.dbcur.execute(query).fetchone()
 		except:
 			from resources.lib.modules import log_utils
 			log_utils.error()
@@ -50,18 +35,18 @@ class WatchedCache:
 	def select_all(self, query, parms=None):
 		try:
 			if parms:
-				self.dbcur.execute(query, parms)
+				return self.dbcur.execute(query, parms).fetchall()
 			else:
-				self.dbcur.execute(query)
-			return self.dbcur.fetchall()
+				return self.dbcur.execute(query).fetchall()
 		except:
 			from resources.lib.modules import log_utils
 			log_utils.error()
 
 	def insert(self, query, values):
 		try:
-			self.dbcur.execute(query, values)
-			self.dbcon.commit()
+			dbcur = self.dbcur
+			dbcur.execute(query, values)
+			dbcur.connection.commit()
 		except:
 			from resources.lib.modules import log_utils
 			log_utils.error()
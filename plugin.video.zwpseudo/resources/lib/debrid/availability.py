@@ -0,0 +1,122 @@
+"""
+	Venom Add-on
+"""
+
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait as futures_wait
+from threading import Lock
+from resources.lib.database import providerscache
+
+POOL_SIZE = 6 # cache-check requests in flight across all debrid services
+CACHED_EXPIRY = 86400 # seconds a verdict is trusted, a cached torrent seldom drops out of a debrid cache within a day
+UNCACHED_EXPIRY = 14400 # uncached torrents get added by other users, so they are checked again sooner
+CHUNK_SIZE = {'Real-Debrid': 100, 'Premiumize.me': 100, 'Offcloud': 100, 'EasyDebrid': 100, 'TorBox': 100} # DMM API allows max 100 hashes per request
+_pruned = []
+
+
+def _client(debrid):
+	if debrid == 'Real-Debrid':
+		from resources.lib.debrid.dmm import DMMCache
+		return DMMCache()
+	if debrid == 'Premiumize.me':
+		from resources.lib.debrid.premiumize import Premiumize
+		return Premiumize()
+	if debrid == 'Offcloud':
+		from resources.lib.debrid.offcloud import Offcloud
+		return Offcloud()
+	if debrid == 'EasyDebrid':
+		from resources.lib.debrid.easydebrid import EasyDebrid
+		return EasyDebrid()
+	if debrid == 'TorBox':
+		from resources.lib.debrid.torbox import TorBox
+		return TorBox()
+
+def _check_chunk(debrid, client, chunk, imdb):
+	"""
+	Returns {hash: True/False} for one request, or None when the request failed so nothing is stored for it.
+	"""
+	if debrid == 'Real-Debrid':
+		files = client.check_cache(chunk, imdb)
+		if files is None: return None
+		return {i: bool(files.get(i)) for i in chunk if len(i) == 40} # base32 hashes are not accepted by DMM, left unchecked
+	if debrid == 'Premiumize.me':
+		cached = client.check_cache_list(chunk)
+		if not isinstance(cached, list) or len(cached) != len(chunk): return None
+		return {i: is_cached is not False for i, is_cached in zip(chunk, cached)}
+	if debrid == 'Offcloud':
+		cached = set(i.lower() for i in client.check_cache(chunk)['cachedItems'])
+		return {i: i in cached for i in chunk}
+	if debrid == 'EasyDebrid':
+		cached = client.check_cache(chunk)['cached']
+		if len(cached) != len(chunk): return None
+		return {i: bool(is_cached) for i, is_cached in zip(chunk, cached)}
+	if debrid == 'TorBox':
+		result = client.check_cache(chunk)
+		if not result or result.get('success') is False: return None
+		cached = set(i['hash'].lower() for i in result['data'] or ())
+		return {i: i in cached for i in chunk}
+
+
+class Availability:
+	"""
+	Cache-check verdicts for one source list. Hashes with an unexpired (hash, debrid) verdict in providers.db are answered from it, the rest
+	are chunked per service limit and checked on a bounded pool. A chunk's verdicts are visible in result() as soon as it returns.
+	"""
+	def __init__(self, imdb='', workers=POOL_SIZE):
+		self.imdb = imdb
+		self.futures = {} # future: debrid
+		self.counts = {} # debrid: [hashes, answered from providers.db, requests sent]
+		self._verdicts = {} # debrid: {hash: True/False}
+		self._lock = Lock()
+		self._executor = ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix='zwpseudo_cachecheck')
+
+	def start(self, debrid, hashes):
+		if not _pruned:
+			_pruned.append(True)
+			providerscache.availability_prune()
+		hashes = list(dict.fromkeys(i.lower() for i in hashes if i))
+		known = providerscache.availability_fetch(debrid, hashes)
+		unknown = [i for i in hashes if i not in known]
+		chunk_size = CHUNK_SIZE.get(debrid, 100)
+		chunks = [unknown[i:i + chunk_size] for i in range(0, len(unknown), chunk_size)]
+		with self._lock:
+			self._verdicts[debrid] = known
+			self.counts[debrid] = [len(hashes), len(known), len(chunks)]
+		if not chunks: return
+		client = _client(debrid)
+		for chunk in chunks: self.futures[self._executor.submit(self._check, debrid, client, chunk)] = debrid
+
+	def _check(self, debrid, client, chunk):
+		try: verdicts = _check_chunk(debrid, client, chunk, self.imdb)
+		except:
+			from resources.lib.modules import log_utils
+			log_utils.error('%s cache check failed' % debrid)
+			return
+		if not verdicts: return
+		with self._lock: self._verdicts[debrid].update(verdicts)
+		providerscache.availability_store(debrid, verdicts, CACHED_EXPIRY, UNCACHED_EXPIRY)
+
+	def result(self, debrid):
+		"""
+		Returns a copy of the verdicts so far for debrid, None when no check was started for it.
+		"""
+		with self._lock:
+			verdicts = self._verdicts.get(debrid)
+			return None if verdicts is None else dict(verdicts)
+
+	def pending(self):
+		return list(dict.fromkeys(debrid for future, debrid in self.futures.items() if not future.done()))
+
+	def wait(self, timeout):
+		"""
+		Blocks until a chunk finished or timeout passed, returns the services still waiting on a request.
+		"""
+		running = [future for future in self.futures if not future.done()]
+		if running: futures_wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+		return self.pending()
+
+	def join(self):
+		self._executor.shutdown(wait=True)
+
+	def cancel(self):
+		for future in self.futures: future.cancel() # chunks already sent still finish and are stored for next time
+		self._executor.shutdown(wait=False)
@@ -0,0 +1,239 @@
+"""
+	Venom Add-on
+"""
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import md5
+from time import time
+from resources.lib.database import cloudindex
+from resources.lib.modules import cleantitle
+
+STALE = 600 # seconds before a scrape syncs the listing again, the service keeps it fresher than this while Kodi is running
+DETAIL_WORKERS = 5 # parallel torrent_info requests, Real-Debrid allows 250 requests a minute
+SERVICE_DETAILS = 100 # folders the service fetches details for per run, the rest are fetched on a title match or on later runs
+_year = re.compile(r'(?:19|20)[0-9]{2}')
+_season_episode = re.compile(r's(\d{1,2})[\s._-]?e(\d{1,3})(?:-?e(\d{1,3}))?|\b(\d{1,2})x(\d{2,3})\b')
+
+
+def title_key(name):
+	"""
+	Same key cloud_utils.cloud_check_title() matches against, the cleaned title before any 4 digit year.
+	"""
+	if not name: return ''
+	return cleantitle.get(_year.split(name.replace('&', 'and'))[0]) or ''
+
+def title_keys(title, aliases):
+	from resources.lib.cloud_scrapers.cloud_utils import aliases_to_array
+	keys = [cleantitle.get(i.replace('&', 'and')) for i in aliases_to_array(aliases) + [title] if i]
+	return list(dict.fromkeys(i for i in keys if i))
+
+def season_episode(name):
+	"""
+	Returns (season, episode_start, episode_end) for SxxEyy, SxxEyy-Ezz and NxNN names, (None, None, None) when there is none.
+	"""
+	match = _season_episode.search(name.lower())
+	if not match: return None, None, None
+	if match.group(1): season, start, end = match.group(1), match.group(2), match.group(3) or match.group(2)
+	else: season, start, end = match.group(4), match.group(5), match.group(5)
+	return int(season), int(start), max(int(start), int(end))
+
+def _file_row(name, size, link, key_name=None):
+	return (name, title_key(key_name or name), size, link) + season_episode(key_name or name)
+
+def _stamp(folder):
+	return md5(repr(folder).encode('utf-8', 'replace')).hexdigest()
+
+
+class RealDebridCloud:
+	name = 'Real-Debrid'
+	needs_details = True
+
+	def listing(self):
+		from resources.lib.debrid.realdebrid import RealDebrid
+		folders = RealDebrid().user_torrents()
+		if not isinstance(folders, list): return None # failed request, keep the index as it is
+		return {str(i['id']): i for i in folders if i.get('ended')}
+
+	def folder_name(self, folder):
+		return folder.get('filename', '')
+
+	def details(self, folder):
+		from resources.lib.debrid.realdebrid import RealDebrid
+		info = RealDebrid().torrent_info(folder['id'])
+		return info if isinstance(info, dict) and 'files' in info else None
+
+	def files(self, folder, details):
+		files = [i for i in details.get('files', []) if i.get('selected') == 1]
+		links = details.get('links', [])
+		return [_file_row(i.get('path', '').lstrip('/'), i.get('bytes'), links[count] if count < len(links) else '') for count, i in enumerate(files)]
+
+
+class PremiumizeCloud:
+	name = 'Premiumize.me'
+	needs_details = False
+
+	def listing(self):
+		from resources.lib.debrid.premiumize import Premiumize
+		from resources.lib.modules.source_utils import supported_video_extensions
+		files = Premiumize().my_files_all()
+		if not isinstance(files, list): return None
+		extensions = tuple(supported_video_extensions())
+		folders = {} # my_files_all() is one flat list, grouped on the top level folder
+		for i in files:
+			if not i.get('path', '').lower().endswith(extensions): continue
+			top = i['path'].split('/')[0]
+			folders.setdefault(top, {'name': top, 'files': []})['files'].append(i)
+		return folders
+
+	def folder_name(self, folder):
+		return folder['name']
+
+	def files(self, folder, details):
+		return [_file_row(i.get('name', ''), i.get('size'), i.get('id', ''), key_name=i.get('path', '').lower()) for i in folder['files']]
+
+
+class AllDebridCloud:
+	name = 'AllDebrid'
+	needs_details = False
+
+	def listing(self):
+		from resources.lib.debrid.alldebrid import AllDebrid
+		try: folders = AllDebrid().user_cloud()['magnets']
+		except: return None
+		if not isinstance(folders, list): return None
+		return {str(i['id']): i for i in folders if i.get('statusCode') == 4}
+
+	def folder_name(self, folder):
+		return folder.get('filename', '')
+
+	def files(self, folder, details):
+		return [_file_row(i.get('filename', ''), i.get('size'), i.get('link', '')) for i in folder.get('links') or []]
+
+
+class OffcloudCloud:
+	name = 'Offcloud'
+	needs_details = True
+
+	def listing(self):
+		from resources.lib.debrid.offcloud import Offcloud
+		folders = Offcloud().user_cloud()
+		if not isinstance(folders, list): return None
+		return {str(i['requestId']): i for i in folders if i.get('status') == 'downloaded'}
+
+	def folder_name(self, folder):
+		return folder.get('fileName', '')
+
+	def details(self, folder):
+		from resources.lib.debrid.offcloud import Offcloud
+		if not folder['isDirectory']: return [Offcloud().build_url(folder['server'], folder['requestId'], folder['fileName'])]
+		files = Offcloud().torrent_info(folder['requestId'])
+		return files if isinstance(files, list) else None
+
+	def files(self, folder, details):
+		from resources.lib.debrid.offcloud import Offcloud
+		return [_file_row(i.split('/')[-1], None, Offcloud().requote_uri(i)) for i in details]
+
+
+class TorBoxCloud:
+	name = 'TorBox'
+	needs_details = False
+
+	def listing(self):
+		from resources.lib.debrid.torbox import TorBox
+		folders, failed = {}, 0
+		for mediatype, function in (('torent', TorBox().user_cloud), ('usenet', TorBox().user_cloud_usenet)):
+			try: folders.update(('%s:%s' % (mediatype, i['id']), {**i, 'mediatype': mediatype}) for i in function()['data'] if i['download_finished'] and i['files'])
+			except: failed += 1
+		return None if failed == 2 else folders
+
+	def folder_name(self, folder):
+		return folder.get('name', '')
+
+	def files(self, folder, details):
+		return [_file_row(i['short_name'], i.get('size'), '%d,%d,%s' % (int(folder['id']), i['id'], folder['mediatype'])) for i in folder['files']]
+
+
+SERVICES = {i.name: i for i in (RealDebridCloud(), PremiumizeCloud(), AllDebridCloud(), OffcloudCloud(), TorBoxCloud())}
+
+
+def _entry(service, folder_id, folder, details):
+	name = service.folder_name(folder)
+	has_files = details is not None or not service.needs_details
+	return {'folder_id': folder_id, 'name': name, 'title_key': title_key(name), 'stamp': _stamp(folder), 'folder': folder,
+			'details': (details if service.needs_details else {}) if has_files else None, 'files': service.files(folder, details) if has_files else []}
+
+def _fetch_details(service, folders):
+	"""
+	:param folders: {folder_id: folder}
+	Returns {folder_id: details}, left out where the request failed.
+	"""
+	def fetch(item):
+		try: return item[0], service.details(item[1])
+		except:
+			from resources.lib.modules import log_utils
+			log_utils.error('%s cloud index: ' % service.name)
+			return item[0], None
+	if not folders: return {}
+	with ThreadPoolExecutor(max_workers=min(DETAIL_WORKERS, len(folders)), thread_name_prefix='zwpseudo_cloudindex') as executor:
+		return {folder_id: details for folder_id, details in executor.map(fetch, folders.items()) if details is not None}
+
+def sync(debrid, keys=None, max_details=None):
+	"""
+	Incremental sync of one account's cloud. Only new or changed folders are written and only removed ones deleted, details (torrent_info)
+	are requested for new folders and for folders still missing them, limited to folders matching keys when given, else to max_details.
+	Returns False when the listing request failed.
+	"""
+	service = SERVICES[debrid]
+	listing = service.listing()
+	if listing is None: return False
+	known = cloudindex.stamps(debrid)
+	removed = [i for i in known if i not in listing]
+	entries, wanted = [], {}
+	for folder_id, folder in listing.items():
+		stamp, detailed = known.get(folder_id, (None, 0))
+		changed = stamp != _stamp(folder)
+		if not service.needs_details:
+			if changed: entries.append(_entry(service, folder_id, folder, None))
+			continue
+		if changed or not detailed:
+			if keys is None or any(key in title_key(service.folder_name(folder)) for key in keys): wanted[folder_id] = folder
+			elif changed: entries.append(_entry(service, folder_id, folder, None)) # searchable by folder name until its details are fetched
+	if max_details is not None and len(wanted) > max_details:
+		for folder_id in list(wanted)[max_details:]:
+			folder = wanted.pop(folder_id)
+			if known.get(folder_id, (None,))[0] != _stamp(folder): entries.append(_entry(service, folder_id, folder, None))
+	details = _fetch_details(service, wanted)
+	for folder_id, folder in wanted.items(): entries.append(_entry(service, folder_id, folder, details.get(folder_id)))
+	cloudindex.store(debrid, entries, removed, synced=True)
+	return True
+
+def folders(debrid, title, aliases, season=None, episode=None):
+	"""
+	Cloud scrapers' lookup, returns [(folder, details)] from the local index for folders matching the title or an alias. A listing older than
+	STALE is synced first, matched folders still missing details have them fetched in parallel and stored for the next scrape.
+	"""
+	keys = title_keys(title, aliases)
+	if not keys: return []
+	if time() - cloudindex.last_synced(debrid) > STALE: sync(debrid, keys)
+	matches = cloudindex.lookup(debrid, keys, season, episode)
+	service = SERVICES[debrid]
+	missing = {folder_id: folder for folder_id, folder, details in matches if details is None and service.needs_details}
+	if missing:
+		fetched = _fetch_details(service, missing)
+		cloudindex.store(debrid, [_entry(service, folder_id, missing[folder_id], details) for folder_id, details in fetched.items()])
+		matches = [(folder_id, folder, fetched.get(folder_id, details)) for folder_id, folder, details in matches]
+	return [(folder, details) for folder_id, folder, details in matches]
+
+def sync_enabled(max_details=SERVICE_DETAILS):
+	"""
+	Service and on demand refresh of every account whose cloud scraper is enabled.
+	"""
+	from resources.lib.cloud_scrapers import enabledCheck
+	scrapers = {'rd_cloud': 'Real-Debrid', 'pm_cloud': 'Premiumize.me', 'ad_cloud': 'AllDebrid', 'oc_cloud': 'Offcloud', 'tb_cloud': 'TorBox'}
+	for scraper, debrid in scrapers.items():
+		if not enabledCheck(scraper): continue
+		try: sync(debrid, max_details=max_details)
+		except:
+			from resources.lib.modules import log_utils
+			log_utils.error('%s cloud index: ' % debrid)
@@ -17,7 +17,7 @@ class DMMCache:
 			results = requests.post(self.availability_check_link, json=data, timeout=self.timeout)
 			available_hashes = results.json()['available']
 			files = {file['hash']: file['files'] for file in available_hashes if 'hash' in file}
-		except: files = {}
+		except: return None # failed request, not the same as none of the hashes available
 
 		return files
 
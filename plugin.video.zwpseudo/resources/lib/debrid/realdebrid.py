@@ -770,12 +770,13 @@ class RealDebrid:
 
 	def get_aliases(self, title): # no longer used atm
 		from sqlite3 import dbapi2 as database
+		from resources.lib.database import codec
 		aliases = []
 		try:
 			dbcon = database.connect(control.providercacheFile, timeout=60)
 			dbcur = dbcon.cursor()
 			fetch = dbcur.execute('''SELECT * FROM rel_aliases WHERE title=?''', (title,)).fetchone()
-			aliases = eval(fetch[1])
+			aliases = codec.decode(fetch[1])
 		except: log_utils.error()
 		return aliases
 
@@ -4,14 +4,20 @@
 
 import re
 
+_html_code_fix = re.compile(r'(&#[0-9]+)([^;^0-9]+)')
+_html_code = re.compile(r'&#(\d+);')
+_brackets_and_symbols = re.compile(r'([<\[({].*?[})\]>])|([^\w0-9])')
+
 
 def get(title):
 	try:
 		if not title: return
-		title = re.sub(r'(&#[0-9]+)([^;^0-9]+)', '\\1;\\2', title) # fix html codes with missing semicolon between groups
-		title = re.sub(r'&#(\d+);', '', title).lower()
-		title = title.replace('&quot;', '\"').replace('&amp;', '&').replace('&nbsp;', '')
-		title = re.sub(r'([<\[({].*?[})\]>])|([^\w0-9])', '', title)
+		if '&#' in title:
+			title = _html_code_fix.sub('\\1;\\2', title) # fix html codes with missing semicolon between groups
+			title = _html_code.sub('', title)
+		title = title.lower()
+		if '&' in title: title = title.replace('&quot;', '\"').replace('&amp;', '&').replace('&nbsp;', '')
+		title = _brackets_and_symbols.sub('', title)
 		return title
 	except:
 		from resources.lib.fenom import log_utils
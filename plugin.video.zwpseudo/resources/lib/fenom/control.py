@@ -40,10 +40,21 @@ undesirablescacheFile = joinPath(dataPath, 'fenomundesirables.db')
 settingsFile = joinPath(dataPath, 'settings.xml')
 
 
-def setting(id, fallback=None):
+_settings_snapshot = {'generation': None, 'settings': None} # invalidated by the generation the zwpseudo service bumps on a setting change
+
+def settings_snapshot():
+	generation = homeWindow.getProperty('zwpseudo_settings.generation')
+	snapshot = _settings_snapshot
+	if snapshot['settings'] is not None and snapshot['generation'] == generation: return snapshot['settings']
 #	try: settings_dict = jsloads(homeWindow.getProperty('fenomscrapers_settings'))
 	try: settings_dict = jsloads(homeWindow.getProperty('zwpseudo_settings'))
 	except: settings_dict = make_settings_dict()
+	if settings_dict is None: return None
+	snapshot['generation'], snapshot['settings'] = generation, settings_dict
+	return settings_dict
+
+def setting(id, fallback=None):
+	settings_dict = settings_snapshot()
 	if settings_dict is None: settings_dict = settings_fallback(id)
 	value = settings_dict.get(id, '')
 	if fallback is None: return value
@@ -54,6 +65,7 @@ def settings_fallback(id):
 	return {id: addonObject.getSetting(id)}
 
 def setSetting(id, value):
+	if _settings_snapshot['settings'] is not None: _settings_snapshot['settings'][id] = value
 	return addonObject.setSetting(id, value)
 
 def make_settings_dict(): # service runs upon a setting change
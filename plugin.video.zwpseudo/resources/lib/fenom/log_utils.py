@@ -4,6 +4,7 @@
 
 from datetime import datetime
 import inspect
+from re import split as re_split
 from resources.lib.fenom.control import transPath, setting as getSetting, lang, joinPath, existsPath
 
 LOGDEBUG = 0
@@ -44,18 +45,9 @@ def log(msg, caller=None, level=LOGINFO):
 			if not existsPath(log_file):
 				f = open(log_file, 'w')
 				f.close()
-			reverse_log = getSetting('debug.reversed') == 'true'
-			if not reverse_log:
-				with open(log_file, 'a', encoding='utf-8') as f: # "with" auto cleans up and closes
-					line = '[%s %s] %s: %s' % (datetime.now().date(), str(datetime.now().time())[:8], DEBUGPREFIX % debug_list[level], msg)
-					f.write(line.rstrip('\r\n') + '\n')
-					# f.writelines([line1, line2]) ## maybe an option for the 2 lines without using "\n"
-			else:
-				with open(log_file, 'r+', encoding='utf-8') as f:
-					line = '[%s %s] %s: %s' % (datetime.now().date(), str(datetime.now().time())[:8], DEBUGPREFIX % debug_list[level], msg)
-					log_file = f.read()
-					f.seek(0, 0)
-					f.write(line.rstrip('\r\n') + '\n' + log_file)
+			with open(log_file, 'a', encoding='utf-8') as f: # always appended, "debug.reversed" is applied when the log is viewed
+				line = '[%s %s] %s: %s' % (datetime.now().date(), str(datetime.now().time())[:8], DEBUGPREFIX % debug_list[level], msg)
+				f.write(line.rstrip('\r\n') + '\n')
 		else:
 			import xbmc
 			xbmc.log('%s: %s' % (DEBUGPREFIX % debug_list[level], msg), level)
@@ -121,6 +113,8 @@ def view_LogFile(name):
 		f = open(log_file, 'r', encoding='utf-8', errors='ignore')
 		text = f.read()
 		f.close()
+		if name.lower() == 'fenomscrapers' and getSetting('debug.reversed') == 'true':
+			text = '\n'.join(reversed(re_split(r'\n(?=\[\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\] )', text.rstrip('\n'))))
 		heading = '[B]%s -  LogFile[/B]' % name
 		windows = TextViewerXML('textviewer.xml', addonPath(), heading=heading, text=text)
 		windows.run()
@@ -0,0 +1,121 @@
+"""
+	Fenomscrapers Module
+"""
+
+from concurrent.futures import Future
+from threading import Lock, local
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from resources.lib.fenom import client
+
+POOL_SIZE = 20 # keep-alive connections kept per host, scrapers for the same host share them across single/season/show pack calls
+RETRY_STATUS = (429, 500, 502, 503, 504)
+CF_CHALLENGE = ('cf-browser-verification', 'cf_chl_', 'jschl', '/cdn-cgi/challenge-platform') # markers of a cloudflare challenge page
+_sessions = {}
+_lock = Lock()
+_local = local() # RequestContext of the scrape job running on each thread
+
+
+def get_session(name='default', headers=None):
+	"""
+	:param name: registry key, scrapers needing their own default headers use their own name
+	:param headers: default headers applied once when the session is created
+	Returns the per-process requests.Session, connection pools are per host inside it and shared by every scraper thread.
+	"""
+	session = _sessions.get(name)
+	if session is not None: return session
+	with _lock:
+		session = _sessions.get(name)
+		if session is None:
+			session = requests.Session() # requests sends "Accept-Encoding: gzip, deflate" and decodes it
+			if headers: session.headers.update(headers)
+			adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=_retry())
+			session.mount('https://', adapter)
+			session.mount('http://', adapter)
+			_sessions[name] = session
+	return session
+
+def _retry():
+	"""
+	Read timeouts are not retried, a second wait would double the timeout the scraper asked for. Retry-After is ignored, a provider
+	asking for minutes would hold a scraper thread in sleep() past any scrape timeout, the backoff stays at 0.3s, 0.6s.
+	"""
+	try: return Retry(total=2, connect=2, read=0, backoff_factor=0.3, status_forcelist=RETRY_STATUS, raise_on_status=False, respect_retry_after_header=False,
+						allowed_methods=('GET', 'HEAD'))
+	except TypeError: return Retry(total=2, connect=2, read=0, backoff_factor=0.3, status_forcelist=RETRY_STATUS, raise_on_status=False, respect_retry_after_header=False,
+						method_whitelist=('GET', 'HEAD')) # urllib3 < 1.26
+
+def get(url, session='default', **kwargs):
+	return get_session(session).get(url, **kwargs)
+
+def post(url, session='default', **kwargs):
+	return get_session(session).post(url, **kwargs) # not retried, POST is not idempotent
+
+def get_text(url, timeout=10, headers=None, session='html'):
+	"""
+	For html scrapers that used client.request(url), falls back to it for a cloudflare challenge, which it gets past with cfscrape, and
+	for a connection the session could not open. Other error statuses were already retried by the session and timeouts are not sent again.
+	"""
+	try: response = get_session(session, headers={'User-Agent': client.randomagent()}).get(url, headers=headers, timeout=timeout)
+	except requests.Timeout: return None
+	except requests.ConnectionError: return client.request(url, headers=headers, timeout=str(timeout))
+	except requests.RequestException: return None
+	if response.status_code in (403, 503) and any(i in response.text for i in CF_CHALLENGE):
+		return client.request(url, headers=headers, timeout=str(timeout))
+	if not response.ok: return None
+	return response.text
+
+def stats():
+	"""
+	Connections opened and requests sent per host since the process started, ex. {'torrentio.strem.fun': (1, 3)}
+	"""
+	result = {}
+	for session in list(_sessions.values()):
+		for adapter in set(session.adapters.values()):
+			try: pools = adapter.poolmanager.pools
+			except AttributeError: continue
+			for key in pools.keys():
+				pool = pools[key]
+				connections, requests_sent = result.get(pool.host, (0, 0))
+				result[pool.host] = (connections + pool.num_connections, requests_sent + pool.num_requests)
+	return result
+
+class RequestContext:
+	"""
+	Per scrape memo of responses keyed on the request url. A scraper's single episode, season pack and show pack passes run as separate
+	jobs asking for the same url, the first one sends it and the others wait on its future or take the finished result.
+	"""
+	def __init__(self):
+		self._futures = {}
+		self._lock = Lock()
+
+	def fetch(self, key, function, *args):
+		with self._lock:
+			future = self._futures.get(key)
+			sender = future is None
+			if sender: future = self._futures[key] = Future()
+		if sender:
+			try: future.set_result(function(*args))
+			except Exception as e: future.set_exception(e)
+		return future.result()
+
+def bind_context(context):
+	"""
+	Set by ScraperPool around each job, None unbinds it.
+	"""
+	_local.context = context
+
+def request_context():
+	"""
+	The RequestContext of the scrape running on this thread, a new one shared with nothing when called outside a scrape.
+	Threads a scraper starts itself get no context, so take it on the job's thread and hand it to them.
+	"""
+	return getattr(_local, 'context', None) or RequestContext()
+
+def close_all():
+	with _lock:
+		for session in _sessions.values():
+			try: session.close()
+			except: pass
+		_sessions.clear()
@@ -2,6 +2,7 @@
 	Fenomscrapers Module
 """
 
+from functools import lru_cache
 import re
 from string import printable
 from threading import Thread as thread
@@ -81,6 +82,49 @@ unwanted_tags = ('tamilrockers.com', 'www.tamilrockers.com', 'www.tamilrockers.w
 			'www.1tamilmv.work', 'www.xbay.me',
 			'crazy4tv-com', '(es)')
 
+
+class KeywordSet:
+	"""
+	Any-keyword substring test done in one pass, same result as any(value in text for value in keywords).
+	Keywords of the ".xx." form are a token lookup on the dotted name, the rest are folded into one trie shaped regex.
+	"""
+	def __init__(self, keywords):
+		tokens, words = set(), []
+		for value in keywords:
+			if len(value) > 2 and value[0] == '.' and value[-1] == '.' and '.' not in value[1:-1]: tokens.add(value[1:-1])
+			else: words.append(value)
+		self.tokens = frozenset(tokens)
+		self.pattern = re.compile(_trie_pattern(words)) if words else None
+
+	def search(self, text, tokens=None):
+		if self.tokens and not self.tokens.isdisjoint(_tokens(text) if tokens is None else tokens): return True
+		return self.pattern is not None and self.pattern.search(text) is not None
+
+def _trie_pattern(words):
+	trie = {}
+	for word in words:
+		node = trie
+		for char in word: node = node.setdefault(char, {})
+		node[''] = None
+	def build(node):
+		if '' in node: return '' # a shorter keyword already matches, longer ones add nothing to an any() test
+		branches = [re.escape(char) + build(child) for char, child in node.items()]
+		return branches[0] if len(branches) == 1 else '(?:%s)' % '|'.join(branches)
+	return build(trie)
+
+_unprintable = re.compile('[^%s]' % re.escape(printable))
+
+def _tokens(text):
+	return text.split('.')[1:-1] # only tokens with a dot either side, so "x" in tokens == ".x." in text
+
+@lru_cache(maxsize=8)
+def _keywords(keywords):
+	return KeywordSet(keywords)
+
+_SCR, _CAM, _RES_720, _RES_1080, _RES_4K = KeywordSet(SCR), KeywordSet(CAM), KeywordSet(RES_720), KeywordSet(RES_1080), KeywordSet(RES_4K)
+_LANG, _ABV_LANG, _DUBBED, _SUBS = KeywordSet(LANG), KeywordSet(ABV_LANG), KeywordSet(DUBBED), KeywordSet(SUBS)
+_ENG_CHECK, _SRT_CHECK = KeywordSet(ENG_CHECK), KeywordSet(SRT_CHECK)
+
 home_getProperty = homeWindow.getProperty
 
 
@@ -94,12 +138,13 @@ def check_foreign_audio():
 	return False if home_getProperty('fs_filterless_search') == 'true' else getSetting('filter.foreign.single.audio') == 'true'
 
 def get_qual(term):
-	if any(i in term for i in SCR): return 'SCR'
-	elif any(i in term for i in CAM): return 'CAM'
-	elif any(i in term for i in RES_720): return '720p'
-	elif any(i in term for i in RES_1080): return '1080p'
-	elif any(i in term for i in RES_4K): return '4K'
-	elif '.hd.' in term: return '720p'
+	tokens = _tokens(term)
+	if _SCR.search(term, tokens): return 'SCR'
+	elif _CAM.search(term, tokens): return 'CAM'
+	elif _RES_720.search(term, tokens): return '720p'
+	elif _RES_1080.search(term, tokens): return '1080p'
+	elif _RES_4K.search(term, tokens): return '4K'
+	elif 'hd' in tokens: return '720p'
 	else: return 'SD'
 
 def get_release_quality(release_info, release_link=None):
@@ -130,60 +175,17 @@ def aliases_to_array(aliases, filter=None):
 		return []
 
 def check_title(title, aliases, release_title, hdlr, year, years=None): # non pack file title check, single eps and movies
-	if years: # for movies only, scraper to pass None for episodes
-		if not any(value in release_title for value in years): return False
-	else: 
-		if not re.search(r'%s' % hdlr, release_title, re.I): return False
-	aliases = aliases_to_array(aliases)
-	title_list = []
-	title_list_append = title_list.append
-	if aliases:
-		for item in aliases:
-			try:
-				alias = item.replace('&', 'and').replace(year, '')
-				if years: # for movies only, scraper to pass None for episodes
-					for i in years: alias = alias.replace(i, '')
-				if alias in title_list: continue
-				title_list_append(alias)
-			except:
-				from resources.lib.fenom import log_utils
-				log_utils.error()
-	try:
-		title = title.replace('&', 'and')
-		if title not in title_list: title_list_append(title)
-
-		release_title = re.sub(r'([(])(?=((19|20)[0-9]{2})).*?([)])', '\\2', release_title) #remove parenthesis only if surrounding a 4 digit date
-		t = re.split(r'%s' % hdlr, release_title, 1, re.I)[0].replace(year, '').replace('&', 'and')
-		if years:
-			for i in years: t = t.split(i)[0]
-		t = re.split(r'2160p|216op|4k|1080p|1o8op|108op|1o80p|720p|72op|480p|48op', t, 1, re.I)[0]
-		if all(cleantitle.get(i) != cleantitle.get(t) for i in title_list): return False
-
-# filter to remove episode ranges that should be picked up in "filter_season_pack()" ex. "s01e01-08"
-		if hdlr != year: # equal for movies but not for shows
-			range_regex = (
-					r's\d{1,3}e\d{1,3}[-.]e\d{1,3}',
-					r's\d{1,3}e\d{1,3}[-.]\d{1,3}(?!p|bit|gb)(?!\d{1,3})',
-					r's\d{1,3}[-.]e\d{1,3}[-.]e\d{1,3}',
-					r'season[.-]?\d{1,3}[.-]?ep[.-]?\d{1,3}[-.]ep[.-]?\d{1,3}',
-					r'season[.-]?\d{1,3}[.-]?episode[.-]?\d{1,3}[-.]episode[.-]?\d{1,3}') # may need to add "to", "thru"
-			for regex in range_regex:
-				if bool(re.search(regex, release_title, re.I)): return False
-		return True
-	except:
-		from resources.lib.fenom import log_utils
-		log_utils.error()
-		return False
+	return _parser(title, _alias_key(aliases), year, hdlr=hdlr, years=tuple(years) if years else None).check_title(release_title)
 
 def remove_lang(release_info, check_foreign_audio):
 	if not release_info: return False
 	try:
-		if any(value in release_info for value in DUBBED): return True
-		if any(value in release_info for value in SUBS): return True
+		tokens = _tokens(release_info)
+		if _DUBBED.search(release_info, tokens): return True
+		if _SUBS.search(release_info, tokens): return True
 		if check_foreign_audio:
-			if any(value in release_info for value in LANG) and not any(value in release_info for value in ENG_CHECK): return True
-			if any(value in release_info for value in ABV_LANG) and not any(value in release_info for value in ENG_CHECK): return True
-		if release_info.endswith('.srt.') and not any(value in release_info for value in SRT_CHECK): return True
+			if (_LANG.search(release_info, tokens) or _ABV_LANG.search(release_info, tokens)) and not _ENG_CHECK.search(release_info, tokens): return True
+		if release_info.endswith('.srt.') and not _SRT_CHECK.search(release_info, tokens): return True
 		return False
 	except:
 		from resources.lib.fenom import log_utils
@@ -191,356 +193,16 @@ def remove_lang(release_info, check_foreign_audio):
 		return False
 
 def remove_undesirables(release_info, undesirables):
-	if any(value in release_info for value in undesirables): return True
+	if _keywords(tuple(undesirables)).search(release_info): return True
 
 def filter_season_pack(show_title, aliases, year, season, release_title):
-	aliases = aliases_to_array(aliases)
-	title_list = []
-	title_list_append = title_list.append
-	if aliases:
-		for item in aliases:
-			try:
-				alias = item.replace('!', '').replace('(', '').replace(')', '').replace('&', 'and').replace(year, '')
-				if alias in title_list: continue
-				title_list_append(alias)
-			except:
-				from resources.lib.fenom import log_utils
-				log_utils.error()
-	try:
-		show_title = show_title.replace('!', '').replace('(', '').replace(')', '').replace('&', 'and')
-		if show_title not in title_list: title_list_append(show_title)
-
-		season_fill = season.zfill(2)
-		season_check = '.s%s.' % season
-		season_fill_check = '.s%s.' % season_fill
-		season_fill_checke = '.s%se' % season_fill # added 3/2/22 to pick up episode range packs ex "Reacher.s01e01-08"
-		season_full_check = '.season.%s.' % season
-		season_full_check_ns = '.season%s.' % season
-		season_full_fill_check = '.season.%s.' % season_fill
-		season_full_fill_check_ns = '.season%s.' % season_fill
-		split_list = (season_check, season_fill_check, season_fill_checke, '.' + season + '.season', 'total.season', 'season', 'the.complete', 'complete', year)
-		string_list = (season_check, season_fill_check, season_fill_checke, season_full_check, season_full_check_ns, season_full_fill_check, season_full_fill_check_ns)
-
-		release_title = release_title_format(release_title)
-		t = release_title.replace('-', '.')
-		for i in split_list: t = t.split(i)[0]
-		if all(cleantitle.get(x) != cleantitle.get(t) for x in title_list): return False, 0, 0
-
-# remove single episodes ONLY (returned in single ep scrape), keep episode ranges as season packs
-		episode_regex = (
-				r's\d{1,3}e\d{1,3}[-.](?!\d{2,3}[-.])(?!e\d{1,3})(?!\d{2}gb)',
-				r'season[.-]?\d{1,3}[.-]?ep[.-]?\d{1,3}[-.](?!\d{2,3}[-.])(?!e\d{1,3})(?!\d{2}gb)',
-				r'season[.-]?\d{1,3}[.-]?episode[.-]?\d{1,3}[-.](?!\d{2,3}[-.])(?!e\d{1,3})(?!\d{2}gb)')
-		for item in episode_regex:
-			if bool(re.search(item, release_title)): return False, 0, 0
-
-# return and identify episode ranges
-		range_regex = (
-				r's\d{1,3}e(\d{1,3})[-.]e(\d{1,3})',
-				r's\d{1,3}e(\d{1,3})[-.](\d{1,3})(?!p|bit|gb)(?!\d{1,3})',
-				r's\d{1,3}[-.]e(\d{1,3})[-.]e(\d{1,3})',
-				r'season[.-]?\d{1,3}[.-]?ep[.-]?(\d{1,3})[-.]ep[.-]?(\d{1,3})',
-				r'season[.-]?\d{1,3}[.-]?episode[.-]?(\d{1,3})[-.]episode[.-]?(\d{1,3})') # may need to add "to", "thru"
-		for regex in range_regex:
-			match = re.search(regex, release_title)
-			if match:
-				# from resources.lib.fenom import log_utils
-				# log_utils.log('pack episode range found -- > release_title=%s' % release_title)
-				episode_start = int(match.group(1))
-				episode_end = int(match.group(2))
-				return True, episode_start, episode_end
-
-# remove season ranges - returned in showPack scrape, plus non conforming season and specific crap
-		rt = release_title.replace('-', '.')
-		if any(i in rt for i in string_list):
-			for item in (
-				season_check.rstrip('.') + r'[.-]s([2-9]{1}|[1-3]{1}[0-9]{1})(?:[.-]|$)', # ex. ".s1-s9.", .s1-s39.
-				season_fill_check.rstrip('.') + r'[.-]s\d{2}(?:[.-]|$)', # ".s01-s09.", .s01-s39.
-				season_fill_check.rstrip('.') + r'[.-]\d{2}(?:[.-]|$)', # ".s01.09."
-				r'\Ws\d{2}\W%s' % season_fill_check.lstrip('.'), # may need more reverse ranges
-				season_full_check.rstrip('.') + r'[.-]to[.-]([2-9]{1}|[1-3]{1}[0-9]{1})(?:[.-]|$)', # ".season.1.to.9.", ".season.1.to.39"
-				season_full_check.rstrip('.') + r'[.-]season[.-]([2-9]{1}|[1-3]{1}[0-9]{1})(?:[.-]|$)', # ".season.1.season.9.", ".season.1.season.39"
-				season_full_check.rstrip('.') + r'[.-]([2-9]{1}|[1-3]{1}[0-9]{1})(?:[.-]|$)', # "season.1.9.", "season.1.39.
-				season_full_check.rstrip('.') + r'[.-]\d{1}[.-]\d{1,2}(?:[.-]|$)', # "season.1.9.09."
-				season_full_check.rstrip('.') + r'[.-]\d{3}[.-](?:19|20)[0-9]{2}(?:[.-]|$)', # single season followed by 3 digit followed by 4 digit year ex."season.1.004.1971"
-				season_full_fill_check.rstrip('.') + r'[.-]\d{3}[.-]\d{3}(?:[.-]|$)', # 2 digit season followed by 3 digit dash range ex."season.10.001-025."
-				season_full_fill_check.rstrip('.') + r'[.-]season[.-]\d{2}(?:[.-]|$)' # 2 digit season followed by 2 digit season range ex."season.01-season.09."
-					):
-				if bool(re.search(item, release_title)): return False, 0, 0
-			return True, 0, 0
-		return False, 0, 0
-	except:
-		from resources.lib.fenom import log_utils
-		log_utils.error()
-		return True
+	return _parser(show_title, _alias_key(aliases), year, season=season).filter_season_pack(release_title)
 
 def filter_show_pack(show_title, aliases, imdb, year, season, release_title, total_seasons):
-	aliases = aliases_to_array(aliases)
-	title_list = []
-	title_list_append = title_list.append
-	if aliases:
-		for item in aliases:
-			try:
-				alias = item.replace('!', '').replace('(', '').replace(')', '').replace('&', 'and').replace(year, '')
-				if alias in title_list: continue
-				title_list_append(alias)
-			except:
-				from resources.lib.fenom import log_utils
-				log_utils.error()
-	try:
-		show_title = show_title.replace('!', '').replace('(', '').replace(')', '').replace('&', 'and')
-		if show_title not in title_list: title_list_append(show_title)
-
-		split_list = ('.all.seasons', 'seasons', 'season', 'the.complete', 'complete', 'all.torrent', 'total.series', 'tv.series', 'series', 'edited', 's1', 's01', year)#s1 or s01 used so show pack only kept that begin with 1
-		release_title = release_title_format(release_title)
-		t = release_title.replace('-', '.')
-
-		for i in split_list: t = t.split(i)[0]
-		if all(cleantitle.get(x) != cleantitle.get(t) for x in title_list): return False, 0
-
-# remove single episodes(returned in single ep scrape)
-		episode_regex = (
-				r's\d{1,3}e\d{1,3}',
-				r's[0-3]{1}[0-9]{1}[.-]e\d{1,2}',
-				r's\d{1,3}[.-]\d{1,3}e\d{1,3}',
-				r'season[.-]?\d{1,3}[.-]?ep[.-]?\d{1,3}',
-				r'season[.-]?\d{1,3}[.-]?episode[.-]?\d{1,3}')
-		for item in episode_regex:
-			if bool(re.search(item, release_title)):
-				return False, 0
-
-# remove season ranges that do not begin at 1
-		season_range_regex = (
-				r'(?:season|seasons|s)[.-]?(?:0?[2-9]{1}|[1-3]{1}[0-9]{1})(?:[.-]?to[.-]?|[.-]?thru[.-]?|[.-])(?:season|seasons|s|)[.-]?(?:0?[3-9]{1}(?!\d{2}p)|[1-3]{1}[0-9]{1}(?!\d{2}p))',) # seasons.5-6, seasons5.to.6, seasons.5.thru.6, season.2-9.s02-s09.1080p
-		for item in season_range_regex:
-			if bool(re.search(item, release_title)):
-				return False, 0
-
-# remove single seasons - returned in seasonPack scrape
-		season_regex = (
-				r'season[.-]?([1-9]{1})[.-]0{1}\1[.-]?complete', # "season.1.01.complete" when 2nd number matches the fiirst group with leading 0
-				r'season[.-]?([2-9]{1})[.-](?:[0-9]+)[.-]?complete', # "season.9.10.complete" when first number is >1 followed by 2 digit number
-				r'season[.-]?\d{1,2}[.-]s\d{1,2}', # season.02.s02
-				r'season[.-]?\d{1,2}[.-]complete', # season.02.complete
-				r'season[.-]?\d{1,2}[.-]\d{3,4}p{0,1}', # "season.02.1080p" and no seperator "season02.1080p"
-				r'season[.-]?\d{1,2}[.-](?!thru|to|\d{1,2}[.-])', # "season.02." or "season.1" not followed by "to", "thru", or another single or 2 digit number then a dot(which would be a range)
-				r'season[.-]?\d{1,2}[.]?$', # end of line ex."season.1", "season.01", "season01" can also have trailing dot or end of line(dash would be a range)
-				r'season[.-]?\d{1,2}[.-](?:19|20)[0-9]{2}', # single season followed by 4 digit year ex."season.1.1971", "season.01.1971", or "season01.1971"
-				r'season[.-]?\d{1,2}[.-]\d{3}[.-]{1,2}(?:19|20)[0-9]{2}', # single season followed by 3 digits then 4 digit year ex."season.1.004.1971" or "season.01.004.1971" (comic book format)
-				r'(?<!thru)(?<!to)(?<!\d{2})[.-]s\d{2}[.-]complete', # ".s01.complete" not preceded by "thru", "to", or 2 digit number
-				r'(?<!thru)(?<!to)(?<!s\d{2})[.-]s\d{2}(?![.-]thru)(?![.-]to)(?![.-]s\d{2})(?![.-]\d{2}[.-])' # .s02. not preceded by "thru", "to", or "s01". Not followed by ".thru", ".to", ".s02", "-s02", ".02.", or "-02."
-				)
-		for item in season_regex:
-			if bool(re.search(item, release_title)):
-				return False, 0
-
-
-# remove spelled out single seasons
-		season_regex = ()
-		season_regex += tuple([r'complete[.-]%s[.-]season' % x for x in season_ordinal_list])
-		season_regex += tuple([r'complete[.-]%s[.-]season' % x for x in season_ordinal2_list])
-		season_regex += tuple([r'season[.-]%s' % x for x in season_list]) 
-		for item in season_regex:
-			if bool(re.search(item, release_title)):
-				return False, 0
-
-
-# from here down we don't filter out, we set and pass "last_season" it covers for the range and addon can filter it so the db will have full valid showPacks.
-# set last_season for range type ex "1.2.3.4" or "1.2.3.and.4" (dots or dashes)
-		dot_release_title = release_title.replace('-', '.')
-		dot_season_ranges = []
-		all_seasons = '1'
-		season_count = 2
-		while season_count <= int(total_seasons):
-			dot_season_ranges.append(all_seasons + '.and.%s' % str(season_count))
-			all_seasons += '.%s' % str(season_count)
-			dot_season_ranges.append(all_seasons)
-			season_count += 1
-		if any(i in dot_release_title for i in dot_season_ranges):
-			keys = [i for i in dot_season_ranges if i in dot_release_title]
-			last_season = int(keys[-1].split('.')[-1])
-			return True, last_season
-
-
-
-# "1.to.9" type range filter (dots or dashes)
-		to_season_ranges = []
-		start_season = '1'
-		season_count = 2
-		while season_count <= int(total_seasons):
-			to_season_ranges.append(start_season + '.to.%s' % str(season_count))
-			season_count += 1
-		if any(i in dot_release_title for i in to_season_ranges):
-			keys = [i for i in to_season_ranges if i in dot_release_title]
-			last_season = int(keys[0].split('to.')[1])
-			return True, last_season
-
-# "1.thru.9" range filter (dots or dashes)
-		thru_ranges = [i.replace('to', 'thru') for i in to_season_ranges]
-		if any(i in dot_release_title for i in thru_ranges):
-			keys = [i for i in thru_ranges if i in dot_release_title]
-			last_season = int(keys[0].split('thru.')[1])
-			return True, last_season
-
-# "1-9" range filter
-		dash_ranges = [i.replace('.to.', '-') for i in to_season_ranges]
-		if any(i in release_title for i in dash_ranges):
-			keys = [i for i in dash_ranges if i in release_title]
-			last_season = int(keys[0].split('-')[1])
-			return True, last_season
-
-# "1~9" range filter
-		tilde_ranges = [i.replace('.to.', '~') for i in to_season_ranges]
-		if any(i in release_title for i in tilde_ranges):
-			keys = [i for i in tilde_ranges if i in release_title]
-			last_season = int(keys[0].split('~')[1])
-			return True, last_season
-
-
-
-# "01.to.09" 2 digit range filter (dots or dashes)
-		to_season_ranges = []
-		start_season = '01'
-		season_count = 2
-		while season_count <= int(total_seasons):
-			to_season_ranges.append(start_season + '.to.%s' % '0' + str(season_count) if int(season_count) < 10 else start_season + '.to.%s' % str(season_count))
-			season_count += 1
-		if any(i in dot_release_title for i in to_season_ranges):
-			keys = [i for i in to_season_ranges if i in dot_release_title]
-			last_season = int(keys[0].split('to.')[1])
-			return True, last_season
-
-# "01.thru.09" 2 digit range filter (dots or dashes)
-		thru_ranges = [i.replace('to', 'thru') for i in to_season_ranges]
-		if any(i in dot_release_title for i in thru_ranges):
-			keys = [i for i in thru_ranges if i in dot_release_title]
-			last_season = int(keys[0].split('thru.')[1])
-			return True, last_season
-
-# "01-09" 2 digit range filtering
-		dash_ranges = [i.replace('.to.', '-') for i in to_season_ranges]
-		if any(i in release_title for i in dash_ranges):
-			keys = [i for i in dash_ranges if i in release_title]
-			last_season = int(keys[0].split('-')[1])
-			return True, last_season
-
-# "01~09" 2 digit range filtering
-		tilde_ranges = [i.replace('.to.', '~') for i in to_season_ranges]
-		if any(i in release_title for i in tilde_ranges):
-			keys = [i for i in tilde_ranges if i in release_title]
-			last_season = int(keys[0].split('~')[1])
-			return True, last_season
-
-
-
-# "s1.to.s9" single digit range filter (dots or dashes)
-		to_season_ranges = []
-		start_season = 's1'
-		season_count = 2
-		while season_count <= int(total_seasons):
-			to_season_ranges.append(start_season + '.to.s%s' % str(season_count))
-			season_count += 1
-		if any(i in dot_release_title for i in to_season_ranges):
-			keys = [i for i in to_season_ranges if i in dot_release_title]
-			last_season = int(keys[0].split('to.s')[1])
-			return True, last_season
-
-# "s1.thru.s9" single digit range filter (dots or dashes)
-		thru_ranges = [i.replace('to', 'thru') for i in to_season_ranges]
-		if any(i in dot_release_title for i in thru_ranges):
-			keys = [i for i in thru_ranges if i in dot_release_title]
-			last_season = int(keys[0].split('thru.s')[1])
-			return True, last_season
-
-# "s1-s9" single digit range filtering (dashes)
-		dash_ranges = [i.replace('.to.', '-') for i in to_season_ranges]
-		if any(i in release_title for i in dash_ranges):
-			keys = [i for i in dash_ranges if i in release_title]
-			last_season = int(keys[0].split('-s')[1])
-			return True, last_season
-
-# "s1~s9" single digit range filtering (dashes)
-		tilde_ranges = [i.replace('.to.', '~') for i in to_season_ranges]
-		if any(i in release_title for i in tilde_ranges):
-			keys = [i for i in tilde_ranges if i in release_title]
-			last_season = int(keys[0].split('~s')[1])
-			return True, last_season
-
-
-
-# "s01.to.s09"  2 digit range filter (dots or dash)
-		to_season_ranges = []
-		start_season = 's01'
-		season_count = 2
-		while season_count <= int(total_seasons):
-			to_season_ranges.append(start_season + '.to.s%s' % '0' + str(season_count) if int(season_count) < 10 else start_season + '.to.s%s' % str(season_count))
-			season_count += 1
-		if any(i in dot_release_title for i in to_season_ranges):
-			keys = [i for i in to_season_ranges if i in dot_release_title]
-			last_season = int(keys[0].split('to.s')[1])
-			return True, last_season
-
-# "s01.thru.s09" 2 digit  range filter (dots or dashes)
-		thru_ranges = [i.replace('to', 'thru') for i in to_season_ranges]
-		if any(i in dot_release_title for i in thru_ranges):
-			keys = [i for i in thru_ranges if i in dot_release_title]
-			last_season = int(keys[0].split('thru.s')[1])
-			return True, last_season
-
-# "s01-s09" 2 digit  range filtering (dashes)
-		dash_ranges = [i.replace('.to.', '-') for i in to_season_ranges]
-		if any(i in release_title for i in dash_ranges):
-			keys = [i for i in dash_ranges if i in release_title]
-			last_season = int(keys[0].split('-s')[1])
-			return True, last_season
-
-# "s01~s09" 2 digit  range filtering (dashes)
-		tilde_ranges = [i.replace('.to.', '~') for i in to_season_ranges]
-		if any(i in release_title for i in tilde_ranges):
-			keys = [i for i in tilde_ranges if i in release_title]
-			last_season = int(keys[0].split('~s')[1])
-			return True, last_season
-
-# "s01.s09" 2 digit  range filtering (dots)
-		dot_ranges = [i.replace('.to.', '.') for i in to_season_ranges]
-		if any(i in release_title for i in dot_ranges):
-			keys = [i for i in dot_ranges if i in release_title]
-			last_season = int(keys[0].split('.s')[1])
-			return True, last_season
-
-		return True, total_seasons
-	except:
-		from resources.lib.fenom import log_utils
-		log_utils.error()
-		# return True, total_seasons
+	return _parser(show_title, _alias_key(aliases), year, season=season, total_seasons=total_seasons).filter_show_pack(release_title)
 
 def info_from_name(release_title, title, year, hdlr=None, episode_title=None, season=None, pack=None):
-	try:
-		release_title = release_title.lower().replace('&', 'and').replace("'", "")
-		release_title = re.sub(r'[^a-z0-9]+', '.', release_title)
-		title = title.lower().replace('&', 'and').replace("'", "")
-		title = re.sub(r'[^a-z0-9]+', '.', title)
-		name_info = release_title.replace(title, '').replace(year, '')
-		if hdlr: name_info = name_info.replace(hdlr.lower(), '')
-		if episode_title:
-			episode_title = episode_title.lower().replace('&', 'and').replace("'", "")
-			episode_title = re.sub(r'[^a-z0-9]+', '.', episode_title)
-			name_info = name_info.replace(episode_title, '')
-		if pack:
-			if pack == 'season':
-				season_fill = season.zfill(2)
-				str1_replace = ('.s%s' % season, '.s%s' % season_fill, '.season.%s' % season, '.season%s' % season, '.season.%s' % season_fill, '.season%s' % season_fill, 'complete')
-				for i in str1_replace: name_info = name_info.replace(i, '')
-			elif pack == 'show':
-				str2_replace = ('.all.seasons', 'seasons', 'season', 'the.complete', 'complete', 'all.torrent', 'total.series', 'tv.series', 'series', 'edited', 's1', 's01')
-				for i in str2_replace: name_info = name_info.replace(i, '')
-		name_info = name_info.lstrip('.').rstrip('.')
-		name_info = '.%s.' % name_info
-		return name_info
-	except:
-		from resources.lib.fenom import log_utils
-		log_utils.error()
-		return release_title
+	return _parser(title, (), year, hdlr=hdlr, season=season, episode_title=episode_title).info_from_name(release_title, pack)
 
 def release_title_format(release_title):
 	try:
@@ -554,15 +216,16 @@ def release_title_format(release_title):
 
 def clean_name(release_title):
 	try:
-		release_title = re.sub(r'【.*?】', '', release_title)
+		if '【' in release_title: release_title = re.sub(r'【.*?】', '', release_title)
 		release_title = strip_non_ascii_and_unprintable(release_title).lstrip('+.-:/ ').replace(' ', '.')
 		releasetitle_startswith = release_title.lower().startswith
 		if releasetitle_startswith('rifftrax'): return release_title # removed by "undesirables" anyway so exit
-		for i in unwanted_tags:
-			if releasetitle_startswith(i):
-				release_title = re.sub(r'^%s' % i.replace('+', '\+'), '', release_title, 1, re.I)
+		if releasetitle_startswith(unwanted_tags):
+			for i in unwanted_tags:
+				if releasetitle_startswith(i):
+					release_title = re.sub(r'^%s' % i.replace('+', '\+'), '', release_title, 1, re.I)
 		release_title = release_title.lstrip('+.-:/ ')
-		release_title = re.sub(r'^\[.*?]', '', release_title, 1, re.I)
+		if release_title.startswith('['): release_title = re.sub(r'^\[.*?]', '', release_title, 1, re.I)
 		release_title = release_title.lstrip('.-[](){}:/')
 		return release_title
 	except:
@@ -572,7 +235,7 @@ def clean_name(release_title):
 
 def strip_non_ascii_and_unprintable(text):
 	try:
-		result = ''.join(char for char in text if char in printable)
+		result = _unprintable.sub('', text)
 		return result.encode('ascii', errors='ignore').decode('ascii', errors='ignore')
 	except:
 		from resources.lib.fenom import log_utils
@@ -683,6 +346,220 @@ def copy2clip(txt):
 			from resources.lib.fenom import log_utils
 			log_utils.error('Linux: Failure to copy to clipboard')
 
+class ReleaseParser:
+	"""
+	Title, alias, season and range patterns for one scrape compiled once, each release name is then checked against them.
+	The module level check_title(), filter_season_pack(), filter_show_pack() and info_from_name() share these through _parser().
+	"""
+	_year_parens = re.compile(r'([(])(?=((19|20)[0-9]{2})).*?([)])')
+	_resolution = re.compile(r'2160p|216op|4k|1080p|1o8op|108op|1o80p|720p|72op|480p|48op', re.I)
+	_non_alnum = re.compile(r'[^a-z0-9]+')
+	_single_range = re.compile(r's\d{1,3}e\d{1,3}[-.]e\d{1,3}|s\d{1,3}e\d{1,3}[-.]\d{1,3}(?!p|bit|gb)(?!\d{1,3})|s\d{1,3}[-.]e\d{1,3}[-.]e\d{1,3}|'
+		r'season[.-]?\d{1,3}[.-]?ep[.-]?\d{1,3}[-.]ep[.-]?\d{1,3}|season[.-]?\d{1,3}[.-]?episode[.-]?\d{1,3}[-.]episode[.-]?\d{1,3}', re.I) # may need to add "to", "thru"
+	_season_episode = re.compile(r's\d{1,3}e\d{1,3}[-.](?!\d{2,3}[-.])(?!e\d{1,3})(?!\d{2}gb)|season[.-]?\d{1,3}[.-]?ep[.-]?\d{1,3}[-.](?!\d{2,3}[-.])(?!e\d{1,3})(?!\d{2}gb)|'
+		r'season[.-]?\d{1,3}[.-]?episode[.-]?\d{1,3}[-.](?!\d{2,3}[-.])(?!e\d{1,3})(?!\d{2}gb)')
+	_episode_ranges = tuple(re.compile(i) for i in (
+		r's\d{1,3}e(\d{1,3})[-.]e(\d{1,3})',
+		r's\d{1,3}e(\d{1,3})[-.](\d{1,3})(?!p|bit|gb)(?!\d{1,3})',
+		r's\d{1,3}[-.]e(\d{1,3})[-.]e(\d{1,3})',
+		r'season[.-]?\d{1,3}[.-]?ep[.-]?(\d{1,3})[-.]ep[.-]?(\d{1,3})',
+		r'season[.-]?\d{1,3}[.-]?episode[.-]?(\d{1,3})[-.]episode[.-]?(\d{1,3})')) # checked in order, first hit sets the range
+	_show_episode = re.compile(r's\d{1,3}e\d{1,3}|s[0-3]{1}[0-9]{1}[.-]e\d{1,2}|s\d{1,3}[.-]\d{1,3}e\d{1,3}|season[.-]?\d{1,3}[.-]?ep[.-]?\d{1,3}|season[.-]?\d{1,3}[.-]?episode[.-]?\d{1,3}')
+	_show_season_range = re.compile(r'(?:season|seasons|s)[.-]?(?:0?[2-9]{1}|[1-3]{1}[0-9]{1})(?:[.-]?to[.-]?|[.-]?thru[.-]?|[.-])(?:season|seasons|s|)[.-]?(?:0?[3-9]{1}(?!\d{2}p)|[1-3]{1}[0-9]{1}(?!\d{2}p))')
+	_show_single_season = re.compile(r'season[.-]?(?P<first>[1-9]{1})[.-]0{1}(?P=first)[.-]?complete|season[.-]?[2-9]{1}[.-](?:[0-9]+)[.-]?complete|season[.-]?\d{1,2}[.-]s\d{1,2}|'
+		r'season[.-]?\d{1,2}[.-]complete|season[.-]?\d{1,2}[.-]\d{3,4}p{0,1}|season[.-]?\d{1,2}[.-](?!thru|to|\d{1,2}[.-])|season[.-]?\d{1,2}[.]?$|'
+		r'season[.-]?\d{1,2}[.-](?:19|20)[0-9]{2}|season[.-]?\d{1,2}[.-]\d{3}[.-]{1,2}(?:19|20)[0-9]{2}|(?<!thru)(?<!to)(?<!\d{2})[.-]s\d{2}[.-]complete|'
+		r'(?<!thru)(?<!to)(?<!s\d{2})[.-]s\d{2}(?![.-]thru)(?![.-]to)(?![.-]s\d{2})(?![.-]\d{2}[.-])')
+	_show_spelled_season = re.compile(r'complete[.-](?:%s)[.-]season|season[.-](?:%s)' % ('|'.join(season_ordinal_list + season_ordinal2_list), '|'.join(season_list)))
+	_show_split = ('.all.seasons', 'seasons', 'season', 'the.complete', 'complete', 'all.torrent', 'total.series', 'tv.series', 'series', 'edited', 's1', 's01')
+
+	def __init__(self, title, aliases, year, hdlr=None, years=None, season=None, episode_title=None, total_seasons=None):
+		self.title, self.aliases, self.year, self.hdlr, self.years = title, aliases_to_array(aliases), year, hdlr, years
+		self.season, self.episode_title, self.total_seasons = season, episode_title, total_seasons
+		self._single = self._season = self._show = self._show_ranges = self._info = None
+
+	def _single_context(self):
+		hdlr = re.compile(r'%s' % self.hdlr, re.I)
+		title_list = []
+		for item in self.aliases or ():
+			try:
+				alias = item.replace('&', 'and').replace(self.year, '')
+				if self.years: # for movies only, scraper to pass None for episodes
+					for i in self.years: alias = alias.replace(i, '')
+				if alias not in title_list: title_list.append(alias)
+			except:
+				from resources.lib.fenom import log_utils
+				log_utils.error()
+		title = self.title.replace('&', 'and')
+		if title not in title_list: title_list.append(title)
+		self._single = (hdlr, frozenset(cleantitle.get(i) for i in title_list))
+		return self._single
+
+	def _pack_titles(self):
+		title_list = []
+		for item in self.aliases or ():
+			try:
+				alias = item.replace('!', '').replace('(', '').replace(')', '').replace('&', 'and').replace(self.year, '')
+				if alias not in title_list: title_list.append(alias)
+			except:
+				from resources.lib.fenom import log_utils
+				log_utils.error()
+		show_title = self.title.replace('!', '').replace('(', '').replace(')', '').replace('&', 'and')
+		if show_title not in title_list: title_list.append(show_title)
+		return frozenset(cleantitle.get(x) for x in title_list)
+
+	def _season_context(self):
+		season = self.season
+		season_fill = season.zfill(2)
+		season_check = '.s%s.' % season
+		season_fill_check = '.s%s.' % season_fill
+		season_fill_checke = '.s%se' % season_fill # to pick up episode range packs ex "Reacher.s01e01-08"
+		season_full_check = '.season.%s.' % season
+		season_full_fill_check = '.season.%s.' % season_fill
+		split_list = (season_check, season_fill_check, season_fill_checke, '.' + season + '.season', 'total.season', 'season', 'the.complete', 'complete', self.year)
+		string_list = (season_check, season_fill_check, season_fill_checke, season_full_check, '.season%s.' % season, season_full_fill_check, '.season%s.' % season_fill)
+		season_range = re.compile('|'.join((
+			season_check.rstrip('.') + r'[.-]s(?:[2-9]{1}|[1-3]{1}[0-9]{1})(?:[.-]|$)', # ex. ".s1-s9.", .s1-s39.
+			season_fill_check.rstrip('.') + r'[.-]s\d{2}(?:[.-]|$)', # ".s01-s09.", .s01-s39.
+			season_fill_check.rstrip('.') + r'[.-]\d{2}(?:[.-]|$)', # ".s01.09."
+			r'\Ws\d{2}\W%s' % season_fill_check.lstrip('.'), # may need more reverse ranges
+			season_full_check.rstrip('.') + r'[.-]to[.-](?:[2-9]{1}|[1-3]{1}[0-9]{1})(?:[.-]|$)', # ".season.1.to.9.", ".season.1.to.39"
+			season_full_check.rstrip('.') + r'[.-]season[.-](?:[2-9]{1}|[1-3]{1}[0-9]{1})(?:[.-]|$)', # ".season.1.season.9.", ".season.1.season.39"
+			season_full_check.rstrip('.') + r'[.-](?:[2-9]{1}|[1-3]{1}[0-9]{1})(?:[.-]|$)', # "season.1.9.", "season.1.39.
+			season_full_check.rstrip('.') + r'[.-]\d{1}[.-]\d{1,2}(?:[.-]|$)', # "season.1.9.09."
+			season_full_check.rstrip('.') + r'[.-]\d{3}[.-](?:19|20)[0-9]{2}(?:[.-]|$)', # single season followed by 3 digit followed by 4 digit year ex."season.1.004.1971"
+			season_full_fill_check.rstrip('.') + r'[.-]\d{3}[.-]\d{3}(?:[.-]|$)', # 2 digit season followed by 3 digit dash range ex."season.10.001-025."
+			season_full_fill_check.rstrip('.') + r'[.-]season[.-]\d{2}(?:[.-]|$)'))) # 2 digit season followed by 2 digit season range ex."season.01-season.09."
+		self._season = (self._pack_titles(), split_list, string_list, season_range)
+		return self._season
+
+	def _show_range_context(self):
+		# (ranges, match on dotted title, text before the last season, use last match) in the order the original range filters ran
+		total_seasons = int(self.total_seasons)
+		dot_ranges, all_seasons = [], '1'
+		for count in range(2, total_seasons + 1):
+			dot_ranges.append(all_seasons + '.and.%s' % count)
+			all_seasons += '.%s' % count
+			dot_ranges.append(all_seasons)
+		ranges = [(tuple(dot_ranges), True, '.', True)]
+		for start, prefix in (('1', ''), ('01', ''), ('s1', 's'), ('s01', 's')):
+			if start == '01' or start == 's01': to_ranges = [start + '.to.%s%s' % (prefix, str(count).zfill(2)) for count in range(2, total_seasons + 1)]
+			else: to_ranges = [start + '.to.%s%s' % (prefix, count) for count in range(2, total_seasons + 1)]
+			ranges.append((tuple(to_ranges), True, 'to.' + prefix, False))
+			ranges.append((tuple(i.replace('to', 'thru') for i in to_ranges), True, 'thru.' + prefix, False))
+			ranges.append((tuple(i.replace('.to.', '-') for i in to_ranges), False, '-' + prefix, False))
+			ranges.append((tuple(i.replace('.to.', '~') for i in to_ranges), False, '~' + prefix, False))
+			if start == 's01': ranges.append((tuple(i.replace('.to.', '.') for i in to_ranges), False, '.s', False))
+		self._show_ranges = ranges
+		return ranges
+
+	def _info_context(self):
+		title = self._non_alnum.sub('.', self.title.lower().replace('&', 'and').replace("'", ""))
+		hdlr = self.hdlr.lower() if self.hdlr else None
+		episode_title = self._non_alnum.sub('.', self.episode_title.lower().replace('&', 'and').replace("'", "")) if self.episode_title else None
+		season_replace = None
+		if self.season:
+			season, season_fill = self.season, self.season.zfill(2)
+			season_replace = ('.s%s' % season, '.s%s' % season_fill, '.season.%s' % season, '.season%s' % season, '.season.%s' % season_fill, '.season%s' % season_fill, 'complete')
+		self._info = (title, hdlr, episode_title, season_replace)
+		return self._info
+
+	def check_title(self, release_title): # non pack file title check, single eps and movies
+		if self.years: # for movies only, scraper to pass None for episodes
+			if not any(value in release_title for value in self.years): return False
+		try:
+			hdlr, titles = self._single or self._single_context()
+			if not self.years and not hdlr.search(release_title): return False
+			release_title = self._year_parens.sub('\\2', release_title) #remove parenthesis only if surrounding a 4 digit date
+			t = hdlr.split(release_title, 1)[0].replace(self.year, '').replace('&', 'and')
+			if self.years:
+				for i in self.years: t = t.split(i)[0]
+			t = self._resolution.split(t, 1)[0]
+			if cleantitle.get(t) not in titles: return False
+			# filter to remove episode ranges that should be picked up in "filter_season_pack()" ex. "s01e01-08"
+			if self.hdlr != self.year and self._single_range.search(release_title): return False # equal for movies but not for shows
+			return True
+		except:
+			from resources.lib.fenom import log_utils
+			log_utils.error()
+			return False
+
+	def filter_season_pack(self, release_title):
+		try:
+			titles, split_list, string_list, season_range = self._season or self._season_context()
+			release_title = release_title_format(release_title)
+			t = release_title.replace('-', '.')
+			for i in split_list: t = t.split(i)[0]
+			if cleantitle.get(t) not in titles: return False, 0, 0
+			# remove single episodes ONLY (returned in single ep scrape), keep episode ranges as season packs
+			if self._season_episode.search(release_title): return False, 0, 0
+			# return and identify episode ranges
+			for regex in self._episode_ranges:
+				match = regex.search(release_title)
+				if match: return True, int(match.group(1)), int(match.group(2))
+			# remove season ranges - returned in showPack scrape, plus non conforming season and specific crap
+			rt = release_title.replace('-', '.')
+			if any(i in rt for i in string_list):
+				if season_range.search(release_title): return False, 0, 0
+				return True, 0, 0
+			return False, 0, 0
+		except:
+			from resources.lib.fenom import log_utils
+			log_utils.error()
+			return True
+
+	def filter_show_pack(self, release_title):
+		try:
+			if self._show is None: self._show = (self._pack_titles(), self._show_split + (self.year,))
+			titles, split_list = self._show
+			release_title = release_title_format(release_title)
+			t = release_title.replace('-', '.')
+			for i in split_list: t = t.split(i)[0]
+			if cleantitle.get(t) not in titles: return False, 0
+			# remove single episodes(returned in single ep scrape), season ranges that do not begin at 1 and single seasons(returned in seasonPack scrape)
+			if self._show_episode.search(release_title): return False, 0
+			if self._show_season_range.search(release_title): return False, 0
+			if self._show_single_season.search(release_title): return False, 0
+			if self._show_spelled_season.search(release_title): return False, 0
+			# from here down we don't filter out, we set and pass "last_season" it covers for the range and addon can filter it so the db will have full valid showPacks.
+			dot_release_title = release_title.replace('-', '.')
+			for ranges, dotted, separator, use_last in self._show_ranges or self._show_range_context():
+				text = dot_release_title if dotted else release_title
+				keys = [i for i in ranges if i in text]
+				if keys:
+					if use_last: return True, int(keys[-1].split('.')[-1])
+					return True, int(keys[0].split(separator)[1])
+			return True, self.total_seasons
+		except:
+			from resources.lib.fenom import log_utils
+			log_utils.error()
+
+	def info_from_name(self, release_title, pack=None):
+		try:
+			release_title = release_title.lower().replace('&', 'and').replace("'", "")
+			release_title = self._non_alnum.sub('.', release_title)
+			title, hdlr, episode_title, season_replace = self._info or self._info_context()
+			name_info = release_title.replace(title, '').replace(self.year, '')
+			if hdlr: name_info = name_info.replace(hdlr, '')
+			if episode_title: name_info = name_info.replace(episode_title, '')
+			if pack == 'season':
+				for i in season_replace: name_info = name_info.replace(i, '')
+			elif pack == 'show':
+				for i in self._show_split: name_info = name_info.replace(i, '')
+			return '.%s.' % name_info.lstrip('.').rstrip('.')
+		except:
+			from resources.lib.fenom import log_utils
+			log_utils.error()
+			return release_title
+
+def _alias_key(aliases):
+	try: return tuple(aliases_to_array(aliases))
+	except: return ()
+
+@lru_cache(maxsize=32)
+def _parser(title, aliases, year, hdlr=None, years=None, season=None, episode_title=None, total_seasons=None):
+	return ReleaseParser(title, aliases, year, hdlr, years, season, episode_title, total_seasons)
+
 class Thread(thread):
 	def __init__(self, target, *args):
 		self._target = target
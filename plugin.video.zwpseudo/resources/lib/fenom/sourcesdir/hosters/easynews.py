@@ -5,10 +5,9 @@
 
 from base64 import b64encode
 import re
-import requests
 from urllib.parse import quote
 from resources.lib.fenom.control import setting as getSetting
-from resources.lib.fenom import source_utils
+from resources.lib.fenom import sessions, source_utils
 
 SORT = {'s1': 'relevance', 's1d': '-', 's2': 'dsize', 's2d': '-', 's3': 'dtime', 's3d': '-'}
 SEARCH_PARAMS = {'st': 'adv', 'sb': 1, 'fex': 'm4v,3gp,mov,divx,xvid,wmv,avi,mpg,mpeg,mp4,mkv,avc,flv,webm', 'fty[]': 'VIDEO', 'spamf': 1, 'u': '1', 'gx': 1, 'pno': 1, 'sS': 3}
@@ -54,7 +53,7 @@ class source:
 			# log_utils.log('query = %s' % query)
 
 			url, params = self._translate_search(query)
-			results = requests.get(url, params=params, headers={'Authorization': auth}, timeout=20).json()
+			results = sessions.get(url, params=params, headers={'Authorization': auth}, timeout=20).json()
 			down_url = results.get('downURL')
 			dl_farm = results.get('dlFarm')
 			dl_port = results.get('dlPort')
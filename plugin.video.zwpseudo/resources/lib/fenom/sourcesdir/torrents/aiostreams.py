@@ -4,9 +4,9 @@
 """
 
 #from json import loads as jsloads
-import re, requests, queue
+import re
 #from resources.lib.fenom import client
-from resources.lib.fenom import source_utils
+from resources.lib.fenom import sessions, source_utils
 
 
 class source:
@@ -14,7 +14,6 @@ class source:
 	pack_capable = True
 	hasMovies = True
 	hasEpisodes = True
-	_queue = queue.SimpleQueue()
 	def __init__(self):
 		params = 'E2-AL4WGqDrj2M0MPdlx8ttOA%3D%3D-RpXaUvTCgu6DtWci%2FJWqVg5S4ZmxAALYaEbE80%2Br%2FdxY1eeZrJr7L7dIiWMeyB%2BzucFEILtMsP49bezJXGFsV%2FrN5S7Zpik1qcsaePN108DTqiskzTyNIblAawM7eAmh06I6SVs4VYm891OlzagAkeMEvchsYhrczGWfi6cEO3t6cO5QC2HRKPRe6GpoXZXXzDMqVeaDbRzmEJuyXGovv1MLxnEbGWjdQJggLU8EkmXtUo1j%2F7o21Y8%2FpVQdjxnipw6DwKxyIyQ255vXoQvXtaK8dqaLbHhbmaldpNfz9xIgJC5I1441OtlEd9ysqygbHg7W%2FYsLs%2F1E%2BJrZFqzss5bm28viMuT8WIWUOE8xHP%2B99%2FlKdADRMQtT0GdvxTyjq%2F2r8AsOuGvbBk1%2Ffo%2FcIN%2Fk9KDelLfiaOY4j7qCVjQzbkQKPLiCMMMJxu57xvpNlqwKzqbAp5UN8jXEQCwuu%2FXbpAGERFYLHINBAzdZZE9lV4PnFrATX5YYBwWHDawdI4XxOjJ4gtoMDUTdJYYzbtlL6clHzHIpKZ1s%2Bb0drhr3VGGKyxD%2F%2FaZVskykGRriwVM1gIHR00BK4kNTi6Gb4cnMrliy7SyaBKk2Xq3b29uB4uqusdpOCdI7vhBme1Jg'
 		self.language = ['en']
@@ -23,6 +22,14 @@ class source:
 		self.tvSearch_link = '/stream/series/%s:%s:%s.json'
 		self.min_seeders = 0
 
+	def _streams(self, url):
+		try:
+			results = sessions.get(url, timeout=7) # client.request(url, timeout=7)
+			return results.json()['streams'] # jsloads(results)['streams']
+		except:
+			source_utils.scraper_error('AIOSTREAMS')
+			return []
+
 	def sources(self, data, hostDict):
 		sources = []
 		if not data: return sources
@@ -43,12 +50,7 @@ class source:
 				url = '%s%s' % (self.base_link, self.movieSearch_link % imdb)
 				hdlr = year
 			# log_utils.log('url = %s' % url)
-			try:
-				results = requests.get(url, timeout=7) # client.request(url, timeout=7)
-				files = results.json()['streams'] # jsloads(results)['streams']
-			except: files = []
-			self._queue.put_nowait(files) # if seasons
-			self._queue.put_nowait(files) # if shows
+			files = sessions.request_context().fetch(url, self._streams, url) # shared with the season and show pack passes of this scrape
 			_INFO = re.compile(r'👤|💾.*')
 		except:
 			source_utils.scraper_error('AIOSTREAMS')
@@ -107,8 +109,7 @@ class source:
 			year = data['year']
 			season = data['season']
 			url = '%s%s' % (self.base_link, self.tvSearch_link % (imdb, season, data['episode']))
-#			results = requests.get(url, timeout=7) # client.request(url, timeout=7)
-			files = self._queue.get(timeout=8) # jsloads(results)['streams']
+			files = sessions.request_context().fetch(url, self._streams, url) # the single episode pass' response, sent from here when that pass was answered from providers.db
 			_INFO = re.compile(r'👤|💾.*')
 		except:
 			source_utils.scraper_error('AIOSTREAMS')
@@ -4,13 +4,12 @@
 """
 
 import base64
-import re, requests
+import re
 from urllib.parse import quote_plus, urlparse, parse_qsl
 from resources.lib.fenom import client
-from resources.lib.fenom import source_utils
+from resources.lib.fenom import sessions, source_utils
 
-session = requests.Session()
-session.headers = {'User-Agent': client.randomagent()}
+session = sessions.get_session('animetosho', headers={'User-Agent': client.randomagent()})
 
 
 class source:
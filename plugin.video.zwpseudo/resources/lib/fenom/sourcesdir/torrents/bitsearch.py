@@ -6,7 +6,7 @@
 import re
 from urllib.parse import quote_plus, unquote_plus
 from resources.lib.fenom import client
-from resources.lib.fenom import source_utils, log_utils
+from resources.lib.fenom import sessions, source_utils, log_utils
 from resources.lib.fenom.control import setting as getSetting
 
 
@@ -58,7 +58,7 @@ class source:
 
 	def get_sources(self, url):
 		try:
-			results = client.request(url, timeout=7)
+			results = sessions.get_text(url, timeout=7)
 			if not results or 'card search-result my-2' not in results: return
 			rows = client.parseDOM(results, 'li', attrs={'class': 'card search-result my-2'})
 		except:
@@ -147,7 +147,7 @@ class source:
 
 	def get_sources_packs(self, link):
 		try:
-			results = client.request(link, timeout=7)
+			results = sessions.get_text(link, timeout=7)
 			if not results or 'card search-result my-2' not in results: return
 			rows = client.parseDOM(results, 'li', attrs={'class': 'card search-result my-2'})
 		except:
@@ -4,9 +4,9 @@
 """
 
 #from json import loads as jsloads
-import re, requests, queue
+import re
 #from resources.lib.fenom import client
-from resources.lib.fenom import source_utils
+from resources.lib.fenom import sessions, source_utils
 
 
 class source:
@@ -14,7 +14,6 @@ class source:
 	pack_capable = True
 	hasMovies = True
 	hasEpisodes = True
-	_queue = queue.SimpleQueue()
 	def __init__(self):
 		params = '/eyJtYXhSZXN1bHRzUGVyUmVzb2x1dGlvbiI6MCwibWF4U2l6ZSI6MCwiY2FjaGVkT25seSI6ZmFsc2UsInJlbW92ZVRyYXNoIjp0cnVlLCJyZXN1bHRGb3JtYXQiOlsidGl0bGUiLCJtZXRhZGF0YSIsInNpemUiLCJsYW5ndWFnZXMiXSwiZGVicmlkU2VydmljZSI6InRvcnJlbnQiLCJkZWJyaWRBcGlLZXkiOiIiLCJkZWJyaWRTdHJlYW1Qcm94eVBhc3N3b3JkIjoiIiwibGFuZ3VhZ2VzIjp7InJlcXVpcmVkIjpbXSwiZXhjbHVkZSI6W10sInByZWZlcnJlZCI6W119LCJyZXNvbHV0aW9ucyI6e30sIm9wdGlvbnMiOnsicmVtb3ZlX3JhbmtzX3VuZGVyIjotMTAwMDAwMDAwMDAsImFsbG93X2VuZ2xpc2hfaW5fbGFuZ3VhZ2VzIjpmYWxzZSwicmVtb3ZlX3Vua25vd25fbGFuZ3VhZ2VzIjpmYWxzZX19'
 		self.language = ['en']
@@ -23,6 +22,14 @@ class source:
 		self.tvSearch_link = f"{params}/stream/series/%s:%s:%s.json"
 		self.min_seeders = 0
 
+	def _streams(self, url):
+		try:
+			results = sessions.get(url, timeout=7) # client.request(url, timeout=7)
+			return results.json()['streams'] # jsloads(results)['streams']
+		except:
+			source_utils.scraper_error('COMET')
+			return []
+
 	def sources(self, data, hostDict):
 		sources = []
 		if not data: return sources
@@ -43,12 +50,7 @@ class source:
 				url = '%s%s' % (self.base_link, self.movieSearch_link % imdb)
 				hdlr = year
 			# log_utils.log('url = %s' % url)
-			try:
-				results = requests.get(url, timeout=7) # client.request(url, timeout=7)
-				files = results.json()['streams'] # jsloads(results)['streams']
-			except: files = []
-			self._queue.put_nowait(files) # if seasons
-			self._queue.put_nowait(files) # if shows
+			files = sessions.request_context().fetch(url, self._streams, url) # shared with the season and show pack passes of this scrape
 			_INFO = re.compile(r'💾.*')
 			undesirables = source_utils.get_undesirables()
 			check_foreign_audio = source_utils.check_foreign_audio()
@@ -114,8 +116,7 @@ class source:
 			year = data['year']
 			season = data['season']
 			url = '%s%s' % (self.base_link, self.tvSearch_link % (imdb, season, data['episode']))
-#			results = requests.get(url, timeout=7) # client.request(url, timeout=7)
-			files = self._queue.get(timeout=8) # jsloads(results)['streams']
+			files = sessions.request_context().fetch(url, self._streams, url) # the single episode pass' response, sent from here when that pass was answered from providers.db
 			_INFO = re.compile(r'💾.*')
 			undesirables = source_utils.get_undesirables()
 			check_foreign_audio = source_utils.check_foreign_audio()
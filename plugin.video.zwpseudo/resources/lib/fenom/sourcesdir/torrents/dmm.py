@@ -4,8 +4,8 @@
 """
 
 import ctypes, math, random, time
-import re, requests, queue
-from resources.lib.fenom import source_utils
+import re
+from resources.lib.fenom import sessions, source_utils
 
 
 class source:
@@ -13,7 +13,6 @@ class source:
 	pack_capable = True
 	hasMovies = True
 	hasEpisodes = True
-	_queue = queue.SimpleQueue()
 	def __init__(self):
 		dmmProblemKey, solution = get_secret()
 		self.params = {'dmmProblemKey': dmmProblemKey, 'solution': solution}
@@ -23,8 +22,16 @@ class source:
 		self.tvSearch_link = '/api/torrents/tv?imdbId=%s&seasonNum=%s'
 		self.min_seeders = 0
 
+	def _results(self, url):
+		try:
+			results = sessions.get(url, params=self.params, timeout=5)
+			return results.json()['results']
+		except:
+			source_utils.scraper_error('DMM')
+			return []
+
 	def sources(self, data, hostDict):
-		self.sources, self.files = [], []
+		self.sources = []
 		if not data: return self.sources
 		self.sources_append = self.sources.append
 		try:
@@ -38,6 +45,7 @@ class source:
 			self.hdlr = 'S%02dE%02d' % (int(data['season']), int(data['episode'])) if 'tvshowtitle' in data else self.year
 			self.undesirables = source_utils.get_undesirables()
 			self.check_foreign_audio = source_utils.check_foreign_audio()
+			self.context = sessions.request_context() # the page threads have none of their own
 
 			threads = []
 			append = threads.append
@@ -47,22 +55,13 @@ class source:
 				append(i := source_utils.Thread(self.get_sources, url))
 				i.start()
 			[i.join() for i in threads]
-			self._queue.put_nowait(self.files)
-			self._queue.put_nowait(self.files)
 			return self.sources
 		except:
 			source_utils.scraper_error('DMM')
 			return self.sources
 
 	def get_sources(self, url):
-		try:
-			results = requests.get(url, params=self.params, timeout=5)
-			files = results.json()['results']
-			self.files += files
-		except:
-			source_utils.scraper_error('DMM')
-			return
-
+		files = self.context.fetch(url, self._results, url) # shared with the season and show pack passes of this scrape
 		for file in files:
 			try:
 				hash = file['hash']
@@ -109,22 +108,22 @@ class source:
 			self.season_xx = self.season_x.zfill(2)
 			self.undesirables = source_utils.get_undesirables()
 			self.check_foreign_audio = source_utils.check_foreign_audio()
+			self.context = sessions.request_context()
 
-			self.get_sources_packs(None)
+			threads = []
+			append = threads.append
+			for page in range(1, 3):
+				url = '%s%s&page=%s' % (self.base_link, self.tvSearch_link % (self.imdb, self.season_x), page)
+				append(i := source_utils.Thread(self.get_sources_packs, url))
+				i.start()
+			[i.join() for i in threads]
 			return self.sources
 		except:
 			source_utils.scraper_error('DMM')
 			return self.sources
 
 	def get_sources_packs(self, link):
-		try:
-			results = self._queue.get(timeout=6)
-			if not results: return
-			files = results
-		except:
-			source_utils.scraper_error('DMM')
-			return
-
+		files = self.context.fetch(link, self._results, link) # the single episode pass' pages, sent from here when that pass was answered from providers.db
 		for file in files:
 			try:
 				hash = file['hash']
@@ -175,7 +174,7 @@ class DMMCache:
 	def check_cache(self, unchecked_hashes_chunk, imdb): # DMM API Allows max 100 hashes per request.
 		data = {**self.params, 'imdbId': imdb, 'hashes': [i for i in unchecked_hashes_chunk if len(i) == 40]}
 		try:
-			results = requests.post(self.availability_check_link, json=data, timeout=6)
+			results = sessions.post(self.availability_check_link, json=data, timeout=6)
 			available_hashes = results.json()['available']
 			files = {file['hash']: file['files'] for file in available_hashes if 'hash' in file}
 		except: files = {}
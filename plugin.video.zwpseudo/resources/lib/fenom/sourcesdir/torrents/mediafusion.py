@@ -4,9 +4,9 @@
 """
 
 #from json import loads as jsloads
-import re, requests, queue
+import re
 #from fenom import client
-from resources.lib.fenom import source_utils
+from resources.lib.fenom import sessions, source_utils
 from resources.lib.fenom.control import setting as getSetting
 
 
@@ -15,7 +15,6 @@ class source:
 	pack_capable = True
 	hasMovies = True
 	hasEpisodes = True
-	_queue = queue.SimpleQueue()
 	def __init__(self):
 		self.language = ['en']
 		self.base_link = "https://mediafusion.elfhosted.com"
@@ -27,6 +26,14 @@ class source:
 		headers = {'encoded_user_data': 'eyJlbmFibGVfY2F0YWxvZ3MiOiBmYWxzZSwgIm1heF9zdHJlYW1zX3Blcl9yZXNvbHV0aW9uIjogOTksICJ0b3JyZW50X3NvcnRpbmdfcHJpb3JpdHkiOiBbXSwgImNlcnRpZmljYXRpb25fZmlsdGVyIjogWyJEaXNhYmxlIl0sICJudWRpdHlfZmlsdGVyIjogWyJEaXNhYmxlIl19'}
 		return headers
 
+	def _streams(self, url):
+		try:
+			results = sessions.get(url, headers=self._headers(), timeout=7) # client.request(url, timeout=7)
+			return results.json()['streams'] # jsloads(results)['streams']
+		except:
+			source_utils.scraper_error('MEDIAFUSION')
+			return []
+
 	def sources(self, data, hostDict):
 		sources = []
 		if not data: return sources
@@ -47,12 +54,7 @@ class source:
 				url = '%s%s' % (self.base_link, self.movieSearch_link % imdb)
 				hdlr = year
 			# log_utils.log('url = %s' % url)
-			try:
-				results = requests.get(url, headers=self._headers(), timeout=7) # client.request(url, timeout=7)
-				files = results.json()['streams'] # jsloads(results)['streams']
-			except: files = []
-			self._queue.put_nowait(files) # if seasons
-			self._queue.put_nowait(files) # if shows
+			files = sessions.request_context().fetch(url, self._streams, url) # shared with the season and show pack passes of this scrape
 			_INFO = re.compile(r'💾.*') # _INFO = re.compile(r'👤.*')
 			undesirables = source_utils.get_undesirables()
 			check_foreign_audio = source_utils.check_foreign_audio()
@@ -119,8 +121,7 @@ class source:
 			year = data['year']
 			season = data['season']
 			url = '%s%s' % (self.base_link, self.tvSearch_link % (imdb, season, data['episode']))
-#			results = requests.get(url, headers=self._headers(), timeout=7) # client.request(url, timeout=7)
-			files = self._queue.get(timeout=8) # jsloads(results)['streams']
+			files = sessions.request_context().fetch(url, self._streams, url) # the single episode pass' response, sent from here when that pass was answered from providers.db
 			_INFO = re.compile(r'💾.*') # _INFO = re.compile(r'👤.*')
 			undesirables = source_utils.get_undesirables()
 			check_foreign_audio = source_utils.check_foreign_audio()
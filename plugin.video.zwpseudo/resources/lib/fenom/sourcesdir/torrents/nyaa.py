@@ -7,7 +7,7 @@ import re
 from urllib.parse import quote_plus, unquote_plus
 from resources.lib.fenom import cleantitle
 from resources.lib.fenom import client
-from resources.lib.fenom import source_utils
+from resources.lib.fenom import sessions, source_utils
 
 
 class source:
@@ -54,7 +54,7 @@ class source:
 
 		for url in urls:
 			try:
-				results = client.request(url, timeout=5)
+				results = sessions.get_text(url, timeout=5)
 				if not results or 'magnet:' not in results: return sources
 				results = re.sub(r'[\n\t]', '', results)
 				tbody = client.parseDOM(results, 'tbody')
@@ -6,8 +6,7 @@
 from json import loads as jsloads
 import re
 from urllib.parse import quote
-from resources.lib.fenom import client
-from resources.lib.fenom import source_utils
+from resources.lib.fenom import sessions, source_utils
 
 SERVER_ERROR = ('521 Origin Down', 'No results returned', 'Connection Time-out', 'Database maintenance')
 
@@ -41,7 +40,7 @@ class source:
 			url = '%s%s' % (self.base_link, url)
 			# log_utils.log('url = %s' % url)
 
-			rjson = client.request(url, timeout=5)
+			rjson = sessions.get_text(url, timeout=5)
 			if not rjson or any(value in rjson for value in SERVER_ERROR): return sources
 			files = jsloads(rjson)
 			undesirables = source_utils.get_undesirables()
@@ -126,7 +125,7 @@ class source:
 
 	def get_sources_packs(self, link):
 		try:
-			rjson = client.request(link, timeout=5)
+			rjson = sessions.get_text(link, timeout=5)
 			if not rjson or any(value in rjson for value in SERVER_ERROR): return
 			files = jsloads(rjson)
 		except:
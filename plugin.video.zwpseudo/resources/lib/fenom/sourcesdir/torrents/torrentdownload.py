@@ -6,7 +6,7 @@
 import re
 from urllib.parse import quote_plus, unquote_plus
 from resources.lib.fenom import client
-from resources.lib.fenom import source_utils
+from resources.lib.fenom import sessions, source_utils
 
 
 class source:
@@ -55,7 +55,7 @@ class source:
 
 	def get_sources(self, url):
 		try:
-			results = client.request(url, timeout=5)
+			results = sessions.get_text(url, timeout=5)
 			if not results: return
 			rows = client.parseDOM(results, 'tr')
 		except:
@@ -140,7 +140,7 @@ class source:
 
 	def get_sources_packs(self, link):
 		try:
-			results = client.request(link, timeout=5)
+			results = sessions.get_text(link, timeout=5)
 			if not results: return
 			rows = client.parseDOM(results, 'tr')
 		except:
@@ -4,9 +4,9 @@
 """
 
 #from json import loads as jsloads
-import re, requests, queue
+import re
 #from resources.lib.fenom import client
-from resources.lib.fenom import source_utils
+from resources.lib.fenom import sessions, source_utils
 
 #SERVER_ERROR = ('521 Origin Down', 'No results returned', 'Connection Time-out', 'Database maintenance')
 headers = {'User-Agent': 'Mozilla/5.0'}
@@ -17,7 +17,6 @@ class source:
 	pack_capable = True
 	hasMovies = True
 	hasEpisodes = True
-	_queue = queue.SimpleQueue()
 	def __init__(self):
 		self.language = ['en']
 		self.base_link = "https://torrentio.strem.fun"
@@ -28,6 +27,14 @@ class source:
 		self.min_seeders = 0
 # Currently supports YTS(+), EZTV(+), RARBG(+), 1337x(+), ThePirateBay(+), KickassTorrents(+), TorrentGalaxy(+), HorribleSubs(+), NyaaSi(+), NyaaPantsu(+), Rutor(+), Comando(+), ComoEuBaixo(+), Lapumia(+), OndeBaixa(+), Torrent9(+).
 
+	def _streams(self, url):
+		try:
+			results = sessions.get(url, headers=headers, timeout=5) # client.request(url, timeout=5)
+			return results.json()['streams'] # jsloads(results)['streams']
+		except:
+			source_utils.scraper_error('TORRENTIO')
+			return []
+
 	def sources(self, data, hostDict):
 		sources = []
 		if not data: return sources
@@ -48,13 +55,7 @@ class source:
 				url = '%s%s' % (self.base_link, self.movieSearch_link % imdb)
 				hdlr = year
 			# log_utils.log('url = %s' % url)
-			try:
-				results = requests.get(url, headers=headers, timeout=5) # client.request(url, timeout=5)
-#				if not results or any(value in results for value in SERVER_ERROR): return sources
-				files = results.json()['streams'] # jsloads(results)['streams']
-			except: files = []
-			self._queue.put_nowait(files) # if seasons
-			self._queue.put_nowait(files) # if shows
+			files = sessions.request_context().fetch(url, self._streams, url) # shared with the season and show pack passes of this scrape
 			_INFO = re.compile(r'👤.*')
 			undesirables = source_utils.get_undesirables()
 			check_foreign_audio = source_utils.check_foreign_audio()
@@ -117,9 +118,7 @@ class source:
 			year = data['year']
 			season = data['season']
 			url = '%s%s' % (self.base_link, self.tvSearch_link % (imdb, season, data['episode']))
-#			results = requests.get(url, headers=headers, timeout=5) # client.request(url, timeout=5)
-#			if not results or any(value in results for value in SERVER_ERROR): return sources
-			files = self._queue.get(timeout=6) # jsloads(results)['streams']
+			files = sessions.request_context().fetch(url, self._streams, url) # the single episode pass' response, sent from here when that pass was answered from providers.db
 			_INFO = re.compile(r'👤.*')
 			undesirables = source_utils.get_undesirables()
 			check_foreign_audio = source_utils.check_foreign_audio()
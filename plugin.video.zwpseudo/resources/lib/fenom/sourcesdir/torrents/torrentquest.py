@@ -7,7 +7,7 @@ import re
 from urllib.parse import unquote_plus
 from resources.lib.fenom import cleantitle
 from resources.lib.fenom import client
-from resources.lib.fenom import source_utils
+from resources.lib.fenom import sessions, source_utils
 
 
 class source:
@@ -39,7 +39,7 @@ class source:
 			query = re.sub(r'[^A-Za-z0-9\s\.-]+', '', query)
 			url = '%s%s' % (self.base_link, self.search_link.format(query[0].lower(), cleantitle.geturl(query)))
 			# log_utils.log('url = %s' % url)
-			results = client.request(url, timeout=5)
+			results = sessions.get_text(url, timeout=5)
 			if not results or '<tbody' not in results: return sources
 			rows = client.parseDOM(results, 'tr')
 			undesirables = source_utils.get_undesirables()
@@ -136,7 +136,7 @@ class source:
 
 	def get_sources_packs(self, url):
 		try:
-			results = client.request(url, timeout=5)
+			results = sessions.get_text(url, timeout=5)
 			if not results or '<tbody' not in results: return
 			rows = client.parseDOM(results, 'tr')
 		except:
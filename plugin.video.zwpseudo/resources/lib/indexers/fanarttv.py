@@ -5,6 +5,7 @@
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
+from resources.lib.database.cache import max_stale
 from resources.lib.modules.control import setting as getSetting, apiLanguage, notification
 
 base_url = 'https://webservice.fanart.tv/v3/%s/%s'
@@ -68,6 +69,7 @@ class FanartTv:
 			return None
 		return ret_img
 
+	@max_stale(720)
 	def get_movie_art(self, imdb, tmdb):
 		try:
 			if not imdb and not tmdb: return None
@@ -128,6 +130,7 @@ class FanartTv:
 			from resources.lib.modules import log_utils
 			log_utils.error()
 
+	@max_stale(720)
 	def get_tvshow_art(self, tvdb):
 		if not tvdb: return None
 		art = self.get_request(base_url % ('tv', tvdb))
@@ -28,6 +28,7 @@ class TMDb:
 		self.mpa_country = mpaCountry()
 		self.enable_fanarttv = getSetting('enable.fanarttv') == 'true'
 
+	@cache.max_stale(168)
 	def get_request(self, url):
 		try:
 			try: response = session.get(url, timeout=20)
@@ -2,8 +2,10 @@
 	Venom Add-on
 """
 
+import atexit
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from json import dumps as jsdumps
+from json import dumps as jsdumps, loads as jsloads
 import re
 import requests
 from requests.adapters import HTTPAdapter
@@ -15,6 +17,7 @@ from resources.lib.database import cache, traktsync
 from resources.lib.modules import cleandate
 from resources.lib.modules import control
 from resources.lib.modules import log_utils
+from resources.lib.modules.request_scheduler import RequestScheduler, TokenBucket
 
 getLS = control.lang
 getSetting = control.setting
@@ -25,11 +28,21 @@ CLIENT_SECRET = getSetting('trakt.client_secret')
 REDIRECT_URI = 'urn:ietf:wg:oauth:2.0:oob'
 headers = {'Content-Type': 'application/json', 'trakt-api-key': V2_API_KEY, 'trakt-api-version': '2'}
 session = requests.Session()
-retries = Retry(total=4, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504, 520, 521, 522, 524, 530])
+retries = Retry(total=4, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504, 520, 521, 522, 524, 530]) # 429s are left to the scheduler
 session.mount('https://api.trakt.tv', HTTPAdapter(max_retries=retries, pool_maxsize=100))
+TRAKT_WORKERS = 6 # requests in flight per process
+THROTTLE_RETRIES = 3
+scheduler = RequestScheduler(session, { # Trakt allows 1000 GETs every 5 minutes and 1 POST/PUT/DELETE a second
+	'GET': TokenBucket(3, 100), # 300s * 3 + a burst of 100 never passes 1000 in any 5 minutes
+	'POST': TokenBucket(1, 1)}, TRAKT_WORKERS)
+MUTATION_BATCH = 100 # items per merged /sync/* POST
+MUTATION_EXPIRY = 604800 # seconds a queued write failing on server errors is retried for
+MUTATION_RETRY = 300 # seconds the service waits before flushing writes left queued by a failure again
+mutation_wake = 'zwpseudo.trakt_mutations' # home window property set when traktsync.db has writes queued for the service
 highlight_color = control.getHighlightColor()
 server_notification = getSetting('trakt.server.notifications') == 'true'
 service_syncInterval = int(getSetting('trakt.service.syncInterval')) if getSetting('trakt.service.syncInterval') else 15
+_watched_stamps = {} # trakt id: "last_watched_at|reset_at|plays" per show from the last watched shows syncTVShows() requested
 
 
 def getTrakt(url, post=None, extended=False, silent=False):
@@ -38,9 +51,13 @@ def getTrakt(url, post=None, extended=False, silent=False):
 		if post: post = jsdumps(post)
 		if getTraktCredentialsInfo(): headers['Authorization'] = 'Bearer %s' % getSetting('trakt.token')
 
-		if post: response = session.post(url, data=post, headers=headers, timeout=20)
-		else: response = session.get(url, headers=headers, timeout=20)
-		status_code = str(response.status_code)
+		for attempt in range(THROTTLE_RETRIES + 1):
+			if post: response = scheduler.send('POST', url, data=post, headers=headers, timeout=20)
+			else: response = scheduler.send('GET', url, headers=headers, timeout=20)
+			status_code = str(response.status_code)
+			if status_code != '429' or attempt == THROTTLE_RETRIES: break
+			if not silent and server_notification and not control.condVisibility('Player.HasVideo'): # 1000 get requests every 5 minutes, 1 post/put/delete every second
+				control.notification(title=32315, message='Trakt Throttling Applied, Sleeping for %s seconds' % response.headers.get('Retry-After', 1)) # message lang code 33674
 
 		# if status_code.startswith('5') or '<html' in response: # temp to log html maintenance response
 		# 	log_utils.log('status_code=%s' % status_code, __name__)
@@ -57,17 +74,76 @@ def getTrakt(url, post=None, extended=False, silent=False):
 #		elif status_code == '401': # Re-Auth token
 #			success = refresh_token()
 #			if success: return getTrakt(url, extended=extended, silent=silent)
-		elif status_code == '429':
-			if 'Retry-After' in response.headers: # API REQUESTS ARE BEING THROTTLED, INTRODUCE WAIT TIME (1000 get requests every 5 minutes, 1 post/put/delte every per second)
-				throttleTime = response.headers['Retry-After']
-				if not silent and server_notification and not control.condVisibility('Player.HasVideo'):
-					control.notification(title=32315, message='Trakt Throttling Applied, Sleeping for %s seconds' % throttleTime) # message lang code 33674
-				control.sleep((int(throttleTime) + 1) * 1000)
-				return getTrakt(url, extended=extended, silent=silent)
 		else: return None
 	except: log_utils.error('getTrakt Error: ')
 	return None
 
+def stats():
+	"""
+	Trakt requests sent, GETs coalesced with one in flight, 429s and seconds waited on the rate limits by this process.
+	"""
+	return scheduler.stats()
+
+def _log_stats():
+	counts = scheduler.stats()
+	if counts['requests']: log_utils.log('Trakt requests this run: %(requests)d sent, %(coalesced)d coalesced, %(throttled)d throttled, %(wait).1fs waited' % counts, level=log_utils.LOGDEBUG)
+
+atexit.register(_log_stats)
+
+def queue_mutations(mutations):
+	"""
+	Queues Trakt writes for the service to send, the caller applies its traktsync.db change right away instead of waiting on the POST limit.
+	:param mutations: [(method, endpoint, post)], post a /sync/* style payload or None for a DELETE
+	"""
+	traktsync.queue_mutations([(method, '/' + endpoint.lstrip('/'), jsdumps(post) if post else '') for method, endpoint, post in mutations])
+	control.homeWindow.setProperty(mutation_wake, 'true')
+
+def flush_mutations():
+	"""
+	Service side of queue_mutations(). Consecutive POSTs to the same endpoint are merged into one multi-item payload per MUTATION_BATCH
+	items, DELETEs have no batch form on Trakt and go one per resource, all paced by the scheduler and sent in the order queued, so a hide
+	then unhide of the same show is never reordered. A write failing on a 401, 429 or server error stays queued with the ones after it for
+	the next flush, a 401 first tries one token refresh. Other 4xx are dropped. Returns the number of writes left queued.
+	"""
+	queued = traktsync.fetch_mutations()
+	if not queued: return 0
+	headers['Authorization'] = 'Bearer %s' % getSetting('trakt.token')
+	batches, batch = [], None
+	for rowid, method, endpoint, post, date in queued:
+		endpoint = '/' + endpoint.lstrip('/') # rows queued before the endpoints were normalized
+		if method != 'POST':
+			batches.append((method, endpoint, None, [(rowid, date)]))
+			batch = None
+			continue
+		post = jsloads(post)
+		size = sum(len(v) for v in post.values() if isinstance(v, type([])))
+		if not batch or batch[0] != endpoint or batch[1] + size > MUTATION_BATCH:
+			batch = [endpoint, 0, {}, []]
+			batches.append(('POST', endpoint, batch[2], batch[3]))
+		batch[1] += size
+		for k, v in iter(post.items()): batch[2].setdefault(k, []).extend(v)
+		batch[3].append((rowid, date))
+	done, now, refreshed = [], int(time()), False
+	for method, endpoint, post, rows in batches:
+		for attempt in (0, 1):
+			try:
+				response = scheduler.send(method, urljoin(BASE_URL, endpoint), data=jsdumps(post) if post else None, headers=headers, timeout=20)
+				status_code = response.status_code
+			except: status_code = None
+			if status_code != 401 or refreshed: break
+			refreshed = True # the token expired since the service last checked it, one refresh per flush
+			if not refresh_token(): break
+			headers['Authorization'] = 'Bearer %s' % getSetting('trakt.token')
+		if status_code and status_code < 500 and status_code not in (401, 429):
+			if status_code >= 400: log_utils.log('Trakt %s %s dropped (%s): %s' % (method, endpoint, status_code, response.text), __name__, log_utils.LOGWARNING)
+			done.extend(rowid for rowid, date in rows)
+			continue
+		expired = [rowid for rowid, date in rows if now - date > MUTATION_EXPIRY]
+		done.extend(expired)
+		if len(expired) < len(rows): break # later writes wait behind this one
+	traktsync.delete_mutations(done)
+	return len(queued) - len(done)
+
 def error_handler(url, response, status_code, silent=False):
 	if status_code.startswith('5') or (response and isinstance(response, str) and '<html' in response) or not str(response): # covers Maintenance html responses ["Bad Gateway", "We're sorry, but something went wrong (500)"])
 		log_utils.log('Temporary Trakt Server Problem: %s:%s' % (status_code, response), level=log_utils.LOGINFO)
@@ -95,7 +171,7 @@ def refresh_token():
 		log_utils.log('Re-Authenticating Trakt Token', level=log_utils.LOGINFO)
 		oauth = urljoin(BASE_URL, '/oauth/token')
 		opost = {'client_id': V2_API_KEY, 'client_secret': CLIENT_SECRET, 'redirect_uri': REDIRECT_URI, 'grant_type': 'refresh_token', 'refresh_token': getSetting('trakt.refresh')}
-		response = session.post(url=oauth, data=jsdumps(opost), headers=headers, timeout=20)
+		response = scheduler.send('POST', oauth, data=jsdumps(opost), headers=headers, timeout=20)
 		status_code = str(response.status_code)
 
 		error_handler(oauth, response, status_code)
@@ -211,7 +287,7 @@ def like_list(list_owner, list_name, list_id):
 	try:
 		headers['Authorization'] = 'Bearer %s' % getSetting('trakt.token')
 		# resp_code = client._basic_request('https://api.trakt.tv/users/%s/lists/%s/like' % (list_owner, list_id), headers=headers, method='POST', ret_code=True)
-		resp_code = session.post('https://api.trakt.tv/users/%s/lists/%s/like' % (list_owner, list_id), headers=headers).status_code
+		resp_code = scheduler.send('POST', 'https://api.trakt.tv/users/%s/lists/%s/like' % (list_owner, list_id), headers=headers).status_code
 		if resp_code == 204:
 			control.notification(title=32315, message='Successfuly Liked list:  [COLOR %s]%s[/COLOR]' % (highlight_color, list_name))
 			sync_liked_lists()
@@ -223,7 +299,7 @@ def unlike_list(list_owner, list_name, list_id):
 	try:
 		headers['Authorization'] = 'Bearer %s' % getSetting('trakt.token')
 		# resp_code = client._basic_request('https://api.trakt.tv/users/%s/lists/%s/like' % (list_owner, list_id), headers=headers, method='DELETE', ret_code=True)
-		resp_code = session.delete('https://api.trakt.tv/users/%s/lists/%s/like' % (list_owner, list_id), headers=headers).status_code
+		resp_code = scheduler.send('DELETE', 'https://api.trakt.tv/users/%s/lists/%s/like' % (list_owner, list_id), headers=headers).status_code
 		if resp_code == 204:
 			control.notification(title=32315, message='Successfuly Unliked list:  [COLOR %s]%s[/COLOR]' % (highlight_color, list_name))
 			traktsync.delete_liked_list(list_id)
@@ -233,20 +309,11 @@ def unlike_list(list_owner, list_name, list_id):
 
 def remove_liked_lists(trakt_ids):
 	if not trakt_ids: return
-	success = None
 	try:
-		headers['Authorization'] = 'Bearer %s' % getSetting('trakt.token')
-		for id in trakt_ids:
-			list_owner = id.get('list_owner')
-			list_id = id.get('trakt_id')
-			list_name = id.get('list_name')
-			# resp_code = client._basic_request('https://api.trakt.tv/users/%s/lists/%s/like' % (list_owner, list_id), headers=headers, method='DELETE', ret_code=True)
-			resp_code = session.delete('https://api.trakt.tv/users/%s/lists/%s/like' % (list_owner, list_id), headers=headers).status_code
-			if resp_code == 204:
-				control.notification(title=32315, message='Successfuly Unliked list:  [COLOR %s]%s[/COLOR]' % (highlight_color, list_name))
-				traktsync.delete_liked_list(list_id)
-			else: control.notification(title=32315, message='Failed to UnLike list %s' % list_name)
-			control.sleep(1000)
+		queue_mutations([('DELETE', '/users/%s/lists/%s/like' % (id.get('list_owner'), id.get('trakt_id')), None) for id in trakt_ids])
+		for id in trakt_ids: traktsync.delete_liked_list(id.get('trakt_id'))
+		total_items = len(trakt_ids)
+		control.notification(title=32315, message='Successfuly Unliked %s list%s' % (total_items, 's' if total_items >1 else ''))
 		control.refresh()
 	except: log_utils.error()
 
@@ -300,46 +367,38 @@ def _rating(action, imdb=None, tvdb=None, season=None, episode=None):
 
 def unHideItems(tvdb_ids):
 	if not tvdb_ids: return
-	success = None
 	try:
 		sections = ['progress_watched', 'calendar']
-		ids = []
-		for id in tvdb_ids: ids.append({"ids": {"tvdb": int(id)}})
-		post = {"shows": ids}
-		for section in sections:
-			success = getTrakt('users/hidden/%s/remove' % section, post=post)
-			control.sleep(1000)
-		if success:
-			if 'plugin.video.zwpseudo' in control.infoLabel('Container.PluginName'): control.refresh()
-			traktsync.delete_hidden_progress(tvdb_ids)
-			control.trigger_widget_refresh()
-			return True
+		post = {"shows": [{"ids": {"tvdb": int(id)}} for id in tvdb_ids]}
+		queue_mutations([('POST', 'users/hidden/%s/remove' % section, post) for section in sections])
+		traktsync.delete_hidden_progress(tvdb_ids)
+		if 'plugin.video.zwpseudo' in control.infoLabel('Container.PluginName'): control.refresh()
+		control.trigger_widget_refresh()
+		return True
 	except:
 		log_utils.error()
 		return False
 
-def hideItems(tvdb_ids):
+def hideItems(tvdb_ids, titles=None):
+	"""
+	:param titles: {tvdb: tvshowtitle} for the rows added to hiddenProgress until the next hidden sync replaces them
+	"""
 	if not tvdb_ids: return
-	success = None
 	try:
 		sections = ['progress_watched', 'calendar']
-		ids = []
-		for id in tvdb_ids: ids.append({"ids": {"tvdb": int(id)}})
-		post = {"shows": ids}
-		for section in sections:
-			success = getTrakt('users/hidden/%s' % section, post=post)
-			control.sleep(1000)
-		if success:
-			if 'plugin.video.zwpseudo' in control.infoLabel('Container.PluginName'): control.refresh()
-			sync_hidden_progress(forced=True)
-			control.trigger_widget_refresh()
-			return True
+		post = {"shows": [{"ids": {"tvdb": int(id)}} for id in tvdb_ids]}
+		queue_mutations([('POST', 'users/hidden/%s' % section, post) for section in sections])
+		timestamp = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.000Z")
+		titles = titles or {}
+		traktsync.insert_hidden_progress([{'show': {'title': titles.get(id) or str(id), 'ids': {'tvdb': str(id)}}, 'hidden_at': timestamp} for id in tvdb_ids], new_sync=False)
+		if 'plugin.video.zwpseudo' in control.infoLabel('Container.PluginName'): control.refresh()
+		control.trigger_widget_refresh()
+		return True
 	except:
 		log_utils.error()
 		return False
 
 def hideItem(name, imdb=None, tvdb=None, season=None, episode=None, refresh=True):
-	success = None
 	try:
 		sections = ['progress_watched', 'calendar']
 		sections_display = [getLS(40072), getLS(40073), getLS(32181)]
@@ -348,56 +407,42 @@ def hideItem(name, imdb=None, tvdb=None, season=None, episode=None, refresh=True
 		control.busy()
 		if episode: post = {"shows": [{"ids": {"tvdb": tvdb}}]}
 		else: post = {"movies": [{"ids": {"imdb": imdb}}]}
-		if selection in (0, 1):
-			section = sections[selection]
-			success = getTrakt('users/hidden/%s' % section, post=post)
-		else:
-			for section in sections:
-				success = getTrakt('users/hidden/%s' % section, post=post)
-				control.sleep(1000)
-		if success:
-			control.hide()
-			sync_hidden_progress(forced=True)
-			if refresh: control.refresh()
-			control.trigger_widget_refresh()
-			if getSetting('trakt.general.notifications') == 'true':
-				control.notification(title=32315, message=getLS(33053) % (name, sections_display[selection]))
+		if selection in (0, 1): sections = [sections[selection]]
+		queue_mutations([('POST', 'users/hidden/%s' % section, post) for section in sections])
+		if episode and 'progress_watched' in sections:
+			timestamp = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.000Z")
+			traktsync.insert_hidden_progress([{'show': {'title': name, 'ids': {'imdb': imdb, 'tvdb': tvdb}}, 'hidden_at': timestamp}], new_sync=False)
+		control.hide()
+		if refresh: control.refresh()
+		control.trigger_widget_refresh()
+		if getSetting('trakt.general.notifications') == 'true':
+			control.notification(title=32315, message=getLS(33053) % (name, sections_display[selection]))
 	except: log_utils.error()
 
 def removeCollectionItems(type, id_list):
 	if not id_list: return
-	success = None
 	try:
-		ids = []
 		total_items = len(id_list)
-		for id in id_list: ids.append({"ids": {"trakt": id}})
-		post = {type: ids}
-		success = getTrakt('/sync/collection/remove', post=post)
-		if success:
-			# if 'plugin.video.zwpseudo' in control.infoLabel('Container.PluginName'): control.refresh()
-			control.trigger_widget_refresh()
-			if type == 'movies': traktsync.delete_collection_items(id_list, 'movies_collection')
-			else: traktsync.delete_collection_items(id_list, 'shows_collection')
-			if getSetting('trakt.general.notifications') == 'true':
-				control.notification(title='Trakt Collection Manager', message='Successfuly Removed %s Item%s' % (total_items, 's' if total_items >1 else ''))
+		queue_mutations([('POST', '/sync/collection/remove', {type: [{"ids": {"trakt": id}} for id in id_list]})])
+		if type == 'movies': traktsync.delete_collection_items(id_list, 'movies_collection')
+		else: traktsync.delete_collection_items(id_list, 'shows_collection')
+		# if 'plugin.video.zwpseudo' in control.infoLabel('Container.PluginName'): control.refresh()
+		control.trigger_widget_refresh()
+		if getSetting('trakt.general.notifications') == 'true':
+			control.notification(title='Trakt Collection Manager', message='Successfuly Removed %s Item%s' % (total_items, 's' if total_items >1 else ''))
 	except: log_utils.error()
 
 def removeWatchlistItems(type, id_list):
 	if not id_list: return
-	success = None
 	try:
-		ids = []
 		total_items = len(id_list)
-		for id in id_list: ids.append({"ids": {"trakt": id}})
-		post = {type: ids}
-		success = getTrakt('/sync/watchlist/remove', post=post)
-		if success:
-			# if 'plugin.video.zwpseudo' in control.infoLabel('Container.PluginName'): control.refresh()
-			control.trigger_widget_refresh()
-			if type == 'movies': traktsync.delete_watchList_items(id_list, 'movies_watchlist')
-			else: traktsync.delete_watchList_items(id_list, 'shows_watchlist')
-			if getSetting('trakt.general.notifications') == 'true':
-				control.notification(title='Trakt Watch List Manager', message='Successfuly Removed %s Item%s' % (total_items, 's' if total_items >1 else ''))
+		queue_mutations([('POST', '/sync/watchlist/remove', {type: [{"ids": {"trakt": id}} for id in id_list]})])
+		if type == 'movies': traktsync.delete_watchList_items(id_list, 'movies_watchlist')
+		else: traktsync.delete_watchList_items(id_list, 'shows_watchlist')
+		# if 'plugin.video.zwpseudo' in control.infoLabel('Container.PluginName'): control.refresh()
+		control.trigger_widget_refresh()
+		if getSetting('trakt.general.notifications') == 'true':
+			control.notification(title='Trakt Watch List Manager', message='Successfuly Removed %s Item%s' % (total_items, 's' if total_items >1 else ''))
 	except: log_utils.error()
 
 def manager(name, imdb=None, tvdb=None, season=None, episode=None, refresh=True, watched=None, unfinished=False):
@@ -767,6 +812,8 @@ def syncTVShows(): # sync all watched shows ex. [({'imdb': 'tt12571834', 'tvdb':
 		if not getTraktCredentialsInfo(): return
 		indicators = getTraktAsJson('/users/me/watched/shows?extended=full')
 		if not indicators: return None
+		_watched_stamps.clear()
+		_watched_stamps.update((str(i['show']['ids']['trakt']), '%s|%s|%s' % (i.get('last_watched_at'), i.get('reset_at'), i.get('plays'))) for i in indicators)
 # /shows/ID/progress/watched  endpoint only accepts imdb or trakt ID so write all ID's
 		indicators = [({'imdb': i['show']['ids']['imdb'], 'tvdb': str(i['show']['ids']['tvdb']), 'tmdb': str(i['show']['ids']['tmdb']), 'trakt': str(i['show']['ids']['trakt'])}, \
 							i['show']['aired_episodes'], sum([[(s['number'], e['number']) for e in s['episodes']] for s in i['seasons']], [])) for i in indicators]
@@ -848,22 +895,48 @@ def update_syncMovies(imdb, remove_id=False):
 		if remove_id: indicators.remove(imdb)
 		else: indicators.append(imdb)
 		key = traktsync._hash_function(syncMovies, ())
-		traktsync.cache_insert(key, repr(indicators))
+		traktsync.cache_insert(key, indicators)
 	except: log_utils.error()
 
-def service_syncSeasons(): # season indicators and counts for watched shows ex. [['1', '2', '3'], {1: {'total': 8, 'watched': 8, 'unwatched': 0}, 2: {'total': 10, 'watched': 10, 'unwatched': 0}}]
+def service_syncSeasons(forced=False): # season indicators and counts for watched shows ex. [['1', '2', '3'], {1: {'total': 8, 'watched': 8, 'unwatched': 0}, 2: {'total': 10, 'watched': 10, 'unwatched': 0}}]
+	"""
+	Only shows whose last_watched_at, reset_at or plays changed since their last season sync are requested again, all of them when forced
+	or when the watched shows were not just requested by syncTVShows() in this process.
+	"""
 	try:
 		indicators = traktsync.cache_existing(syncTVShows) # use cached data from service cachesyncTVShows() just written fresh
-		threads = []
-		for indicator in indicators:
-			imdb = indicator[0].get('imdb', '') if indicator[0].get('imdb') else ''
-			tvdb = str(indicator[0].get('tvdb', '')) if indicator[0].get('tvdb') else ''
-			trakt = str(indicator[0].get('trakt', '')) if indicator[0].get('trakt') else ''
-			threads.append(Thread(target=cachesyncSeasons, args=(imdb, tvdb, trakt))) # season indicators and counts for an entire show
-		[i.start() for i in threads]
-		[i.join() for i in threads]
+		stamps = dict(_watched_stamps)
+		snapshot = traktsync.fetch_watched_snapshot() if stamps and not forced else {}
+		futures = {}
+		with ThreadPoolExecutor(max_workers=TRAKT_WORKERS, thread_name_prefix='zwpseudo_trakt') as executor:
+			for indicator in indicators:
+				imdb = indicator[0].get('imdb', '') if indicator[0].get('imdb') else ''
+				tvdb = str(indicator[0].get('tvdb', '')) if indicator[0].get('tvdb') else ''
+				trakt = str(indicator[0].get('trakt', '')) if indicator[0].get('trakt') else ''
+				if trakt in snapshot and snapshot[trakt] == stamps.get(trakt): continue
+				futures[executor.submit(_service_syncSeason, imdb, tvdb, trakt)] = trakt # season indicators and counts for an entire show
+		synced = {trakt: stamps[trakt] for future, trakt in futures.items() if future.result() and trakt in stamps} # failed shows are retried next sync
+		traktsync.update_watched_snapshot(synced, removed=[i for i in snapshot if i not in stamps])
+		counts = scheduler.stats()
+		log_utils.log('Trakt season sync of %d changed of %d shows: %d requests sent, %d throttled, %.1fs waited on the rate limits' % (len(futures), len(indicators), counts['requests'], counts['throttled'], counts['wait']), level=log_utils.LOGDEBUG)
 	except: log_utils.error()
 
+def _service_syncSeason(imdb, tvdb, trakt):
+	"""
+	Returns True when the show's seasons were fetched and stored. Unlike cachesyncSeasons() a failed request does not fall back to the
+	cached value, so the show is left out of the watched snapshot and requested again next sync.
+	"""
+	try:
+		imdb = imdb or ''
+		tvdb = tvdb or ''
+		indicators = syncSeasons(imdb, tvdb, trakt=trakt)
+		if not indicators: return False
+		traktsync.cache_insert(traktsync._hash_function(syncSeasons, (imdb, tvdb)), indicators) # same key traktsync.get() stores it under
+		return True
+	except:
+		log_utils.error()
+		return False
+
 def markMovieAsWatched(imdb):
 	try:
 		result = getTraktAsJson('/sync/history', {"movies": [{"ids": {"imdb": imdb}}]})
@@ -880,7 +953,6 @@ def markTVShowAsWatched(imdb, tvdb):
 	try:
 		result = getTraktAsJson('/sync/history', {"shows": [{"ids": {"imdb": imdb, "tvdb": tvdb}}]})
 		if result['added']['episodes'] == 0 and tvdb: # sometimes trakt fails to mark because of imdb_id issues, check tvdb only as fallback if it fails
-			control.sleep(1000) # POST 1 call per sec rate-limit
 			result = getTraktAsJson('/sync/history', {"shows": [{"ids": {"tvdb": tvdb}}]})
 		return result['added']['episodes'] != 0
 	except: log_utils.error()
@@ -889,7 +961,6 @@ def markTVShowAsNotWatched(imdb, tvdb):
 	try:
 		result = getTraktAsJson('/sync/history/remove', {"shows": [{"ids": {"imdb": imdb, "tvdb": tvdb}}]})
 		if result['deleted']['episodes'] == 0 and tvdb: # sometimes trakt fails to mark because of imdb_id issues, check tvdb only as fallback if it fails
-			control.sleep(1000) # POST 1 call per sec rate-limit
 			result = getTraktAsJson('/sync/history/remove', {"shows": [{"ids": {"tvdb": tvdb}}]})
 		return result['deleted']['episodes'] != 0
 	except: log_utils.error()
@@ -899,7 +970,6 @@ def markSeasonAsWatched(imdb, tvdb, season):
 		season = int('%01d' % int(season))
 		result = getTraktAsJson('/sync/history', {"shows": [{"seasons": [{"number": season}], "ids": {"imdb": imdb, "tvdb": tvdb}}]})
 		if result['added']['episodes'] == 0 and tvdb: # sometimes trakt fails to mark because of imdb_id issues, check tvdb only as fallback if it fails
-			control.sleep(1000) # POST 1 call per sec rate-limit
 			result = getTraktAsJson('/sync/history', {"shows": [{"seasons": [{"number": season}], "ids": {"tvdb": tvdb}}]})
 		return result['added']['episodes'] != 0
 	except: log_utils.error()
@@ -909,7 +979,6 @@ def markSeasonAsNotWatched(imdb, tvdb, season):
 		season = int('%01d' % int(season))
 		result = getTraktAsJson('/sync/history/remove', {"shows": [{"seasons": [{"number": season}], "ids": {"imdb": imdb, "tvdb": tvdb}}]})
 		if result['deleted']['episodes'] == 0 and tvdb: # sometimes trakt fails to mark because of imdb_id issues, check tvdb only as fallback if it fails
-			control.sleep(1000) # POST 1 call per sec rate-limit
 			result = getTraktAsJson('/sync/history/remove', {"shows": [{"seasons": [{"number": season}], "ids": {"tvdb": tvdb}}]})
 		return result['deleted']['episodes'] != 0
 	except: log_utils.error()
@@ -942,7 +1011,6 @@ def markEpisodeAsNotWatched(imdb, tvdb, season, episode):
 		season, episode = int('%01d' % int(season)), int('%01d' % int(episode))
 		result = getTraktAsJson('/sync/history/remove', {"shows": [{"seasons": [{"episodes": [{"number": episode}], "number": season}], "ids": {"imdb": imdb, "tvdb": tvdb}}]})
 		if result['deleted']['episodes'] == 0 and tvdb: # sometimes trakt fails to mark because of imdb_id issues, check tvdb only as fallback if it fails
-			control.sleep(1000) # POST 1 call per sec rate-limit
 			result = getTraktAsJson('/sync/history/remove', {"shows": [{"seasons": [{"episodes": [{"number": episode}], "number": season}], "ids": {"tvdb": tvdb}}]})
 		return result['deleted']['episodes'] != 0
 	except: log_utils.error()
@@ -1137,7 +1205,7 @@ def scrobbleReset(imdb, tmdb=None, tvdb=None, season=None, episode=None, refresh
 		resume_info = traktsync.fetch_bookmarks(imdb, tmdb, tvdb, season, episode, ret_type='resume_info')
 		if resume_info == '0': return control.hide() # returns string "0" if no data in db 
 		headers['Authorization'] = 'Bearer %s' % getSetting('trakt.token')
-		success = session.delete('https://api.trakt.tv/sync/playback/%s' % resume_info[1], headers=headers).status_code == 204
+		success = scheduler.send('DELETE', 'https://api.trakt.tv/sync/playback/%s' % resume_info[1], headers=headers).status_code == 204
 		if content_type == 'movie':
 			items = [{'type': 'movie', 'movie': {'ids': {'imdb': imdb}}}]
 			label_string = resume_info[0]
@@ -1160,27 +1228,20 @@ def scrobbleReset(imdb, tmdb=None, tvdb=None, season=None, episode=None, refresh
 
 def scrobbleResetItems(imdb_ids, tvdb_dicts=None, refresh=True, widgetRefresh=False):
 	control.busy()
-	success = False
 	try:
 		content_type = 'movie' if not tvdb_dicts else 'episode'
+		timestamp = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.000Z")
+		resume_ids, items = [], []
 		if content_type == 'movie':
 			total_items = len(imdb_ids)
 			resume_info = traktsync.fetch_bookmarks(imdb='', ret_all=True, ret_type='movies')
 			for imdb in imdb_ids:
 				try:
-					resume_info_index = [resume_info.index(i) for i in resume_info if i['imdb'] == imdb][0]
-					resume_dict = resume_info[resume_info_index]
-					resume_id = resume_dict['resume_id']
-					headers['Authorization'] = 'Bearer %s' % getSetting('trakt.token')
-					success = session.delete('https://api.trakt.tv/sync/playback/%s' % resume_id, headers=headers).status_code == 204
-					items = [{'type': 'movie', 'movie': {'ids': {'imdb': imdb}}}]
-					timestamp = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.000Z")
-					items[0].update({'paused_at': timestamp})
-					if success:
-						traktsync.delete_bookmark(items)
-						log_utils.log('Successfuly Removed Trakt Playback Progress: movie title=%s  with resume_id=%s' % (resume_dict['title'], str(resume_id)), __name__, level=log_utils.LOGDEBUG)
-					control.sleep(1000)
-				except: log_utils.log('Failed to Remove Trakt Playback Progress: movie title=%s  with resume_id=%s' % (resume_dict['title'], str(resume_id)), __name__, level=log_utils.LOGDEBUG)
+					resume_dict = [i for i in resume_info if i['imdb'] == imdb][0]
+					resume_ids.append(resume_dict['resume_id'])
+					items.append({'type': 'movie', 'movie': {'ids': {'imdb': imdb}}, 'paused_at': timestamp})
+					log_utils.log('Removing Trakt Playback Progress: movie title=%s  with resume_id=%s' % (resume_dict['title'], str(resume_dict['resume_id'])), __name__, level=log_utils.LOGDEBUG)
+				except: log_utils.log('Failed to Remove Trakt Playback Progress: imdb=%s not in bookmarks' % imdb, __name__, level=log_utils.LOGDEBUG)
 		else:
 			total_items = len(tvdb_dicts)
 			resume_info = traktsync.fetch_bookmarks(imdb='', ret_all=True, ret_type='episodes')
@@ -1188,27 +1249,21 @@ def scrobbleResetItems(imdb_ids, tvdb_dicts=None, refresh=True, widgetRefresh=Fa
 				try:
 					imdb, tvdb = dict.get('imdb'), dict.get('tvdb')
 					season, episode = dict.get('season'), dict.get('episode')
-					resume_info_index = [resume_info.index(i) for i in resume_info if i['tvdb'] == tvdb][0]
-					resume_dict = resume_info[resume_info_index]
-					resume_id = resume_dict['resume_id']
-					headers['Authorization'] = 'Bearer %s' % getSetting('trakt.token')
-					success = session.delete('https://api.trakt.tv/sync/playback/%s' % resume_id, headers=headers).status_code == 204
-					items = [{'type': 'episode', 'episode': {'season': season, 'number': episode}, 'show': {'ids': {'imdb': imdb, 'tvdb': tvdb}}}]
-					timestamp = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.000Z")
-					items[0].update({'paused_at': timestamp})
-					if success:
-						traktsync.delete_bookmark(items)
-						label_string = resume_dict['tvshowtitle'] + ' - ' + 'S%02dE%02d' % (int(season), int(episode))
-						log_utils.log('Successfuly Removed Trakt Playback Progress:  tvshowtitle=%s  with resume_id=%s' % (label_string, str(resume_id)), __name__, level=log_utils.LOGDEBUG)
-					control.sleep(1000)
-				except: log_utils.log('Failed to Remove Trakt Playback Progress:  tvshowtitle=%s  with resume_id=%s' % (label_string, str(resume_id)), __name__, level=log_utils.LOGDEBUG)
+					resume_dict = [i for i in resume_info if i['tvdb'] == tvdb][0]
+					resume_ids.append(resume_dict['resume_id'])
+					items.append({'type': 'episode', 'episode': {'season': season, 'number': episode}, 'show': {'ids': {'imdb': imdb, 'tvdb': tvdb}}, 'paused_at': timestamp})
+					label_string = resume_dict['tvshowtitle'] + ' - ' + 'S%02dE%02d' % (int(season), int(episode))
+					log_utils.log('Removing Trakt Playback Progress:  tvshowtitle=%s  with resume_id=%s' % (label_string, str(resume_dict['resume_id'])), __name__, level=log_utils.LOGDEBUG)
+				except: log_utils.log('Failed to Remove Trakt Playback Progress:  tvdb=%s not in bookmarks' % dict.get('tvdb'), __name__, level=log_utils.LOGDEBUG)
+		if resume_ids:
+			queue_mutations([('DELETE', '/sync/playback/%s' % resume_id, None) for resume_id in resume_ids]) # no batch endpoint, the service sends one a second
+			traktsync.delete_bookmark(items)
 		control.hide()
-		if success:
-			if refresh: control.refresh()
-			if widgetRefresh: control.trigger_widget_refresh() # skinshortcuts handles the widget_refresh when plyback ends, but not a manual clear from Trakt Manager
-			control.notification(title='Trakt Playback Progress Manager', message='Successfuly Removed %s Item%s' % (total_items, 's' if total_items >1 else ''))
-			return True
-		else: return False
+		if not resume_ids: return False
+		if refresh: control.refresh()
+		if widgetRefresh: control.trigger_widget_refresh() # skinshortcuts handles the widget_refresh when plyback ends, but not a manual clear from Trakt Manager
+		control.notification(title='Trakt Playback Progress Manager', message='Successfuly Removed %s Item%s' % (total_items, 's' if total_items >1 else ''))
+		return True
 	except:
 		log_utils.error()
 		return False
@@ -1301,7 +1356,7 @@ def sync_watched(activities=None, forced=False): # writes to traktsync.db as of
 			log_utils.log('Forced - Trakt Watched Movie Sync Complete', __name__, log_utils.LOGDEBUG)
 			cachesyncTVShows()
 			control.sleep(5000)
-			service_syncSeasons() # syncs all watched shows season indicators and counts
+			service_syncSeasons(forced=True) # syncs all watched shows season indicators and counts
 			log_utils.log('Forced - Trakt Watched Shows Sync Complete', __name__, log_utils.LOGDEBUG)
 			traktsync.insert_syncSeasons_at()
 		else:
@@ -1319,7 +1374,7 @@ def sync_watched(activities=None, forced=False): # writes to traktsync.db as of
 								(str(min(db_last_syncTVShows, db_last_syncSeasons)), str(episodesWatchedActivity)), __name__, log_utils.LOGDEBUG)
 				cachesyncTVShows()
 				control.sleep(5000)
-				service_syncSeasons() # syncs all watched shows season indicators and counts
+				service_syncSeasons() # syncs season indicators and counts of the watched shows that changed
 				traktsync.insert_syncSeasons_at()
 	except: log_utils.error()
 
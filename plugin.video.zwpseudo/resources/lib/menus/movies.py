@@ -295,12 +295,16 @@ class Movies:
 			from resources.lib.modules import log_utils
 			log_utils.error()
 
+	def sort_order(self, type='movies'):
+		attribute = int(getSetting('sort.%s.type' % type))
+		reverse = int(getSetting('sort.%s.order' % type)) == 1
+		if attribute == 0: reverse = False # Sorting Order is not enabled when sort method is "Default"
+		return attribute, reverse
+
 	def sort(self, type='movies'):
 		try:
 			if not self.list: return
-			attribute = int(getSetting('sort.%s.type' % type))
-			reverse = int(getSetting('sort.%s.order' % type)) == 1
-			if attribute == 0: reverse = False # Sorting Order is not enabled when sort method is "Default"
+			attribute, reverse = self.sort_order(type)
 			if attribute > 0:
 				if attribute == 1:
 					try: self.list = sorted(self.list, key=lambda k: re.sub(r'(^the |^a |^an )', '', k['title'].lower()), reverse=reverse)
@@ -571,13 +575,9 @@ class Movies:
 		try:
 			q = dict(parse_qsl(urlsplit(url).query))
 			index = int(q['page']) - 1
-			self.list = traktsync.fetch_collection('movies_collection')
-			self.sort() # sort before local pagination
-			total_pages = 1
-			if getSetting('trakt.paginate.lists') == 'true' and self.list:
-				paginated_ids = [self.list[x:x + int(self.page_limit)] for x in range(0, len(self.list), int(self.page_limit))]
-				total_pages = len(paginated_ids)
-				self.list = paginated_ids[index]
+			limit = int(self.page_limit) if getSetting('trakt.paginate.lists') == 'true' else None
+			self.list, total = traktsync.fetch_list_page('movies_collection', *self.sort_order(), limit=limit, offset=index * (limit or 0)) # sorted and paged in sqlite
+			total_pages = -(-total // limit) if limit and total else 1
 			try:
 				if int(q['limit']) != len(self.list): raise Exception()
 				if int(q['page']) == total_pages: raise Exception()
@@ -599,13 +599,9 @@ class Movies:
 		try:
 			q = dict(parse_qsl(urlsplit(url).query))
 			index = int(q['page']) - 1
-			self.list = traktsync.fetch_watch_list('movies_watchlist')
-			self.sort(type='movies.watchlist') # sort before local pagination
-			total_pages = 1
-			if getSetting('trakt.paginate.lists') == 'true' and self.list:
-				paginated_ids = [self.list[x:x + int(self.page_limit)] for x in range(0, len(self.list), int(self.page_limit))]
-				total_pages = len(paginated_ids)
-				self.list = paginated_ids[index]
+			limit = int(self.page_limit) if getSetting('trakt.paginate.lists') == 'true' else None
+			self.list, total = traktsync.fetch_list_page('movies_watchlist', *self.sort_order('movies.watchlist'), limit=limit, offset=index * (limit or 0)) # sorted and paged in sqlite
+			total_pages = -(-total // limit) if limit and total else 1
 			try:
 				if int(q['limit']) != len(self.list): raise Exception()
 				if int(q['page']) == total_pages: raise Exception()
@@ -642,6 +638,7 @@ class Movies:
 		self.addDirectory(self.list, queue=True)
 		return self.list
 
+	@cache.max_stale(48)
 	def trakt_list(self, url, user):
 		self.list = []
 		if ',return' in url: url = url.split(',return')[0]
@@ -822,6 +819,7 @@ class Movies:
 				log_utils.error()
 		return self.list
 
+	@cache.max_stale(168)
 	def imdb_list(self, url, comingSoon=False, isRatinglink=False):
 		list = []
 		try:
@@ -1034,6 +1032,7 @@ class Movies:
 		yt_status = control.condVisibility('System.HasAddon(plugin.video.youtube)')
 		addonPoster, addonFanart, addonBanner = control.addonPoster(), control.addonFanart(), control.addonBanner()
 		indicators = getMovieIndicators() # refresh not needed now due to service sync
+		meta_handles = []
 		if play_mode == '1': playbackMenu = getLS(32063)
 		else: playbackMenu = getLS(32064)
 		if trakt.getTraktIndicatorsInfo(): watchedMenu, unwatchedMenu = getLS(32068), getLS(32069)
@@ -1083,8 +1082,9 @@ class Movies:
 								'clearart': meta.get('clearart', ''), 'discart': meta.get('discart', ''), 'keyart': meta.get('keyart', '')})
 				for k in ('metacache', 'poster2', 'poster3', 'fanart2', 'fanart3', 'banner2', 'banner3', 'trailer'): meta.pop(k, None)
 				meta.update({'poster': poster, 'fanart': fanart, 'banner': banner, 'clearlogo': clearlogo})
-				sysmeta, sysart = quote_plus(jsdumps(meta)), quote_plus(jsdumps(art))
-				url = '%s?action=play_Item&title=%s&year=%s&imdb=%s&tmdb=%s&meta=%s' % (sysaddon, systitle, year, imdb, tmdb, sysmeta)
+				sysmeta, sysart = cache.meta_handle('movie', self.lang, imdb, tmdb), quote_plus(jsdumps(art))
+				meta_handles.append((sysmeta, jsdumps(meta)))
+				url = '%s?action=play_Item&title=%s&year=%s&imdb=%s&tmdb=%s&meta_id=%s' % (sysaddon, systitle, year, imdb, tmdb, sysmeta)
 				sysurl = quote_plus(url)
 ####-Context Menu and Overlays-####
 				cm = []
@@ -1105,21 +1105,21 @@ class Movies:
 				if i.get('belongs_to_collection', ''):
 					cm.append(('Browse Collection', 'Container.Update(%s?action=collections&url=%s)' % (
 							sysaddon, quote_plus('https://api.themoviedb.org/3/collection/%s?api_key=%s&page=1,return' % (i['belongs_to_collection']['id'], self.tmdb_key)))))
-				cm.append((playbackMenu, 'RunPlugin(%s?action=alterSources&url=%s&meta=%s)' % (sysaddon, sysurl, sysmeta)))
-				cm.append((playlistManagerMenu, 'RunPlugin(%s?action=playlist_Manager&name=%s&url=%s&meta=%s&art=%s)' % (sysaddon, sysname, sysurl, sysmeta, sysart)))
+				cm.append((playbackMenu, 'RunPlugin(%s?action=alterSources&url=%s&meta_id=%s)' % (sysaddon, sysurl, sysmeta)))
+				cm.append((playlistManagerMenu, 'RunPlugin(%s?action=playlist_Manager&name=%s&url=%s&meta_id=%s&art=%s)' % (sysaddon, sysname, sysurl, sysmeta, sysart)))
 				cm.append((queueMenu, 'RunPlugin(%s?action=playlist_QueueItem&name=%s)' % (sysaddon, sysname)))
 				cm.append((addToLibrary, 'RunPlugin(%s?action=library_movieToLibrary&name=%s&title=%s&year=%s&imdb=%s&tmdb=%s)' % (sysaddon, sysname, systitle, year, imdb, tmdb)))
 				if not rescrape_useDefault:
-					cm.append(('Rescrape Options...', 'PlayMedia(%s?action=rescrapeMenu&title=%s&year=%s&imdb=%s&tmdb=%s&meta=%s)' % (sysaddon, systitle, year, imdb, tmdb, sysmeta)))
+					cm.append(('Rescrape Options...', 'PlayMedia(%s?action=rescrapeMenu&title=%s&year=%s&imdb=%s&tmdb=%s&meta_id=%s)' % (sysaddon, systitle, year, imdb, tmdb, sysmeta)))
 				else:
 					if rescrape_method == '0':
-						cm.append((rescrapeMenu, 'PlayMedia(%s?action=play_Item&title=%s&year=%s&imdb=%s&tmdb=%s&meta=%s&rescrape=true&select=1)' % (sysaddon, systitle, year, imdb, tmdb, sysmeta)))
+						cm.append((rescrapeMenu, 'PlayMedia(%s?action=play_Item&title=%s&year=%s&imdb=%s&tmdb=%s&meta_id=%s&rescrape=true&select=1)' % (sysaddon, systitle, year, imdb, tmdb, sysmeta)))
 					if rescrape_method == '1':
-						cm.append((rescrapeMenu, 'PlayMedia(%s?action=play_Item&title=%s&year=%s&imdb=%s&tmdb=%s&meta=%s&rescrape=true&select=0)' % (sysaddon, systitle, year, imdb, tmdb, sysmeta)))
+						cm.append((rescrapeMenu, 'PlayMedia(%s?action=play_Item&title=%s&year=%s&imdb=%s&tmdb=%s&meta_id=%s&rescrape=true&select=0)' % (sysaddon, systitle, year, imdb, tmdb, sysmeta)))
 					if rescrape_method == '2':
-						cm.append((rescrapeMenu, 'PlayMedia(%s?action=play_Item&title=%s&year=%s&imdb=%s&tmdb=%s&meta=%s&rescrape=true&all_providers=true&select=1)' % (sysaddon, systitle, year, imdb, tmdb, sysmeta)))
+						cm.append((rescrapeMenu, 'PlayMedia(%s?action=play_Item&title=%s&year=%s&imdb=%s&tmdb=%s&meta_id=%s&rescrape=true&all_providers=true&select=1)' % (sysaddon, systitle, year, imdb, tmdb, sysmeta)))
 					if rescrape_method == '3':
-						cm.append((rescrapeMenu, 'PlayMedia(%s?action=play_Item&title=%s&year=%s&imdb=%s&tmdb=%s&meta=%s&rescrape=true&all_providers=true&select=0)' % (sysaddon, systitle, year, imdb, tmdb, sysmeta)))
+						cm.append((rescrapeMenu, 'PlayMedia(%s?action=play_Item&title=%s&year=%s&imdb=%s&tmdb=%s&meta_id=%s&rescrape=true&all_providers=true&select=0)' % (sysaddon, systitle, year, imdb, tmdb, sysmeta)))
 				cm.append((clearSourcesMenu, 'RunPlugin(%s?action=cache_clearSources)' % sysaddon))
 				cm.append(('[COLOR red][B]zwpseudo Settings[/B][/COLOR]', 'RunPlugin(%s?action=tools_openSettings)' % sysaddon))
 				if not is_widget: cm.append(('[B]Exit Movies List[/B]', 'Container.Refresh(%s?action=movieNavigator)' % sysaddon))
@@ -1144,6 +1144,7 @@ class Movies:
 			except:
 				from resources.lib.modules import log_utils
 				log_utils.error()
+		cache.meta_store(meta_handles)
 		if next:
 			try:
 				if not items: raise Exception()
@@ -299,6 +299,7 @@ class Navigator:
 		self.addDirectoryItem(getLS(32613) % self.highlight_color, 'cache_clearCache', 'tools.png', 'DefaultAddonService.png', isFolder=False)
 		self.addDirectoryItem(getLS(32614) % self.highlight_color, 'cache_clearSearch', 'tools.png', 'DefaultAddonService.png', isFolder=False)
 		self.addDirectoryItem(getLS(32615) % self.highlight_color, 'cache_clearBookmarks', 'tools.png', 'DefaultAddonService.png', isFolder=False)
+		self.addDirectoryItem('View Cache Hit Rates', 'cache_viewStats', 'tools.png', 'DefaultAddonProgram.png', isFolder=False)
 		self.endDirectory()
 
 	def library(self): # -- Library - 9
@@ -330,6 +331,7 @@ class Navigator:
 	def downloads(self):
 		movie_downloads = getSetting('movie.download.path')
 		tv_downloads = getSetting('tv.download.path')
+		self.addDirectoryItem('Download Queue', 'downloadManager', 'downloads.png', 'DefaultFolder.png')
 		if len(control.listDir(movie_downloads)[0]) > 0: self.addDirectoryItem(32001, movie_downloads, 'movies.png', 'DefaultMovies.png', isAction=False)
 		if len(control.listDir(tv_downloads)[0]) > 0: self.addDirectoryItem(32002, tv_downloads, 'tvshows.png', 'DefaultTVShows.png', isAction=False)
 		self.endDirectory()
@@ -37,10 +37,10 @@ class Seasons:
 	def get(self, tvshowtitle, year, imdb, tmdb, tvdb, art, idx=True, create_directory=True): # may need to add a cache duration over-ride param to pass
 		self.list = []
 		if idx:
-			self.list = cache.get(self.tmdb_list, 720, tvshowtitle, imdb, tmdb, tvdb, art)
+			self.list = self.tmdb_list(tvshowtitle, imdb, tmdb, tvdb, art, 720)
 			if self.list:
 				if not self.list[0]['status'].lower() in ('ended', 'canceled'):
-					self.list = cache.get(self.tmdb_list, 96, tvshowtitle, imdb, tmdb, tvdb, art)
+					self.list = self.tmdb_list(tvshowtitle, imdb, tmdb, tvdb, art, 96)
 			if self.list is None: self.list = []
 			if create_directory: self.seasonDirectory(self.list)
 			return self.list
@@ -48,7 +48,7 @@ class Seasons:
 			self.list = self.tmdb_list(tvshowtitle, imdb, tmdb, tvdb, art)
 			return self.list
 
-	def tmdb_list(self, tvshowtitle, imdb, tmdb, tvdb, art):
+	def tmdb_list(self, tvshowtitle, imdb, tmdb, tvdb, art, duration=None): # duration caches the TMDb show seasons only, the art is merged fresh each call
 #### -- Missing id's lookup -- ####
 		trakt_ids = None
 		if (not tmdb or not tvdb) and imdb: trakt_ids = trakt.IdLookup('imdb', imdb, 'show')
@@ -67,7 +67,8 @@ class Seasons:
 				return log_utils.log('tvshowtitle: (%s) missing tmdb_id: ids={imdb: %s, tmdb: %s, tvdb: %s}' % (tvshowtitle, imdb, tmdb, tvdb), __name__, log_utils.LOGDEBUG) # log TMDb shows that they do not have
 #################################
 		list = []
-		showSeasons = tmdb_indexer().get_showSeasons_meta(tmdb)
+		if duration: showSeasons = cache.get(tmdb_indexer().get_showSeasons_meta, duration, tmdb)
+		else: showSeasons = tmdb_indexer().get_showSeasons_meta(tmdb)
 		if not showSeasons: return
 		if not showSeasons.get('imdb'): showSeasons['imdb'] = imdb # use value passed from tvshows super_info() due to extensive ID lookups
 		if not showSeasons.get('tvdb'): showSeasons['tvdb'] = tvdb
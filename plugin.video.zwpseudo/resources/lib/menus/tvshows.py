@@ -235,7 +235,7 @@ class TVshows:
 				success = trakt.unHideItems(chosen_unhide)
 				if success: control.notification(title='Trakt Hidden Progress Manager', message='Successfully Unhid %s Item%s' % (len(chosen_unhide), 's' if len(chosen_unhide) >1 else ''))
 			if chosen_hide:
-				success = trakt.hideItems(chosen_hide)
+				success = trakt.hideItems(chosen_hide, titles={i['tvdb']: i['tvshowtitle'] for i in self.list})
 				if success: control.notification(title='Trakt Hidden Progress Manager', message='Successfully Hid %s Item%s' % (len(chosen_hide), 's' if len(chosen_hide) >1 else ''))
 		except:
 			from resources.lib.modules import log_utils
@@ -282,12 +282,16 @@ class TVshows:
 			log_utils.error()
 			control.hide()
 
+	def sort_order(self, type='shows'):
+		attribute = int(getSetting('sort.%s.type' % type))
+		reverse = int(getSetting('sort.%s.order' % type)) == 1
+		if attribute == 0: reverse = False # Sorting Order is not enabled when sort method is "Default"
+		return attribute, reverse
+
 	def sort(self, type='shows'):
 		try:
 			if not self.list: return
-			attribute = int(getSetting('sort.%s.type' % type))
-			reverse = int(getSetting('sort.%s.order' % type)) == 1
-			if attribute == 0: reverse = False # Sorting Order is not enabled when sort method is "Default"
+			attribute, reverse = self.sort_order(type)
 			if attribute > 0:
 				if attribute == 1:
 					try: self.list = sorted(self.list, key=lambda k: re.sub(r'(^the |^a |^an )', '', k['tvshowtitle'].lower()), reverse=reverse)
@@ -569,13 +573,9 @@ class TVshows:
 		try:
 			q = dict(parse_qsl(urlsplit(url).query))
 			index = int(q['page']) - 1
-			self.list = traktsync.fetch_collection('shows_collection')
-			self.sort() # sort before local pagination
-			total_pages = 1
-			if getSetting('trakt.paginate.lists') == 'true' and self.list:
-				paginated_ids = [self.list[x:x + int(self.page_limit)] for x in range(0, len(self.list), int(self.page_limit))]
-				total_pages = len(paginated_ids)
-				self.list = paginated_ids[index]
+			limit = int(self.page_limit) if getSetting('trakt.paginate.lists') == 'true' else None
+			self.list, total = traktsync.fetch_list_page('shows_collection', *self.sort_order(), limit=limit, offset=index * (limit or 0)) # sorted and paged in sqlite
+			total_pages = -(-total // limit) if limit and total else 1
 			try:
 				if int(q['limit']) != len(self.list): raise Exception()
 				if int(q['page']) == total_pages: raise Exception()
@@ -597,13 +597,9 @@ class TVshows:
 		try:
 			q = dict(parse_qsl(urlsplit(url).query))
 			index = int(q['page']) - 1
-			self.list = traktsync.fetch_watch_list('shows_watchlist')
-			self.sort(type='shows.watchlist') # sort before local pagination
-			total_pages = 1
-			if getSetting('trakt.paginate.lists') == 'true' and self.list:
-				paginated_ids = [self.list[x:x + int(self.page_limit)] for x in range(0, len(self.list), int(self.page_limit))]
-				total_pages = len(paginated_ids)
-				self.list = paginated_ids[index]
+			limit = int(self.page_limit) if getSetting('trakt.paginate.lists') == 'true' else None
+			self.list, total = traktsync.fetch_list_page('shows_watchlist', *self.sort_order('shows.watchlist'), limit=limit, offset=index * (limit or 0)) # sorted and paged in sqlite
+			total_pages = -(-total // limit) if limit and total else 1
 			try:
 				if int(q['limit']) != len(self.list): raise Exception()
 				if int(q['page']) == total_pages: raise Exception()
@@ -640,6 +636,7 @@ class TVshows:
 		self.addDirectory(self.list, queue=True)
 		return self.list
 
+	@cache.max_stale(48)
 	def trakt_list(self, url, user):
 		self.list = []
 		if ',return' in url: url = url.split(',return')[0]
@@ -828,6 +825,7 @@ class TVshows:
 				log_utils.error()
 		return self.list
 
+	@cache.max_stale(168)
 	def imdb_list(self, url, isRatinglink=False):
 		list = [] ; items = [] ; dupes = []
 		try:
@@ -77,6 +77,8 @@ cacheFile = joinPath(dataPath, 'cache.db')
 traktSyncFile = joinPath(dataPath, 'traktsync.db')
 fanarttvCacheFile = joinPath(dataPath, 'fanarttv.db')
 watchedcacheFile = joinPath(dataPath, 'watched.db')
+cloudindexFile = joinPath(dataPath, 'cloudindex.db')
+downloadsFile = joinPath(dataPath, 'downloads.db')
 trailer = 'plugin://plugin.video.youtube/play/?video_id=%s'
 KODI_VERSION = int(xbmc.getInfoLabel("System.BuildVersion")[:2])
 
@@ -84,20 +86,58 @@ def getKodiVersion(full=False):
 	if full: return xbmc.getInfoLabel("System.BuildVersion")
 	else: return int(xbmc.getInfoLabel("System.BuildVersion")[:2])
 
-def setting(id, fallback=None):
+_settings_snapshot = {'generation': None, 'settings': None} # parsed once per invoker, or once per reuselanguageinvoker lifetime
+
+def settings_generation():
+	return homeWindow.getProperty('zwpseudo_settings.generation')
+
+def bump_settings_generation(): # service bumps on a setting change so every invoker drops its snapshot
+	try: generation = int(settings_generation() or 0) + 1
+	except: generation = 1
+	homeWindow.setProperty('zwpseudo_settings.generation', str(generation))
+	return generation
+
+def settings_snapshot():
+	generation = settings_generation()
+	snapshot = _settings_snapshot
+	if snapshot['settings'] is not None and snapshot['generation'] == generation: return snapshot['settings']
 	try: settings_dict = jsloads(homeWindow.getProperty('zwpseudo_settings'))
 	except: settings_dict = make_settings_dict()
+	if settings_dict is None: return None
+	snapshot['generation'], snapshot['settings'] = generation, settings_dict
+	return settings_dict
+
+def setting(id, fallback=None):
+	settings_dict = settings_snapshot()
 	if settings_dict is None: settings_dict = settings_fallback(id)
 	value = settings_dict.get(id, '')
 	if fallback is None: return value
 	if value == '': return fallback
 	return value
 
+def setting_bool(id, fallback=False):
+	value = setting(id)
+	if value == '': return fallback
+	return value == 'true'
+
+def setting_int(id, fallback=0):
+	try: return int(setting(id))
+	except: return fallback
+
+def setting_float(id, fallback=0.0):
+	try: return float(setting(id))
+	except: return fallback
+
+def setting_color(id):
+	try: return getColor(setting(id))
+	except: return getColor('0')
+
 def settings_fallback(id):
 	return {id: xbmcaddon.Addon().getSetting(id)}
 
 def setSetting(id, value):
 	xbmcaddon.Addon().setSetting(id, value)
+	if _settings_snapshot['settings'] is not None: _settings_snapshot['settings'][id] = value # keep this invoker's snapshot current until the service re-parses
 
 def make_settings_dict(): # service runs upon a setting change
 	try:
@@ -342,10 +382,10 @@ def getColor(n):
 	return color
 
 def getHighlightColor():
-	return getColor(setting('highlight.color'))
+	return setting_color('highlight.color')
 
 def getSourceHighlightColor():
-	return getColor(setting('sources.highlight.color'))
+	return setting_color('sources.highlight.color')
 
 def getMenuEnabled(menu_title):
 	is_enabled = setting(menu_title).strip()
@@ -368,11 +408,6 @@ def refresh_libPath(): # for zwpseudo global CM library actions
 	homeWindow.setProperty('zwpseudo.movieLib.path', transPath(setting('library.movie')))
 	homeWindow.setProperty('zwpseudo.tvLib.path', transPath(setting('library.tv')))
 
-def refresh_debugReversed(): # called from service "onSettingsChanged" to clear zwpseudo.log if setting to reverse has been changed
-	if homeWindow.getProperty('zwpseudo.debug.reversed') != setting('debug.reversed'):
-		homeWindow.setProperty('zwpseudo.debug.reversed', setting('debug.reversed'))
-		execute('RunPlugin(plugin://plugin.video.zwpseudo/?action=tools_clearLogFile)')
-
 def metadataClean(metadata):
 	if not metadata: return metadata
 	allowed = ('genre', 'country', 'year', 'episode', 'season', 'sortepisode', 'sortseason', 'episodeguide', 'showlink',
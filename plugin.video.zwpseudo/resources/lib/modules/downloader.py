@@ -6,10 +6,21 @@ import os
 import re
 from urllib.parse import parse_qsl, urlparse
 from urllib.request import urlopen, Request
+from threading import Event, Lock, Thread
+from resources.lib.database import downloads
 from resources.lib.modules import control
 from resources.lib.modules import log_utils
+from resources.lib.modules.request_scheduler import TokenBucket
 # from resources.lib.modules.source_utils import supported_video_extensions
 
+SEGMENTS = 4 # Range connections per job unless downloads.segments says otherwise
+MIN_SEGMENT = 16 * 1024 * 1024 # smaller files get fewer connections
+CHUNK = 256 * 1024
+MAX_JOBS = 2 # jobs downloading at once, the rest wait queued
+RETRIES = 10 # consecutive errors before a segment, and its job, fails
+SAVE_EVERY = 1 # seconds between segment progress writes and pause/cancel checks
+download_wake = 'zwpseudo.download_wake' # home window property set when a job is queued or resumed
+
 
 def download(name, image, url, meta_name=None):
 # def download(name, image, url, meta_name=None, selected_source): # future for re-write, pack file support
@@ -73,18 +84,52 @@ def download(name, image, url, meta_name=None):
 		if not ext in ('3gp', 'divx', 'xvid', 'm4v', 'mp4', 'mpeg', 'mpg', 'm2ts', 'mov', 'mkv', 'flv', 'avi', 'wmv', 'webm'):
 			ext = 'mp4'
 		dest = os.path.join(dest, transname + '.' + ext)
-		doDownload(url, dest, name, image, headers)
+		enqueue(url, dest, name, image, headers)
 	except: log_utils.error()
 
-def getResponse(url, headers, size):
+def enqueue(url, dest, title, image, headers):
+	file = dest.rsplit(os.sep, 1)[-1]
+	try: size, ranged = probe(url, headers)
+	except:
+		log_utils.error()
+		control.hide()
+		return control.okDialog(title, dest + 'Download failed: No response from server')
+	if size < 1:
+		control.hide()
+		return control.okDialog(title, file + 'Unknown filesize: Unable to download')
+	gb = str(round(size / float(1073741824), 2))
+	control.hide()
+	if control.yesnoDialog('File Size: %sGB' % gb, 'Path: %s' % dest, 'Continue with download?', '[B]Confirm Download[/B]', 'Confirm', 'Cancel') == 1: return
+	if downloads.add_job(url, headers, dest, title, image, size) is None: return control.okDialog(title, file + 'Download failed: Unable to queue')
+	control.homeWindow.setProperty(download_wake, 'true')
+	control.notification(title=title, message='Download queued%s' % ('' if ranged else ' (single connection)'), icon=image)
+
+def probe(url, headers):
+	"""
+	Returns (size, ranged) for url, ranged True when the server answers a Range request with 206.
+	"""
+	resp = getResponse(url, headers, 0, 0, raise_error=True)
+	try:
+		if resp.status == 206: return int(resp.headers['Content-Range'].rsplit('/', 1)[1]), True
+		try: size = int(resp.headers['Content-Length'])
+		except: size = 0
+		try: ranged = 'bytes' in resp.headers['Accept-Ranges'].lower()
+		except: ranged = False
+		return size, ranged
+	finally: resp.close()
+
+def getResponse(url, headers, start, end=None, raise_error=False):
+	"""
+	:param end: last byte wanted, inclusive, None for the rest of the file
+	"""
 	try:
-		if size > 0:
-			size = int(size)
-			headers['Range'] = 'bytes=%d-' % size
+		headers = dict(headers)
+		if start > 0 or end is not None: headers['Range'] = 'bytes=%d-%s' % (start, '' if end is None else end)
 		req = Request(url, headers=headers)
 		resp = urlopen(req, timeout=30)
 		return resp
 	except:
+		if raise_error: raise
 		log_utils.error()
 		return None
 
@@ -105,92 +150,192 @@ def done(title, dest, downloaded):
 	except:
 		log_utils.error()
 
-def doDownload(url, dest, title, image, headers):
-	file = dest.rsplit(os.sep, 1)[-1]
-	resp = getResponse(url, headers, 0)
-	if not resp:
-		control.hide()
-		return control.okDialog(title, dest + 'Download failed: No response from server')
-	try: content = int(resp.headers['Content-Length'])
-	except: content = 0
-	try: resumable = 'bytes' in resp.headers['Accept-Ranges'].lower()
-	except: resumable = False
-	if content < 1:
-		control.hide()
-		return control.okDialog(title, file + 'Unknown filesize: Unable to download')
-	size = 1024 * 1024
-	gb = str(round(content / float(1073741824), 2))
-	if content < size:
-		size = content
-	total = 0
-	notify = 0
-	errors = 0
-	count = 0
-	resume = 0
-	sleep = 0
-	control.hide()
-	if control.yesnoDialog('File Size: %sGB' % gb, 'Path: %s' % dest, 'Continue with download?', '[B]Confirm Download[/B]', 'Confirm', 'Cancel') == 1: return
-	f = control.openFile(dest, 'w')
-	chunk = None
-	chunks = []
-	while True:
-		downloaded = total
-		for c in chunks: downloaded += len(c)
-		percent = min(100 * downloaded / content, 100)
-		if percent >= notify:
-			control.notification(title=str(int(percent)) + '%', message=title, icon=image, time=3000) #xbmcgui.Dialog().notification() auto scroll time to complete supercedes allowed "time=" to run in Silvo, removed dest
-			notify += 20
-		chunk = None
-		error = False
-		try:
-			chunk  = resp.read(size)
-			if not chunk:
-				if percent < 99: error = True
-				else:
-					while len(chunks) > 0:
-						c = chunks.pop(0)
-						f.write(c)
-						del c
-					f.close()
-					log_utils.log('Download Complete: %s' % (dest), level=log_utils.LOGDEBUG)
-					return done(title, dest, True)
+def split(size, count):
+	"""
+	Returns [[start, end, done]] byte ranges for count connections, no range smaller than MIN_SEGMENT.
+	"""
+	count = max(1, min(count, size // MIN_SEGMENT))
+	step = -(-size // count)
+	return [[start, min(start + step, size) - 1, 0] for start in range(0, size, step)]
+
+def preallocate(dest, size):
+	with open(dest, 'r+b' if os.path.exists(dest) else 'wb') as f:
+		f.truncate(size)
+		if hasattr(os, 'posix_fallocate'): os.posix_fallocate(f.fileno(), 0, size) # fails now on a full disk, not hours in
+
+
+class DownloadManager:
+	"""
+	Runs in the service. Queued jobs from downloads.db are fetched MAX_JOBS at a time, each over downloads.segments Range connections
+	writing into a preallocated file. Segment progress is saved every SAVE_EVERY seconds so a paused, failed or interrupted job
+	resumes where it stopped, and while a video plays all downloads share the downloads.playback.limit cap.
+	"""
+	def __init__(self):
+		self.active = {} # job id: Thread
+		self.lock = Lock()
+		self.playing = False
+		self.cap, self.cap_rate = None, 0
+
+	def run(self):
+		downloads.requeue_running()
+		self.start_queued()
+		while not control.monitor.waitForAbort(1):
+			self.playing = control.condVisibility('Player.HasVideo')
+			rate = int(control.setting('downloads.playback.limit') or 0) * 131072 # Mbit/s to bytes
+			if rate != self.cap_rate: self.cap, self.cap_rate = TokenBucket(rate, CHUNK) if rate else None, rate
+			if control.homeWindow.getProperty(download_wake) != 'true': continue
+			control.homeWindow.clearProperty(download_wake)
+			self.start_queued()
+
+	def start_queued(self):
+		with self.lock:
+			for job in downloads.fetch_jobs(downloads.QUEUED):
+				if len(self.active) >= MAX_JOBS: break
+				if job['id'] in self.active or not downloads.set_status(job['id'], downloads.RUNNING, where=(downloads.QUEUED,)): continue
+				self.active[job['id']] = thread = Thread(target=self._job, args=(job,), name='zwpseudo_download', daemon=True)
+				thread.start()
+
+	def _job(self, job):
+		try: status, error = self._download(job)
 		except Exception as e:
-			log_utils.error('DOWNNLOADER EXCEPTION: ')
-			error = True
-			sleep = 10
-			errno = 0
-			if hasattr(e, 'errno'):
-				errno = e.errno
-			if errno == 10035: # 'A non-blocking socket operation could not be completed immediately'
-				pass
-			if errno == 10054: #'An existing connection was forcibly closed by the remote host'
-				errors = 10 #force resume
-				sleep  = 30
-			if errno == 11001: # 'getaddrinfo failed'
-				errors = 10 #force resume
-				sleep  = 30
-		if chunk:
-			errors = 0
-			chunks.append(chunk)
-			if len(chunks) > 5:
-				c = chunks.pop(0)
-				f.write(c)
-				total += len(c)
-				del c
-		if error:
-			errors += 1
-			count  += 1
-			control.sleep(sleep*1000)
-		if (resumable and errors > 0) or errors >= 10:
-			if (not resumable and resume >= 50) or resume >= 500: # Give up!
-				log_utils.log('Download Canceled: %s - too many errors whilst downloading' % (dest), level=log_utils.LOGWARNING)
-				return done(title, dest, False)
-			resume += 1
-			errors  = 0
-			if resumable:
-				chunks  = []
-				resp = getResponse(url, headers, total) # create new response
-			else: pass
+			log_utils.error('DOWNLOADER EXCEPTION: ')
+			status, error = downloads.FAILED, str(e)
+		finished = False
+		if status == downloads.CANCELLED: discard(job)
+		elif status in (downloads.DONE, downloads.FAILED): finished = downloads.set_status(job['id'], status, error, where=(downloads.RUNNING,))
+		with self.lock: self.active.pop(job['id'], None)
+		if control.monitor.abortRequested(): return
+		self.start_queued()
+		if finished: # the dialog waits on the user, the next job does not
+			log_utils.log('Download %s: %s %s' % (status, job['dest'], error), level=log_utils.LOGDEBUG)
+			done(job['title'], job['dest'], status == downloads.DONE)
+
+	def _download(self, job):
+		"""
+		Returns (status, error) once the segments are written, the job is paused or cancelled from the queue, or a segment gave up.
+		"""
+		id, dest, local = job['id'], job['dest'], '://' not in job['dest']
+		segments = downloads.fetch_segments(id)
+		if segments and not (local and os.path.exists(dest)): segments = [[start, end, 0] for start, end, done in segments] # remote files are rewritten
+		if not segments:
+			size, ranged = probe(job['url'], job['headers'])
+			if size < 1: return downloads.FAILED, 'Unknown filesize'
+			count = int(control.setting('downloads.segments') or SEGMENTS) if ranged and local else 1
+			segments = split(size, count)
+			downloads.store_segments(id, segments, replace=True)
+			downloads.set_status(id, downloads.RUNNING, size=size)
+			job['size'] = size
+		if local: preallocate(dest, job['size'])
+		stop, exited, errors = Event(), Event(), []
+		workers = [Thread(target=self._segment, args=(job, segment, local, stop, exited, errors), name='zwpseudo_segment', daemon=True) for segment in segments if segment[0] + segment[2] <= segment[1]]
+		for worker in workers: worker.start()
+		status, notify = None, 0
+		while any(worker.is_alive() for worker in workers):
+			exited.wait(SAVE_EVERY) ; exited.clear()
+			if control.monitor.abortRequested(): stop.set()
+			downloads.store_segments(id, segments)
+			percent = 100 * sum(i[2] for i in segments) // job['size']
+			if percent >= notify:
+				control.notification(title=str(percent) + '%', message=job['title'], icon=job['image'], time=3000)
+				notify = percent - percent % 20 + 20
+			if stop.is_set(): continue
+			status = downloads.job_status(id)
+			if status in (downloads.PAUSED, downloads.CANCELLED) or errors: stop.set()
+		for worker in workers: worker.join()
+		downloads.store_segments(id, segments)
+		if status in (downloads.PAUSED, downloads.CANCELLED): return status, ''
+		if errors: return downloads.FAILED, errors[0]
+		if control.monitor.abortRequested(): return downloads.RUNNING, '' # requeued on the next start
+		return downloads.DONE, ''
+
+	def _segment(self, job, segment, local, stop, exited, errors):
+		try: self._fetch(job, segment, local, stop, errors)
+		finally: exited.set()
+
+	def _fetch(self, job, segment, local, stop, errors):
+		start, end = segment[0], segment[1]
+		attempts = 0
+		while segment[0] + segment[2] <= end and not stop.is_set():
+			offset = start + segment[2]
+			f = resp = None
+			try:
+				resp = getResponse(job['url'], job['headers'], offset, end if local else None, raise_error=True)
+				if offset and resp.status != 206:
+					if start: raise IOError('Server ignored the Range request')
+					offset = segment[2] = 0 # a single connection to a server without ranges starts over
+				if local:
+					f = open(job['dest'], 'r+b')
+					f.seek(offset)
+				else: f = control.openFile(job['dest'], 'w')
+				while not stop.is_set():
+					chunk = resp.read(min(CHUNK, end + 1 - start - segment[2]))
+					if not chunk: break
+					if self.playing and self.cap: self.cap.take(len(chunk))
+					f.write(chunk)
+					segment[2] += len(chunk)
+					attempts = 0
+				if not stop.is_set() and segment[0] + segment[2] <= end: raise IOError('Connection closed at %d of %d' % (start + segment[2], end + 1))
+			except Exception as e:
+				attempts += 1
+				log_utils.log('Download segment %d-%d error %d/%d: %s' % (start, end, attempts, RETRIES, e), level=log_utils.LOGWARNING)
+				if attempts >= RETRIES:
+					errors.append(str(e))
+					return
+				if not local: segment[2] = 0 # remote files are reopened and rewritten
+				stop.wait(min(30, 2 ** attempts))
+			finally:
+				if f: f.close()
+				if resp: resp.close()
+
+
+def discard(job):
+	try:
+		if control.existsPath(job['dest']): control.deleteFile(job['dest'])
+	except: log_utils.error()
+	downloads.remove_job(job['id'])
+
+def manager():
+	"""
+	Lists the download queue, selecting a job offers pause/resume/cancel.
+	"""
+	from sys import argv
+	syshandle = int(argv[1])
+	colors = {downloads.QUEUED: 'skyblue', downloads.RUNNING: 'forestgreen', downloads.PAUSED: 'orange', downloads.FAILED: 'red', downloads.DONE: 'gray'}
+	for job in downloads.fetch_jobs():
+		try:
+			percent = 100 * job['downloaded'] // job['size'] if job['size'] else 0
+			label = '[COLOR %s][%s][/COLOR] %s | %d%% of %.2f GB' % (colors.get(job['status'], 'white'), job['status'].upper(), job['title'], percent, job['size'] / 1073741824.0)
+			if job['error']: label += ' [I](%s)[/I]' % job['error']
+			item = control.item(label=label, offscreen=True)
+			item.setArt({'icon': job['image'], 'thumb': job['image'], 'poster': job['image'], 'fanart': control.addonFanart()})
+			control.addItem(handle=syshandle, url='plugin://plugin.video.zwpseudo/?action=downloadJob&id=%s' % job['id'], listitem=item, isFolder=False)
+		except: log_utils.error()
+	control.content(syshandle, '')
+	control.directory(syshandle, cacheToDisc=False)
+
+def manage_job(id):
+	try:
+		id = int(id)
+		status = downloads.job_status(id)
+		if status is None: return control.refresh()
+		actions = []
+		if status in (downloads.QUEUED, downloads.RUNNING): actions.append(('Pause', 'pause'))
+		if status in (downloads.PAUSED, downloads.FAILED): actions.append(('Resume', 'resume'))
+		if status == downloads.DONE: actions.append(('Remove from list', 'remove'))
+		else: actions.append(('Cancel and delete file', 'cancel'))
+		select = control.selectDialog([i[0] for i in actions], heading='Download Queue')
+		if select == -1: return
+		action = actions[select][1]
+		if action == 'pause': downloads.set_status(id, downloads.PAUSED, where=(downloads.QUEUED, downloads.RUNNING))
+		elif action == 'resume':
+			if downloads.set_status(id, downloads.QUEUED, where=(downloads.PAUSED, downloads.FAILED)): control.homeWindow.setProperty(download_wake, 'true')
+		elif action == 'cancel':
+			job = [i for i in downloads.fetch_jobs() if i['id'] == id]
+			if downloads.set_status(id, downloads.CANCELLED, where=(downloads.QUEUED, downloads.PAUSED, downloads.FAILED)): discard(job[0]) # else the running job cleans up
+			else: downloads.set_status(id, downloads.CANCELLED, where=(downloads.RUNNING,))
+		elif action == 'remove': downloads.remove_job(id) # keeps the file
+		control.refresh()
+	except: log_utils.error()
 
 def titlecase(string): # not perfect but close enough
 	try:
@@ -2,12 +2,15 @@
 	Venom Add-on
 """
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
+from itertools import chain
 from json import loads as jsloads
 import re
 import _strptime # import _strptime to workaround python 2 bug with threads
 from sys import exit as sysexit
 from sqlite3 import dbapi2 as database
+from time import time
 from urllib.parse import parse_qsl, quote_plus
 from resources.lib.modules import control
 from resources.lib.modules import cleandate
@@ -20,6 +23,8 @@ service_update = control.setting('library.service.update') == 'true'
 service_notification = control.setting('library.service.notification') == 'true'
 general_notification = control.setting('library.general.notification') == 'true'
 tmdb_session_id = control.setting('tmdb.session_id')
+LIB_WORKERS = 4 # shows whose TMDb seasons and episodes are fetched at the same time by libepisodes().update()
+RESUME_WINDOW = 86400 # seconds an interrupted libepisodes().update() run is resumed from its checkpoint instead of starting over
 
 
 class lib_tools:
@@ -630,115 +635,175 @@ class libepisodes:
 		# if control.setting('library.service.update') == 'false': control.notification(message=32106)
 		contains = lib_tools().ckKodiSources()
 		if not contains: return control.notification(message=32107)
-		try:
-			items, season, episode = [], [], []
-			show = [control.joinPath(self.library_folder, i) for i in control.listDir(self.library_folder)[0]]
-			if show == []:
-				return control.notification(message=32108)
-			for s in show:
-				try: season += [control.joinPath(s, i) for i in control.listDir(s)[0]]
-				except: pass
-			for s in season:
-				try: episode.append([control.joinPath(s, i) for i in control.listDir(s)[1] if i.endswith('.strm')][-1])
-				except: pass
-			for file in episode:
-				try:
-					file = control.openFile(file)
-					read = file.read()
-					file.close()
-					if not read.startswith(('plugin://plugin.video.themoviedb.helper', 'plugin://plugin.video.zwpseudo')): continue
-					params = dict(parse_qsl(read.replace('?','')))
-					try: tvshowtitle = params['tvshowtitle']
-					except:
-						try: tvshowtitle = params['show'] # this does not appear written to .strm files...?
-						except: tvshowtitle = None
-					if not tvshowtitle: continue
-					year, imdb, tvdb, tmdb = params['year'], params.get('imdb', ''), params.get('tvdb', ''), params.get('tmdb', '')
-					items.append({'tvshowtitle': tvshowtitle, 'year': year, 'imdb': imdb, 'tmdb': tmdb, 'tvdb': tvdb})
-				except: pass
-			items = [i for x, i in enumerate(items) if i not in items[x + 1:]]
-			if len(items) == 0: return
-		except:
-			log_utils.error()
-			return
-		try:
-			lib = control.jsonrpc('{"jsonrpc": "2.0", "method": "VideoLibrary.GetTVShows", "params": {"properties": ["imdbnumber", "title", "year"]}, "id": 1 }')
-			# lib = control.jsonrpc('{"jsonrpc": "2.0", "method": "VideoLibrary.GetTVShows", "params": {"filter":{"or": [{"field": "year", "operator": "is", "value": "%s"}, {"field": "year", "operator": "is", "value": "%s"}, {"field": "year", "operator": "is", "value": "%s"}]}, "properties": ["imdbnumber", "title", "year"]}, "id": 1}' % (year, str(int(year)+1), str(int(year)-1)))
-			lib = jsloads(lib)['result']['tvshows']
-		except:
-			log_utils.error()
-			return
-		if service_notification and not control.condVisibility('Window.IsVisible(infodialog)') and not control.condVisibility('Player.HasVideo'):
-			control.notification(message=32553)
 		try:
 			control.makeFile(control.dataPath)
 			dbcon = database.connect(control.libcacheFile)
 			dbcur = dbcon.cursor()
 			dbcur.execute('''CREATE TABLE IF NOT EXISTS tvshows (id TEXT, items TEXT, UNIQUE(id));''')
+			dbcur.execute('''CREATE TABLE IF NOT EXISTS service (setting TEXT, value TEXT, UNIQUE(setting));''')
+			dbcur.execute('''CREATE TABLE IF NOT EXISTS show_index (folder TEXT, tvshowtitle TEXT, year TEXT, imdb TEXT, tmdb TEXT, tvdb TEXT, last_season INTEGER,
+								last_episode INTEGER, UNIQUE(folder));''')
+			dbcur.execute('''CREATE TABLE IF NOT EXISTS update_progress (run TEXT, folder TEXT, UNIQUE(run, folder));''')
 			dbcur.connection.commit()
-			from resources.lib.menus import seasons as seasonsX
-			from resources.lib.menus import episodes as episodesX
 		except:
 			log_utils.error()
 			try: dbcur.close() ; dbcon.close()
 			except: pass
 			return
-		files_added = 0
+		try: self.update_shows(dbcur, contains)
+		finally:
+			try: dbcur.close() ; dbcon.close()
+			except: pass
+
+	def show_index(self, dbcur):
+		"""
+		Returns {folder: item} for the zwpseudo show folders in the library, None when the library folder is empty. A folder's ids are read from one of its .strm files the first
+		time it is seen and kept in show_index, later runs only list the library folder. Folders no longer on disk are dropped.
+		"""
+		folders = control.listDir(self.library_folder)[0]
+		if not folders: return None
+		known = {i[0]: i[1:] for i in dbcur.execute('''SELECT folder, tvshowtitle, year, imdb, tmdb, tvdb, last_season, last_episode FROM show_index''').fetchall()}
+		on_disk = set(folders)
+		for folder in [i for i in known if i not in on_disk]: dbcur.execute('''DELETE FROM show_index WHERE folder=?''', (folder,))
+		index = {}
+		for folder in folders:
+			if folder in known:
+				tvshowtitle, year, imdb, tmdb, tvdb, last_season, last_episode = known[folder]
+				if tvshowtitle: index[folder] = {'tvshowtitle': tvshowtitle, 'year': year, 'imdb': imdb, 'tmdb': tmdb, 'tvdb': tvdb,
+												'last': (last_season, last_episode) if last_season is not None else None}
+				continue
+			item = self.read_show(control.joinPath(self.library_folder, folder))
+			if item is None: continue # no .strm yet, looked at again next run
+			dbcur.execute('''INSERT OR REPLACE INTO show_index Values (?, ?, ?, ?, ?, ?, NULL, NULL)''', (folder, item.get('tvshowtitle', ''), item.get('year', ''),
+							item.get('imdb', ''), item.get('tmdb', ''), item.get('tvdb', '')))
+			if item: index[folder] = dict(item, last=None)
+		dbcur.connection.commit()
+		return index
+
+	def read_show(self, path):
+		"""
+		Returns the show's ids from its most recent season's .strm file, {} when the folder was not written by zwpseudo and None when it has no .strm.
+		"""
+		try: seasons = sorted(control.listDir(path)[0], reverse=True)
+		except: return None
+		for season in seasons:
+			try: strm = [i for i in control.listDir(control.joinPath(path, season))[1] if i.endswith('.strm')]
+			except: continue
+			if not strm: continue
+			try:
+				file = control.openFile(control.joinPath(path, season, strm[-1]))
+				read = file.read()
+				file.close()
+			except: continue
+			if not read.startswith(('plugin://plugin.video.themoviedb.helper', 'plugin://plugin.video.zwpseudo')): return {}
+			params = dict(parse_qsl(read.replace('?','')))
+			tvshowtitle = params.get('tvshowtitle') or params.get('show')
+			if not tvshowtitle: return {}
+			return {'tvshowtitle': tvshowtitle, 'year': params.get('year', ''), 'imdb': params.get('imdb', ''), 'tmdb': params.get('tmdb', ''), 'tvdb': params.get('tvdb', '')}
+		return None
+
+	def kodi_library(self):
+		"""
+		Two JSON-RPC calls for the whole library, returns (shows matched by id, shows matched by (title, year), {tvshowid: (season, episode)} of the last episode).
+		"""
+		lib = jsloads(control.jsonrpc('{"jsonrpc": "2.0", "method": "VideoLibrary.GetTVShows", "params": {"properties": ["imdbnumber", "title", "year"]}, "id": 1 }'))['result'].get('tvshows', [])
+		episodes = jsloads(control.jsonrpc('{"jsonrpc": "2.0", "method": "VideoLibrary.GetEpisodes", "params": {"properties": ["season", "episode", "tvshowid"]}, "id": 1}')).get('result', {}).get('episodes', [])
+		by_id, by_title, last = {}, {}, {}
+		for x in lib:
+			by_id.setdefault(str(x['imdbnumber']), x['tvshowid'])
+			by_title.setdefault((x['title'], str(x['year'])), x['tvshowid'])
+		for i in episodes:
+			episode = (int(i['season']), int(i['episode']))
+			if episode > last.get(i['tvshowid'], (-1, -1)): last[i['tvshowid']] = episode
+		return by_id, by_title, last
+
+	def tmdb_episodes(self, item):
+		"""
+		Runs on the update pool, fresh (uncached) season and episode meta for one show. Returns (status, episodes) or None.
+		"""
+		from resources.lib.menus import seasons as seasonsX
+		from resources.lib.menus import episodes as episodesX
+		seasons = seasonsX.Seasons().tmdb_list(item['tvshowtitle'], item['imdb'], item['tmdb'], item['tvdb'], art=None)
+		if not seasons: return None
+		status = seasons[0]['status'].lower()
+		it = []
+		for season in seasons:
+			episodes = episodesX.Episodes().tmdb_list(item['tvshowtitle'], item['imdb'], item['tmdb'], item['tvdb'], meta=season, season=season['season'])
+			it += [{'tvshowtitle': i['tvshowtitle'], 'status': status, 'title': i['title'], 'year': i['year'], 'imdb': i['imdb'], 'tmdb': i['tmdb'], 'tvdb': i['tvdb'], 'season': i['season'], 'episode': i['episode'], 'premiered': i['premiered']} for i in episodes]
+		return status, it
+
+	def update_shows(self, dbcur, contains):
+		started = time()
+		try:
+			index = self.show_index(dbcur)
+			if index is None: return control.notification(message=32108)
+			if not index: return
+			items = {}
+			for folder, item in index.items(): # the same show in two folders is updated once
+				items.setdefault((item['tvshowtitle'], item['year'], item['imdb'], item['tmdb'], item['tvdb']), (folder, item))
+			by_id, by_title, kodi_last = self.kodi_library()
+		except:
+			log_utils.error()
+			return
+		fetch = dbcur.execute('''SELECT value FROM service WHERE setting="tv_update_run"''').fetchone()
+		if fetch and time() - float(fetch[0]) < RESUME_WINDOW: run = fetch[0]
+		else:
+			run = str(time())
+			dbcur.execute('''DELETE FROM update_progress''')
+			dbcur.execute('''INSERT OR REPLACE INTO service Values (?, ?)''', ('tv_update_run', run))
+			dbcur.connection.commit()
+		done = set(i[0] for i in dbcur.execute('''SELECT folder FROM update_progress WHERE run=?''', (run,)).fetchall())
+		if service_notification and not control.condVisibility('Window.IsVisible(infodialog)') and not control.condVisibility('Player.HasVideo'):
+			control.notification(message=32553)
 		# __init__ doesn't get called from services so self.date never gets updated and new episodes are not added to the library
 		self.date_time = datetime.now()
 		if control.setting('library.importdelay') != 'true': self.date = self.date_time.strftime('%Y%m%d')
 		else: self.date = (self.date_time - timedelta(hours=24)).strftime('%Y%m%d')
-		for item in items:
-			it = None
-			if control.monitor.abortRequested():
-				try: dbcur.close() ; dbcon.close()
-				except: pass
-				return sysexit()
+		pending, cached = {}, {}
+		for folder, item in items.values():
+			if folder in done: continue
+			ids = [item['imdb'], item['tvdb']] + ([item['tmdb']] if item['tmdb'] else [])
+			tvshowid = next((by_id[i] for i in ids if i in by_id), by_title.get((item['tvshowtitle'], item['year'])))
+			if tvshowid is None or tvshowid not in kodi_last: # not scanned into the Kodi library yet
+				self.mark_done(dbcur, run, folder)
+				continue
+			last = max(kodi_last[tvshowid], tuple(item['last'] or (-1, -1)))
+			pending[folder] = (item, last)
 			try:
 				fetch = dbcur.execute('''SELECT * FROM tvshows WHERE id=?''', (item['tvdb'],)).fetchone()
-				if fetch: it = eval(fetch[1])
+				if fetch: cached[folder] = ('ended', eval(fetch[1]))
 			except: log_utils.error()
-			try:
-				if it: raise Exception()
-				seasons = seasonsX.Seasons().tmdb_list(item['tvshowtitle'], item['imdb'], item['tmdb'], item['tvdb'], art=None) # fetch fresh meta (uncached)
-				if not seasons: continue
-				status = seasons[0]['status'].lower()
-				it = []
-				for season in seasons:
-					episodes = episodesX.Episodes().tmdb_list(item['tvshowtitle'], item['imdb'], item['tmdb'], item['tvdb'], meta=season, season=season['season']) # fetch fresh meta (uncached)
-					it += [{'tvshowtitle': i['tvshowtitle'], 'status': status, 'title': i['title'], 'year': i['year'], 'imdb': i['imdb'], 'tmdb': i['tmdb'], 'tvdb': i['tvdb'], 'season': i['season'], 'episode': i['episode'], 'premiered': i['premiered']} for i in episodes]
-					# it += [{'tvshowtitle': i['tvshowtitle'], 'status': status, 'title': i['title'], 'year': i['year'], 'imdb': i['imdb'], 'tmdb': i['tmdb'], 'tvdb': i['tvdb'], 'season': i['season'], 'episode': i['episode'], 'premiered': i['premiered'], 'aliases': i['aliases'], 'country_codes': i['country_codes']} for i in episodes]
-				# if not status or any(value in status for value in ('continuing', 'returning series')): raise Exception() # only write db entry for completed(Ended) shows
-				if status == 'ended':
-					dbcur.execute('''INSERT INTO tvshows Values (?, ?)''', (item['tvdb'], repr(it)))
-					dbcur.connection.commit()
-			except: log_utils.error()
-			try:
-				id = [item['imdb'], item['tvdb']]
-				if item['tmdb']: id += [item['tmdb']]
-				ep = [x['title'] for x in lib if str(x['imdbnumber']) in id or (x['title'] == item['tvshowtitle'] and str(x['year']) == item['year'])][0]
-				ep = control.jsonrpc('{"jsonrpc": "2.0", "method": "VideoLibrary.GetEpisodes", "params": {"filter":{"and": [{"field": "tvshow", "operator": "is", "value": "%s"}]}, "properties": ["season", "episode"]}, "id": 1}' % ep)
-				ep = jsloads(ep).get('result', {}).get('episodes', {})
-				ep = [{'season': int(i['season']), 'episode': int(i['episode'])} for i in ep]
-				ep = sorted(ep, key = lambda x: (x['season'], x['episode']))[-1]
-				num = [x for x,y in enumerate(it) if str(y['season']) == str(ep['season']) and str(y['episode']) == str(ep['episode'])][-1]
-				it = [y for x,y in enumerate(it) if x > num]
-				if len(it) == 0: continue
-			except: continue
-			for i in it:
-				if control.monitor.abortRequested(): return sysexit()
+		dbcur.connection.commit()
+		writer = libtvshows()
+		files_added, shows_done = 0, 0
+		executor = ThreadPoolExecutor(max_workers=LIB_WORKERS, thread_name_prefix='zwpseudo_library')
+		futures = {executor.submit(self.tmdb_episodes, item): folder for folder, (item, last) in pending.items() if folder not in cached}
+		try:
+			for folder, result in chain(cached.items(), ((futures[f], f) for f in as_completed(futures))):
+				if control.monitor.abortRequested():
+					for f in futures: f.cancel()
+					return sysexit()
+				item, last = pending[folder]
 				try:
-					if str(i.get('season')) == '0' and self.include_special == 'false': continue
-					premiered = i.get('premiered', '') if i.get('premiered') else ''
-					if not premiered:
-						if self.include_unknown == 'false': continue
-					elif int(re.sub('[^0-9]', '', str(premiered))) > int(re.sub(r'[^0-9]', '', str(self.date))): continue
-					libtvshows().strmFile(i)
-					files_added += 1
-					if service_notification: control.notification(title=item['tvshowtitle'], message=32678)
-				except: log_utils.error()
-		try: dbcur.close() ; dbcon.close()
-		except: pass
+					if not isinstance(result, tuple):
+						result = result.result()
+						if result and result[0] == 'ended':
+							dbcur.execute('''INSERT OR REPLACE INTO tvshows Values (?, ?)''', (item['tvdb'], repr(result[1])))
+				except:
+					log_utils.error()
+					result = None
+				if result: files_added += self.write_episodes(dbcur, writer, folder, item, last, result[1])
+				self.mark_done(dbcur, run, folder)
+				dbcur.connection.commit()
+				shows_done += 1
+		finally:
+			executor.shutdown(wait=False)
+		dbcur.execute('''DELETE FROM update_progress''')
+		dbcur.execute('''DELETE FROM service WHERE setting="tv_update_run"''')
+		dbcur.connection.commit()
+		elapsed = time() - started
+		log_utils.log('Library TV update: %s shows (%s resumed as done) in %.1f secs, %.1f shows per minute, %s files added' % (
+					shows_done, len(done), elapsed, shows_done / max(elapsed, 0.001) * 60, files_added), level=log_utils.LOGINFO)
 		if files_added == 0 and service_notification: control.notification(message=32109)
 		if self.library_update == 'true' and not control.condVisibility('Library.IsScanningVideo') and files_added > 0:
 			if contains:
@@ -746,3 +811,25 @@ class libepisodes:
 				control.sleep(10000)
 				control.execute('UpdateLibrary(video)')
 			elif service_notification: control.notification(message=32103)
+
+	def write_episodes(self, dbcur, writer, folder, item, last, it):
+		files_added, written = 0, None
+		for i in it:
+			if control.monitor.abortRequested(): return sysexit()
+			try:
+				if (int(i['season']), int(i['episode'])) <= last: continue
+				if str(i.get('season')) == '0' and self.include_special == 'false': continue
+				premiered = i.get('premiered', '') if i.get('premiered') else ''
+				if not premiered:
+					if self.include_unknown == 'false': continue
+				elif int(re.sub('[^0-9]', '', str(premiered))) > int(re.sub(r'[^0-9]', '', str(self.date))): continue
+				writer.strmFile(i)
+				files_added += 1
+				written = max(written or (-1, -1), (int(i['season']), int(i['episode'])))
+				if service_notification: control.notification(title=item['tvshowtitle'], message=32678)
+			except: log_utils.error()
+		if written: dbcur.execute('''UPDATE show_index SET last_season=?, last_episode=? WHERE folder=?''', (written[0], written[1], folder))
+		return files_added
+
+	def mark_done(self, dbcur, run, folder):
+		dbcur.execute('''INSERT OR REPLACE INTO update_progress Values (?, ?)''', (run, folder))
@@ -2,10 +2,16 @@
 	Venom Add-on
 """
 
+import atexit
 from datetime import datetime
 import inspect
+from os import replace as os_replace
+from os.path import getsize
+from queue import Queue, Empty, Full
+from re import split as re_split
+from threading import Lock, Thread
 from resources.lib.modules import string_tools
-from resources.lib.modules.control import transPath, setting as getSetting, lang, joinPath, existsPath
+from resources.lib.modules.control import transPath, setting as getSetting, settings_generation, lang, joinPath, existsPath
 
 LOGDEBUG = 0
 LOGINFO = 1
@@ -17,14 +23,95 @@ LOGNONE = 5 # not used
 debug_list = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'FATAL']
 DEBUGPREFIX = '[COLOR red][ zwpseudo: %s ][/COLOR]'
 LOGPATH = transPath('special://logpath/')
+MAX_SIZE = 2097152 # bytes before zwpseudo.log is rotated to zwpseudo.log.1, the previous .1 is dropped
+QUEUE_SIZE = 5000 # lines waiting on the writer thread, a burst past this is dropped and counted rather than blocking the caller
+_debug_config = {'generation': None, 'config': None}
+_STOP = object()
 
 
+class LogWriter:
+	"""
+	Appends lines to a log file from a daemon thread, one open() per batch of whatever is queued. Lines are always written oldest first,
+	a reversed view is rendered when the file is read (reversed_log()). Queued lines are flushed when the interpreter exits.
+	"""
+	def __init__(self, log_file, max_size=MAX_SIZE):
+		self.log_file = log_file
+		self.max_size = max_size
+		self.queue = Queue(QUEUE_SIZE)
+		self.dropped = 0
+		self.thread = None
+		self.lock = Lock()
+		atexit.register(self.flush)
+
+	def write(self, line):
+		try: self.queue.put_nowait(line)
+		except Full:
+			self.dropped += 1
+			return
+		if self.thread is None or not self.thread.is_alive():
+			with self.lock:
+				if self.thread is None or not self.thread.is_alive():
+					self.thread = Thread(target=self._run, name='zwpseudo_log', daemon=True)
+					self.thread.start()
+
+	def flush(self, timeout=2):
+		thread = self.thread
+		if thread is None or not thread.is_alive(): return
+		try: self.queue.put(_STOP, timeout=timeout)
+		except Full: return
+		thread.join(timeout)
+
+	def _run(self):
+		while True:
+			lines = [self.queue.get()]
+			while len(lines) < 1000:
+				try: lines.append(self.queue.get_nowait())
+				except Empty: break
+			stop = _STOP in lines
+			self._write([i for i in lines if i is not _STOP])
+			if stop: return
+
+	def _write(self, lines):
+		if self.dropped:
+			dropped, self.dropped = self.dropped, 0
+			lines.append(_format_line('%s log lines dropped, the log queue was full' % dropped, LOGWARNING))
+		try:
+			try:
+				if getsize(self.log_file) > self.max_size: os_replace(self.log_file, self.log_file + '.1')
+			except OSError: pass
+			with open(self.log_file, 'a', encoding='utf-8') as f: f.write(''.join(lines))
+		except Exception as e:
+			import xbmc
+			xbmc.log('[ plugin.video.zwpseudo ] LogWriter Failure: %s' % (e), LOGERROR)
+
+_writer = LogWriter(joinPath(LOGPATH, 'zwpseudo.log'))
+
+
+def debug_config():
+	"""
+	Returns (enabled, level, location) for the current settings generation, so log() does not read three settings per line.
+	"""
+	generation = settings_generation()
+	if _debug_config['config'] is None or _debug_config['generation'] != generation:
+		_debug_config['generation'], _debug_config['config'] = generation, (getSetting('debug.enabled') == 'true', getSetting('debug.level'), getSetting('debug.location'))
+	return _debug_config['config']
+
+def _format_line(msg, level):
+	now = datetime.now()
+	line = '[%s %s] %s: %s' % (now.date(), str(now.time())[:8], DEBUGPREFIX % debug_list[level], msg)
+	return line.rstrip('\r\n') + '\n'
+
+def reversed_log(text):
+	"""
+	Newest entry first for the "debug.reversed" view, multi-line entries keep their own line order.
+	"""
+	entries = re_split(r'\n(?=\[\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\] )', text.rstrip('\n'))
+	return '\n'.join(reversed(entries)) + '\n' if text else text
+
 def log(msg, caller=None, level=LOGINFO):
-	debug_enabled = getSetting('debug.enabled') == 'true'
+	debug_enabled, debug_level, debug_location = debug_config()
 	if not debug_enabled: return
-	debug_level = getSetting('debug.level')
 	if level == LOGDEBUG and debug_level != '1': return
-	debug_location = getSetting('debug.location')
 
 	if isinstance(msg, int): msg = lang(msg) # for strings.po translations
 	try:
@@ -41,23 +128,7 @@ def log(msg, caller=None, level=LOGINFO):
 		elif caller is not None and level == LOGERROR:
 			msg = 'From func name: %s.%s() Line # :%s\n                       msg : %s' % (caller[0], caller[1], caller[2], msg)
 
-		if debug_location == '1':
-			log_file = joinPath(LOGPATH, 'zwpseudo.log')
-			if not existsPath(log_file):
-				f = open(log_file, 'w')
-				f.close()
-			reverse_log = getSetting('debug.reversed') == 'true'
-			if not reverse_log:
-				with open(log_file, 'a', encoding='utf-8') as f:  # "with" auto cleans up and closes
-					line = '[%s %s] %s: %s' % (datetime.now().date(), str(datetime.now().time())[:8], DEBUGPREFIX % debug_list[level], msg)
-					f.write(line.rstrip('\r\n') + '\n')
-					# f.writelines([line1, line2]) ## maybe an option for the 2 lines without using "\n"
-			else:
-				with open(log_file, 'r+', encoding='utf-8') as f:
-					line = '[%s %s] %s: %s' % (datetime.now().date(), str(datetime.now().time())[:8], DEBUGPREFIX % debug_list[level], msg)
-					log_file = f.read()
-					f.seek(0, 0)
-					f.write(line.rstrip('\r\n') + '\n' + log_file)
+		if debug_location == '1': _writer.write(_format_line(msg, level))
 		else:
 			import xbmc
 			xbmc.log('%s: %s' % (DEBUGPREFIX % debug_list[level], msg), level)
@@ -97,6 +168,7 @@ def clear_logFile():
 	try:
 		from resources.lib.modules.control import yesnoDialog
 		if not yesnoDialog(lang(32056), '', ''): return 'canceled'
+		_writer.flush()
 		log_file = joinPath(LOGPATH, 'zwpseudo.log')
 		if not existsPath(log_file):
 			f = open(log_file, 'w')
@@ -119,9 +191,11 @@ def view_LogFile(name):
 		if not existsPath(log_file):
 			from resources.lib.modules.control import notification
 			return notification(message='Log File not found, likely logging is not enabled.')
+		if name.lower() == 'zwpseudo': _writer.flush()
 		f = open(log_file, 'r', encoding='utf-8', errors='ignore')
 		text = f.read()
 		f.close()
+		if name.lower() == 'zwpseudo' and getSetting('debug.reversed') == 'true': text = reversed_log(text)
 		heading = '[B]%s -  LogFile[/B]' % name
 		windows = TextViewerXML('textviewer.xml', addonPath('plugin.video.zwpseudo'), heading=heading, text=text)
 		windows.run()
@@ -137,6 +211,7 @@ def upload_LogFile(name):
 	try:
 		import requests
 		from resources.lib.modules.control import addonVersion, selectDialog, getHighlightColor
+		if name.lower() == 'zwpseudo': _writer.flush()
 		f = open(log_file, 'r', encoding='utf-8', errors='ignore')
 		text = f.read()
 		f.close()
@@ -21,7 +21,7 @@ def getMovieIndicators(refresh=False):
 			elif trakt.getMoviesWatchedActivity() < trakt.timeoutsyncMovies(): timeout = 720
 			else: timeout = 0
 			indicators = trakt.cachesyncMovies(timeout=timeout)
-			return indicators
+			return movie_index(indicators)
 		else:
 #			from metahandler import metahandlers
 #			indicators = metahandlers.MetaData(tmdb_api_key, omdb_api_key, tvdb_api_key)
@@ -39,7 +39,7 @@ def getTVShowIndicators(refresh=False):
 			elif trakt.getEpisodesWatchedActivity() < trakt.timeoutsyncTVShows(): timeout = 720
 			else: timeout = 0
 			indicators = trakt.cachesyncTVShows(timeout=timeout)
-			return indicators
+			return episode_index(indicators)
 		else:
 #			from metahandler import metahandlers
 #			indicators = metahandlers.MetaData(tmdb_api_key, omdb_api_key, tvdb_api_key)
@@ -59,7 +59,7 @@ def getSeasonIndicators(imdb, tvdb, refresh=False):
 			elif trakt.getEpisodesWatchedActivity() < timeoutsyncSeasons: timeout = 720
 			else: timeout = 0
 			indicators = trakt.cachesyncSeasons(imdb, tvdb, timeout=timeout)
-			return indicators
+			return season_index(indicators)
 		else:
 #			from metahandler import metahandlers
 #			indicators = metahandlers.MetaData(tmdb_api_key, omdb_api_key, tvdb_api_key)
@@ -70,13 +70,37 @@ def getSeasonIndicators(imdb, tvdb, refresh=False):
 		from resources.lib.modules import log_utils
 		log_utils.error()
 
+def movie_index(indicators):
+	"""
+	syncMovies() list of imdb ids as a set.
+	"""
+	if not indicators: return indicators
+	return frozenset(indicators)
+
+def episode_index(indicators):
+	"""
+	syncTVShows() list as {imdb or tvdb: frozenset((season, episode))}, a show is found under each of its ids.
+	"""
+	if not indicators: return indicators
+	index = {}
+	for ids, aired, episodes in indicators:
+		watched = frozenset(episodes) # (season, episode) int tuples
+		for key in (ids.get('imdb'), str(ids.get('tvdb'))):
+			if key and key != 'None': index.setdefault(key, watched)
+	return index
+
+def season_index(indicators):
+	"""
+	syncSeasons() [watched seasons, counts] with the watched seasons as a set of ints, counts stay {season: {'total', 'watched', 'unwatched'}}.
+	"""
+	if not indicators: return indicators
+	return [frozenset(int(i) for i in indicators[0]), indicators[1]]
+
 def getMovieOverlay(indicators, imdb):
 	if not indicators: return '4'
 	try:
 		if traktIndicators:
-			playcount = [i for i in indicators if i == imdb]
-			playcount = '5' if len(playcount) > 0 else '4'
-			return playcount
+			return '5' if imdb in indicators else '4'
 		else: # indicators will be metahandler object
 			playcount = indicators.get_watched('movie', imdb, '')
 			return str(playcount)
@@ -107,9 +131,7 @@ def getSeasonOverlay(indicators, imdb, tvdb, season): # tvdb no longer used
 	if not indicators: return '4'
 	try:
 		if traktIndicators:
-			playcount = [i for i in indicators if int(season) == int(i)]
-			playcount = '5' if len(playcount) > 0 else '4'
-			return playcount
+			return '5' if int(season) in indicators else '4'
 		else: # indicators will be metahandler object
 			playcount = indicators._get_watched('season', imdb, '', season)
 			return str(playcount)
@@ -122,11 +144,9 @@ def getEpisodeOverlay(indicators, imdb, tvdb, season, episode):
 	if not indicators: return '4'
 	try:
 		if traktIndicators:
-			playcount = [i[2] for i in indicators if (i[0].get('imdb') == imdb or str(i[0].get('tvdb')) == tvdb)]
-			playcount = playcount[0] if len(playcount) > 0 else []
-			playcount = [i for i in playcount if int(season) == int(i[0]) and int(episode) == int(i[1])]
-			playcount = '5' if len(playcount) > 0 else '4'
-			return playcount
+			watched = indicators.get(imdb) if imdb else None
+			if watched is None: watched = indicators.get(str(tvdb), ())
+			return '5' if (int(season), int(episode)) in watched else '4'
 		else: # indicators will be metahandler object
 			playcount = indicators.get_watched_episode('episode', imdb, '', season=season, episode=episode)
 			return str(playcount)
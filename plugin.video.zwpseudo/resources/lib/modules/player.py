@@ -7,7 +7,7 @@ from json import dumps as jsdumps, loads as jsloads
 from sys import argv, exit as sysexit
 from sqlite3 import dbapi2 as database
 import xbmc
-from resources.lib.database.cache import clear_local_bookmarks
+from resources.lib.database.cache import clear_local_bookmarks, meta_fetch
 from resources.lib.database.metacache import fetch as fetch_metacache
 from resources.lib.database.traktsync import fetch_bookmarks
 from resources.lib.modules import control
@@ -445,6 +445,7 @@ class PlayNext(xbmc.Player):
 			next_url = control.playlist[current_position + 1].getPath()
 			# next_url=videodb://tvshows/titles/16/2/571?season=2&tvshowid=16 # library playback returns this
 			params = dict(parse_qsl(next_url.replace('?', '')))
+			if params.get('meta_id'): params['meta'] = meta_fetch(params['meta_id']) # episode directory urls carry a handle to the stored meta
 			next_meta = jsloads(params.get('meta')) if params.get('meta') else '' # not available for library playback
 			return next_meta
 		except:
@@ -0,0 +1,92 @@
+"""
+	Venom Add-on
+"""
+
+from concurrent.futures import Future
+from threading import BoundedSemaphore, Lock
+from time import monotonic, sleep
+
+
+class TokenBucket:
+	"""
+	Refills rate tokens a second up to capacity, take() blocks until they are free. pause() empties it and holds every taker back,
+	used for a 429's Retry-After so the whole process backs off and not only the request that was throttled.
+	"""
+	def __init__(self, rate, capacity):
+		self.rate = float(rate)
+		self.capacity = float(capacity)
+		self._tokens = float(capacity)
+		self._stamp = monotonic()
+		self._paused_until = 0.0
+		self._lock = Lock()
+
+	def take(self, tokens=1):
+		tokens = min(tokens, self.capacity)
+		while True:
+			with self._lock:
+				now = monotonic()
+				self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+				self._stamp = now
+				if now >= self._paused_until and self._tokens >= tokens:
+					self._tokens -= tokens
+					return
+				delay = max(self._paused_until - now, (tokens - self._tokens) / self.rate)
+			sleep(delay)
+
+	def pause(self, seconds):
+		with self._lock:
+			self._paused_until = max(self._paused_until, monotonic() + seconds)
+			self._tokens = 0.0
+
+
+class RequestScheduler:
+	"""
+	Every request of a session goes through send(), which takes a token from the method's bucket and one of workers in flight slots.
+	GETs for a url already in flight are not sent again, the callers share the one response.
+	:param buckets: {method: TokenBucket}, methods not in it use the 'POST' bucket
+	"""
+	def __init__(self, session, buckets, workers):
+		self.session = session
+		self.buckets = buckets
+		self._slots = BoundedSemaphore(max(1, int(workers)))
+		self._in_flight = {} # url: Future of a GET being sent
+		self._lock = Lock()
+		self._counters = {'requests': 0, 'coalesced': 0, 'throttled': 0, 'wait': 0.0}
+
+	def send(self, method, url, **kwargs):
+		if method != 'GET': return self._send(method, url, **kwargs)
+		with self._lock:
+			future = self._in_flight.get(url)
+			sender = future is None
+			if sender: future = self._in_flight[url] = Future()
+			else: self._counters['coalesced'] += 1
+		if sender:
+			try: future.set_result(self._send(method, url, **kwargs))
+			except Exception as e: future.set_exception(e)
+			finally:
+				with self._lock: del self._in_flight[url]
+		return future.result()
+
+	def _send(self, method, url, **kwargs):
+		bucket = self.buckets.get(method) or self.buckets['POST']
+		start = monotonic()
+		bucket.take()
+		with self._slots:
+			waited = monotonic() - start
+			response = self.session.request(method, url, **kwargs)
+		throttled = response.status_code == 429
+		if throttled:
+			try: retry_after = int(response.headers.get('Retry-After', 1))
+			except ValueError: retry_after = 1
+			bucket.pause(retry_after + 1)
+		with self._lock:
+			self._counters['requests'] += 1
+			self._counters['wait'] += waited
+			if throttled: self._counters['throttled'] += 1
+		return response
+
+	def stats(self):
+		"""
+		Returns {'requests', 'coalesced', 'throttled' (429s), 'wait' (seconds spent waiting on a token or slot)} since the process started.
+		"""
+		with self._lock: return dict(self._counters)
@@ -19,6 +19,9 @@ def router(params):
 	url = params.get('url')
 	query = params.get('query')
 	source = params.get('source')
+	if 'meta_id' in params: # directory items carry a handle, the full meta json is kept in cache.db
+		from resources.lib.database.cache import meta_fetch
+		params['meta'] = meta_fetch(params['meta_id']) or meta_from_ids(params) # handle expired, ex. a favourite kept past meta_handle_expiry
 
 	if action is None:
 		from resources.lib.menus import navigator
@@ -500,16 +503,22 @@ def router(params):
 		if action == 'downloadNavigator':
 			from resources.lib.menus import navigator
 			navigator.Navigator().downloads()
+		elif action == 'downloadManager':
+			from resources.lib.modules import downloader
+			downloader.manager()
+		elif action == 'downloadJob':
+			from resources.lib.modules import downloader
+			downloader.manage_job(params.get('id'))
 		elif action == 'download':
 			caller = params.get('caller')
 			image = params.get('image')
 			if caller == 'sources': # future, move to downloader module for pack support
 				control.busy()
 				try:
-					from json import loads as jsloads
+					from resources.lib.database import providerscache
 					from resources.lib.modules import sources
 					from resources.lib.modules import downloader
-					downloader.download(name, image, sources.Sources().sourcesResolve(jsloads(source)[0]), title)
+					downloader.download(name, image, sources.Sources().sourcesResolve(providerscache.resultset_item(params.get('result_set'), params.get('index'))), title)
 				except:
 					import traceback
 					traceback.print_exc()
@@ -641,6 +650,10 @@ def router(params):
 		elif action == 'tools_forceTraktSync':
 			from resources.lib.indexers import trakt
 			trakt.force_traktSync()
+		elif action == 'tools_syncCloudIndex':
+			from resources.lib.debrid import cloud_library
+			cloud_library.sync_enabled(max_details=None)
+			control.notification(message='Debrid Cloud Index Updated')
 		elif action == 'tools_clearLogFile':
 			from resources.lib.modules import log_utils
 			cleared = log_utils.clear_logFile()
@@ -808,7 +821,7 @@ def router(params):
 		Sources().debridPackDialog(params.get('caller'), name, url, source)
 	elif action == 'sourceInfo':
 		from resources.lib.modules.sources import Sources
-		Sources().sourceInfo(source)
+		Sources().sourceInfo(params.get('result_set'), params.get('index'))
 	elif action == 'cacheTorrent':
 		caller = params.get('caller')
 		pack = True if params.get('type') == 'pack' else False
@@ -827,7 +840,7 @@ def router(params):
 		success = debrid_function().add_uncached_torrent(url, pack=pack)
 		if success:
 			from resources.lib.modules import sources
-			sources.Sources().playItem(title, params.get('items'), source, params.get('meta'))
+			sources.Sources().playItem(title, params.get('result_set'), params.get('index'), params.get('meta'))
 
 	elif action == 'rescrapeMenu':
 		from resources.lib.modules import sources
@@ -938,6 +951,35 @@ def router(params):
 		elif action == 'cache_clearBookmark':
 			from resources.lib.menus import navigator
 			navigator.Navigator().clearBookmark(name, year)
+		elif action == 'cache_viewStats':
+			from resources.lib.database import cache
+			cache.view_stats()
+		elif action == 'cache_clearCloudIndex':
+			from resources.lib.database import cloudindex
+			if cloudindex.clear(): control.notification(message='Debrid Cloud Index Cleared')
 		elif action == 'cache_clearKodiBookmark': # context.zwpseudo action call only
 			from resources.lib.database import cache
 			cache.clear_local_bookmark(url)
+
+def meta_from_ids(params):
+	"""
+	Rebuilds the meta json for an expired meta_id from the url's own ids and titles over the movie or show row in metacache, so callers
+	loading it with jsloads() get the fields the directory had instead of None.
+	"""
+	from json import dumps as jsdumps
+	from resources.lib.modules.control import setting as getSetting
+	meta = dict((k, params[k]) for k in ('title', 'tvshowtitle', 'year', 'imdb', 'tmdb', 'tvdb', 'season', 'episode', 'premiered') if params.get(k))
+	try:
+		from resources.lib.database import metacache
+		mediatype, lang = params['meta_id'].split('.')[:2]
+		if mediatype == 'movie': user = getSetting('tmdb.api.key')
+		else: user = getSetting('imdb.user').replace('ur', '') + getSetting('tvdb.api.key')
+		item = metacache.fetch([dict((k, meta.get(k, '')) for k in ('imdb', 'tmdb', 'tvdb'))], lang, user)[0]
+		item.pop('metacache', None)
+		item.update(meta) # an episode keeps its own title, season and episode over the show row
+		if mediatype != 'movie': item['mediatype'] = mediatype
+		meta = item
+	except:
+		from resources.lib.modules import log_utils
+		log_utils.error()
+	return jsdumps(meta)
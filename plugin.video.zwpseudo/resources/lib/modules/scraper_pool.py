@@ -0,0 +1,101 @@
+"""
+	Venom Add-on
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from threading import Condition, Event
+from resources.lib.fenom.sessions import RequestContext, bind_context
+
+
+class ScraperPool:
+	"""
+	Bounded pool for provider scrapes. Jobs not yet picked up by a worker are dropped on cancel(), jobs already inside a
+	scraper check "cancelled" before handing back results, a blocking request can not be interrupted.
+	Each pool is one scrape, its jobs share a RequestContext so pack passes reuse the single episode pass' response.
+	"""
+	def __init__(self, workers=20, on_done=None):
+		self.cancelled = Event()
+		self.futures = {} # future: provider name shown in the progress dialog
+		self._on_done = on_done # called once a job is done, so a waiting dialog sees the remaining providers change
+		self.context = RequestContext()
+		self._executor = ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix='zwpseudo_scraper')
+
+	def submit(self, name, function, *args):
+		future = self._executor.submit(self._run, function, args)
+		self.futures[future] = name
+		if self._on_done: future.add_done_callback(lambda future: self._on_done())
+
+	def _run(self, function, args):
+		if self.cancelled.is_set(): return
+		bind_context(self.context)
+		try: return function(*args)
+		except:
+			from resources.lib.modules import log_utils
+			log_utils.error()
+		finally: bind_context(None)
+
+	def pending(self):
+		return [name for future, name in self.futures.items() if not future.done()]
+
+	def cancel(self):
+		self.cancelled.set()
+		for future in self.futures: future.cancel() # python 3.8 (Kodi 19) has no shutdown(cancel_futures=True)
+		self._executor.shutdown(wait=False)
+
+
+class SourceCollector:
+	"""
+	Scraper threads add() results as they arrive and the counters are kept current, the progress dialog only reads them.
+	wait() blocks the dialog until something changed or the timeout passed, so it redraws on change instead of polling.
+	Results to be written to providers.db are kept in pending under the same lock, so once close() returns no straggler can add
+	to either and storeSources() reads a list nothing else touches.
+	"""
+	def __init__(self):
+		self.sources = deque()
+		self.quality = {'4K': 0, '1080p': 0, '720p': 0, 'SD': 0} # SCR and CAM count as SD
+		self.providers = {} # provider: results
+		self.debrid = {} # debrid service: cloud results
+		self.cloud = 0
+		self.version = 0 # bumped on every change, compared by wait()
+		self.pending = [] # (provider, imdb, season, episode, expiry, sources) for providerscache.results_store()
+		self.closed = False
+		self._changed = Condition()
+
+	def add(self, sources, store=None):
+		"""
+		:param store: optional pending row for providers.db, only kept when the results are
+		"""
+		with self._changed:
+			if self.closed: return False # straggler returning after timeout or pre-emptive termination, not shown or cached
+			if store: self.pending.append(store)
+			self.sources.extend(sources)
+			quality, providers, debrid = self.quality, self.providers, self.debrid
+			for i in sources:
+				q = i.get('quality')
+				if q in quality: quality[q] += 1
+				elif q in ('SCR', 'CAM'): quality['SD'] += 1
+				provider = i.get('provider')
+				providers[provider] = providers.get(provider, 0) + 1
+				if i.get('source') == 'cloud':
+					self.cloud += 1
+					service = i.get('debrid')
+					debrid[service] = debrid.get(service, 0) + 1
+			self.version += 1
+			self._changed.notify_all()
+		return True
+
+	def touch(self):
+		with self._changed:
+			self.version += 1
+			self._changed.notify_all()
+
+	def close(self):
+		with self._changed:
+			self.closed = True
+			self._changed.notify_all()
+
+	def wait(self, version, timeout):
+		with self._changed:
+			if self.version == version and not self.closed: self._changed.wait(timeout)
+			return self.version
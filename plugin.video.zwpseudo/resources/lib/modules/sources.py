@@ -3,7 +3,7 @@
 """
 
 from collections import deque
-from datetime import datetime, timedelta
+from datetime import datetime
 from json import dumps as jsdumps, loads as jsloads
 import re
 import _strptime # import _strptime to workaround python 2 bug with threads
@@ -11,12 +11,11 @@ from sys import exit as sysexit
 from threading import Thread
 from time import time
 from urllib.parse import unquote
-from sqlite3 import dbapi2 as database
-from resources.lib.database import metacache, providerscache
-from resources.lib.modules import cleandate
+from resources.lib.database import dbpool, metacache, providerscache
 from resources.lib.modules import control
 from resources.lib.modules import debrid
 from resources.lib.modules import log_utils
+from resources.lib.modules.scraper_pool import ScraperPool, SourceCollector
 from resources.lib.modules import string_tools
 from resources.lib.modules.source_utils import supported_video_extensions, getFileType, aliases_check
 from resources.lib.cloud_scrapers import cloudSources
@@ -26,10 +25,11 @@ homeWindow = control.homeWindow
 playerWindow = control.playerWindow
 getLS = control.lang
 getSetting = control.setting
+getSettingBool = control.setting_bool
 sourceFile = control.providercacheFile
-single_expiry = timedelta(hours=6)
-season_expiry = timedelta(hours=48)
-show_expiry = timedelta(hours=48)
+single_expiry = 21600 # 6hrs
+season_expiry = 172800 # 48hrs
+show_expiry = 172800 # 48hrs
 video_extensions = supported_video_extensions()
 
 class Sources:
@@ -44,15 +44,16 @@ class Sources:
 		self.filterless_scrape = filterless_scrape
 		self.time = datetime.now()
 		self.getConstants()
-		self.enable_playnext = getSetting('enable.playnext') == 'true'
-		self.dev_mode = getSetting('dev.mode.enable') == 'true'
-		self.dev_disable_single = getSetting('dev.disable.single') == 'true'
-		# self.dev_disable_single_filter = getSetting('dev.disable.single.filter') == 'true'
-		self.dev_disable_season_packs = getSetting('dev.disable.season.packs') == 'true'
-		self.dev_disable_season_filter = getSetting('dev.disable.season.filter') == 'true'
-		self.dev_disable_show_packs = getSetting('dev.disable.show.packs') == 'true'
-		self.dev_disable_show_filter = getSetting('dev.disable.show.filter') == 'true'
-		self.highlight_color = control.getColor(getSetting('scraper.dialog.color'))
+		self.enable_playnext = getSettingBool('enable.playnext')
+		self.dev_mode = getSettingBool('dev.mode.enable')
+		self.dev_disable_single = getSettingBool('dev.disable.single')
+		# self.dev_disable_single_filter = getSettingBool('dev.disable.single.filter')
+		self.dev_disable_season_packs = getSettingBool('dev.disable.season.packs')
+		self.dev_disable_season_filter = getSettingBool('dev.disable.season.filter')
+		self.dev_disable_show_packs = getSettingBool('dev.disable.show.packs')
+		self.dev_disable_show_filter = getSettingBool('dev.disable.show.filter')
+		self.highlight_color = control.setting_color('scraper.dialog.color')
+		self.scraper_workers = control.setting_int('scrapers.workers', 20)
 
 	def play(self, title, year, imdb, tmdb, tvdb, season, episode, tvshowtitle, premiered, meta, select, rescrape=None):
 		if not self.prem_providers:
@@ -182,16 +183,16 @@ class Sources:
 			def sourcesDirMeta(metadata): # pass skin minimal meta needed
 				if not metadata: return metadata
 				if getSetting('fanart') == 'false': metadata['fanart'] = ''
-				if getSetting('prefer.tmdbArt') == 'true': metadata['clearlogo'] = metadata.get('tmdblogo') or metadata.get('clearlogo') or ''
+				if getSettingBool('prefer.tmdbArt'): metadata['clearlogo'] = metadata.get('tmdblogo') or metadata.get('clearlogo') or ''
 				allowed = ['mediatype', 'imdb', 'tmdb', 'tvdb', 'poster', 'tvshow.poster', 'season_poster', 'season_poster', 'fanart', 'clearart', 'clearlogo', 'discart', 'thumb', 'title', 'tvshowtitle', 'year', 'premiered', 'rating', 'plot', 'duration', 'mpaa', 'season', 'episode', 'castandrole']
 				return {k: v for k, v in iter(metadata.items()) if k in allowed}
 			self.meta = sourcesDirMeta(self.meta)
 			if self.mediatype == 'movie':
-				if getSetting('imdb.Moviemeta.check') == 'true': # check IMDB. TMDB and Trakt differ on a ratio of 1 in 20 and year is off by 1, some meta titles mismatch
+				if getSettingBool('imdb.Moviemeta.check'): # check IMDB. TMDB and Trakt differ on a ratio of 1 in 20 and year is off by 1, some meta titles mismatch
 					title, year = self.imdb_meta_chk(imdb, title, year)
 				if title == 'The F**k-It List': title = 'The Fuck-It List'
 			if self.mediatype == 'episode':
-				if getSetting('imdb.Showmeta.check') == 'true':
+				if getSettingBool('imdb.Showmeta.check'):
 					tvshowtitle, year = self.imdb_meta_chk(imdb, tvshowtitle, year)
 				if tvshowtitle == 'The End of the F***ing World': tvshowtitle = 'The End of the Fucking World'
 				self.total_seasons, self.season_isAiring = self.get_season_info(imdb, tmdb, tvdb, meta, season)
@@ -201,7 +202,7 @@ class Sources:
 				self.url = url
 				return self.errorForSources()
 			filter = [] ; uncached_items = []
-			if getSetting('torrent.remove.uncached') == 'true':
+			if getSettingBool('torrent.remove.uncached'):
 				uncached_items += [i for i in items if re.match(r'^uncached.*torrent', i['source'])]
 				filter += [i for i in items if i not in uncached_items]
 				if filter: pass
@@ -248,7 +249,7 @@ class Sources:
 		except: log_utils.error('Error sourceSelect(): ')
 
 		try:
-			if getSetting('uncached.seeder.sort') == 'true':
+			if getSettingBool('uncached.seeder.sort'):
 				uncached_items = sorted(uncached_items, key=lambda k: k['seeders'], reverse=True)
 				uncached_items = self.sort_byQuality(source_list=uncached_items)
 			if items == uncached_items:
@@ -260,7 +261,7 @@ class Sources:
 			action, chosen_source = window.run()
 			del window
 			if action == 'play_Item' and self.uncached_chosen != True:
-				return self.playItem(title, items, chosen_source.getProperty('zwpseudo.source_dict'), self.meta)
+				return self.playItem(title, items, chosen_source.getProperty('zwpseudo.index'), self.meta)
 			else:
 				try: self.progressDialog.close()
 				except: pass
@@ -269,20 +270,25 @@ class Sources:
 			log_utils.error('Error sourceSelect(): ')
 			control.cancelPlayback()
 
-	def playItem(self, title, items, chosen_source, meta):
+	def playItem(self, title, items, source_index, meta):
+		"""
+		:param items: the source list, or its result-set id (providerscache.resultset_store()) when called from a RunPlugin url
+		:param source_index: index of the chosen source, it and the 40 after it (wrapping around to the start) are resolved in turn
+		"""
 		try:
-			try: items = jsloads(items)
-			except: pass
 			try: meta = jsloads(meta)
 			except: pass
+			resolve_items = []
 			try:
-				chosen_source = jsloads(chosen_source)
-				source_index = items.index(chosen_source[0])
-				source_len = len(items)
+				source_index = int(source_index)
+				source_len = len(items) if isinstance(items, list) else providerscache.resultset_len(items)
 				next_end = min(source_len, source_index+41)
-				sources_next = items[source_index+1:next_end]
-				sources_prev = [] if next_end < source_len else items[0:41-(source_len-source_index)]
-				resolve_items = [i for i in chosen_source + sources_next + sources_prev]
+				resolve_indexes = list(range(source_index, next_end))
+				if next_end == source_len: resolve_indexes += list(range(0, min(source_index, 41-(source_len-source_index))))
+				if isinstance(items, list): resolve_items = [(i, items[i]) for i in resolve_indexes]
+				else:
+					fetched = providerscache.resultset_items(items, resolve_indexes)
+					resolve_items = [(i, fetched[i]) for i in resolve_indexes if i in fetched]
 			except: log_utils.error()
 			header = homeWindow.getProperty(self.labelProperty) + ': Resolving...'
 			try:
@@ -294,17 +300,16 @@ class Sources:
 				homeWindow.clearProperty('zwpseudo.source_progress_is_alive')
 				self.progressDialog = control.progressDialogBG
 				self.progressDialog.create(header, '')
-			for i in range(len(resolve_items)):
+			for count, (index, item) in enumerate(resolve_items):
 				try:
-					resolve_index = items.index(resolve_items[i])+1
-					src_provider = resolve_items[i]['debrid'] if resolve_items[i].get('debrid') else ('%s - %s' % (resolve_items[i]['source'], resolve_items[i]['provider']))
-					label = '[B][COLOR %s]%s[CR]%s[CR]%02d.  %s[/COLOR][/B]' % (self.highlight_color, src_provider.upper(), resolve_items[i]['info'][:40], resolve_index, resolve_items[i]['name'][:40]) # using "[CR]" has some weird delay with progressDialog.update() at times
+					src_provider = item['debrid'] if item.get('debrid') else ('%s - %s' % (item['source'], item['provider']))
+					label = '[B][COLOR %s]%s[CR]%s[CR]%02d.  %s[/COLOR][/B]' % (self.highlight_color, src_provider.upper(), item['info'][:40], index+1, item['name'][:40]) # using "[CR]" has some weird delay with progressDialog.update() at times
 					control.sleep(100)
 					try:
 						if self.progressDialog == control.progressDialogBG and self.progressDialog.iscanceled(): break
-						self.progressDialog.update(int((100 / float(len(resolve_items))) * i), label)
-					except: self.progressDialog.update(int((100 / float(len(resolve_items))) * i), '[B][COLOR %s]Resolving...[/COLOR]%s[/B]' % (self.highlight_color, resolve_items[i]['name']))
-					w = Thread(target=self.sourcesResolve, args=(resolve_items[i],))
+						self.progressDialog.update(int((100 / float(len(resolve_items))) * count), label)
+					except: self.progressDialog.update(int((100 / float(len(resolve_items))) * count), '[B][COLOR %s]Resolving...[/COLOR]%s[/B]' % (self.highlight_color, item['name']))
+					w = Thread(target=self.sourcesResolve, args=(item,))
 					w.start()
 					for x in range(50):
 						try:
@@ -362,7 +367,7 @@ class Sources:
 				meta = self.meta
 				aliases = meta.get('aliases', [])
 			except: pass
-			threads = []
+			self.scrape_pool = ScraperPool(self.scraper_workers, on_done=self.collector.touch)
 			scraperDict = [(i[0], i[1], '') for i in sourceDict]
 			if self.season_isAiring == 'false':
 				scraperDict.extend([(i[0], i[1], 'season') for i in sourceDict if i[1].pack_capable])
@@ -382,23 +387,23 @@ class Sources:
 				name, pack = i[0].upper(), i[2]
 				if pack == 'season': name = '%s (season pack)' % name
 				elif pack == 'show': name = '%s (show pack)' % name
-				threads.append(Thread(target=self.getEpisodeSource, args=(imdb, season, episode, data, i[0], i[1], pack), name=name))
-			[i.start() for i in threads]
+				self.scrape_pool.submit(name, self.getEpisodeSource, imdb, season, episode, data, i[0], i[1], pack)
 			end_time = time() + timeout
 		except: return log_utils.error()
 		while True:
 			try:
 				if control.monitor.abortRequested(): return sysexit()
 				try:
-					info = [x.getName() for x in threads if x.is_alive() is True]
-					if len(info) == 0: break
+					if not self.scrape_pool.pending(): break
 					if end_time < time(): break
 				except:
 					log_utils.error()
 					break
 				control.sleep(100)
 			except: log_utils.error()
-		del threads[:] # Make sure any remaining providers are stopped.
+		self.collector.close() # running providers returning from here on are not shown or cached
+		self.scrape_pool.cancel() # drop providers not started yet
+		self.storeSources()
 		self.sources.extend(self.scraper_sources)
 		self.tvshowtitle = tvshowtitle
 		self.year = year
@@ -450,23 +455,20 @@ class Sources:
 			self.progressDialog.update(0, getLS(32600)) # preparing sources
 			if content == 'movie': sourceDict = [(i[0], i[1]) for i in sourceDict if i[1].hasMovies]
 			else: sourceDict = [(i[0], i[1]) for i in sourceDict if i[1].hasEpisodes]
-			if getSetting('cf.disable') == 'true': sourceDict = [(i[0], i[1]) for i in sourceDict if not any(x in i[0] for x in self.sourcecfDict)]
-			if getSetting('scrapers.prioritize') == 'true':
+			if getSettingBool('cf.disable'): sourceDict = [(i[0], i[1]) for i in sourceDict if not any(x in i[0] for x in self.sourcecfDict)]
+			if getSettingBool('scrapers.prioritize'):
 				sourceDict = [(i[0], i[1], i[1].priority) for i in sourceDict]
 				sourceDict = sorted(sourceDict, key=lambda i: i[2]) # sorted by scraper priority
 			try: aliases = self.meta.get('aliases', [])
 			except: aliases = []
-			threads = [] ; threads_append = threads.append
+			self.scrape_pool = ScraperPool(self.scraper_workers, on_done=self.collector.touch)
 
 			if content == 'movie':
 				trakt_aliases = self.getAliasTitles(imdb, content) # cached for 7 days in trakt module called
 				try: aliases.extend([i for i in trakt_aliases if not i in aliases]) # combine TMDb and Trakt aliases
 				except: pass
 				data = {'title': title, 'aliases': aliases, 'year': year, 'imdb': imdb}
-				for i in sourceDict:
-					i = Thread(target=self.getMovieSource, args=(imdb, data, i[0], i[1]), name=i[0].upper())
-					threads_append(i)
-					i.start()
+				for i in sourceDict: self.scrape_pool.submit(i[0].upper(), self.getMovieSource, imdb, data, i[0], i[1])
 			else:
 				scraperDict = [(i[0], i[1], '') for i in sourceDict] if ((not self.dev_mode) or (not self.dev_disable_single)) else []
 				if self.season_isAiring == 'false':
@@ -488,10 +490,7 @@ class Sources:
 					name, pack = i[0].upper(), i[2]
 					if pack == 'season': name = '%s (season pack)' % name
 					elif pack == 'show': name = '%s (show pack)' % name
-					i = Thread(target=self.getEpisodeSource, args=(imdb, season, episode, data, i[0], i[1], pack), name=name)
-					threads_append(i)
-					i.start()
-#			[i.start() for i in threads]
+					self.scrape_pool.submit(name, self.getEpisodeSource, imdb, season, episode, data, i[0], i[1], pack)
 			sdc = control.getSourceHighlightColor()
 			string1 = f"[B]{getLS(32404) % (self.highlight_color, sdc, '%s')}[/B]" # msgid "[COLOR %s]Time elapsed:[/COLOR]  [COLOR %s]%s seconds[/COLOR]"
 			string3 = f"[B]{getLS(32406) % (self.highlight_color, sdc, '%s')}[/B]" # msgid "[COLOR %s]Remaining providers:[/COLOR] [COLOR %s]%s[/COLOR]"
@@ -504,12 +503,14 @@ class Sources:
 			end_time = self.start_time + timeout
 			quality = getSetting('hosts.quality') or '0'
 			line1 = line2 = line3 = ""
-			terminate_onCloud = getSetting('terminate.onCloud.sources') == 'true'
-			pre_emp = getSetting('preemptive.termination') == 'true'
-			pre_emp_limit = int(getSetting('preemptive.limit'))
+			terminate_onCloud = getSettingBool('terminate.onCloud.sources')
+			pre_emp = getSettingBool('preemptive.termination')
+			pre_emp_limit = control.setting_int('preemptive.limit', 25)
 			pre_emp_res = getSetting('preemptive.res') or '0'
 			source_4k = source_1080 = source_720 = source_sd = total = 0
 			total_format = '[COLOR %s][B]%s[/B][/COLOR]'
+			redraw_interval = 100 # ms, at most 10 redraws a second so the dialog does not compete with scraper threads for the GIL
+			idle_interval = 0.25 # seconds, redraw for the elapsed timer when nothing arrives
 			pdiag_format = '[COLOR %s]4K:[/COLOR]  %s  |  [COLOR %s]1080p:[/COLOR]  %s  |  [COLOR %s]720p:[/COLOR]  %s  |  [COLOR %s]SD:[/COLOR]  %s  |  [COLOR %s]TOTAL:[/COLOR]  %s' % (
 				self.highlight_color, '%s', self.highlight_color, '%s', self.highlight_color, '%s', self.highlight_color, '%s', self.highlight_color, '%s' )
 			control.hide()
@@ -520,6 +521,8 @@ class Sources:
 			del self.progressDialog
 			return
 
+		collector = self.collector
+		version = None
 		while True:
 			try:
 				if control.monitor.abortRequested(): return sysexit()
@@ -528,26 +531,17 @@ class Sources:
 				except: pass
 
 				if terminate_onCloud:
-					if len([e for e in self.scraper_sources if e['source'] == 'cloud']) > 0: break
+					if collector.cloud > 0: break
 				if pre_emp:
 					if pre_emp_res == '0' and source_4k >= pre_emp_limit: break
 					elif pre_emp_res == '1' and source_1080 >= pre_emp_limit: break
 					elif pre_emp_res == '2' and source_720 >= pre_emp_limit: break
 					elif pre_emp_res == '3' and source_sd >= pre_emp_limit: break
-				if quality == '0':
-					source_4k = len([e for e in self.scraper_sources if e['quality'] == '4K'])
-					source_1080 = len([e for e in self.scraper_sources if e['quality'] == '1080p'])
-					source_720 = len([e for e in self.scraper_sources if e['quality'] == '720p'])
-					source_sd = len([e for e in self.scraper_sources if e['quality'] in ('SD', 'SCR', 'CAM')])
-				elif quality == '1':
-					source_1080 = len([e for e in self.scraper_sources if e['quality'] == '1080p'])
-					source_720 = len([e for e in self.scraper_sources if e['quality'] == '720p'])
-					source_sd = len([e for e in self.scraper_sources if e['quality'] in ('SD', 'SCR', 'CAM')])
-				elif quality == '2':
-					source_720 = len([e for e in self.scraper_sources if e['quality'] == '720p'])
-					source_sd = len([e for e in self.scraper_sources if e['quality'] in ('SD', 'SCR', 'CAM')])
-				else:
-					source_sd = len([e for e in self.scraper_sources if e['quality'] in ('SD', 'SCR', 'CAM')])
+				counts = collector.quality # kept current by the collector as each provider returns
+				if quality == '0': source_4k = counts['4K']
+				if quality in ('0', '1'): source_1080 = counts['1080p']
+				if quality in ('0', '1', '2'): source_720 = counts['720p']
+				source_sd = counts['SD']
 				total = source_4k + source_1080 + source_720 + source_sd
 
 				source_4k_label = total_format % ('red', source_4k) if source_4k == 0 else total_format % (sdc, source_4k)
@@ -556,7 +550,7 @@ class Sources:
 				source_sd_label = total_format % ('red', source_sd) if source_sd == 0 else total_format % (sdc, source_sd)
 				source_total_label = total_format % ('red', total) if total == 0 else total_format % (sdc, total)
 				try:
-					info = [x.getName() for x in threads if x.is_alive() is True]
+					info = self.scrape_pool.pending()
 					line1 = pdiag_format % (source_4k_label, source_1080_label, source_720_label, source_sd_label, source_total_label)
 					line2 = string1 % round(time() - self.start_time, 1)
 					if len(info) > 6: line3 = string3 % str(len(info))
@@ -565,16 +559,20 @@ class Sources:
 					current_time = time()
 					current_progress = current_time - self.start_time
 #					percent = int((current_progress / float(timeout)) * 100)
-					percent = int((len(sourceDict) - len(info)) * 100 / len(sourceDict))
+					percent = int((len(self.scrape_pool.futures) - len(info)) * 100 / len(self.scrape_pool.futures))
 					if self.progressDialog != control.progressDialogBG: self.progressDialog.update(max(1, percent), line1 + '[CR]' + line2 + '[CR]' + line3)
 					else: self.progressDialog.update(max(1, percent), line3)
 					if end_time < current_time: break
 				except:
 					log_utils.error()
 					break
-				control.sleep(25)
+				control.sleep(redraw_interval) # caps the redraw rate while results stream in
+				version = collector.wait(version, idle_interval) # returns as soon as a provider adds results or finishes
 			except: log_utils.error()
-		del threads[:] # Make sure any remaining providers are stopped, only deletes threads not started yet.
+		self.collector.close() # running providers returning from here on are not shown or cached
+		self.scrape_pool.cancel() # drop providers not started yet
+		log_utils.log('Unfiltered results per provider: %s' % collector.providers, level=log_utils.LOGDEBUG)
+		self.storeSources()
 		self.sources.extend(self.scraper_sources)
 		self.tvshowtitle = tvshowtitle
 		self.year = year
@@ -590,7 +588,7 @@ class Sources:
 		try:
 			if not next_sources: raise Exception()
 			homeWindow.setProperty(self.metaProperty, jsdumps(next_meta))
-			if getSetting('autoplay.sd') == 'true': next_sources = [i for i in next_sources if not i['quality'] in ('4K', '1080p', '720p')]
+			if getSettingBool('autoplay.sd'): next_sources = [i for i in next_sources if not i['quality'] in ('4K', '1080p', '720p')]
 			uncached_filter = [i for i in next_sources if re.match(r'^uncached.*torrent', i['source'])]
 			next_sources = [i for i in next_sources if i not in uncached_filter]
 		except:
@@ -623,115 +621,41 @@ class Sources:
 		control.sleep(200)
 
 	def prepareSources(self):
-		try:
-			control.makeFile(control.dataPath)
-			dbcon = database.connect(sourceFile)
-			dbcur = dbcon.cursor()
-			dbcur.execute('''CREATE TABLE IF NOT EXISTS rel_src (source TEXT, imdb_id TEXT, season TEXT, episode TEXT, hosts TEXT, added TEXT, UNIQUE(source, imdb_id, season, episode));''')
-			dbcur.execute('''CREATE TABLE IF NOT EXISTS rel_aliases (title TEXT, aliases TEXT, UNIQUE(title));''')
-			dbcur.connection.commit()
-		except: log_utils.error()
-		finally:
-			dbcur.close() ; dbcon.close()
+		dbpool.ensure_schema(sourceFile) # rel_results and rel_aliases are registered in providerscache, created once per interpreter
+		self.aliases_pending = None
+		self.collector = SourceCollector()
+		self.scraper_sources = self.collector.sources
+
+	def storeSources(self):
+		self.collector.close() # no straggler adds to pending once this returns
+		providerscache.results_store(self.collector.pending, self.aliases_pending)
+
+	def addSources(self, sources, store=None): # scraper threads only, the collector keeps the progress dialog counts current without rescanning scraper_sources
+		return self.collector.add(sources, store)
 
 	def getMovieSource(self, imdb, data, source, call):
-		try:
-			dbcon = database.connect(sourceFile, timeout=60)
-			dbcon.execute('''PRAGMA page_size = 32768''')
-			dbcon.execute('''PRAGMA journal_mode = WAL''')
-			dbcon.execute('''PRAGMA synchronous = OFF''')
-			dbcon.execute('''PRAGMA temp_store = memory''')
-			dbcon.execute('''PRAGMA mmap_size = 30000000000''')
-			dbcur = dbcon.cursor()
-		except: pass
-		if not imdb: # Fix to stop items passed with null IMDB_id pulling old unrelated sources from the database
-			try:
-				dbcur.execute('''DELETE FROM rel_src WHERE (source=? AND imdb_id='' AND season='' AND episode='')''', (source,))
-				dbcur.connection.commit()
-			except: log_utils.error()
-		try:
-			sources = []
-			db_movie = dbcur.execute('''SELECT * FROM rel_src WHERE (source=? AND imdb_id=? AND season='' AND episode='')''', (source, imdb)).fetchone()
-			if db_movie:
-				timestamp = cleandate.datetime_from_string(str(db_movie[5]), '%Y-%m-%d %H:%M:%S.%f', False)
-				db_movie_valid = abs(self.time - timestamp) < single_expiry
-				if db_movie_valid:
-					sources = eval(db_movie[4])
-					return self.scraper_sources.extend(sources)
-		except: log_utils.error()
+		if imdb: # items passed with null IMDB_id are never cached so they can not pull old unrelated sources
+			sources = providerscache.results_fetch(source, imdb)
+			if sources is not None: return self.addSources(sources)
 		try:
 			sources = []
 			sources = call().sources(data, self.hostprDict)
-			if sources:
-				self.scraper_sources.extend(sources)
-				dbcur.execute('''INSERT OR REPLACE INTO rel_aliases Values (?, ?)''', (data.get('title', ''), repr(data.get('aliases', ''))))
-				dbcur.execute('''INSERT OR REPLACE INTO rel_src Values (?, ?, ?, ?, ?, ?)''', (source, imdb, '', '', repr(sources), datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")))
-				dbcur.connection.commit()
+			if sources and self.addSources(sources, (source, imdb, '', '', single_expiry, sources) if imdb else None) and imdb:
+				self.aliases_pending = (data.get('title', ''), data.get('aliases', ''))
 		except: log_utils.error()
 
 	def getEpisodeSource(self, imdb, season, episode, data, source, call, pack):
-		try:
-			dbcon = database.connect(sourceFile, timeout=60)
-			dbcon.execute('''PRAGMA page_size = 32768''')
-			dbcon.execute('''PRAGMA journal_mode = WAL''')
-			dbcon.execute('''PRAGMA synchronous = OFF''')
-			dbcon.execute('''PRAGMA temp_store = memory''')
-			dbcon.execute('''PRAGMA mmap_size = 30000000000''')
-			dbcur = dbcon.cursor()
-		except: pass
-		if not imdb: # Fix to stop items passed with null IMDB_id pulling old unrelated sources from the database
-			try:
-				dbcur.execute('''DELETE FROM rel_src WHERE (source=? AND imdb_id='' AND season=? AND episode=?)''', (source, season, episode))
-				dbcur.execute('''DELETE FROM rel_src WHERE (source=? AND imdb_id='' AND season=? AND episode='')''', (source, season))
-				dbcur.execute('''DELETE FROM rel_src WHERE (source=? AND imdb_id='' AND season='' AND episode='')''', (source, ))
-				dbcur.connection.commit()
-			except: log_utils.error()
-		if not pack: # singleEpisodes db check
-			try:
-				db_singleEpisodes = dbcur.execute('''SELECT * FROM rel_src WHERE (source=? AND imdb_id=? AND season=? AND episode=?)''', (source, imdb, season, episode)).fetchone()
-				if db_singleEpisodes:
-					timestamp = cleandate.datetime_from_string(str(db_singleEpisodes[5]), '%Y-%m-%d %H:%M:%S.%f', False)
-					db_singleEpisodes_valid = abs(self.time - timestamp) < single_expiry
-					if db_singleEpisodes_valid:
-						sources = eval(db_singleEpisodes[4])
-						return self.scraper_sources.extend(sources)
-			except: log_utils.error()
-		elif pack == 'season': # seasonPacks db check
-			try:
-				db_seasonPacks = dbcur.execute('''SELECT * FROM rel_src WHERE (source=? AND imdb_id=? AND season=? AND episode='')''', (source, imdb, season)).fetchone()
-				if db_seasonPacks:
-					timestamp = cleandate.datetime_from_string(str(db_seasonPacks[5]), '%Y-%m-%d %H:%M:%S.%f', False)
-					db_seasonPacks_valid = abs(self.time - timestamp) < season_expiry
-					if db_seasonPacks_valid:
-						sources = eval(db_seasonPacks[4])
-						sources = [i for i in sources if not 'episode_start' in i or i['episode_start'] <= int(episode) <= i['episode_end']] # filter out range items that do not apply to current episode for return
-						return self.scraper_sources.extend(sources)
-			except: log_utils.error()
-		elif pack == 'show': # showPacks db check
-			try:
-				db_showPacks = dbcur.execute('''SELECT * FROM rel_src WHERE (source=? AND imdb_id=? AND season='' AND episode='')''', (source, imdb)).fetchone()
-				if db_showPacks:
-					timestamp = cleandate.datetime_from_string(str(db_showPacks[5]), '%Y-%m-%d %H:%M:%S.%f', False)
-					db_showPacks_valid = abs(self.time - timestamp) < show_expiry
-					if db_showPacks_valid:
-						sources = eval(db_showPacks[4])
-						sources = [i for i in sources if i.get('last_season') >= int(season)] # filter out range items that do not apply to current season for return
-						return self.scraper_sources.extend(sources)
-			except: log_utils.error()
-
-		try: #dummy write or threads wait till return from scrapers...write for each is needed
-			dbcur.execute('''INSERT OR REPLACE INTO rel_src Values (?, ?, ?, ?, ?, ?)''', ('dummy write', '', '', '', '', ''))
-			dbcur.connection.commit()
-		except: log_utils.error()
+		if imdb: # items passed with null IMDB_id are never cached so they can not pull old unrelated sources
+			if not pack: sources = providerscache.results_fetch(source, imdb, season, episode) # singleEpisodes db check
+			elif pack == 'season': sources = providerscache.results_fetch(source, imdb, season, range_episode=episode) # seasonPacks db check, range items that do not apply to current episode filtered in sql
+			else: sources = providerscache.results_fetch(source, imdb, range_season=season) # showPacks db check, range items that do not apply to current season filtered in sql
+			if sources is not None: return self.addSources(sources)
 
 		if not pack: # singleEpisodes scraper call
 			try:
 				sources = []
 				sources = call().sources(data, self.hostprDict)
-				if sources:
-					dbcur.execute('''INSERT OR REPLACE INTO rel_src Values (?, ?, ?, ?, ?, ?)''', (source, imdb, season, episode, repr(sources), datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")))
-					dbcur.connection.commit()
-					return self.scraper_sources.extend(sources)
+				if sources: return self.addSources(sources, (source, imdb, season, episode, single_expiry, sources) if imdb else None)
 				return
 			except: return log_utils.error()
 		elif pack == 'season': # seasonPacks scraper call
@@ -739,10 +663,9 @@ class Sources:
 				sources = []
 				sources = call().sources_packs(data, self.hostprDict, bypass_filter=self.dev_disable_season_filter)
 				if sources:
-					dbcur.execute('''INSERT OR REPLACE INTO rel_src Values (?, ?, ?, ?, ?, ?)''', (source, imdb, season,'', repr(sources), datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")))
-					dbcur.connection.commit()
+					store = (source, imdb, season, '', season_expiry, sources) if imdb else None
 					sources = [i for i in sources if not 'episode_start' in i or i['episode_start'] <= int(episode) <= i['episode_end']] # filter out range items that do not apply to current episode for return
-					return self.scraper_sources.extend(sources)
+					return self.addSources(sources, store)
 				return
 			except: return log_utils.error()
 		elif pack == 'show': # showPacks scraper call
@@ -750,24 +673,23 @@ class Sources:
 				sources = []
 				sources = call().sources_packs(data, self.hostprDict, search_series=True, total_seasons=self.total_seasons, bypass_filter=self.dev_disable_show_filter)
 				if sources:
-					dbcur.execute('''INSERT OR REPLACE INTO rel_src Values (?, ?, ?, ?, ?, ?)''', (source, imdb, '', '', repr(sources), datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")))
-					dbcur.connection.commit()
+					store = (source, imdb, '', '', show_expiry, sources) if imdb else None
 					sources = [i for i in sources if i.get('last_season') >= int(season)] # filter out range items that do not apply to current season for return
-					return self.scraper_sources.extend(sources)
+					return self.addSources(sources, store)
 			except: log_utils.error()
 
 	def sourcesFilter(self):
 		if not self.isPrescrape: control.busy()
-		if getSetting('remove.duplicates') == 'true': self.sources = self.filter_dupes()
+		if getSettingBool('remove.duplicates'): self.sources = self.filter_dupes()
 		if self.mediatype == 'movie':
-			if getSetting('source.enable.msizelimit') == 'true':
+			if getSettingBool('source.enable.msizelimit'):
 				try:
 					movie_minSize, movie_maxSize = float(getSetting('source.min.moviesize')), float(getSetting('source.max.moviesize'))
 					self.sources = [i for i in self.sources if (i.get('size', 0) >= movie_minSize and i.get('size', 0) <= movie_maxSize)]
 				except: log_utils.error()
 		else:
 			self.sources = [i for i in self.sources if 'movie.collection' not in i.get('name_info', '')] # rare but a few retuned from "complete" show pack scrape returned as "movie.collection"
-			if getSetting('source.checkReboots') == 'true':
+			if getSettingBool('source.checkReboots'):
 				try:
 					from resources.lib.modules.source_utils import tvshow_reboots
 					reboots = tvshow_reboots()
@@ -775,7 +697,7 @@ class Sources:
 						log_utils.log('tvshowtitle(%s) is a REBOOT, filtering for year match per enabled setting' % self.tvshowtitle, level= log_utils.LOGDEBUG)
 						self.sources = [i for i in self.sources if self.year in i.get('name')]
 				except: log_utils.error()
-			if getSetting('source.enable.esizelimit') == 'true':
+			if getSettingBool('source.enable.esizelimit'):
 				try:
 					episode_minSize, episode_maxSize = float(getSetting('source.min.epsize')), float(getSetting('source.max.epsize'))
 					self.sources = [i for i in self.sources if (i.get('size', 0) >= episode_minSize and i.get('size', 0) <= episode_maxSize)]
@@ -788,18 +710,18 @@ class Sources:
 				else: info_string = getFileType(url=i.get('url'))
 				i.update({'info': (i.get('info') + ' /' + info_string).lstrip(' ').lstrip('/').rstrip('/')})
 			except: log_utils.error()
-		if getSetting('remove.hevc') == 'true':
+		if getSettingBool('remove.hevc'):
 			self.sources = [i for i in self.sources if 'HEVC' not in i.get('info', '')]
-		if getSetting('remove.hdr') == 'true':
+		if getSettingBool('remove.hdr'):
 			self.sources = [i for i in self.sources if ' HDR ' not in i.get('info', '')] # needs space before and aft because of "HDRIP"
-		if getSetting('remove.dolby.vision') == 'true':
+		if getSettingBool('remove.dolby.vision'):
 			self.sources = [i for i in self.sources if ('DOLBY-VISION' not in i.get('info', '')) or ('DOLBY-VISION' in i.get('info', '') and ' HDR ' in i.get('info', ''))]
-		if getSetting('remove.cam.sources') == 'true':
+		if getSettingBool('remove.cam.sources'):
 			self.sources = [i for i in self.sources if i['quality'] != 'CAM']
-		if getSetting('remove.sd.sources') == 'true':
+		if getSettingBool('remove.sd.sources'):
 			if any(i for i in self.sources if any(value in i['quality'] for value in ('4K', '1080p', '720p'))): #only remove SD if better quality does exist
 				self.sources = [i for i in self.sources if i['quality'] != 'SD']
-		if getSetting('remove.3D.sources') == 'true':
+		if getSettingBool('remove.3D.sources'):
 			self.sources = [i for i in self.sources if '3D' not in i.get('info', '')]
 
 		local = [i for i in self.sources if 'local' in i and i['local'] is True] # for library and videoscraper (skips cache check)
@@ -809,89 +731,65 @@ class Sources:
 		from copy import deepcopy
 		deepcopy_sources = deepcopy(self.sources)
 		deepcopy_sources = [i for i in deepcopy_sources if 'magnet:' in i['url']]
-		if deepcopy_sources: hashList = [i['hash'] for i in deepcopy_sources]
-		threads = [] ; self.filter = []
+		hashList = [i['hash'] for i in deepcopy_sources]
+		self.filter = [] ; services = []
 		valid_hosters = set([i['source'] for i in self.sources if 'magnet:' not in i['url']])
+		from resources.lib.debrid.availability import Availability
+		availability = Availability(self.meta.get('imdb', '') if self.meta else '')
 
-		def checkStatus(function, debrid_name, valid_hoster):
+		for d in self.debrid_resolvers:
 			try:
-				cached = None
-				if deepcopy_sources: cached = function(deepcopy_sources, hashList)
-				if cached: self.filter += [dict(list(i.items()) + [('debrid', debrid_name)]) for i in cached] # this makes a new instance so no need for deepcopy beyond the one time done now
-				if valid_hoster: self.filter += [dict(list(i.items()) + [('debrid', debrid_name)]) for i in self.sources if i['source'] in valid_hoster and 'magnet:' not in i['url']]
+				if d.name == 'Real-Debrid' and getSettingBool('realdebrid.enable'):
+					services.append((d.name, [i for i in valid_hosters if d.valid_url(i)]))
+					if deepcopy_sources and getSettingBool('realdebrid.check_cache'): availability.start(d.name, hashList)
+				if d.name == 'Premiumize.me' and getSettingBool('premiumize.enable'):
+					services.append((d.name, [i for i in valid_hosters if d.valid_url(i)]))
+					if deepcopy_sources: availability.start(d.name, hashList)
+				if d.name == 'AllDebrid' and getSettingBool('alldebrid.enable'): # no cache check, torrents listed unchecked
+					services.append((d.name, [i for i in valid_hosters if d.valid_url(i)]))
+				if d.name == 'Offcloud' and getSettingBool('offcloud.enable'):
+					services.append((d.name, []))
+					if deepcopy_sources: availability.start(d.name, hashList)
+				if d.name == 'EasyDebrid' and getSettingBool('easydebrid.enable'):
+					services.append((d.name, []))
+					if deepcopy_sources: availability.start(d.name, hashList)
+				if d.name == 'TorBox' and getSettingBool('torbox.enable'):
+					services.append((d.name, []))
+					if deepcopy_sources: availability.start(d.name, hashList)
 			except: log_utils.error()
-		for d in self.debrid_resolvers:
-			if d.name == 'Real-Debrid' and getSetting('realdebrid.enable') == 'true':
-				try:
-					valid_hoster = [i for i in valid_hosters if d.valid_url(i)]
-					i = Thread(name=d.name.upper(), target=checkStatus, args=(self.rd_cache_chk_list, d.name, valid_hoster))
-					threads.append(i)
-					i.start()
-				except: log_utils.error()
-			if d.name == 'Premiumize.me' and getSetting('premiumize.enable') == 'true':
-				try:
-					valid_hoster = [i for i in valid_hosters if d.valid_url(i)]
-					i = Thread(name=d.name.upper(), target=checkStatus, args=(self.pm_cache_chk_list, d.name, valid_hoster))
-					threads.append(i)
-					i.start()
-				except: log_utils.error()
-			if d.name == 'AllDebrid' and getSetting('alldebrid.enable') == 'true':
-				try:
-					valid_hoster = [i for i in valid_hosters if d.valid_url(i)]
-					i = Thread(name=d.name.upper(), target=checkStatus, args=(self.ad_cache_chk_list, d.name, valid_hoster))
-					threads.append(i)
-					i.start()
-				except: log_utils.error()
-			if d.name == 'Offcloud' and getSetting('offcloud.enable') == 'true':
-				try:
-					valid_hoster = []
-					i = Thread(name=d.name.upper(), target=checkStatus, args=(self.oc_cache_chk_list, d.name, valid_hoster))
-					threads.append(i)
-					i.start()
-				except: log_utils.error()
-			if d.name == 'EasyDebrid' and getSetting('easydebrid.enable') == 'true':
-				try:
-					valid_hoster = []
-					i = Thread(name=d.name.upper(), target=checkStatus, args=(self.ed_cache_chk_list, d.name, valid_hoster))
-					threads.append(i)
-					i.start()
-				except: log_utils.error()
-			if d.name == 'TorBox' and getSetting('torbox.enable') == 'true':
-				try:
-					valid_hoster = []
-					i = Thread(name=d.name.upper(), target=checkStatus, args=(self.tb_cache_chk_list, d.name, valid_hoster))
-					threads.append(i)
-					i.start()
-				except: log_utils.error()
-		if threads:
-#			[i.start() for i in threads]
+		if availability.pending():
 			if self.progressDialog:
 				control.hide()
 				sdc = control.getSourceHighlightColor()
 				string2 = '[B][COLOR %s]Time elapsed[/COLOR]:  [COLOR %s]%s seconds[/COLOR][/B]' % (self.highlight_color, sdc, '%s')
 				string3 = '[B][COLOR %s]Remaining debrid[/COLOR]: [COLOR %s]%s[/COLOR][/B]' % (self.highlight_color, sdc, '%s')
-
-				while True:
+				info = availability.pending()
+				while info:
 					try:
-						if control.monitor.abortRequested(): return sysexit()
+						if control.monitor.abortRequested():
+							availability.cancel()
+							return sysexit()
 						try:
 							if self.progressDialog.iscanceled(): break
 						except: pass
+						line1 = '[B][COLOR %s]Checking Debrid...[/COLOR][/B]' % self.highlight_color
+						line2 = string2 % round(time() - self.start_time, 1)
+						line3 = string3 % (', '.join(info).upper())
+						if self.progressDialog != control.progressDialogBG: self.progressDialog.update(100, f"{line1}[CR]{line2}[CR]{line3}")
+						else: self.progressDialog.update(100, line1 + '  ' + line3)
+						info = availability.wait(0.1) # returns early when a chunk finishes
+					except:
+						log_utils.error()
+						break
+				availability.cancel() # a cancelled dialog stops waiting, chunks still queued are dropped and their torrents left unchecked
+			else: availability.join()
+		log_utils.log('debrid cache check (hashes, from providers.db, requests)=%s' % availability.counts, level=log_utils.LOGDEBUG)
 
-						try:
-							info = [i.getName() for i in threads if i.is_alive()]
-							line1 = '[B][COLOR %s]Checking Debrid...[/COLOR][/B]' % self.highlight_color
-							line2 = string2 % round(time() - self.start_time, 1)
-							line3 = string3 % (', '.join(info))
-							if not info: break
-							if self.progressDialog != control.progressDialogBG: self.progressDialog.update(100, f"{line1}[CR]{line2}[CR]{line3}")
-							else: self.progressDialog.update(100, line1 + '  ' + line3)
-						except:
-							log_utils.error()
-							break
-						control.sleep(25)
-					except: log_utils.error()
-			[i.join() for i in threads]
+		for debrid_name, valid_hoster in services:
+			try:
+				if deepcopy_sources: self.filter += self.debrid_cache_chk_list(deepcopy_sources, debrid_name, availability.result(debrid_name))
+				if valid_hoster: self.filter += [dict(list(i.items()) + [('debrid', debrid_name)]) for i in self.sources if i['source'] in valid_hoster and 'magnet:' not in i['url']]
+			except: log_utils.error()
 
 		self.filter += direct # add direct links in to be considered in priority sorting
 		try:
@@ -908,27 +806,27 @@ class Sources:
 		if getSetting('sources.group.sort') == '1':
 			torr_filter = []
 			torr_filter += [i for i in self.sources if 'torrent' in i['source']]  #torrents first
-			if getSetting('sources.size.sort') == 'true': torr_filter.sort(key=lambda k: round(k.get('size', 0)), reverse=True)
+			if getSettingBool('sources.size.sort'): torr_filter.sort(key=lambda k: round(k.get('size', 0)), reverse=True)
 			aact_filter = []
 			aact_filter += [i for i in self.sources if i['direct'] == True]  #account scrapers and local/library next
-			if getSetting('sources.size.sort') == 'true': aact_filter.sort(key=lambda k: round(k.get('size', 0)), reverse=True)
+			if getSettingBool('sources.size.sort'): aact_filter.sort(key=lambda k: round(k.get('size', 0)), reverse=True)
 			prem_filter = []
 			prem_filter += [i for i in self.sources if 'torrent' not in i['source'] and i['debridonly'] is True]  #prem.hosters last
-			if getSetting('sources.size.sort') == 'true': prem_filter.sort(key=lambda k: round(k.get('size', 0)), reverse=True)
+			if getSettingBool('sources.size.sort'): prem_filter.sort(key=lambda k: round(k.get('size', 0)), reverse=True)
 			self.sources = torr_filter
 			self.sources += aact_filter
 			self.sources += prem_filter
-		elif getSetting('sources.size.sort') == 'true':
+		elif getSettingBool('sources.size.sort'):
 			reverse_sort = True if getSetting('sources.sizeSort.reverse') == 'false' else False
 			self.sources.sort(key=lambda k: round(k.get('size', 0), 2), reverse=reverse_sort)
 
-		if getSetting('source.prioritize.hevc') == 'true': # filter to place HEVC sources first
+		if getSettingBool('source.prioritize.hevc'): # filter to place HEVC sources first
 			filter = []
 			filter += [i for i in self.sources if 'HEVC' in i.get('info', '')]
 			filter += [i for i in self.sources if i not in filter]
 			self.sources = filter
 
-		if getSetting('source.prioritize.hdrdv') == 'true': # filter to place HDR and DOLBY-VISION sources first
+		if getSettingBool('source.prioritize.hdrdv'): # filter to place HDR and DOLBY-VISION sources first
 			filter = []
 			filter += [i for i in self.sources if any(value in i.get('info', '') for value in (' HDR ', 'DOLBY-VISION'))]
 			filter += [i for i in self.sources if i not in filter]
@@ -948,29 +846,30 @@ class Sources:
 	def filter_dupes(self):
 		filter = []
 		append = filter.append
-		remove = filter.remove
+		hashes, urls = {}, {} # normalized infohash or url: index of the kept source in filter, replaced sources are set to None
 		log_dupes = getSetting('remove.duplicates.logging') == 'false'
 		for i in self.sources:
-			larger = False
-			a = i['url'].lower()
-			for sublist in filter:
-				try:
-					if i['source'] == 'cloud': break
-					b = sublist['url'].lower()
-					if 'magnet:' in a:
-						if i['hash'].lower() in b:
-							if sublist['provider'] == 'torrentio' or (len(sublist['name']) > len(i['name']) and i['provider'] != 'torrentio'): # favor "torrentio" or keep matching hash with longer name for possible more info
-								larger = True
-								break
-							remove(sublist)
-							if log_dupes: log_utils.log('Removing %s - %s (DUPLICATE TORRENT) ALREADY IN :: %s' % (sublist['provider'], b, i['provider']), level=log_utils.LOGDEBUG)
-							break
-					elif a == b:
-						remove(sublist)
-						if log_dupes: log_utils.log('Removing %s - %s (DUPLICATE LINK) ALREADY IN :: %s' % (sublist['source'], i['url'], i['provider']), level=log_utils.LOGDEBUG)
-						break
-				except: log_utils.error('Error filter_dupes: ')
-			if not larger: append(i) # sublist['name'] len() was larger, or "torrentio" so do not append
+			try:
+				if i['source'] == 'cloud': # cloud sources are never deduped
+					append(i)
+					continue
+				a = i['url'].lower()
+				if 'magnet:' in a: index, key = hashes, i['hash'].lower()
+				else: index, key = urls, a
+				position = index.get(key)
+				if position is not None:
+					sublist = filter[position]
+					if index is hashes:
+						if sublist['provider'] == 'torrentio' or (len(sublist['name']) > len(i['name']) and i['provider'] != 'torrentio'): continue # favor "torrentio" or keep matching hash with longer name for possible more info
+						if log_dupes: log_utils.log('Removing %s - %s (DUPLICATE TORRENT) ALREADY IN :: %s' % (sublist['provider'], sublist['url'].lower(), i['provider']), level=log_utils.LOGDEBUG)
+					elif log_dupes: log_utils.log('Removing %s - %s (DUPLICATE LINK) ALREADY IN :: %s' % (sublist['source'], i['url'], i['provider']), level=log_utils.LOGDEBUG)
+					filter[position] = None
+				index[key] = len(filter)
+				append(i)
+			except:
+				log_utils.error('Error filter_dupes: ')
+				append(i)
+		filter = [i for i in filter if i is not None]
 		item_title = homeWindow.getProperty(self.labelProperty)
 #		if self.mediatype == 'movie' or (self.mediatype == 'episode' and not self.enable_playnext):
 #			control.notification(title=item_title, message='Removed %s duplicate sources from list' % (len(self.sources) - len(filter)))
@@ -978,7 +877,7 @@ class Sources:
 		return filter
 
 	def sourcesAutoPlay(self, items):
-		if getSetting('autoplay.sd') == 'true': items = [i for i in items if not i['quality'] in ('4K', '1080p', '720p')]
+		if getSettingBool('autoplay.sd'): items = [i for i in items if not i['quality'] in ('4K', '1080p', '720p')]
 		header = homeWindow.getProperty(self.labelProperty) + ': Resolving...'
 		try:
 			if getSetting('progress.dialog') == '0':
@@ -1142,11 +1041,12 @@ class Sources:
 			log_utils.error('Error debridPackDialog: ')
 			control.hide()
 
-	def sourceInfo(self, item):
+	def sourceInfo(self, result_set, index):
 		try:
 			from sys import platform as sys_platform
 			supported_platform = any(value in sys_platform for value in ('win32', 'linux2'))
-			source = jsloads(item)[0]
+			source = providerscache.resultset_item(result_set, index)
+			if not source: return control.notification(message='Source list expired, scrape again')
 			list = [('[COLOR %s]url:[/COLOR]  %s' % (self.highlight_color, source.get('url')), source.get('url'))]
 			if supported_platform: list += [('[COLOR %s]  -- Copy url To Clipboard[/COLOR]' % self.highlight_color, ' ')] # "&" in magnets causes copy2clip to fail .replace('&', '^&').strip() used in copy2clip() method
 			list += [('[COLOR %s]name:[/COLOR]  %s' % (self.highlight_color, source.get('name')), source.get('name'))]
@@ -1289,142 +1189,24 @@ class Sources:
 			except: log_utils.error()
 		return self.sources
 
-	def ad_cache_chk_list(self, torrent_List, hashList):
-		if len(torrent_List) == 0: return
-		try:
-#			from resources.lib.debrid.alldebrid import AllDebrid
-#			cached = AllDebrid().check_cache(hashList)
-#			if not cached: return None
-#			cached = cached['magnets']
-#			count = 0
-#			for i in torrent_List:
-#				if 'error' in cached[count]: # list index out of range
-#					count += 1
-#					continue
-#				if cached[count]['instant'] is False:
-#					if 'package' in i: i.update({'source': 'uncached (pack) torrent'})
-#					else: i.update({'source': 'uncached torrent'})
-#				else:
-#					if 'package' in i: i.update({'source': 'cached (pack) torrent'})
-#					else: i.update({'source': 'cached torrent'})
-#				count += 1
-			[i.update({'source': f"unchecked{' (pack)' if 'package' in i else ''}"}) for i in torrent_List]
-			return torrent_List
-		except: log_utils.error()
-
-	def pm_cache_chk_list(self, torrent_List, hashList):
-		if len(torrent_List) == 0: return
-		try:
-			from resources.lib.debrid.premiumize import Premiumize
-			cached = Premiumize().check_cache_list(hashList)
-			if not cached: return None
-			count = 0
-			for i in torrent_List:
-				if cached[count] is False:
-					if 'package' in i: i.update({'source': 'uncached (pack) torrent'})
-					else: i.update({'source': 'uncached torrent'})
-				else:
-					if 'package' in i: i.update({'source': 'cached (pack) torrent'})
-					else: i.update({'source': 'cached torrent'})
-				count += 1
-			return torrent_List
-		except: log_utils.error()
-
-	def rd_cache_chk_list(self, torrent_List, hashList):
-		def _process(_chunk, _id):
-			try: cached.update(dmm.check_cache(_chunk, _id))
-			except: pass
-		if len(torrent_List) == 0: return
-		try:
-			if getSetting('realdebrid.check_cache') == 'true':
-				from resources.lib.debrid.dmm import DMMCache
-				cached = {}
-				threads = []
-				chunk_size, dmm = 100, DMMCache()
-				chunks = (hashList[i:i + chunk_size] for i in range(0, len(hashList), chunk_size))
-				for chunk in chunks:
-					thread = Thread(target=_process, args=(chunk, self.meta['imdb']))
-					threads.append(thread)
-					thread.start()
-				[i.join() for i in threads]
-				if not cached: return None
-				for i in torrent_List:
-					if not cached.get(i['hash'].lower(), []): # i['hash'] could still be base32 here and not found due to conversion above
-						if 'package' in i: i.update({'source': 'uncached (pack) torrent'})
-						else: i.update({'source': 'uncached torrent'})
-						continue
-					elif len(cached[i['hash'].lower()]) >= 1:
-						if 'package' in i: i.update({'source': 'cached (pack) torrent'})
-						else: i.update({'source': 'cached torrent'})
-					else:
-						if 'package' in i: i.update({'source': 'uncached (pack) torrent'})
-						else: i.update({'source': 'uncached torrent'})
-			else: [i.update({'source': f"unchecked{' (pack)' if 'package' in i else ''}"}) for i in torrent_List]
-			return torrent_List
-		except: log_utils.error()
-
-	def oc_cache_chk_list(self, torrent_List, hashList):
-		if len(torrent_List) == 0: return
-		try:
-			from resources.lib.debrid.offcloud import Offcloud
-			cached = Offcloud().check_cache(hashList)
-			if not cached: return None
-			cached = cached['cachedItems']
-			for i in torrent_List:
-				if i['hash'].lower() in cached:
-					if 'package' in i: i.update({'source': 'cached (pack) torrent'})
-					else: i.update({'source': 'cached torrent'})
-				else:
-					if 'package' in i: i.update({'source': 'uncached (pack) torrent'})
-					else: i.update({'source': 'uncached torrent'})
-			return torrent_List
-		except: log_utils.error()
-
-	def ed_cache_chk_list(self, torrent_List, hashList):
-		if len(torrent_List) == 0: return
-		try:
-			from resources.lib.debrid.easydebrid import EasyDebrid
-			cached = EasyDebrid().check_cache(hashList)
-			if not cached: return None
-			cached = cached['cached']
-			for i, is_cached in zip(torrent_List, cached):
-				if i['hash'].lower() and is_cached:
-					if 'package' in i: i.update({'source': 'cached (pack) torrent'})
-					else: i.update({'source': 'cached torrent'})
-				else:
-					if 'package' in i: i.update({'source': 'uncached (pack) torrent'})
-					else: i.update({'source': 'uncached torrent'})
-			return torrent_List
-		except: log_utils.error()
-
-	def tb_cache_chk_list(self, torrent_List, hashList):
-		if len(torrent_List) == 0: return
-		try:
-			from resources.lib.debrid.torbox import TorBox
-			cached = TorBox().check_cache(hashList)
-			if not cached: return None
-			cached = [i['hash'] for i in cached['data']]
-			for i in torrent_List:
-				if i['hash'].lower() in cached:
-					if 'package' in i: i.update({'source': 'cached (pack) torrent'})
-					else: i.update({'source': 'cached torrent'})
-				else:
-					if 'package' in i: i.update({'source': 'uncached (pack) torrent'})
-					else: i.update({'source': 'uncached torrent'})
-			return torrent_List
-		except: log_utils.error()
+	def debrid_cache_chk_list(self, torrent_List, debrid_name, verdicts):
+		"""
+		:param verdicts: {hash: True/False} from Availability.result(), None when the service has no cache check (AllDebrid) or it is disabled
+		Returns new source dicts for debrid_name, a hash without a verdict (failed or cancelled request) is listed as unchecked.
+		"""
+		results = []
+		for i in torrent_List:
+			pack = ' (pack)' if 'package' in i else ''
+			cached = verdicts.get(i['hash'].lower()) if verdicts is not None else None
+			if cached is None: source = f"unchecked{pack}"
+			elif cached: source = f"cached{pack} torrent"
+			else: source = f"uncached{pack} torrent"
+			results.append(dict(list(i.items()) + [('source', source), ('debrid', debrid_name)])) # new instance per debrid, no deepcopy beyond the one done in sourcesFilter()
+		return results
 
 	def clr_item_providers(self, title, year, imdb, tmdb, tvdb, season, episode, tvshowtitle, premiered):
 		providerscache.remove(self.getSources, title, year, imdb, tmdb, tvdb, season, episode, tvshowtitle, premiered) # function cache removal of selected item ONLY
-		try:
-			dbcon = database.connect(sourceFile)
-			dbcur = dbcon.cursor()
-			dbcur.execute('''SELECT count(name) FROM sqlite_master WHERE type='table' AND name='rel_src';''') # table exists so both will
-			if dbcur.fetchone()[0] == 1:
-				dbcur.execute('''DELETE FROM rel_src WHERE imdb_id=?''', (imdb,)) # DEL the "rel_src" list of cached links
-				dbcur.connection.commit()
-		except: log_utils.error()
-		finally: dbcur.close() ; dbcon.close()
+		providerscache.results_remove(imdb) # DEL the "rel_results" cached links
 
 	def imdb_meta_chk(self, imdb, title, year):
 		try:
@@ -1437,17 +1219,17 @@ class Sources:
 			title_ck = self.getTitle(result['l'])
 			if not year_ck or not title_ck: return title, year
 			if self.mediatype == 'movie':
-				if getSetting('imdb.Movietitle.check') == 'true' and (title != title_ck):
+				if getSettingBool('imdb.Movietitle.check') and (title != title_ck):
 					log_utils.log('IMDb Movie title_ck: (%s) does not match meta Movie title passed: (%s)' % (title_ck, title), __name__, level=log_utils.LOGDEBUG)
 					title = title_ck
-				if getSetting('imdb.Movieyear.check') == 'true' and (year != year_ck):
+				if getSettingBool('imdb.Movieyear.check') and (year != year_ck):
 					log_utils.log('IMDb Movie year_ck: (%s) does not match meta Movie year passed: (%s) for title: (%s)' % (year_ck, year, title), __name__, level=log_utils.LOGDEBUG)
 					year = year_ck
 			else:
-				if getSetting('imdb.Showtitle.check') == 'true' and (title != title_ck):
+				if getSettingBool('imdb.Showtitle.check') and (title != title_ck):
 					log_utils.log('IMDb Show title_ck: (%s) does not match meta tvshowtitle title passed: (%s)' % (title_ck, title), __name__, level=log_utils.LOGDEBUG)
 					title = title_ck
-				if getSetting('imdb.Showyear.check') == 'true' and (year != year_ck):
+				if getSettingBool('imdb.Showyear.check') and (year != year_ck):
 					log_utils.log('IMDb Show year_ck: (%s) does not match meta tvshowtitle year passed: (%s) for title: (%s)' % (year_ck, year, title), __name__, level=log_utils.LOGDEBUG)
 					year = year_ck
 			return title, year
@@ -6,6 +6,7 @@ from json import dumps as jsdumps
 from urllib.parse import quote_plus
 from resources.lib.modules.control import joinPath, transPath, dialog, getSourceHighlightColor, notification, setting as getSetting
 from resources.lib.modules.source_utils import getFileType
+from resources.lib.database import providerscache
 from resources.lib.modules import tools
 from resources.lib.windows.base import BaseDialog
 
@@ -24,6 +25,7 @@ class SourceResultsXML(BaseDialog):
 		self.uncached = kwargs.get('uncached')
 		self.total_results = str(len(self.results))
 		self.meta = kwargs.get('meta')
+		self._result_set = None
 		self.make_items()
 		self.set_properties()
 		self.dnlds_enabled = True if getSetting('downloads') == 'true' and (getSetting('movie.download.path') != '' or getSetting('tv.download.path') != '') else False
@@ -43,9 +45,8 @@ class SourceResultsXML(BaseDialog):
 			action_id = action.getId() # change to just "action" as the ID is already returned in that.
 			if action_id in self.info_actions:
 				chosen_source = self.item_list[self.get_position(self.window_id)]
-				chosen_source = chosen_source.getProperty('zwpseudo.source_dict')
-				syssource = quote_plus(chosen_source)
-				self.execute_code('RunPlugin(plugin://plugin.video.zwpseudo/?action=sourceInfo&source=%s)' % syssource)
+				if not chosen_source.getProperty('zwpseudo.index'): return # "View Uncached Torrents" row is not a result
+				self.execute_code('RunPlugin(plugin://plugin.video.zwpseudo/?action=sourceInfo&result_set=%s&index=%s)' % (self.result_set(), chosen_source.getProperty('zwpseudo.index')))
 			if action_id in self.selection_actions:
 				chosen_source = self.item_list[self.get_position(self.window_id)]
 				source = chosen_source.getProperty('zwpseudo.source')
@@ -58,8 +59,8 @@ class SourceResultsXML(BaseDialog):
 					return
 				elif 'UNCACHED' in source:
 					debrid = chosen_source.getProperty('zwpseudo.debrid')
-					source_dict = chosen_source.getProperty('zwpseudo.source_dict')
-					link_type = 'pack' if 'package' in source_dict else 'single'
+					index = chosen_source.getProperty('zwpseudo.index')
+					link_type = 'pack' if 'package' in self.results[int(index)] else 'single'
 					sysname = quote_plus(self.meta.get('title'))
 					if 'tvshowtitle' in self.meta and 'season' in self.meta and 'episode' in self.meta:
 						poster = self.meta.get('season_poster') or self.meta.get('poster')
@@ -67,8 +68,8 @@ class SourceResultsXML(BaseDialog):
 					elif 'year' in self.meta: sysname += quote_plus(' (%s)' % self.meta['year'])
 					try: new_sysname = quote_plus(chosen_source.getProperty('zwpseudo.name'))
 					except: new_sysname = sysname
-					self.execute_code('RunPlugin(plugin://plugin.video.zwpseudo/?action=cacheTorrent&caller=%s&type=%s&title=%s&items=%s&url=%s&source=%s&meta=%s)' %
-											(debrid, link_type, sysname, quote_plus(jsdumps(self.results)), quote_plus(chosen_source.getProperty('zwpseudo.url')), quote_plus(source_dict), quote_plus(jsdumps(self.meta))))
+					self.execute_code('RunPlugin(plugin://plugin.video.zwpseudo/?action=cacheTorrent&caller=%s&type=%s&title=%s&result_set=%s&url=%s&index=%s&meta=%s)' %
+											(debrid, link_type, sysname, self.result_set(), quote_plus(chosen_source.getProperty('zwpseudo.url')), index, quote_plus(jsdumps(self.meta))))
 					self.selected = (None, '')
 				else:
 					self.selected = ('play_Item', chosen_source)
@@ -76,9 +77,10 @@ class SourceResultsXML(BaseDialog):
 			elif action_id in self.context_actions:
 				from re import match as re_match
 				chosen_source = self.item_list[self.get_position(self.window_id)]
-				source_dict = chosen_source.getProperty('zwpseudo.source_dict')
+				index = chosen_source.getProperty('zwpseudo.index')
+				if not index: return # "View Uncached Torrents" row is not a result, it has no link menu
 				cm_list = [('[B]Additional Link Info[/B]', 'sourceInfo')]
-				if 'cached (pack)' in source_dict or 'unchecked (pack)' in source_dict:
+				if any(i in self.results[int(index)].get('source', '') for i in ('cached (pack)', 'unchecked (pack)')):
 					cm_list += [('[B]Browse Debrid Pack[/B]', 'showDebridPack')]
 				source = chosen_source.getProperty('zwpseudo.source')
 				if not 'UNCACHED' in source and self.dnlds_enabled:
@@ -90,7 +92,7 @@ class SourceResultsXML(BaseDialog):
 				if chosen_cm_item == -1: return
 				cm_action = cm_list[chosen_cm_item][1]
 				if cm_action == 'sourceInfo':
-					self.execute_code('RunPlugin(plugin://plugin.video.zwpseudo/?action=sourceInfo&source=%s)' % quote_plus(source_dict))
+					self.execute_code('RunPlugin(plugin://plugin.video.zwpseudo/?action=sourceInfo&result_set=%s&index=%s)' % (self.result_set(), index))
 				elif cm_action == 'showDebridPack':
 					debrid = chosen_source.getProperty('zwpseudo.debrid')
 					name = chosen_source.getProperty('zwpseudo.name')
@@ -108,8 +110,8 @@ class SourceResultsXML(BaseDialog):
 					elif 'year' in self.meta: sysname += quote_plus(' (%s)' % self.meta['year'])
 					try: new_sysname = quote_plus(chosen_source.getProperty('zwpseudo.name'))
 					except: new_sysname = sysname
-					self.execute_code('RunPlugin(plugin://plugin.video.zwpseudo/?action=download&name=%s&image=%s&source=%s&caller=sources&title=%s)' %
-										(new_sysname, quote_plus(poster), quote_plus(source_dict), sysname))
+					self.execute_code('RunPlugin(plugin://plugin.video.zwpseudo/?action=download&name=%s&image=%s&result_set=%s&index=%s&caller=sources&title=%s)' %
+										(new_sysname, quote_plus(poster), self.result_set(), index, sysname))
 					self.selected = (None, '')
 				elif cm_action == 'saveToCloud':
 					magnet = chosen_source.getProperty('zwpseudo.url')
@@ -146,6 +148,10 @@ class SourceResultsXML(BaseDialog):
 			from resources.lib.modules import log_utils
 			log_utils.error()
 
+	def result_set(self):
+		if not self._result_set: self._result_set = providerscache.resultset_store(self.results) # stored on the first RunPlugin action that needs it
+		return self._result_set
+
 	def get_quality_iconPath(self, quality):
 		try:
 			return joinPath(transPath('special://home/addons/plugin.video.zwpseudo/resources/skins/Default/media/resolution'), '%s.png' % quality)
@@ -172,7 +178,7 @@ class SourceResultsXML(BaseDialog):
 					extra_info = extra_info.replace('/', '')
 					extra_info = extra_info.split('GB ', 1)[-1]
 					size_label = '%.2f GB' % item.get('size', 0) if item.get('size') else 'NA'
-					listitem.setProperty('zwpseudo.source_dict', jsdumps([item]))
+					listitem.setProperty('zwpseudo.index', str(count - 1))
 					listitem.setProperty('zwpseudo.debrid', self.debrid_abv(item.get('debrid')))
 					listitem.setProperty('zwpseudo.provider', item.get('provider').upper())
 					listitem.setProperty('zwpseudo.source', item.get('source').upper())
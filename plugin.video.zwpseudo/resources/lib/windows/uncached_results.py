@@ -6,6 +6,7 @@ from json import dumps as jsdumps
 from urllib.parse import quote_plus
 from resources.lib.modules.control import joinPath, transPath, dialog
 from resources.lib.modules.source_utils import getFileType
+from resources.lib.database import providerscache
 from resources.lib.modules import tools
 from resources.lib.windows.base import BaseDialog
 
@@ -17,6 +18,7 @@ class UncachedResultsXML(BaseDialog):
 		self.uncached = kwargs.get('uncached')
 		self.total_results = str(len(self.uncached))
 		self.meta = kwargs.get('meta')
+		self._result_set = None
 		self.make_items()
 		self.set_properties()
 
@@ -35,16 +37,14 @@ class UncachedResultsXML(BaseDialog):
 			action_id = action.getId()# change to just "action" as the ID is already returned in that.
 			if action_id in self.info_actions:
 				chosen_source = self.item_list[self.get_position(self.window_id)]
-				chosen_source = chosen_source.getProperty('zwpseudo.source_dict')
-				syssource = quote_plus(chosen_source)
-				self.execute_code('RunPlugin(plugin://plugin.video.zwpseudo/?action=sourceInfo&source=%s)' % syssource)
+				self.execute_code('RunPlugin(plugin://plugin.video.zwpseudo/?action=sourceInfo&result_set=%s&index=%s)' % (self.result_set(), chosen_source.getProperty('zwpseudo.index')))
 			if action_id in self.selection_actions:
 				chosen_source = self.item_list[self.get_position(self.window_id)]
 				source = chosen_source.getProperty('zwpseudo.source')
 				if 'UNCACHED' in source:
 					debrid = chosen_source.getProperty('zwpseudo.debrid')
-					source_dict = chosen_source.getProperty('zwpseudo.source_dict')
-					link_type = 'pack' if 'package' in source_dict else 'single'
+					index = chosen_source.getProperty('zwpseudo.index')
+					link_type = 'pack' if 'package' in self.uncached[int(index)] else 'single'
 					sysname = quote_plus(self.meta.get('title'))
 					if 'tvshowtitle' in self.meta and 'season' in self.meta and 'episode' in self.meta:
 						poster = self.meta.get('season_poster') or self.meta.get('poster')
@@ -52,15 +52,15 @@ class UncachedResultsXML(BaseDialog):
 					elif 'year' in self.meta: sysname += quote_plus(' (%s)' % self.meta['year'])
 					try: new_sysname = quote_plus(chosen_source.getProperty('zwpseudo.name'))
 					except: new_sysname = sysname
-					self.execute_code('RunPlugin(plugin://plugin.video.zwpseudo/?action=cacheTorrent&caller=%s&type=%s&title=%s&items=%s&url=%s&source=%s&meta=%s)' %
-											(debrid, link_type, sysname, quote_plus(jsdumps(self.uncached)), quote_plus(chosen_source.getProperty('zwpseudo.url')), quote_plus(source_dict), quote_plus(jsdumps(self.meta))))
+					self.execute_code('RunPlugin(plugin://plugin.video.zwpseudo/?action=cacheTorrent&caller=%s&type=%s&title=%s&result_set=%s&url=%s&index=%s&meta=%s)' %
+											(debrid, link_type, sysname, self.result_set(), quote_plus(chosen_source.getProperty('zwpseudo.url')), index, quote_plus(jsdumps(self.meta))))
 					self.selected = (None, '')
 				else:
 					self.selected = (None, '')
 				return self.close()
 			elif action_id in self.context_actions:
 				chosen_source = self.item_list[self.get_position(self.window_id)]
-				source_dict = chosen_source.getProperty('zwpseudo.source_dict')
+				index = chosen_source.getProperty('zwpseudo.index')
 				cm_list = [('[B]Additional Link Info[/B]', 'sourceInfo')]
 
 				source = chosen_source.getProperty('zwpseudo.source')
@@ -74,12 +74,12 @@ class UncachedResultsXML(BaseDialog):
 				cm_action = cm_list[chosen_cm_item][1]
 
 				if cm_action == 'sourceInfo':
-					self.execute_code('RunPlugin(plugin://plugin.video.zwpseudo/?action=sourceInfo&source=%s)' % quote_plus(source_dict))
+					self.execute_code('RunPlugin(plugin://plugin.video.zwpseudo/?action=sourceInfo&result_set=%s&index=%s)' % (self.result_set(), index))
 
 				if cm_action == 'cacheToCloud':
 					debrid = chosen_source.getProperty('zwpseudo.debrid')
-					source_dict = chosen_source.getProperty('zwpseudo.source_dict')
-					link_type = 'pack' if 'package' in source_dict else 'single'
+					index = chosen_source.getProperty('zwpseudo.index')
+					link_type = 'pack' if 'package' in self.uncached[int(index)] else 'single'
 					sysname = quote_plus(self.meta.get('title'))
 					if 'tvshowtitle' in self.meta and 'season' in self.meta and 'episode' in self.meta:
 						poster = self.meta.get('season_poster') or self.meta.get('poster')
@@ -87,8 +87,8 @@ class UncachedResultsXML(BaseDialog):
 					elif 'year' in self.meta: sysname += quote_plus(' (%s)' % self.meta['year'])
 					try: new_sysname = quote_plus(chosen_source.getProperty('zwpseudo.name'))
 					except: new_sysname = sysname
-					self.execute_code('RunPlugin(plugin://plugin.video.zwpseudo/?action=cacheTorrent&caller=%s&type=%s&title=%s&items=%s&url=%s&source=%s&meta=%s)' %
-											(debrid, link_type, sysname, quote_plus(jsdumps(self.uncached)), quote_plus(chosen_source.getProperty('zwpseudo.url')), quote_plus(source_dict), quote_plus(jsdumps(self.meta))))
+					self.execute_code('RunPlugin(plugin://plugin.video.zwpseudo/?action=cacheTorrent&caller=%s&type=%s&title=%s&result_set=%s&url=%s&index=%s&meta=%s)' %
+											(debrid, link_type, sysname, self.result_set(), quote_plus(chosen_source.getProperty('zwpseudo.url')), index, quote_plus(jsdumps(self.meta))))
 			elif action in self.closing_actions:
 				self.selected = (None, '')
 				self.close()
@@ -96,6 +96,10 @@ class UncachedResultsXML(BaseDialog):
 			from resources.lib.modules import log_utils
 			log_utils.error()
 
+	def result_set(self):
+		if not self._result_set: self._result_set = providerscache.resultset_store(self.uncached)
+		return self._result_set
+
 	def get_quality_iconPath(self, quality):
 		try:
 			return joinPath(transPath('special://home/addons/plugin.video.zwpseudo/resources/skins/Default/media/resolution'), '%s.png' % quality)
@@ -120,7 +124,7 @@ class UncachedResultsXML(BaseDialog):
 					quality_icon = self.get_quality_iconPath(quality)
 					extra_info = item.get('info')
 					size_label = str(round(item.get('size', ''), 2)) + ' GB' if item.get('size') else 'NA'
-					listitem.setProperty('zwpseudo.source_dict', jsdumps([item]))
+					listitem.setProperty('zwpseudo.index', str(count - 1))
 					listitem.setProperty('zwpseudo.debrid', self.debrid_abv(item.get('debrid')))
 					listitem.setProperty('zwpseudo.provider', item.get('provider').upper())
 					listitem.setProperty('zwpseudo.source', item.get('source').upper())
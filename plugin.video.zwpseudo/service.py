@@ -28,6 +28,7 @@ class CheckSettingsFile:
 				control.log('%s : created successfully' % settings_xml, LOGINFO)
 			else: log_utils.log('%s : already exists' % settings_xml, LOGINFO)
 			control.make_settings_dict()
+			control.bump_settings_generation()
 			return control.log('[ plugin.video.zwpseudo ]  CheckSettingsFile Service Finished', LOGINFO)
 		except:
 			log_utils.error()
@@ -37,16 +38,15 @@ class SettingsMonitor(control.monitor_class):
 		control.monitor_class.__init__(self)
 		control.refresh_playAction()
 		control.refresh_libPath()
-		window.setProperty('zwpseudo.debug.reversed', control.setting('debug.reversed'))
 		control.log('[ plugin.video.zwpseudo ]  Settings Monitor Service Starting...', LOGINFO)
 
 	def onSettingsChanged(self): # Kodi callback when the addon settings are changed
 		window.clearProperty('zwpseudo_settings')
 		control.sleep(50)
 		refreshed = control.make_settings_dict()
+		control.bump_settings_generation()
 		control.refresh_playAction()
 		control.refresh_libPath()
-		control.refresh_debugReversed()
 
 class ReuseLanguageInvokerCheck:
 	def run(self):
@@ -172,6 +172,44 @@ class SyncTraktService:
 		control.log('[ plugin.video.zwpseudo ]  Trakt Sync Service Starting (sync check every %s minutes)...' % service_syncInterval, LOGINFO)
 		trakt.trakt_service_sync() # method contains "control.monitor().waitForAbort()" while loop every "service_syncInterval" minutes
 
+class CloudIndexService:
+	def run(self):
+		from resources.lib.debrid import cloud_library
+		control.log('[ plugin.video.zwpseudo ]  Debrid Cloud Index Service Starting (sync check every %s minutes)...' % (cloud_library.STALE // 120), LOGINFO)
+		while not control.monitor.abortRequested():
+			cloud_library.sync_enabled() # incremental, only new or changed cloud folders are requested
+			if control.monitor.waitForAbort(cloud_library.STALE // 2): break
+
+class CacheRefreshService:
+	def run(self):
+		from resources.lib.database import cache
+		control.log('[ plugin.video.zwpseudo ]  Cache Refresh Service Starting...', LOGINFO)
+		cache.refresh_queued() # stale entries queued by plugin runs before Kodi was last closed
+		while not control.monitor.waitForAbort(2):
+			if control.homeWindow.getProperty(cache.refresh_wake) != 'true': continue
+			control.homeWindow.clearProperty(cache.refresh_wake)
+			cache.refresh_queued()
+
+class TraktMutationService:
+	def run(self):
+		from resources.lib.indexers import trakt
+		control.log('[ plugin.video.zwpseudo ]  Trakt Mutation Service Starting...', LOGINFO)
+		try: left = trakt.flush_mutations() # writes queued by plugin runs before Kodi was last closed
+		except: left = 0 ; log_utils.error()
+		retry = time.time() + trakt.MUTATION_RETRY
+		while not control.monitor.waitForAbort(2):
+			if control.homeWindow.getProperty(trakt.mutation_wake) == 'true': control.homeWindow.clearProperty(trakt.mutation_wake)
+			elif not left or time.time() < retry: continue # writes left by a failure are retried without waiting for a new one to be queued
+			try: left = trakt.flush_mutations()
+			except: log_utils.error()
+			retry = time.time() + trakt.MUTATION_RETRY
+
+class DownloadService:
+	def run(self):
+		from resources.lib.modules.downloader import DownloadManager
+		control.log('[ plugin.video.zwpseudo ]  Download Queue Service Starting...', LOGINFO)
+		DownloadManager().run()
+
 class CheckUndesirablesDatabase:
 	def run(self):
 		from resources.lib.fenom.undesirables import Undesirables, add_new_default_keywords
@@ -252,6 +290,16 @@ def main():
 		accountsService = Thread(target=PremAccntNotification().run)
 		accountsService.start()
 
+		cloudIndexService = Thread(target=CloudIndexService().run) # keeps the local debrid cloud index current for the cloud scrapers
+		cloudIndexService.start()
+
+		cacheRefreshService = Thread(target=CacheRefreshService().run) # refreshes stale cache entries plugin runs served from cache.get()
+		cacheRefreshService.start()
+		traktMutationService = Thread(target=TraktMutationService().run) # sends the Trakt writes the managers queued, merged per endpoint
+		traktMutationService.start()
+		downloadService = Thread(target=DownloadService().run) # downloads queued from the plugin, resumed across restarts
+		downloadService.start()
+
 		syncTraktService = Thread(target=SyncTraktService().run) # run service in case user auth's trakt later, sync will loop and do nothing without valid auth'd account
 		syncTraktService.start()
 